@@ -90,8 +90,6 @@ with dai.Device(pipeline) as device:
         inColor = inMessage["rgb"]
         inPointCloud = inMessage["pcl"]
         cvColorFrame = inColor.getCvFrame()
-        # Convert the frame to RGB
-        cvRGBFrame = cv2.cvtColor(cvColorFrame, cv2.COLOR_BGR2RGB)
         fps = fpsCounter.tick()
         # Display the FPS on the frame
         cv2.putText(cvColorFrame, f"FPS: {fps:.2f}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
@@ -101,10 +99,10 @@ with dai.Device(pipeline) as device:
             break
         if inPointCloud:
             t_before = time.time()
-            points = inPointCloud.getPoints().astype(np.float64)
-            pcd.points = o3d.utility.Vector3dVector(points)
-            colors = (cvRGBFrame.reshape(-1, 3) / 255.0).astype(np.float64)
-            pcd.colors = o3d.utility.Vector3dVector(colors)
+            # Points paired with RGB colors of the aligned frame, points without depth are left out
+            points, colors = inPointCloud.getPointsRGB(inColor)
+            pcd.points = o3d.utility.Vector3dVector(points.astype(np.float64))
+            pcd.colors = o3d.utility.Vector3dVector(colors.astype(np.float64) / 255.0)
             if first:
                 vis.add_geometry(pcd)
                 first = False
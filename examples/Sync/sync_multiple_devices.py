@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+import cv2
+import depthai as dai
+import contextlib
+from datetime import timedelta
+
+def createPipeline():
+    pipeline = dai.Pipeline()
+    camRgb = pipeline.create(dai.node.ColorCamera)
+    camRgb.setPreviewSize(300, 300)
+    camRgb.setBoardSocket(dai.CameraBoardSocket.CAM_A)
+    camRgb.setInterleaved(False)
+    camRgb.setFps(30)
+
+    xoutRgb = pipeline.create(dai.node.XLinkOut)
+    xoutRgb.setStreamName("rgb")
+    camRgb.preview.link(xoutRgb.input)
+    return pipeline
+
+
+with contextlib.ExitStack() as stack:
+    queues = {}
+    for deviceInfo in dai.Device.getAllAvailableDevices():
+        device: dai.Device = stack.enter_context(dai.Device(createPipeline(), deviceInfo))
+        print("===Connected to ", device.getMxId())
+        # All devices have an 'rgb' queue, name the streams by device instead
+        queues["rgb-" + device.getMxId()] = device.getOutputQueue(name="rgb", maxSize=4, blocking=False)
+
+    # Groups frames of all devices, matched by their host synced timestamps
+    sync = dai.HostSync(queues, syncThreshold=timedelta(milliseconds=15))
+
+    while True:
+        group = sync.get()
+        for name, frame in group:
+            cv2.imshow(name, frame.getCvFrame())
+        print(f"Group {group.getSequenceNum()}, interval between frames: {group.getIntervalNs() / 1e6:.2f} ms")
+
+        if cv2.waitKey(1) == ord('q'):
+            break
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+import asyncio
+import depthai as dai
+
+# Create pipeline
+pipeline = dai.Pipeline()
+
+# Define sources and outputs
+camRgb = pipeline.create(dai.node.ColorCamera)
+left = pipeline.create(dai.node.MonoCamera)
+xoutRgb = pipeline.create(dai.node.XLinkOut)
+xoutLeft = pipeline.create(dai.node.XLinkOut)
+
+xoutRgb.setStreamName("rgb")
+xoutLeft.setStreamName("left")
+
+# Properties
+camRgb.setPreviewSize(300, 300)
+left.setCamera("left")
+left.setResolution(dai.MonoCameraProperties.SensorResolution.THE_400_P)
+
+# Linking
+camRgb.preview.link(xoutRgb.input)
+left.out.link(xoutLeft.input)
+
+async def consume(queue: dai.DataOutputQueue, count: int):
+    # Each awaiting consumer is woken up by the queue itself, no thread is parked per queue
+    received = 0
+    async for frame in queue:
+        print(f"[{queue.getName()}] seq: {frame.getSequenceNum()}, size: {frame.getWidth()}x{frame.getHeight()}")
+        received += 1
+        if received >= count:
+            break
+
+async def main():
+    # Connect to device and start pipeline
+    with dai.Device(pipeline) as device:
+        qRgb = device.getOutputQueue(name="rgb", maxSize=4, blocking=False)
+        qLeft = device.getOutputQueue(name="left", maxSize=4, blocking=False)
+
+        # Single message can be awaited as well
+        first = await qRgb.getAsync()
+        print(f"First rgb frame at: {first.getTimestamp()}")
+
+        await asyncio.gather(consume(qRgb, 100), consume(qLeft, 100))
+
+asyncio.run(main())
@@ -2,10 +2,17 @@
 
 // std
 #include <chrono>
+#include <functional>
+#include <memory>
 
 // depthai
 #include "depthai/device/DataQueue.hpp"
 
+// project
+#include "utility/AsyncGet.hpp"
+#include "utility/BlockingCall.hpp"
+#include "utility/QueueBindings.hpp"
+
 void DataQueueBindings::bind(pybind11::module& m, void* pCallstack){
     using namespace dai;
     using namespace std::chrono;
@@ -14,6 +21,9 @@ void DataQueueBindings::bind(pybind11::module& m, void* pCallstack){
     // Type definitions
     py::class_<DataOutputQueue, std::shared_ptr<DataOutputQueue>> dataOutputQueue(m, "DataOutputQueue", DOC(dai, DataOutputQueue));
     py::class_<DataInputQueue, std::shared_ptr<DataInputQueue>> dataInputQueue(m, "DataInputQueue", DOC(dai, DataInputQueue));
+    py::class_<QueueStats> queueStats(m, "QueueStats", "Snapshot of queue counters");
+    py::class_<QueueSubscription, std::shared_ptr<QueueSubscription>> queueSubscription(m, "QueueSubscription", "Independent consumer of an output queue, with its own maximum size and blocking behavior. Messages are shared with other consumers, not copied");
+    py::enum_<QueueDropPolicy> queueDropPolicy(dataOutputQueue, "DropPolicy", "Which messages are dropped once a queue exceeds its limits");
 
 
     ///////////////////////////////////////////////////////////////////////
@@ -31,7 +41,39 @@ void DataQueueBindings::bind(pybind11::module& m, void* pCallstack){
 
 
     // To prevent blocking whole python interpreter, blocking functions like 'get' and 'send'
-    // are pooled with a reasonable delay and check for python interrupt signal in between.
+    // release the GIL while waiting. Only the main thread wakes up periodically to check for
+    // python interrupt signal, other threads block until woken up by data, timeout or queue closure.
+
+    queueDropPolicy
+        .value("DROP_OLDEST", QueueDropPolicy::DROP_OLDEST, "Drops oldest messages in the queue")
+        .value("DROP_NEWEST", QueueDropPolicy::DROP_NEWEST, "Drops the incoming message")
+        .value("KEEP_EVERY_NTH", QueueDropPolicy::KEEP_EVERY_NTH, "While the queue is over its limits, only keeps every Nth incoming message, then drops oldest messages")
+        .value("KEEP_KEYFRAMES", QueueDropPolicy::KEEP_KEYFRAMES, "Drops whole groups of pictures of an EncodedFrame stream from the oldest, so the queue always starts with a keyframe. Other messages are treated as keyframes")
+        ;
+
+    queueStats
+        .def_readonly("name", &QueueStats::name)
+        .def_readonly("messagesIn", &QueueStats::messagesIn, "Messages received from the device (output queue) or sent (input queue)")
+        .def_readonly("messagesOut", &QueueStats::messagesOut, "Messages taken from the queue")
+        .def_readonly("messagesDropped", &QueueStats::messagesDropped, "Messages overwritten by a non-blocking queue, or dropped by host side limits")
+        .def_readonly("bytesIn", &QueueStats::bytesIn)
+        .def_readonly("bytesOut", &QueueStats::bytesOut)
+        .def_readonly("depth", &QueueStats::depth, "Messages currently in the queue")
+        .def_readonly("peakDepth", &QueueStats::peakDepth)
+        .def_readonly("timeouts", &QueueStats::timeouts, "Number of get/send calls which timed out")
+        .def_readonly("callbackDropped", &QueueStats::callbackDropped, "Messages dropped by batched callbacks (see 'addCallback') which fell behind. These don't count towards 'messagesDropped'")
+        .def_readonly("waitHistogram", &QueueStats::waitHistogram, "Number of get/send calls by time spent waiting, bucketed by 'getWaitHistogramBounds'")
+        .def_readonly("totalWaitTime", &QueueStats::totalWaitTime, "Total time spent waiting in get/send calls")
+        .def_static("getWaitHistogramBounds", [](){
+            std::vector<microseconds> bounds;
+            for(auto bound : QUEUE_WAIT_HISTOGRAM_BOUNDS_US) bounds.emplace_back(bound);
+            return bounds;
+        }, "Returns upper bounds of wait histogram buckets. Last bucket holds all longer waits")
+        .def("__repr__", [](const QueueStats& stats){
+            return "QueueStats(name='" + stats.name + "', messagesIn=" + std::to_string(stats.messagesIn) + ", messagesOut=" + std::to_string(stats.messagesOut)
+                + ", messagesDropped=" + std::to_string(stats.messagesDropped) + ", depth=" + std::to_string(stats.depth) + ", peakDepth=" + std::to_string(stats.peakDepth) + ")";
+        })
+        ;
 
     // Bind DataOutputQueue
     auto addCallbackLambda = [](DataOutputQueue& q, py::function cb) -> int {
@@ -56,59 +98,59 @@ void DataQueueBindings::bind(pybind11::module& m, void* pCallstack){
         .def("addCallback", addCallbackLambda, py::arg("callback"), DOC(dai, DataOutputQueue, addCallback))
         .def("addCallback", addCallbackLambda, py::arg("callback"), DOC(dai, DataOutputQueue, addCallback, 2))
         .def("addCallback", addCallbackLambda, py::arg("callback"), DOC(dai, DataOutputQueue, addCallback, 3))
-        .def("removeCallback", &DataOutputQueue::removeCallback, py::arg("callbackId"), DOC(dai, DataOutputQueue, removeCallback))
 
         .def("setBlocking", &DataOutputQueue::setBlocking, py::arg("blocking"), DOC(dai, DataOutputQueue, setBlocking))
         .def("getBlocking", &DataOutputQueue::getBlocking, DOC(dai, DataOutputQueue, getBlocking))
         .def("setMaxSize", &DataOutputQueue::setMaxSize, py::arg("maxSize"), DOC(dai, DataOutputQueue, setMaxSize))
         .def("getMaxSize", &DataOutputQueue::getMaxSize, DOC(dai, DataOutputQueue, getMaxSize))
-        .def("getAll", [](DataOutputQueue& obj){
-
-            std::vector<std::shared_ptr<ADatatype>> messages;
-            bool timedout = true;
-            do {
-                {
-                    // releases python GIL
-                    py::gil_scoped_release release;
-
-                    // block for 100ms
-                    messages = obj.getAll(milliseconds(100), timedout);
-                }
-
-                // reacquires python GIL for PyErr_CheckSignals call
-
-                // check if interrupt triggered in between
-                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
-
-            } while(timedout); // Keep reiterating until a message is received (not timedout)
-
-            return messages;
-        }, DOC(dai, DataOutputQueue, getAll, 2))
-        .def("get", [](DataOutputQueue& obj){
-
+        .def("has", &outputQueueHas<DataOutputQueue>, DOC(dai, DataOutputQueue, has, 2))
+        .def("tryGet", &outputQueueTryGet<DataOutputQueue>, DOC(dai, DataOutputQueue, tryGet, 2))
+        .def("tryGetAll", &outputQueueTryGetAll<DataOutputQueue>, DOC(dai, DataOutputQueue, tryGetAll, 2))
+        ;
+    bindOutputQueue(dataOutputQueue);
+
+    queueSubscription
+        .def("getName", &QueueSubscription::getName, "Returns name of the subscribed queue")
+        .def("isClosed", &QueueSubscription::isClosed, "Returns true once the subscription or the subscribed queue is closed")
+        .def("close", &QueueSubscription::close, "Unsubscribes from the queue", py::call_guard<py::gil_scoped_release>())
+        .def("__enter__", [](py::object self){
+            return self;
+        })
+        .def("__exit__", [](QueueSubscription& s, py::object, py::object, py::object){
+            py::gil_scoped_release release;
+            s.close();
+        })
+        .def("getMaxSize", &QueueSubscription::getMaxSize, "Returns maximum size of the subscription")
+        .def("getBlocking", &QueueSubscription::getBlocking, "Returns whether the subscription blocks the stream while full")
+        .def("has", &QueueSubscription::has, "Returns true if a message is available")
+        .def("tryGet", &QueueSubscription::tryGet, "Returns a message if available, None otherwise")
+        .def("tryGetAll", &QueueSubscription::tryGetAll, "Returns all available messages")
+        .def("get", [](std::shared_ptr<QueueSubscription> obj, microseconds timeout){
             std::shared_ptr<ADatatype> d = nullptr;
-            bool timedout = true;
-            do {
-                {
-                    // releases python GIL
-                    py::gil_scoped_release release;
-
-                    // block for 100ms
-                    d = obj.get(milliseconds(100), timedout);
-                }
-
-                // reacquires python GIL for PyErr_CheckSignals call
-
-                // check if interrupt triggered in between
-                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
-
-            } while(timedout);
-
+            blockingGet(*obj, timeout, d);
             return d;
-        }, DOC(dai, DataOutputQueue, get, 2))
-        .def("has", static_cast<bool(DataOutputQueue::*)()>(&DataOutputQueue::has), DOC(dai, DataOutputQueue, has, 2))
-        .def("tryGet", static_cast<std::shared_ptr<ADatatype>(DataOutputQueue::*)()>(&DataOutputQueue::tryGet), DOC(dai, DataOutputQueue, tryGet, 2))
-        .def("tryGetAll", static_cast<std::vector<std::shared_ptr<ADatatype>>(DataOutputQueue::*)()>(&DataOutputQueue::tryGetAll), DOC(dai, DataOutputQueue, tryGetAll, 2))
+        }, py::arg("timeout") = microseconds(-1), "Block until a message is available or timeout occurs (negative timeout meaning indefinitely). None is returned on timeout")
+        .def("getAll", [](std::shared_ptr<QueueSubscription> obj, microseconds timeout){
+            std::vector<std::shared_ptr<ADatatype>> messages;
+            blockingGetAll(*obj, timeout, messages);
+            return messages;
+        }, py::arg("timeout") = microseconds(-1), "Block until at least one message is available or timeout occurs (negative timeout meaning indefinitely). Then return all available messages. Empty list is returned on timeout")
+        .def("getAsync", [](std::shared_ptr<QueueSubscription> obj){
+            return asyncGet(obj, false, false);
+        }, "Awaitable variant of 'get'. Must be called from a running asyncio event loop")
+        .def("getAllAsync", [](std::shared_ptr<QueueSubscription> obj){
+            return asyncGet(obj, true, false);
+        }, "Awaitable variant of 'getAll'. Must be called from a running asyncio event loop")
+        .def("__aiter__", [](py::object self){
+            return self;
+        })
+        .def("__anext__", [](std::shared_ptr<QueueSubscription> obj){
+            if(obj->isClosed()) {
+                PyErr_SetNone(PyExc_StopAsyncIteration);
+                throw py::error_already_set();
+            }
+            return asyncGet(obj, false, true);
+        })
         ;
 
     // Bind DataInputQueue
@@ -120,44 +162,7 @@ void DataQueueBindings::bind(pybind11::module& m, void* pCallstack){
         .def("getBlocking", &DataInputQueue::getBlocking, DOC(dai, DataInputQueue, getBlocking))
         .def("setMaxSize", &DataInputQueue::setMaxSize, py::arg("maxSize"), DOC(dai, DataInputQueue, setMaxSize))
         .def("getMaxSize", &DataInputQueue::getMaxSize, DOC(dai, DataInputQueue, getMaxSize))
-        .def("send", [](DataInputQueue& obj, std::shared_ptr<ADatatype> d){
-
-            bool sent = false;
-            do {
-
-                // block for 100ms
-                {
-                    // Release GIL, then block
-                    py::gil_scoped_release release;
-                    sent = obj.send(d, milliseconds(100));
-                }
-
-                // reacquires GIL as PyErr_CheckSignals requires GIL
-
-                // check if interrupt triggered in between
-                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
-
-            } while(!sent);
-
-        }, py::arg("msg"), DOC(dai, DataInputQueue, send, 2))
-        .def("send", [](DataInputQueue& obj, std::shared_ptr<dai::RawBuffer> d){
-
-            bool sent = false;
-            do {
-                 // block for 100ms
-                {
-                    // Release GIL, then block
-                    py::gil_scoped_release release;
-                    sent = obj.send(d, milliseconds(100));
-                }
-                // reacquires GIL as PyErr_CheckSignals requires GIL
-
-                // check if interrupt triggered in between
-                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
-
-            } while(!sent);
-
-        }, py::arg("rawMsg"), DOC(dai, DataInputQueue, send))
         ;
+    bindInputQueue(dataInputQueue);
 
-}
\ No newline at end of file
+}
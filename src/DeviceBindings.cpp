@@ -15,6 +15,11 @@
 #include <pybind11/detail/common.h>
 // hedley
 #include <hedley/hedley.h>
+// project
+#include "utility/BlockingCall.hpp"
+#include "utility/QueueBindings.hpp"
+#include "utility/QueueLimiter.hpp"
+#include "utility/QueueStats.hpp"
 // STL Bind
 #include <pybind11/stl_bind.h>
 
@@ -58,25 +63,89 @@ static auto deviceSearchHelper(Args&&... args){
 
 
 static std::vector<std::string> deviceGetQueueEventsHelper(dai::Device& d, const std::vector<std::string>& queueNames, std::size_t maxNumEvents, std::chrono::microseconds timeout){
-    using namespace std::chrono;
-
     // if timeout < 0, unlimited timeout
-    bool unlimitedTimeout = timeout < microseconds(0);
-    auto startTime = steady_clock::now();
-    do {
-        {
-            // releases python GIL
-            py::gil_scoped_release release;
-            // block for 100ms
-            auto events = d.getQueueEvents(queueNames, maxNumEvents, std::chrono::milliseconds(100));
-            if(!events.empty()) return events;
-        }
-        // reacquires python GIL for PyErr_CheckSignals call
-        // check if interrupt triggered in between
-        if (PyErr_CheckSignals() != 0) throw py::error_already_set();
-    } while(unlimitedTimeout || steady_clock::now() - startTime < timeout);
+    std::vector<std::string> events;
+    blockingCall([&](std::chrono::microseconds slice){
+        events = d.getQueueEvents(queueNames, maxNumEvents, slice);
+        return !events.empty();
+    }, timeout);
+    return events;
+}
+
+// Host memory budgets of devices, shared by their output queues (which keep a budget alive as long as they need it).
+// Keyed by device, an entry is released once the device is closed or its Python object is destroyed,
+// so a device later created at the same address doesn't inherit it
+static std::mutex deviceBudgetsMtx;
+static std::unordered_map<const dai::DeviceBase*, std::shared_ptr<HostMemoryBudget>> deviceBudgets;
+
+static void deviceReleaseHostMemoryBudget(const dai::DeviceBase& d){
+    std::unique_lock<std::mutex> lock(deviceBudgetsMtx);
+    deviceBudgets.erase(&d);
+}
+
+// Returns budget of a device, creating it if needed. Must be called with GIL held
+static std::shared_ptr<HostMemoryBudget> deviceHostMemoryBudget(const dai::DeviceBase& d){
+    {
+        std::unique_lock<std::mutex> lock(deviceBudgetsMtx);
+        auto it = deviceBudgets.find(&d);
+        if(it != deviceBudgets.end()) return it->second;
+    }
+    // Python object of the device, the budget is released through a finalizer once it is destroyed
+    py::object self = py::cast(&d, py::return_value_policy::reference);
+    const dai::DeviceBase* key = &d;
+    py::module::import("weakref").attr("finalize")(self, py::cpp_function([key](){ deviceReleaseHostMemoryBudget(*key); }));
+
+    std::unique_lock<std::mutex> lock(deviceBudgetsMtx);
+    auto& budget = deviceBudgets[key];
+    if(!budget) budget = std::make_shared<HostMemoryBudget>();
+    return budget;
+}
+
+static void deviceClose(dai::DeviceBase& d){
+    deviceReleaseHostMemoryBudget(d);
+    d.close();
+}
 
-    return std::vector<std::string>();
+// Starts counting queue statistics and applies the device host memory budget, if set (unless the queue limits were removed)
+static std::shared_ptr<dai::DataOutputQueue> deviceAttachOutputQueue(dai::Device& d, std::shared_ptr<dai::DataOutputQueue> queue){
+    QueueCountersRegistry::get(queue);
+    auto budget = deviceHostMemoryBudget(d);
+    // Limiter is attached only when needed, as limited queues are consumed on host side
+    auto limiter = QueueLimiterRegistry::find(queue);
+    if(limiter == nullptr && budget->getLimit() != 0 && !QueueLimiterRegistry::isDetached(queue)) limiter = QueueLimiterRegistry::get(queue);
+    if(limiter) limiter->setBudget(budget);
+    return queue;
+}
+
+static std::vector<ResolvedQueue<dai::DataOutputQueue>> deviceResolveOutputQueues(dai::Device& d, const std::vector<std::string>& queueNames){
+    std::vector<ResolvedQueue<dai::DataOutputQueue>> queues;
+    queues.reserve(queueNames.size());
+    for(const auto& name : queueNames) {
+        auto queue = d.getOutputQueue(name);
+        auto counters = QueueCountersRegistry::get(queue);
+        queues.push_back({name, std::move(queue), std::move(counters)});
+    }
+    return queues;
+}
+
+static py::dict deviceWaitAnyHelper(dai::Device& d, const std::vector<std::string>& queueNames, std::chrono::microseconds timeout){
+    std::vector<ResolvedQueue<dai::DataOutputQueue>> queues;
+    {
+        py::gil_scoped_release release;
+        queues = deviceResolveOutputQueues(d, queueNames);
+    }
+    return waitAnyMessages(queues, timeout, [&](std::chrono::microseconds remaining){
+        return !d.getQueueEvents(queueNames, std::numeric_limits<std::size_t>::max(), remaining).empty();
+    });
+}
+
+static py::dict deviceGetAllMessagesHelper(dai::Device& d, const std::vector<std::string>& queueNames){
+    QueueMessages messages;
+    {
+        py::gil_scoped_release release;
+        messages = tryGetAllMessages(deviceResolveOutputQueues(d, queueNames));
+    }
+    return queueMessagesToDict(messages);
 }
 
 
@@ -443,9 +512,9 @@ void DeviceBindings::bind(pybind11::module& m, void* pCallstack){
         .def("__enter__", [](DeviceBase& d) -> DeviceBase& { return d; })
         .def("__exit__", [](DeviceBase& d, py::object type, py::object value, py::object traceback) {
             py::gil_scoped_release release;
-            d.close();
+            deviceClose(d);
         })
-        .def("close", [](DeviceBase& d) { py::gil_scoped_release release; d.close(); }, "Closes the connection to device. Better alternative is the usage of context manager: `with depthai.Device(pipeline) as device:`")
+        .def("close", [](DeviceBase& d) { py::gil_scoped_release release; deviceClose(d); }, "Closes the connection to device. Better alternative is the usage of context manager: `with depthai.Device(pipeline) as device:`")
         .def("isClosed", [](DeviceBase& d) { py::gil_scoped_release release; return d.isClosed(); }, DOC(dai, DeviceBase, isClosed))
 
         //dai::Device methods
@@ -560,13 +629,40 @@ void DeviceBindings::bind(pybind11::module& m, void* pCallstack){
     // Bind the rest
     device
         .def("__enter__", [](Device& d) -> Device& { return d; })
-        .def("getOutputQueue", py::overload_cast<const std::string&>(&Device::getOutputQueue), py::arg("name"), DOC(dai, Device, getOutputQueue))
-        .def("getOutputQueue", py::overload_cast<const std::string&, unsigned int, bool>(&Device::getOutputQueue), py::arg("name"), py::arg("maxSize"), py::arg("blocking") = true, DOC(dai, Device, getOutputQueue, 2))
+        .def("getOutputQueue", [](Device& d, const std::string& name){
+            return deviceAttachOutputQueue(d, d.getOutputQueue(name));
+        }, py::arg("name"), DOC(dai, Device, getOutputQueue))
+        .def("getOutputQueue", [](Device& d, const std::string& name, unsigned int maxSize, bool blocking){
+            return deviceAttachOutputQueue(d, d.getOutputQueue(name, maxSize, blocking));
+        }, py::arg("name"), py::arg("maxSize"), py::arg("blocking") = true, DOC(dai, Device, getOutputQueue, 2))
         .def("getOutputQueueNames", &Device::getOutputQueueNames, DOC(dai, Device, getOutputQueueNames))
 
         .def("getInputQueue", py::overload_cast<const std::string&>(&Device::getInputQueue), py::arg("name"), DOC(dai, Device, getInputQueue))
         .def("getInputQueue", py::overload_cast<const std::string&, unsigned int, bool>(&Device::getInputQueue), py::arg("name"), py::arg("maxSize"), py::arg("blocking") = true, DOC(dai, Device, getInputQueue, 2))
         .def("getInputQueueNames", &Device::getInputQueueNames, DOC(dai, Device, getInputQueueNames))
+        .def("setHostMemoryBudget", [](Device& d, std::size_t bytes){
+            deviceHostMemoryBudget(d)->setLimit(bytes);
+            for(const auto& name : d.getOutputQueueNames()) deviceAttachOutputQueue(d, d.getOutputQueue(name));
+        }, py::arg("bytes"), "Sets maximum total size of message data held on host by all output queues of the device, 0 meaning unlimited.\n"
+        "Once exceeded, messages are evicted from the queue holding the most bytes, by that queue's drop policy, so a queue nobody reads can't starve the others.\n"
+        "Setting a budget makes all output queues of the device drop messages instead of blocking, as their messages are held on host side.\n"
+        "Queues whose limits were removed by 'removeLimits' are excluded from the budget")
+        .def("getHostMemoryBudget", [](Device& d){
+            return deviceHostMemoryBudget(d)->getLimit();
+        }, "Returns host memory budget of output queues, 0 meaning unlimited")
+        .def("getHostMemoryUsage", [](Device& d){
+            return deviceHostMemoryBudget(d)->getUsage();
+        }, "Returns total size of message data currently held on host by output queues limited by the budget")
+        .def("getQueueStats", [](Device& d){
+            py::dict stats;
+            for(const auto& name : d.getOutputQueueNames()) {
+                stats[py::str(name)] = QueueCountersRegistry::get(d.getOutputQueue(name))->snapshot(name);
+            }
+            for(const auto& name : d.getInputQueueNames()) {
+                stats[py::str(name)] = QueueCountersRegistry::get(d.getInputQueue(name))->snapshot(name);
+            }
+            return stats;
+        }, "Returns dict of queue name to QueueStats snapshot, for all output and input queues")
 
         .def("getQueueEvents", [](Device& d, const std::vector<std::string>& queueNames, std::size_t maxNumEvents, std::chrono::microseconds timeout) {
             return deviceGetQueueEventsHelper(d, queueNames, maxNumEvents, timeout);
@@ -596,6 +692,22 @@ void DeviceBindings::bind(pybind11::module& m, void* pCallstack){
             return events[0];
         }, py::arg("timeout") = std::chrono::microseconds(-1), DOC(dai, Device, getQueueEvent, 4))
 
+        .def("waitAny", [](Device& d, const std::vector<std::string>& queueNames, std::chrono::microseconds timeout) {
+            return deviceWaitAnyHelper(d, queueNames, timeout);
+        }, py::arg("queueNames"), py::arg("timeout") = std::chrono::microseconds(-1),
+        "Blocks until any of the specified output queues has messages (or timeout elapses), then takes all available messages from all of them at once.\n"
+        "Returns dictionary of queue name to list of messages, containing only queues which had any. Empty on timeout")
+        .def("waitAny", [](Device& d, std::chrono::microseconds timeout) {
+            return deviceWaitAnyHelper(d, d.getOutputQueueNames(), timeout);
+        }, py::arg("timeout") = std::chrono::microseconds(-1), "Same as waitAny(queueNames, timeout), for all output queues")
+        .def("getAllMessages", [](Device& d, const std::vector<std::string>& queueNames) {
+            return deviceGetAllMessagesHelper(d, queueNames);
+        }, py::arg("queueNames"), "Takes all messages currently available in the specified output queues, without blocking.\n"
+        "Returns dictionary of queue name to list of messages, containing only queues which had any")
+        .def("getAllMessages", [](Device& d) {
+            return deviceGetAllMessagesHelper(d, d.getOutputQueueNames());
+        }, "Same as getAllMessages(queueNames), for all output queues")
+
         //.def("setCallback", DeviceWrapper::wrap(&Device::setCallback), py::arg("name"), py::arg("callback"))
 
     ;
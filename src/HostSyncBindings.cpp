@@ -0,0 +1,379 @@
+#include "HostSyncBindings.hpp"
+
+// std
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <deque>
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/pipeline/datatype/MessageGroup.hpp"
+#include "depthai/utility/LockingQueue.hpp"
+
+// project
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "utility/AnyQueue.hpp"
+#include "utility/AsyncGet.hpp"
+#include "utility/BlockingCall.hpp"
+#include "utility/QueueLimiter.hpp"
+#include "utility/QueueStats.hpp"
+
+// Messages kept per stream while waiting for the other streams, oldest are dropped first
+constexpr std::size_t HOST_SYNC_MAX_PENDING = 64;
+// Interval in which a blocked 'get' checks whether the input queues were closed
+constexpr std::chrono::milliseconds HOST_SYNC_CLOSED_CHECK_INTERVAL{100};
+
+// Synchronizes messages of multiple DataOutputQueues (possibly of different devices) on host, same as Sync node does on device.
+// Messages are consumed from the input queues by callbacks on their reading threads and kept per stream, sorted by timestamp.
+// Once every stream has a message within the threshold of the others, they are emitted as a MessageGroup
+class HostSync {
+   public:
+    using Callback = std::function<void(std::shared_ptr<dai::MessageGroup>)>;
+
+    HostSync(const std::vector<std::pair<std::string, std::shared_ptr<AnyOutputQueue>>>& queues,
+             std::chrono::nanoseconds threshold,
+             int attempts,
+             bool device,
+             unsigned int maxSize)
+        : thresholdNs(threshold.count()), attempts(attempts), device(device), out(maxSize, false) {
+        if(queues.empty()) throw std::invalid_argument("HostSync requires at least one queue");
+        inputs.resize(queues.size());
+        for(std::size_t i = 0; i < queues.size(); i++) {
+            if(!queues[i].second) throw std::invalid_argument("HostSync queues must not be None");
+            for(std::size_t j = 0; j < i; j++) {
+                if(inputs[j].name == queues[i].first) throw std::invalid_argument("Duplicate HostSync stream name '" + queues[i].first + "'");
+            }
+            inputs[i].name = queues[i].first;
+            inputs[i].queue = queues[i].second;
+        }
+        for(std::size_t i = 0; i < inputs.size(); i++) {
+            // Attached upfront, as attaching from within a queue callback would deadlock
+            inputs[i].counters = inputs[i].queue->getCounters();
+            inputs[i].callbackId = inputs[i].queue->addCallback([this, i]() { onMessages(i); });
+            // Consume messages which arrived before the callback was registered
+            onMessages(i);
+        }
+    }
+
+    ~HostSync() {
+        // Input queue callbacks may be waiting for the GIL
+        if(PyGILState_Check()) {
+            pybind11::gil_scoped_release release;
+            close();
+        } else {
+            close();
+        }
+    }
+
+    void close() {
+        if(closed.exchange(true)) return;
+        for(auto& input : inputs) input.queue->removeCallback(input.callbackId);
+        out.destruct();
+        // Wake up waiters, so they observe the closure
+        notify(nullptr);
+    }
+
+    bool isClosed() const {
+        if(closed) return true;
+        return std::any_of(inputs.begin(), inputs.end(), [](const Input& input) { return input.queue->isClosed(); });
+    }
+
+    std::vector<std::string> getNames() const {
+        std::vector<std::string> names;
+        for(const auto& input : inputs) names.push_back(input.name);
+        return names;
+    }
+
+    void setSyncThreshold(std::chrono::nanoseconds threshold) {
+        std::unique_lock<std::mutex> lock(syncMtx);
+        thresholdNs = threshold.count();
+    }
+
+    std::chrono::nanoseconds getSyncThreshold() const {
+        std::unique_lock<std::mutex> lock(syncMtx);
+        return std::chrono::nanoseconds(thresholdNs);
+    }
+
+    void setSyncAttempts(int syncAttempts) {
+        std::unique_lock<std::mutex> lock(syncMtx);
+        attempts = syncAttempts;
+    }
+
+    int getSyncAttempts() const {
+        std::unique_lock<std::mutex> lock(syncMtx);
+        return attempts;
+    }
+
+    bool has() {
+        return !out.empty();
+    }
+
+    std::shared_ptr<dai::MessageGroup> tryGet() {
+        std::shared_ptr<dai::MessageGroup> group;
+        if(out.tryPop(group)) return group;
+        if(isClosed()) throw std::runtime_error("HostSync is closed");
+        return nullptr;
+    }
+
+    std::vector<std::shared_ptr<dai::MessageGroup>> tryGetAll() {
+        std::vector<std::shared_ptr<dai::MessageGroup>> groups;
+        out.consumeAll([&groups](std::shared_ptr<dai::MessageGroup>& group) { groups.push_back(std::move(group)); });
+        if(groups.empty() && isClosed()) throw std::runtime_error("HostSync is closed");
+        return groups;
+    }
+
+    // Waits up to 'timeout' for a group, returns false on timeout
+    bool get(std::shared_ptr<dai::MessageGroup>& group, std::chrono::microseconds timeout) {
+        if(out.tryWaitAndPop(group, timeout)) return true;
+        if(isClosed()) throw std::runtime_error("HostSync is closed");
+        return false;
+    }
+
+    int addCallback(Callback callback) {
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        callbacks[nextCallbackId] = {std::move(callback), true};
+        return nextCallbackId++;
+    }
+
+    // Callback without arguments is also called once on close
+    int addCallback(std::function<void()> callback) {
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        callbacks[nextCallbackId] = {[callback](std::shared_ptr<dai::MessageGroup>) { callback(); }, false};
+        return nextCallbackId++;
+    }
+
+    bool removeCallback(int callbackId) {
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        return callbacks.erase(callbackId) > 0;
+    }
+
+   private:
+    struct Pending {
+        std::int64_t timestamp;
+        std::shared_ptr<dai::Buffer> msg;
+    };
+
+    struct Input {
+        std::string name;
+        std::shared_ptr<AnyOutputQueue> queue;
+        std::shared_ptr<QueueCounters> counters;
+        int callbackId = -1;
+        // Sorted by timestamp
+        std::deque<Pending> pending;
+    };
+
+    struct CallbackEntry {
+        Callback callback;
+        bool withGroup;
+    };
+
+    // Runs on the reading thread of the input queue
+    void onMessages(std::size_t stream) {
+        std::vector<std::shared_ptr<dai::ADatatype>> messages;
+        try {
+            // Limited queues hold their messages on host side
+            auto limiter = findQueueLimiter(*inputs[stream].counters);
+            messages = limiter ? limiter->tryGetAll() : inputs[stream].queue->tryGetAll();
+        } catch(const std::runtime_error&) {
+            // Queue closed
+            return;
+        }
+        inputs[stream].counters->onOut(messages);
+
+        std::vector<std::shared_ptr<dai::MessageGroup>> groups;
+        {
+            std::unique_lock<std::mutex> lock(syncMtx);
+            auto& pending = inputs[stream].pending;
+            for(auto& message : messages) {
+                auto msg = std::dynamic_pointer_cast<dai::Buffer>(message);
+                if(!msg) continue;
+                const auto timestamp = device ? getMessageTimestampDeviceNs(*msg) : getMessageTimestampNs(*msg);
+                // Messages mostly arrive in order, search for the position from the back
+                auto it = pending.end();
+                while(it != pending.begin() && std::prev(it)->timestamp > timestamp) --it;
+                pending.insert(it, {timestamp, std::move(msg)});
+                if(pending.size() > HOST_SYNC_MAX_PENDING) pending.pop_front();
+            }
+            synchronize(groups);
+        }
+
+        for(auto& group : groups) {
+            out.push(group);
+            notify(group);
+        }
+    }
+
+    // Emits groups while every stream has a pending message. Must be called with syncMtx held
+    void synchronize(std::vector<std::shared_ptr<dai::MessageGroup>>& groups) {
+        while(std::all_of(inputs.begin(), inputs.end(), [](const Input& input) { return !input.pending.empty(); })) {
+            std::int64_t newest = inputs[0].pending.front().timestamp;
+            for(const auto& input : inputs) newest = std::max(newest, input.pending.front().timestamp);
+
+            // Skip messages superseded by ones closer to the newest
+            Input* oldest = &inputs[0];
+            for(auto& input : inputs) {
+                while(input.pending.size() > 1 && input.pending[1].timestamp <= newest) input.pending.pop_front();
+                if(input.pending.front().timestamp < oldest->pending.front().timestamp) oldest = &input;
+            }
+
+            if(newest - oldest->pending.front().timestamp > thresholdNs && (attempts < 0 || attemptCount < attempts)) {
+                // Out of sync, replace the oldest message
+                oldest->pending.pop_front();
+                attemptCount++;
+                continue;
+            }
+
+            // In sync, or out of attempts
+            auto group = std::make_shared<dai::MessageGroup>();
+            std::shared_ptr<dai::Buffer> newestMsg;
+            for(auto& input : inputs) {
+                auto& front = input.pending.front();
+                if(front.timestamp == newest) newestMsg = front.msg;
+                group->add(input.name, std::static_pointer_cast<dai::ADatatype>(front.msg));
+                input.pending.pop_front();
+            }
+            group->setTimestamp(newestMsg->getTimestamp());
+            group->setTimestampDevice(newestMsg->getTimestampDevice());
+            group->setSequenceNum(sequenceNum++);
+            groups.push_back(std::move(group));
+            attemptCount = 0;
+        }
+    }
+
+    // Calls callbacks with a new group, or callbacks without arguments with nullptr on close
+    void notify(const std::shared_ptr<dai::MessageGroup>& group) {
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        for(const auto& kv : callbacks) {
+            if(!group && kv.second.withGroup) continue;
+            try {
+                kv.second.callback(group);
+            } catch(pybind11::error_already_set& ex) {
+                pybind11::gil_scoped_acquire acquire;
+                ex.discard_as_unraisable("HostSync callback");
+            } catch(const std::exception&) {
+                // Callbacks mustn't break synchronization of other groups
+            }
+        }
+    }
+
+    std::vector<Input> inputs;
+    mutable std::mutex syncMtx;
+    std::int64_t thresholdNs;
+    int attempts;
+    int attemptCount = 0;
+    std::int64_t sequenceNum = 0;
+    bool device;
+
+    dai::LockingQueue<std::shared_ptr<dai::MessageGroup>> out;
+    std::atomic<bool> closed{false};
+
+    std::mutex callbacksMtx;
+    std::unordered_map<int, CallbackEntry> callbacks;
+    int nextCallbackId = 0;
+};
+
+void HostSyncBindings::bind(pybind11::module& m, void* pCallstack){
+    using namespace dai;
+    using namespace std::chrono;
+
+    // Type definitions
+    py::class_<HostSync, std::shared_ptr<HostSync>> hostSync(m, "HostSync", "Synchronizes messages of multiple output queues (possibly of different devices) on host into MessageGroups, same as Sync node does on device");
+
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    // Call the rest of the type defines, then perform the actual bindings
+    Callstack* callstack = (Callstack*) pCallstack;
+    auto cb = callstack->top();
+    callstack->pop();
+    cb(m, pCallstack);
+    // Actual bindings
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+
+    // Input queue callbacks are invoked on their reading threads and never hold the GIL
+    // while synchronizing, so only registering and removing callbacks releases it here.
+    hostSync
+        .def(py::init([](const std::vector<py::object>& queues, nanoseconds syncThreshold, int syncAttempts, bool device, unsigned int maxSize){
+            std::vector<std::pair<std::string, std::shared_ptr<AnyOutputQueue>>> named;
+            for(const auto& queue : queues) {
+                auto output = castAnyOutputQueue(queue);
+                if(!output) throw py::value_error("HostSync queues must not be None");
+                named.emplace_back(output->getName(), std::move(output));
+            }
+            py::gil_scoped_release release;
+            return std::make_shared<HostSync>(named, syncThreshold, syncAttempts, device, maxSize);
+        }), py::arg("queues"), py::arg("syncThreshold") = nanoseconds(10000000), py::arg("syncAttempts") = -1, py::arg("device") = false, py::arg("maxSize") = 4,
+        "Synchronizes given queues (DataOutputQueue or MockDataOutputQueue), grouping messages under their queue names. The queues are consumed by HostSync.\n"
+        "Messages are grouped if within 'syncThreshold' of each other. After 'syncAttempts' replaced messages, a group is emitted even if not in sync (negative meaning never).\n"
+        "Messages are matched by their timestamps synced to host clock, or device timestamps if 'device' is set (only meaningful for queues of a single device).\n"
+        "Up to 'maxSize' groups are kept, oldest being dropped")
+        .def(py::init([](const std::map<std::string, py::object>& queues, nanoseconds syncThreshold, int syncAttempts, bool device, unsigned int maxSize){
+            std::vector<std::pair<std::string, std::shared_ptr<AnyOutputQueue>>> named;
+            for(const auto& queue : queues) named.emplace_back(queue.first, castAnyOutputQueue(queue.second));
+            py::gil_scoped_release release;
+            return std::make_shared<HostSync>(named, syncThreshold, syncAttempts, device, maxSize);
+        }), py::arg("queues"), py::arg("syncThreshold") = nanoseconds(10000000), py::arg("syncAttempts") = -1, py::arg("device") = false, py::arg("maxSize") = 4,
+        "Synchronizes queues of given dict, grouping messages under the dict keys (eg. to distinguish same named queues of multiple devices)")
+        .def("getNames", &HostSync::getNames, "Returns names of the synchronized streams")
+        .def("isClosed", &HostSync::isClosed, "Returns true if HostSync or any of its queues was closed")
+        .def("close", &HostSync::close, "Stops consuming the queues", py::call_guard<py::gil_scoped_release>())
+        .def("setSyncThreshold", &HostSync::setSyncThreshold, py::arg("syncThreshold"), "Sets the maximal interval between messages of a group")
+        .def("getSyncThreshold", &HostSync::getSyncThreshold, "Gets the maximal interval between messages of a group")
+        .def("setSyncAttempts", &HostSync::setSyncAttempts, py::arg("syncAttempts"), "Sets number of replaced messages after which a group is emitted even if not in sync. Negative meaning never")
+        .def("getSyncAttempts", &HostSync::getSyncAttempts, "Gets number of replaced messages after which a group is emitted even if not in sync")
+        .def("addCallback", [](HostSync& sync, py::function cb) -> int {
+            auto numParams = py::len(py::module::import("inspect").attr("signature")(cb).attr("parameters"));
+            if(numParams == 1) {
+                auto callback = cb.cast<HostSync::Callback>();
+                py::gil_scoped_release release;
+                return sync.addCallback(std::move(callback));
+            } else if(numParams == 0) {
+                auto callback = cb.cast<std::function<void()>>();
+                py::gil_scoped_release release;
+                return sync.addCallback(std::move(callback));
+            }
+            throw py::value_error("Callback must take either zero or one argument");
+        }, py::arg("callback"), "Adds a callback, called with each new MessageGroup (or without arguments) from a queue reading thread. Returns callback id")
+        .def("removeCallback", &HostSync::removeCallback, py::arg("callbackId"), "Removes a callback", py::call_guard<py::gil_scoped_release>())
+        .def("has", &HostSync::has, "Check whether a group is available")
+        .def("tryGet", &HostSync::tryGet, "Returns a group if available, None otherwise")
+        .def("tryGetAll", &HostSync::tryGetAll, "Returns all available groups")
+        .def("get", [](HostSync& sync, microseconds timeout){
+            std::shared_ptr<MessageGroup> group;
+            blockingCall([&](microseconds slice){
+                if(slice < microseconds(0) || slice > HOST_SYNC_CLOSED_CHECK_INTERVAL) slice = HOST_SYNC_CLOSED_CHECK_INTERVAL;
+                return sync.get(group, slice);
+            }, timeout);
+            return group;
+        }, py::arg("timeout") = microseconds(-1), "Block until a group is available or timeout occurs (negative timeout meaning indefinitely). None is returned on timeout")
+        .def("getAsync", [](std::shared_ptr<HostSync> sync){
+            return asyncGet(sync, false, false);
+        }, "Awaitable variant of 'get'. Must be called from a running asyncio event loop")
+        .def("getAllAsync", [](std::shared_ptr<HostSync> sync){
+            return asyncGet(sync, true, false);
+        }, "Awaitable variant of 'tryGetAll', which completes once at least one group is available. Must be called from a running asyncio event loop")
+        .def("__aiter__", [](py::object self){
+            return self;
+        })
+        .def("__anext__", [](std::shared_ptr<HostSync> sync){
+            if(sync->isClosed() && !sync->has()) {
+                PyErr_SetNone(PyExc_StopAsyncIteration);
+                throw py::error_already_set();
+            }
+            return asyncGet(sync, false, true);
+        })
+        ;
+
+}
@@ -0,0 +1,461 @@
+#include "MockDeviceBindings.hpp"
+
+// std
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/Pipeline.hpp"
+#include "depthai/pipeline/node/XLinkIn.hpp"
+#include "depthai/pipeline/node/XLinkOut.hpp"
+
+// project
+#include "utility/MockQueue.hpp"
+#include "utility/QueueBindings.hpp"
+#include "utility/QueueStats.hpp"
+
+// Sends messages produced by 'generate' to an input queue from its own thread, at 'fps' (as fast as possible if not positive).
+// Stops after 'count' messages (never if negative), or once 'generate' returns nullptr
+class MockGenerator {
+   public:
+    using Generate = std::function<std::shared_ptr<dai::ADatatype>()>;
+
+    MockGenerator(std::shared_ptr<MockInputQueue> input, Generate generate, double fps, std::int64_t count)
+        : input(std::move(input)), counters(QueueCountersRegistry::get(this->input)), generate(std::move(generate)), fps(fps), count(count) {
+        thread = std::thread([this]() { run(); });
+    }
+
+    ~MockGenerator() {
+        stop();
+    }
+
+    // Must be called without GIL held, as the generator might be waiting for it
+    void stop() {
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            stopped = true;
+        }
+        cv.notify_all();
+        if(thread.joinable()) thread.join();
+    }
+
+   private:
+    void run() {
+        using namespace std::chrono;
+        try {
+            const auto period = fps > 0.0 ? duration_cast<steady_clock::duration>(duration<double>(1.0 / fps)) : steady_clock::duration(0);
+            auto next = steady_clock::now();
+            for(std::int64_t i = 0; count < 0 || i < count; i++) {
+                {
+                    std::unique_lock<std::mutex> lock(mtx);
+                    if(cv.wait_until(lock, next, [this]() { return stopped; })) return;
+                }
+                next += period;
+
+                auto msg = generate();
+                if(!msg) return;
+                const auto raw = input->serialize(*msg);
+                msg = nullptr;
+
+                // Sent in slices, so stopping never waits for a full queue
+                const auto sent = steady_clock::now();
+                while(!input->push(raw, sent, MOCK_STOP_CHECK_INTERVAL)) {
+                    if(isStopped()) return;
+                }
+                counters->onSend(getMessageDataSize(*raw));
+            }
+        } catch(pybind11::error_already_set& ex) {
+            if(!Py_IsInitialized()) return;
+            pybind11::gil_scoped_acquire acquire;
+            ex.discard_as_unraisable("MockDevice generator");
+        } catch(const std::exception& ex) {
+            // Closing the input queue ends its generators
+            if(isStopped() || input->isClosed() || !Py_IsInitialized()) return;
+            pybind11::gil_scoped_acquire acquire;
+            PyErr_SetString(PyExc_RuntimeError, ex.what());
+            pybind11::error_already_set error;
+            error.discard_as_unraisable("MockDevice generator");
+        }
+    }
+
+    bool isStopped() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return stopped;
+    }
+
+    std::shared_ptr<MockInputQueue> input;
+    // Generated messages count as sent to the input queue
+    std::shared_ptr<QueueCounters> counters;
+    Generate generate;
+    const double fps;
+    const std::int64_t count;
+    std::mutex mtx;
+    std::condition_variable cv;
+    bool stopped = false;
+    std::thread thread;
+};
+
+// Counts messages arriving to output queues of a mock device, so 'waitAny' sleeps until any arrives, same as Device::getQueueEvents
+class MockQueueEvents {
+   public:
+    void notify() {
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            count++;
+        }
+        cv.notify_all();
+    }
+
+    std::uint64_t getCount() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return count;
+    }
+
+    // Waits at most 'timeout' (negative meaning indefinitely) for events after 'seen', updating it. Returns false on timeout
+    bool wait(std::uint64_t& seen, std::chrono::microseconds timeout) {
+        std::unique_lock<std::mutex> lock(mtx);
+        auto arrived = [this, &seen]() { return count != seen; };
+        if(timeout < std::chrono::microseconds(0)) {
+            cv.wait(lock, arrived);
+        } else if(!cv.wait_for(lock, timeout, arrived)) {
+            return false;
+        }
+        seen = count;
+        return true;
+    }
+
+   private:
+    std::mutex mtx;
+    std::condition_variable cv;
+    std::uint64_t count = 0;
+};
+
+// In-process stand-in for a device running a pipeline of only XLinkIn and XLinkOut nodes.
+// Each XLinkIn stream gets an input queue and each XLinkOut stream an output queue, looped back on host
+class MockDevice {
+   public:
+    explicit MockDevice(const dai::Pipeline& pipeline) : counters(std::make_shared<MockLinkCounters>()), events(std::make_shared<MockQueueEvents>()) {
+        std::map<dai::Node::Id, std::shared_ptr<MockOutputQueue>> outputsById;
+        std::map<dai::Node::Id, std::shared_ptr<const dai::node::XLinkIn>> xlinkIns;
+        for(const auto& node : pipeline.getAllNodes()) {
+            if(auto xlinkOut = std::dynamic_pointer_cast<const dai::node::XLinkOut>(node)) {
+                const auto name = xlinkOut->getStreamName();
+                if(outputs.count(name) > 0) throw std::invalid_argument("Multiple XLinkOut nodes with stream name '" + name + "'");
+                outputsById[node->id] = outputs[name] = std::make_shared<MockOutputQueue>(name, counters);
+                auto queueEvents = events;
+                outputs[name]->addCallback([queueEvents]() { queueEvents->notify(); });
+            } else if(auto xlinkIn = std::dynamic_pointer_cast<const dai::node::XLinkIn>(node)) {
+                xlinkIns[node->id] = xlinkIn;
+            } else {
+                throw std::invalid_argument(std::string("MockDevice only runs XLinkIn and XLinkOut nodes, pipeline contains a ") + node->getName() + " node");
+            }
+        }
+
+        std::map<dai::Node::Id, std::vector<std::shared_ptr<MockOutputQueue>>> links;
+        for(const auto& connection : pipeline.getConnections()) links[connection.outputId].push_back(outputsById.at(connection.inputId));
+        for(const auto& kv : xlinkIns) {
+            const auto name = kv.second->getStreamName();
+            if(inputs.count(name) > 0) throw std::invalid_argument("Multiple XLinkIn nodes with stream name '" + name + "'");
+            inputs[name] = std::make_shared<MockInputQueue>(name, kv.second->getMaxDataSize(), links[kv.first], counters);
+        }
+    }
+
+    ~MockDevice() {
+        // Link threads may be waiting for the GIL
+        if(PyGILState_Check()) {
+            pybind11::gil_scoped_release release;
+            close();
+        } else {
+            close();
+        }
+    }
+
+    // Stops generators and closes all queues
+    void close() {
+        std::vector<std::unique_ptr<MockGenerator>> stopping;
+        {
+            std::unique_lock<std::mutex> lock(generatorsMtx);
+            if(closed) return;
+            closed = true;
+            stopping = std::move(generators);
+        }
+        stopping.clear();
+        // Output queues first, to release writing threads waiting for space
+        for(auto& kv : outputs) kv.second->close();
+        for(auto& kv : inputs) kv.second->close();
+        // Wakes 'waitAny', which then raises on the closed queues
+        events->notify();
+    }
+
+    bool isClosed() const {
+        std::unique_lock<std::mutex> lock(generatorsMtx);
+        return closed;
+    }
+
+    std::shared_ptr<MockOutputQueue> getOutputQueue(const std::string& name) const {
+        const auto it = outputs.find(name);
+        if(it == outputs.end()) throw std::runtime_error("Queue for stream name '" + name + "' doesn't exist");
+        return it->second;
+    }
+
+    std::shared_ptr<MockInputQueue> getInputQueue(const std::string& name) const {
+        const auto it = inputs.find(name);
+        if(it == inputs.end()) throw std::runtime_error("Queue for stream name '" + name + "' doesn't exist");
+        return it->second;
+    }
+
+    std::vector<std::string> getOutputQueueNames() const {
+        std::vector<std::string> names;
+        for(const auto& kv : outputs) names.push_back(kv.first);
+        return names;
+    }
+
+    std::vector<std::string> getInputQueueNames() const {
+        std::vector<std::string> names;
+        for(const auto& kv : inputs) names.push_back(kv.first);
+        return names;
+    }
+
+    void addGenerator(const std::string& name, MockGenerator::Generate generate, double fps, std::int64_t count) {
+        auto input = getInputQueue(name);
+        std::unique_lock<std::mutex> lock(generatorsMtx);
+        if(closed) throw std::runtime_error("MockDevice closed");
+        generators.push_back(std::unique_ptr<MockGenerator>(new MockGenerator(std::move(input), std::move(generate), fps, count)));
+    }
+
+    MockLinkStats getLinkStats() const {
+        return counters->snapshot();
+    }
+
+    void resetLinkStats() {
+        counters->reset();
+    }
+
+    std::shared_ptr<MockQueueEvents> getEvents() const {
+        return events;
+    }
+
+   private:
+    std::shared_ptr<MockLinkCounters> counters;
+    std::shared_ptr<MockQueueEvents> events;
+    std::map<std::string, std::shared_ptr<MockOutputQueue>> outputs;
+    std::map<std::string, std::shared_ptr<MockInputQueue>> inputs;
+    mutable std::mutex generatorsMtx;
+    std::vector<std::unique_ptr<MockGenerator>> generators;
+    bool closed = false;
+};
+
+static std::vector<ResolvedQueue<MockOutputQueue>> mockDeviceResolveOutputQueues(const MockDevice& d, const std::vector<std::string>& queueNames){
+    std::vector<ResolvedQueue<MockOutputQueue>> queues;
+    queues.reserve(queueNames.size());
+    for(const auto& name : queueNames) {
+        auto queue = d.getOutputQueue(name);
+        auto counters = QueueCountersRegistry::get(queue);
+        queues.push_back({name, std::move(queue), std::move(counters)});
+    }
+    return queues;
+}
+
+static py::dict mockDeviceWaitAnyHelper(MockDevice& d, const std::vector<std::string>& queueNames, std::chrono::microseconds timeout){
+    std::vector<ResolvedQueue<MockOutputQueue>> queues;
+    {
+        py::gil_scoped_release release;
+        queues = mockDeviceResolveOutputQueues(d, queueNames);
+    }
+    // Events counted before the first drain, so messages arriving in between aren't waited for
+    auto events = d.getEvents();
+    auto seen = events->getCount();
+    return waitAnyMessages(queues, timeout, [&](std::chrono::microseconds remaining){
+        return events->wait(seen, remaining);
+    });
+}
+
+static py::dict mockDeviceGetAllMessagesHelper(const MockDevice& d, const std::vector<std::string>& queueNames){
+    QueueMessages messages;
+    {
+        py::gil_scoped_release release;
+        messages = tryGetAllMessages(mockDeviceResolveOutputQueues(d, queueNames));
+    }
+    return queueMessagesToDict(messages);
+}
+
+void MockDeviceBindings::bind(pybind11::module& m, void* pCallstack){
+
+    using namespace dai;
+    namespace py = pybind11;
+    using namespace std::chrono;
+
+    // Type definitions
+    py::class_<MockDevice, std::shared_ptr<MockDevice>> mockDevice(m, "MockDevice",
+        "Host-only stand-in for a device, running a pipeline made only of XLinkIn and XLinkOut nodes inside the process.\n"
+        "Messages sent to an XLinkIn stream are serialized and parsed the same as over XLink, and delivered to the linked XLinkOut streams.\n"
+        "Meant for measuring throughput and latency of the host side without hardware.\n"
+        "Its queues aren't DataOutputQueue/DataInputQueue (those require an XLink connection to a booted device), but stand-ins over the same\n"
+        "core LockingQueue and StreamMessageParser, with the same bindings. Queue internals of the real queues (XLink reads and writes) aren't measured");
+    py::class_<MockOutputQueue, std::shared_ptr<MockOutputQueue>> mockDataOutputQueue(m, "MockDataOutputQueue", "Output queue of a MockDevice, with the same interface as DataOutputQueue");
+    py::class_<MockInputQueue, std::shared_ptr<MockInputQueue>> mockDataInputQueue(m, "MockDataInputQueue", "Input queue of a MockDevice, with the same interface as DataInputQueue");
+    py::class_<MockLinkStats> mockLinkStats(m, "MockLinkStats", "Snapshot of MockDevice link counters");
+
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    // Call the rest of the type defines, then perform the actual bindings
+    Callstack* callstack = (Callstack*) pCallstack;
+    auto cb = callstack->top();
+    callstack->pop();
+    cb(m, pCallstack);
+    // Actual bindings
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+
+    mockLinkStats
+        .def_readonly("messagesSent", &MockLinkStats::messagesSent, "Messages taken from input queues by the link")
+        .def_readonly("bytesSent", &MockLinkStats::bytesSent, "Serialized size of sent messages (data and metadata)")
+        .def_readonly("messagesReceived", &MockLinkStats::messagesReceived, "Messages delivered to output queues")
+        .def_readonly("bytesReceived", &MockLinkStats::bytesReceived, "Serialized size of delivered messages (data and metadata)")
+        .def_readonly("messagesConsumed", &MockLinkStats::messagesConsumed, "Messages taken from output queues")
+        .def_readonly("elapsed", &MockLinkStats::elapsed, "Time since the device was created or counters were reset")
+        .def_readonly("messagesPerSecond", &MockLinkStats::messagesPerSecond, "Messages delivered per second")
+        .def_readonly("bytesPerSecond", &MockLinkStats::bytesPerSecond, "Bytes delivered per second")
+        .def_readonly("meanLatency", &MockLinkStats::meanLatency, "Mean time from a message being sent until taken from an output queue")
+        .def_readonly("maxLatency", &MockLinkStats::maxLatency)
+        .def_readonly("latencyHistogram", &MockLinkStats::latencyHistogram, "Number of consumed messages by latency, bucketed by 'QueueStats.getWaitHistogramBounds'")
+        .def("__repr__", [](const MockLinkStats& stats){
+            return "MockLinkStats(messagesSent=" + std::to_string(stats.messagesSent) + ", messagesReceived=" + std::to_string(stats.messagesReceived)
+                + ", messagesPerSecond=" + std::to_string(stats.messagesPerSecond) + ", bytesPerSecond=" + std::to_string(stats.bytesPerSecond)
+                + ", meanLatency=" + std::to_string(stats.meanLatency.count()) + "us)";
+        })
+        ;
+
+    // Link threads only hold the GIL while calling Python callbacks and generators,
+    // so blocking calls and anything joining them release it here.
+
+    auto addCallbackLambda = [](MockOutputQueue& q, py::function cb) -> int {
+        auto numParams = py::len(py::module::import("inspect").attr("signature")(cb).attr("parameters"));
+        if(numParams == 2) {
+            auto callback = cb.cast<MockOutputQueue::Callback>();
+            py::gil_scoped_release release;
+            return q.addCallback(std::move(callback));
+        } else if(numParams == 1) {
+            auto callback = cb.cast<std::function<void(std::shared_ptr<ADatatype>)>>();
+            py::gil_scoped_release release;
+            return q.addCallback(std::move(callback));
+        } else if(numParams == 0) {
+            auto callback = cb.cast<std::function<void()>>();
+            py::gil_scoped_release release;
+            return q.addCallback(std::move(callback));
+        }
+        throw py::value_error("Callback must take either zero, one or two arguments");
+    };
+    mockDataOutputQueue
+        .def("getName", &MockOutputQueue::getName, "Gets queues name")
+        .def("isClosed", &MockOutputQueue::isClosed, "Check whether queue is closed")
+        .def("close", &MockOutputQueue::close, "Closes the queue", py::call_guard<py::gil_scoped_release>())
+        .def("addCallback", addCallbackLambda, py::arg("callback"), "Adds a callback, called on the link thread with (name, message), (message) or no arguments on every new message. Returns callback id")
+        .def("setBlocking", &MockOutputQueue::setBlocking, py::arg("blocking"), "Sets queue behavior when full (maxSize) - blocking the link or overwriting oldest messages")
+        .def("getBlocking", &MockOutputQueue::getBlocking, "Gets current queue behavior when full (maxSize)")
+        .def("setMaxSize", &MockOutputQueue::setMaxSize, py::arg("maxSize"), "Sets maximum queue size")
+        .def("getMaxSize", &MockOutputQueue::getMaxSize, "Gets queue maximum size")
+        .def("has", &outputQueueHas<MockOutputQueue>, "Check whether front of the queue has a message")
+        .def("tryGet", &outputQueueTryGet<MockOutputQueue>, "Retrieves message from the queue if available, None otherwise")
+        .def("tryGetAll", &outputQueueTryGetAll<MockOutputQueue>, "Retrieves all messages from the queue")
+        ;
+    bindOutputQueue(mockDataOutputQueue);
+
+    mockDataInputQueue
+        .def("getName", &MockInputQueue::getName, "Gets queues name")
+        .def("isClosed", &MockInputQueue::isClosed, "Check whether queue is closed")
+        .def("close", &MockInputQueue::close, "Closes the queue", py::call_guard<py::gil_scoped_release>())
+        .def("setBlocking", &MockInputQueue::setBlocking, py::arg("blocking"), "Sets queue behavior when full (maxSize) - blocking the sender or overwriting oldest messages")
+        .def("getBlocking", &MockInputQueue::getBlocking, "Gets current queue behavior when full (maxSize)")
+        .def("setMaxSize", &MockInputQueue::setMaxSize, py::arg("maxSize"), "Sets maximum queue size")
+        .def("getMaxSize", &MockInputQueue::getMaxSize, "Gets queue maximum size")
+        .def("getMaxDataSize", &MockInputQueue::getMaxDataSize, "Gets maximum message data size of the XLinkIn node")
+        ;
+    bindInputQueue(mockDataInputQueue);
+
+    mockDevice
+        .def(py::init<const Pipeline&>(), py::arg("pipeline"), "Starts a pipeline made only of XLinkIn and XLinkOut nodes on host")
+        .def("close", &MockDevice::close, "Stops generators and closes all queues", py::call_guard<py::gil_scoped_release>())
+        .def("isClosed", &MockDevice::isClosed, "Returns true once the device was closed")
+        .def("__enter__", [](py::object self){
+            return self;
+        })
+        .def("__exit__", [](MockDevice& d, py::object, py::object, py::object){
+            py::gil_scoped_release release;
+            d.close();
+        })
+        // Queue statistics are counted from when a queue is first handed out, same as with Device
+        .def("getOutputQueue", [](MockDevice& d, const std::string& name){
+            auto queue = d.getOutputQueue(name);
+            QueueCountersRegistry::get(queue);
+            return queue;
+        }, py::arg("name"), "Gets an output queue corresponding to an XLinkOut stream")
+        .def("getOutputQueue", [](MockDevice& d, const std::string& name, unsigned int maxSize, bool blocking){
+            auto queue = d.getOutputQueue(name);
+            QueueCountersRegistry::get(queue);
+            queue->setMaxSize(maxSize);
+            queue->setBlocking(blocking);
+            return queue;
+        }, py::arg("name"), py::arg("maxSize"), py::arg("blocking") = true, "Gets an output queue corresponding to an XLinkOut stream, setting its maximum size and blocking behavior")
+        .def("getInputQueue", [](MockDevice& d, const std::string& name){
+            auto queue = d.getInputQueue(name);
+            QueueCountersRegistry::get(queue);
+            return queue;
+        }, py::arg("name"), "Gets an input queue corresponding to an XLinkIn stream")
+        .def("getInputQueue", [](MockDevice& d, const std::string& name, unsigned int maxSize, bool blocking){
+            auto queue = d.getInputQueue(name);
+            QueueCountersRegistry::get(queue);
+            queue->setMaxSize(maxSize);
+            queue->setBlocking(blocking);
+            return queue;
+        }, py::arg("name"), py::arg("maxSize"), py::arg("blocking") = true, "Gets an input queue corresponding to an XLinkIn stream, setting its maximum size and blocking behavior")
+        .def("getOutputQueueNames", &MockDevice::getOutputQueueNames, "Gets names of all XLinkOut streams")
+        .def("getInputQueueNames", &MockDevice::getInputQueueNames, "Gets names of all XLinkIn streams")
+        .def("addGenerator", [](MockDevice& d, const std::string& name, py::object source, double fps, std::int64_t count){
+            MockGenerator::Generate generate;
+            if(py::isinstance<ADatatype>(source)) {
+                auto msg = source.cast<std::shared_ptr<ADatatype>>();
+                generate = [msg]() { return msg; };
+            } else if(PyCallable_Check(source.ptr())) {
+                generate = source.cast<MockGenerator::Generate>();
+            } else {
+                throw py::type_error("Generator source must be a message or a callable returning messages");
+            }
+            py::gil_scoped_release release;
+            d.addGenerator(name, std::move(generate), fps, count);
+        }, py::arg("name"), py::arg("source"), py::arg("fps") = 0.0, py::arg("count") = -1,
+        "Sends messages to an XLinkIn stream from a background thread, at 'fps' (as fast as the queue accepts them if not positive).\n"
+        "'source' is either a message, sent repeatedly without the GIL, or a callable returning the next message (None to stop).\n"
+        "Stops after 'count' messages (never if negative) or when the device is closed")
+        .def("getLinkStats", &MockDevice::getLinkStats, "Returns snapshot of link counters, including achieved throughput and latency")
+        .def("resetLinkStats", &MockDevice::resetLinkStats, "Resets link counters and restarts the elapsed time")
+        .def("waitAny", [](MockDevice& d, const std::vector<std::string>& queueNames, microseconds timeout) {
+            return mockDeviceWaitAnyHelper(d, queueNames, timeout);
+        }, py::arg("queueNames"), py::arg("timeout") = microseconds(-1),
+        "Blocks until any of the specified output queues has messages (or timeout elapses), then takes all available messages from all of them at once.\n"
+        "Returns dictionary of queue name to list of messages, containing only queues which had any. Empty on timeout")
+        .def("waitAny", [](MockDevice& d, microseconds timeout) {
+            return mockDeviceWaitAnyHelper(d, d.getOutputQueueNames(), timeout);
+        }, py::arg("timeout") = microseconds(-1), "Same as waitAny(queueNames, timeout), for all output queues")
+        .def("getAllMessages", [](MockDevice& d, const std::vector<std::string>& queueNames) {
+            return mockDeviceGetAllMessagesHelper(d, queueNames);
+        }, py::arg("queueNames"), "Takes all messages currently available in the specified output queues, without blocking.\n"
+        "Returns dictionary of queue name to list of messages, containing only queues which had any")
+        .def("getAllMessages", [](MockDevice& d) {
+            return mockDeviceGetAllMessagesHelper(d, d.getOutputQueueNames());
+        }, "Same as getAllMessages(queueNames), for all output queues")
+        ;
+
+}
@@ -0,0 +1,217 @@
+#include "RecordingBindings.hpp"
+
+// std
+#include <chrono>
+#include <cstdint>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+
+// project
+#include "utility/AnyQueue.hpp"
+#include "utility/Recording.hpp"
+
+// Message data waiting to be written before further messages are dropped
+constexpr std::size_t RECORDER_DEFAULT_MAX_PENDING_BYTES = 512 * 1024 * 1024;
+
+// Records messages of output queues into a single recording.
+// Messages are taken by callbacks on the queue reading threads, which only hand them over to the writers I/O thread
+class Recorder {
+   public:
+    Recorder(const std::string& path, const std::vector<std::shared_ptr<AnyOutputQueue>>& queues, std::size_t maxPendingBytes)
+        : writer(std::make_shared<RecordingWriter>(path, maxPendingBytes)) {
+        if(queues.empty()) throw std::invalid_argument("Recorder requires at least one queue");
+        for(const auto& queue : queues) {
+            if(!queue) throw std::invalid_argument("Recorder queues must not be None");
+        }
+        for(const auto& queue : queues) {
+            const auto stream = writer->addStream(queue->getName());
+            auto writer = this->writer;
+            const auto callbackId = queue->addCallback([writer, stream](std::shared_ptr<dai::ADatatype> msg) {
+                if(msg) writer->write(stream, std::move(msg));
+            });
+            attachments.emplace_back(queue, callbackId);
+        }
+    }
+
+    ~Recorder() {
+        // Releasing written messages may require the GIL
+        if(PyGILState_Check()) {
+            pybind11::gil_scoped_release release;
+            closeQuietly();
+        } else {
+            closeQuietly();
+        }
+    }
+
+    // Detaches from the queues, then writes pending messages and the index
+    void close() {
+        if(closed) return;
+        closed = true;
+        for(auto& attached : attachments) attached.first->removeCallback(attached.second);
+        attachments.clear();
+        writer->close();
+    }
+
+    bool isClosed() const {
+        return closed;
+    }
+
+    std::string getPath() const {
+        return writer->getPath();
+    }
+
+    std::vector<std::string> getStreams() const {
+        return writer->getStreams();
+    }
+
+    std::uint64_t getMessagesWritten() const {
+        return writer->getMessagesWritten();
+    }
+
+    std::uint64_t getBytesWritten() const {
+        return writer->getBytesWritten();
+    }
+
+    std::uint64_t getMessagesDropped() const {
+        return writer->getMessagesDropped();
+    }
+
+    std::size_t getPendingBytes() const {
+        return writer->getPendingBytes();
+    }
+
+   private:
+    void closeQuietly() {
+        try {
+            close();
+        } catch(const std::exception&) {
+            // Write errors are reported by an explicit close
+        }
+    }
+
+    std::shared_ptr<RecordingWriter> writer;
+    std::vector<std::pair<std::shared_ptr<AnyOutputQueue>, int>> attachments;
+    bool closed = false;
+};
+
+void RecordingBindings::bind(pybind11::module& m, void* pCallstack){
+
+    using namespace dai;
+    namespace py = pybind11;
+    using namespace std::chrono;
+
+    // Type definitions
+    py::class_<Recorder, std::shared_ptr<Recorder>> recorder(m, "Recorder",
+        "Records every message of selected output queues, with full metadata and timestamps, into a single recording file (see Recording).\n"
+        "Messages are written in large chunks from a background thread, so queue reading threads never wait for disk.\n"
+        "Recorded queues keep their messages as well - queues which aren't otherwise read should be non-blocking");
+    py::class_<RecordingReader, std::shared_ptr<RecordingReader>> recording(m, "Recording",
+        "Memory mapped recording written by Recorder, indexed by stream, sequence number and timestamp.\n"
+        "Buffer, ImgFrame and EncodedFrame messages reference their (read-only) data in the file without a copy");
+
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    // Call the rest of the type defines, then perform the actual bindings
+    Callstack* callstack = (Callstack*) pCallstack;
+    auto cb = callstack->top();
+    callstack->pop();
+    cb(m, pCallstack);
+    // Actual bindings
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+
+    recorder
+        .def(py::init([](py::object device, std::vector<std::string> streams, const std::string& path, std::size_t maxPendingBytes, py::object blocking){
+            if(streams.empty()) streams = device.attr("getOutputQueueNames")().cast<std::vector<std::string>>();
+            std::vector<std::shared_ptr<AnyOutputQueue>> queues;
+            for(const auto& name : streams) {
+                // Queues are recorded as they are, unless asked otherwise
+                py::object queue = device.attr("getOutputQueue")(name);
+                if(!blocking.is_none()) queue.attr("setBlocking")(blocking);
+                queues.push_back(castAnyOutputQueue(queue));
+            }
+            // Reading threads hold their queue callbacks lock while waiting for the GIL
+            py::gil_scoped_release release;
+            return std::make_shared<Recorder>(path, queues, maxPendingBytes);
+        }), py::arg("device"), py::arg("streams"), py::arg("path"), py::arg("maxPendingBytes") = RECORDER_DEFAULT_MAX_PENDING_BYTES, py::arg("blocking") = py::none(),
+        "Records output queues of given streams of a device or MockDevice (all output queues if 'streams' is empty) into 'path'.\n"
+        "Queues are recorded with their current size and blocking behavior. If 'blocking' is given, it is set on all recorded queues -\n"
+        "False keeps streams which aren't otherwise read from stalling the device.\n"
+        "Once more than 'maxPendingBytes' of message data waits to be written, further messages are dropped")
+        .def(py::init([](const std::string& path, const std::vector<py::object>& queues, std::size_t maxPendingBytes){
+            std::vector<std::shared_ptr<AnyOutputQueue>> outputs;
+            for(const auto& queue : queues) outputs.push_back(castAnyOutputQueue(queue));
+            py::gil_scoped_release release;
+            return std::make_shared<Recorder>(path, outputs, maxPendingBytes);
+        }), py::arg("path"), py::arg("queues"), py::arg("maxPendingBytes") = RECORDER_DEFAULT_MAX_PENDING_BYTES,
+            "Records given output queues (DataOutputQueue or MockDataOutputQueue) into 'path'")
+        .def("close", &Recorder::close, "Stops recording and finishes the recording file, by writing pending messages and the index", py::call_guard<py::gil_scoped_release>())
+        .def("isClosed", &Recorder::isClosed, "Returns true once recording was stopped")
+        .def("__enter__", [](py::object self){
+            return self;
+        })
+        .def("__exit__", [](Recorder& r, py::object, py::object, py::object){
+            py::gil_scoped_release release;
+            r.close();
+        })
+        .def("getPath", &Recorder::getPath, "Returns path of the recording file")
+        .def("getStreams", &Recorder::getStreams, "Returns names of recorded streams")
+        .def("getMessagesWritten", &Recorder::getMessagesWritten, "Returns number of messages written")
+        .def("getBytesWritten", &Recorder::getBytesWritten, "Returns number of message bytes written (data and metadata)")
+        .def("getMessagesDropped", &Recorder::getMessagesDropped, "Returns number of messages dropped, as too much data was waiting to be written")
+        .def("getPendingBytes", &Recorder::getPendingBytes, "Returns size of message data waiting to be written")
+        ;
+
+    recording
+        .def(py::init<std::string>(), py::arg("path"), "Opens a recording. Index of an interrupted recording is rebuilt from its complete chunks")
+        .def("close", &RecordingReader::close, "Closes the recording, reading messages afterwards raises. Messages still referencing the file keep it mapped until released")
+        .def("__enter__", [](py::object self){
+            return self;
+        })
+        .def("__exit__", [](RecordingReader& r, py::object, py::object, py::object){
+            r.close();
+        })
+        .def("getPath", &RecordingReader::getPath, "Returns path of the recording file")
+        .def("isComplete", &RecordingReader::isComplete, "Returns true if recording was closed properly, false if its index had to be rebuilt")
+        .def("getStreams", &RecordingReader::getStreams, "Returns names of recorded streams")
+        .def("getCount", [](RecordingReader& r, const std::string& stream){
+            return r.getEntries(r.getStreamId(stream)).size();
+        }, py::arg("stream"), "Returns number of recorded messages of a stream")
+        .def("__len__", [](RecordingReader& r){
+            return r.getAllEntries().size();
+        })
+        .def("get", [](RecordingReader& r, const std::string& stream, std::size_t index){
+            const auto& entries = r.getEntries(r.getStreamId(stream));
+            if(index >= entries.size()) throw py::index_error("Recording stream '" + stream + "' has only " + std::to_string(entries.size()) + " messages");
+            return r.getMessage(entries[index]);
+        }, py::arg("stream"), py::arg("index"), "Returns message at 'index' of a stream")
+        .def("getAll", [](RecordingReader& r){
+            // Messages of all streams in recorded order
+            py::list messages;
+            for(const auto& entry : r.getAllEntries()) messages.append(py::make_tuple(r.getStreams()[entry.stream], r.getMessage(entry)));
+            return messages;
+        }, "Returns all messages as list of (stream, message), in recorded order")
+        .def("findSequenceNum", [](RecordingReader& r, const std::string& stream, std::int64_t sequenceNum){
+            return r.findSequenceNum(r.getStreamId(stream), sequenceNum);
+        }, py::arg("stream"), py::arg("sequenceNum"), "Returns index of the first message of a stream with sequence number at least 'sequenceNum' (message count if none)")
+        .def("findTimestamp", [](RecordingReader& r, const std::string& stream, nanoseconds timestamp){
+            return r.findTimestamp(r.getStreamId(stream), timestamp.count());
+        }, py::arg("stream"), py::arg("timestamp"), "Returns index of the first message of a stream with (host) timestamp at least 'timestamp' (message count if none)")
+        .def("getTimestampsNs", [](RecordingReader& r, const std::string& stream, bool device){
+            const auto& entries = r.getEntries(r.getStreamId(stream));
+            py::array_t<std::int64_t> timestamps(static_cast<py::ssize_t>(entries.size()));
+            auto* ts = timestamps.mutable_data();
+            for(const auto& entry : entries) *ts++ = device ? entry.timestampDeviceNs : entry.timestampNs;
+            return timestamps;
+        }, py::arg("stream"), py::arg("device") = false, "Returns timestamps (host, or device if 'device' is true) of all messages of a stream as int64 nanoseconds array, read from the index")
+        ;
+
+}
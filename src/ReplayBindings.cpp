@@ -0,0 +1,552 @@
+#include "ReplayBindings.hpp"
+
+// std
+#include <algorithm>
+#include <array>
+#include <chrono>
+#include <climits>
+#include <condition_variable>
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+
+// project
+#include "pipeline/datatype/HostMessage.hpp"
+#include "utility/AnyQueue.hpp"
+#include "utility/BlockingCall.hpp"
+#include "utility/QueueStats.hpp"
+#include "utility/Recording.hpp"
+
+// Interval in which a waiting sender checks whether replay was stopped
+constexpr std::chrono::milliseconds REPLAY_STOP_CHECK_INTERVAL{100};
+// Files of an image directory which are replayed
+const std::vector<std::string> REPLAY_IMAGE_EXTENSIONS{".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".pgm", ".ppm", ".webp"};
+
+// Snapshot of replay counters
+struct ReplayStats {
+    std::uint64_t messagesSent = 0;
+    std::uint64_t bytesSent = 0;
+    std::chrono::nanoseconds elapsed{0};
+    double messagesPerSecond = 0.0;
+    double bytesPerSecond = 0.0;
+    // How far behind the original timing messages were sent at most (realtime replay only)
+    std::chrono::nanoseconds maxLag{0};
+    // Number of times the sender had to wait for a message to be loaded
+    std::uint64_t prefetchStalls = 0;
+};
+
+// Messages to replay, in replay order
+class ReplaySource {
+   public:
+    virtual ~ReplaySource() = default;
+
+    virtual std::size_t size() const = 0;
+
+    // Sources which must be loaded in order limit the number of workers
+    virtual unsigned int getMaxWorkers() const {
+        return UINT_MAX;
+    }
+
+    // Index of the queue a message is sent to
+    virtual std::size_t getStream(std::size_t index) const = 0;
+
+    virtual std::int64_t getTimestampNs(std::size_t index) const = 0;
+
+    // Loads a message, called from worker threads without the GIL. Returns nullptr if source ended early
+    virtual std::shared_ptr<dai::ADatatype> load(std::size_t index) = 0;
+};
+
+// Messages of selected streams of a recording, parsed from the memory mapped file
+class RecordingReplaySource : public ReplaySource {
+   public:
+    // Must be called with GIL held
+    RecordingReplaySource(const std::string& path, const std::vector<std::string>& streams) : reader(std::make_shared<RecordingReader>(path)) {
+        std::vector<std::size_t> queueOf(reader->getStreams().size(), SIZE_MAX);
+        for(std::size_t i = 0; i < streams.size(); i++) queueOf.at(reader->getStreamId(streams[i])) = i;
+        for(const auto& entry : reader->getAllEntries()) {
+            if(queueOf[entry.stream] == SIZE_MAX) continue;
+            entries.push_back(entry);
+            this->streams.push_back(queueOf[entry.stream]);
+        }
+    }
+
+    std::size_t size() const override {
+        return entries.size();
+    }
+
+    std::size_t getStream(std::size_t index) const override {
+        return streams[index];
+    }
+
+    std::int64_t getTimestampNs(std::size_t index) const override {
+        return entries[index].timestampNs;
+    }
+
+    std::shared_ptr<dai::ADatatype> load(std::size_t index) override {
+        // Parsed the same as received messages
+        const auto packet = reader->getPacket(entries[index]);
+        streamPacketDesc_t desc{};
+        desc.data = const_cast<std::uint8_t*>(packet.first);
+        desc.length = static_cast<std::uint32_t>(packet.second);
+        return dai::StreamMessageParser::parseMessageToADatatype(&desc);
+    }
+
+   private:
+    std::shared_ptr<RecordingReader> reader;
+    std::vector<RecordingIndexEntry> entries;
+    std::vector<std::size_t> streams;
+};
+
+// Frame from a decoded image (BGR or grayscale), referencing the image as external data. Must be called with GIL held
+static std::shared_ptr<dai::ADatatype> imageToFrame(const pybind11::object& decoded, std::size_t index, std::int64_t timestampNs) {
+    if(decoded.is_none()) return nullptr;
+    auto image = pybind11::array::ensure(decoded, pybind11::array::c_style);
+    if(!image || !image.dtype().is(pybind11::dtype::of<std::uint8_t>()) || !(image.ndim() == 2 || (image.ndim() == 3 && image.shape(2) == 3))) {
+        throw std::runtime_error("Only 8-bit grayscale and BGR images can be replayed");
+    }
+    auto frame = std::make_shared<HostImgFrame>();
+    frame->setType(image.ndim() == 2 ? dai::RawImgFrame::Type::GRAY8 : dai::RawImgFrame::Type::BGR888i);
+    frame->setWidth(static_cast<unsigned int>(image.shape(1)));
+    frame->setHeight(static_cast<unsigned int>(image.shape(0)));
+    frame->setSequenceNum(static_cast<std::int64_t>(index));
+    const std::chrono::time_point<std::chrono::steady_clock, std::chrono::steady_clock::duration> timestamp(
+        std::chrono::duration_cast<std::chrono::steady_clock::duration>(std::chrono::nanoseconds(timestampNs)));
+    frame->setTimestamp(timestamp);
+    frame->setTimestampDevice(timestamp);
+    frame->setExternalData(image);
+    return frame;
+}
+
+static pybind11::module importCv2() {
+    try {
+        return pybind11::module::import("cv2");
+    } catch(pybind11::error_already_set& e) {
+        if(!e.matches(PyExc_ImportError)) throw;
+        throw std::runtime_error("Replaying images and videos requires 'cv2' module (opencv-python)");
+    }
+}
+
+// Images of a directory in name order, decoded by 'cv2' (which releases the GIL while decoding) at given frame rate
+class ImageDirectoryReplaySource : public ReplaySource {
+   public:
+    // Must be called with GIL held
+    ImageDirectoryReplaySource(const std::string& path, double fps) : cv2(importCv2()), intervalNs(static_cast<std::int64_t>(1e9 / fps)) {
+        auto os = pybind11::module::import("os");
+        auto names = pybind11::module::import("builtins").attr("sorted")(os.attr("listdir")(path)).cast<std::vector<std::string>>();
+        for(const auto& name : names) {
+            auto ext = os.attr("path").attr("splitext")(name)[pybind11::int_(1)].attr("lower")().cast<std::string>();
+            if(std::find(REPLAY_IMAGE_EXTENSIONS.begin(), REPLAY_IMAGE_EXTENSIONS.end(), ext) == REPLAY_IMAGE_EXTENSIONS.end()) continue;
+            files.push_back(os.attr("path").attr("join")(path, name).cast<std::string>());
+        }
+        if(files.empty()) throw std::runtime_error("Directory '" + path + "' contains no images");
+    }
+
+    ~ImageDirectoryReplaySource() override {
+        pybind11::gil_scoped_acquire gil;
+        cv2 = pybind11::module();
+    }
+
+    std::size_t size() const override {
+        return files.size();
+    }
+
+    std::size_t getStream(std::size_t) const override {
+        return 0;
+    }
+
+    std::int64_t getTimestampNs(std::size_t index) const override {
+        return static_cast<std::int64_t>(index) * intervalNs;
+    }
+
+    std::shared_ptr<dai::ADatatype> load(std::size_t index) override {
+        pybind11::gil_scoped_acquire gil;
+        auto image = cv2.attr("imread")(files[index], cv2.attr("IMREAD_UNCHANGED"));
+        if(image.is_none()) throw std::runtime_error("Couldn't decode image '" + files[index] + "'");
+        return imageToFrame(image, index, getTimestampNs(index));
+    }
+
+   private:
+    pybind11::module cv2;
+    std::vector<std::string> files;
+    std::int64_t intervalNs;
+};
+
+// Frames of a video file decoded by 'cv2', which has to be done in order, at the videos frame rate (or given one if unknown)
+class VideoReplaySource : public ReplaySource {
+   public:
+    // Must be called with GIL held
+    VideoReplaySource(const std::string& path, double fps) : cv2(importCv2()) {
+        capture = cv2.attr("VideoCapture")(path);
+        if(!capture.attr("isOpened")().cast<bool>()) throw std::runtime_error("Couldn't open '" + path + "' as recording, image directory or video");
+        frames = static_cast<std::size_t>(std::max(capture.attr("get")(cv2.attr("CAP_PROP_FRAME_COUNT")).cast<double>(), 0.0));
+        const auto videoFps = capture.attr("get")(cv2.attr("CAP_PROP_FPS")).cast<double>();
+        intervalNs = static_cast<std::int64_t>(1e9 / (videoFps > 0.0 ? videoFps : fps));
+        if(frames == 0) throw std::runtime_error("Video '" + path + "' has no frames");
+    }
+
+    ~VideoReplaySource() override {
+        pybind11::gil_scoped_acquire gil;
+        capture.attr("release")();
+        capture = pybind11::object();
+        cv2 = pybind11::module();
+    }
+
+    std::size_t size() const override {
+        return frames;
+    }
+
+    unsigned int getMaxWorkers() const override {
+        return 1;
+    }
+
+    std::size_t getStream(std::size_t) const override {
+        return 0;
+    }
+
+    std::int64_t getTimestampNs(std::size_t index) const override {
+        return static_cast<std::int64_t>(index) * intervalNs;
+    }
+
+    std::shared_ptr<dai::ADatatype> load(std::size_t index) override {
+        pybind11::gil_scoped_acquire gil;
+        // Seek back to the start when looping
+        if(index != next) capture.attr("set")(cv2.attr("CAP_PROP_POS_FRAMES"), index);
+        next = index + 1;
+        auto result = capture.attr("read")().cast<pybind11::tuple>();
+        // Frame count of some containers is only an estimate
+        if(!result[0].cast<bool>()) return nullptr;
+        return imageToFrame(result[1], index, getTimestampNs(index));
+    }
+
+   private:
+    pybind11::module cv2;
+    pybind11::object capture;
+    std::size_t frames = 0;
+    std::size_t next = 0;
+    std::int64_t intervalNs = 0;
+};
+
+// Must be called with GIL held
+static std::unique_ptr<ReplaySource> openReplaySource(const std::string& path, const std::vector<std::string>& streams, double fps) {
+    if(fps <= 0.0) throw std::invalid_argument("Replay fps must be positive");
+    if(pybind11::module::import("os").attr("path").attr("isdir")(path).cast<bool>()) {
+        if(streams.size() != 1) throw std::invalid_argument("Replaying an image directory requires exactly one queue");
+        return std::unique_ptr<ReplaySource>(new ImageDirectoryReplaySource(path, fps));
+    }
+    std::array<char, RECORDING_MAGIC.size()> magic{};
+    std::ifstream file(path, std::ios::binary);
+    if(!file) throw std::runtime_error("Couldn't open '" + path + "'");
+    file.read(magic.data(), magic.size());
+    if(file && magic == RECORDING_MAGIC) return std::unique_ptr<ReplaySource>(new RecordingReplaySource(path, streams));
+    if(streams.size() != 1) throw std::invalid_argument("Replaying a video requires exactly one queue");
+    return std::unique_ptr<ReplaySource>(new VideoReplaySource(path, fps));
+}
+
+// Replays messages of a source into input queues.
+// Worker threads load (parse or decode) messages ahead of the sender, at most 'prefetch' messages ahead.
+// The sender thread sends them in order, either at their original timing (scaled by 'speed') or as fast as the queues accept them
+class Replay {
+   public:
+    Replay(std::unique_ptr<ReplaySource> source,
+           std::vector<std::shared_ptr<AnyInputQueue>> queues,
+           bool realtime,
+           double speed,
+           bool loop,
+           unsigned int workers,
+           std::size_t prefetch,
+           std::int64_t loopIntervalNs)
+        : source(std::move(source)), queues(std::move(queues)), realtime(realtime), speed(speed), workers(workers), prefetch(prefetch) {
+        if(speed <= 0.0) throw std::invalid_argument("Replay speed must be positive");
+        if(workers == 0) throw std::invalid_argument("Replay requires at least one worker");
+        if(prefetch == 0) throw std::invalid_argument("Replay prefetch must be at least one message");
+        for(const auto& queue : this->queues) {
+            if(!queue) throw std::invalid_argument("Replay queues must not be None");
+            counters.push_back(queue->getCounters());
+        }
+        const auto size = this->source->size();
+        total = loop ? SIZE_MAX : size;
+        if(size == 0) total = 0;
+        // Loops follow each other by the average interval between messages, or by 'loopIntervalNs' if the source
+        // has no interval of its own (single message, equal timestamps), so a realtime loop doesn't send as fast as possible
+        if(loop && loopIntervalNs <= 0) throw std::invalid_argument("Replay loop interval must be positive");
+        const auto span = size > 1 ? std::max<std::int64_t>(this->source->getTimestampNs(size - 1) - this->source->getTimestampNs(0), 0) : 0;
+        loopPeriodNs = span + (span > 0 ? span / static_cast<std::int64_t>(size - 1) : loopIntervalNs);
+    }
+
+    ~Replay() {
+        // Workers may be waiting for the GIL
+        if(PyGILState_Check()) {
+            pybind11::gil_scoped_release release;
+            stop();
+        } else {
+            stop();
+        }
+    }
+
+    void start() {
+        std::unique_lock<std::mutex> lock(mtx);
+        if(started) throw std::runtime_error("Replay was already started");
+        started = true;
+        startTime = std::chrono::steady_clock::now();
+        const auto count = std::min(workers, source->getMaxWorkers());
+        for(unsigned int i = 0; i < count; i++) threads.emplace_back([this]() { work(); });
+        threads.emplace_back([this]() { send(); });
+    }
+
+    // Stops replay and waits for its threads. Must be called without the GIL
+    void stop() {
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            stopping = true;
+        }
+        cv.notify_all();
+        for(auto& thread : threads) {
+            if(thread.joinable()) thread.join();
+        }
+        // Loaded messages may require the GIL to be released
+        std::map<std::size_t, Loaded> remaining;
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            remaining.swap(loaded);
+        }
+    }
+
+    // Waits until all messages were sent (or replay was stopped), returns false on timeout. Must be called without the GIL
+    bool wait(std::chrono::microseconds timeout) {
+        std::unique_lock<std::mutex> lock(mtx);
+        if(!started) throw std::runtime_error("Replay wasn't started");
+        if(timeout < std::chrono::microseconds(0)) {
+            cv.wait(lock, [this]() { return finished; });
+            return true;
+        }
+        return cv.wait_for(lock, timeout, [this]() { return finished; });
+    }
+
+    bool isRunning() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return started && !finished;
+    }
+
+    // Rethrows error which stopped the replay, if any
+    void checkError() {
+        std::unique_lock<std::mutex> lock(mtx);
+        if(!error.empty()) throw std::runtime_error("Replay failed: " + error);
+    }
+
+    ReplayStats getStats() {
+        std::unique_lock<std::mutex> lock(mtx);
+        ReplayStats snapshot = stats;
+        if(started) snapshot.elapsed = std::chrono::duration_cast<std::chrono::nanoseconds>((finished ? endTime : std::chrono::steady_clock::now()) - startTime);
+        const auto seconds = std::chrono::duration<double>(snapshot.elapsed).count();
+        if(seconds > 0.0) {
+            snapshot.messagesPerSecond = static_cast<double>(snapshot.messagesSent) / seconds;
+            snapshot.bytesPerSecond = static_cast<double>(snapshot.bytesSent) / seconds;
+        }
+        return snapshot;
+    }
+
+   private:
+    struct Loaded {
+        std::shared_ptr<dai::ADatatype> msg;
+        std::size_t stream;
+        std::int64_t timestampNs;
+    };
+
+    void work() {
+        std::unique_lock<std::mutex> lock(mtx);
+        while(true) {
+            cv.wait(lock, [this]() { return stopping || (nextLoad < total && nextLoad < nextSend + prefetch); });
+            if(stopping) return;
+            const auto index = nextLoad++;
+            lock.unlock();
+
+            Loaded item{nullptr, 0, 0};
+            std::string failure;
+            try {
+                const auto size = source->size();
+                const auto position = index % size;
+                item.msg = source->load(position);
+                item.stream = source->getStream(position);
+                item.timestampNs = source->getTimestampNs(position) + static_cast<std::int64_t>(index / size) * loopPeriodNs;
+            } catch(const std::exception& e) {
+                failure = e.what();
+            }
+
+            lock.lock();
+            if(!failure.empty() && error.empty()) error = failure;
+            loaded.emplace(index, std::move(item));
+            cv.notify_all();
+        }
+    }
+
+    void send() {
+        std::int64_t firstTimestampNs = 0;
+        std::unique_lock<std::mutex> lock(mtx);
+        for(std::size_t index = 0; index < total; index++) {
+            if(loaded.find(index) == loaded.end()) {
+                // First message is always waited for
+                if(index > 0) stats.prefetchStalls++;
+                cv.wait(lock, [this, index]() { return stopping || loaded.find(index) != loaded.end(); });
+            }
+            if(stopping) break;
+            auto it = loaded.find(index);
+            auto item = std::move(it->second);
+            loaded.erase(it);
+            nextSend = index + 1;
+            cv.notify_all();
+            // Failed to load, or source ended early
+            if(!item.msg) break;
+
+            if(index == 0) firstTimestampNs = item.timestampNs;
+            if(realtime) {
+                const auto offset = std::chrono::nanoseconds(static_cast<std::int64_t>(static_cast<double>(item.timestampNs - firstTimestampNs) / speed));
+                const auto due = startTime + std::chrono::duration_cast<std::chrono::steady_clock::duration>(offset);
+                if(cv.wait_until(lock, due, [this]() { return stopping; })) break;
+                stats.maxLag = std::max(stats.maxLag, std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now() - due));
+            }
+            lock.unlock();
+
+            const auto bytes = getMessageDataSize(*item.msg);
+            auto& queue = queues.at(item.stream);
+            auto& queueCounters = counters.at(item.stream);
+            bool sent = false;
+            std::string failure;
+            try {
+                while(!sent && !isStopping()) sent = queue->send(item.msg, REPLAY_STOP_CHECK_INTERVAL);
+            } catch(const std::exception& e) {
+                failure = e.what();
+            }
+            if(sent) queueCounters->onSend(bytes);
+            // Released outside of the lock, as it may require the GIL
+            item.msg = nullptr;
+
+            lock.lock();
+            if(!failure.empty() && error.empty()) error = failure;
+            if(!sent) break;
+            stats.messagesSent++;
+            stats.bytesSent += bytes;
+        }
+        finished = true;
+        stopping = true;
+        endTime = std::chrono::steady_clock::now();
+        cv.notify_all();
+    }
+
+    bool isStopping() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return stopping;
+    }
+
+    std::unique_ptr<ReplaySource> source;
+    std::vector<std::shared_ptr<AnyInputQueue>> queues;
+    std::vector<std::shared_ptr<QueueCounters>> counters;
+    bool realtime;
+    double speed;
+    unsigned int workers;
+    std::size_t prefetch;
+    std::size_t total = 0;
+    std::int64_t loopPeriodNs = 0;
+
+    std::mutex mtx;
+    std::condition_variable cv;
+    std::map<std::size_t, Loaded> loaded;
+    std::size_t nextLoad = 0;
+    std::size_t nextSend = 0;
+    bool started = false;
+    bool stopping = false;
+    bool finished = false;
+    std::string error;
+    ReplayStats stats;
+    std::chrono::steady_clock::time_point startTime;
+    std::chrono::steady_clock::time_point endTime;
+    std::vector<std::thread> threads;
+};
+
+void ReplayBindings::bind(pybind11::module& m, void* pCallstack){
+
+    using namespace dai;
+    namespace py = pybind11;
+    using namespace std::chrono;
+
+    // Type definitions
+    py::class_<Replay, std::shared_ptr<Replay>> replay(m, "Replay",
+        "Replays a recording (see Recorder), a directory of images or a video into input queues, either at the original timing or as fast as possible.\n"
+        "Messages are loaded (parsed or decoded) ahead on worker threads, sending happens on a dedicated thread. Achieved throughput is reported by 'getStats'");
+    py::class_<ReplayStats> replayStats(m, "ReplayStats", "Snapshot of replay counters");
+
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    // Call the rest of the type defines, then perform the actual bindings
+    Callstack* callstack = (Callstack*) pCallstack;
+    auto cb = callstack->top();
+    callstack->pop();
+    cb(m, pCallstack);
+    // Actual bindings
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+
+    replayStats
+        .def_readonly("messagesSent", &ReplayStats::messagesSent)
+        .def_readonly("bytesSent", &ReplayStats::bytesSent)
+        .def_readonly("elapsed", &ReplayStats::elapsed, "Time since replay was started, until it finished")
+        .def_readonly("messagesPerSecond", &ReplayStats::messagesPerSecond)
+        .def_readonly("bytesPerSecond", &ReplayStats::bytesPerSecond)
+        .def_readonly("maxLag", &ReplayStats::maxLag, "How far behind the original timing messages were sent at most (realtime replay only)")
+        .def_readonly("prefetchStalls", &ReplayStats::prefetchStalls, "Number of times sending waited for a message to be loaded - if frequent, more workers or prefetch are needed")
+        .def("__repr__", [](const ReplayStats& stats){
+            return "ReplayStats(messagesSent=" + std::to_string(stats.messagesSent) + ", bytesSent=" + std::to_string(stats.bytesSent)
+                + ", messagesPerSecond=" + std::to_string(stats.messagesPerSecond) + ", bytesPerSecond=" + std::to_string(stats.bytesPerSecond) + ")";
+        })
+        ;
+
+    replay
+        .def(py::init([](const std::string& path, const std::map<std::string, py::object>& queues, bool realtime, double speed, bool loop, unsigned int workers, std::size_t prefetch, double fps){
+            std::vector<std::string> streams;
+            std::vector<std::shared_ptr<AnyInputQueue>> inputs;
+            for(const auto& queue : queues) {
+                streams.push_back(queue.first);
+                inputs.push_back(castAnyInputQueue(queue.second));
+            }
+            auto source = openReplaySource(path, streams, fps);
+            return std::make_shared<Replay>(std::move(source), std::move(inputs), realtime, speed, loop, workers, prefetch, static_cast<std::int64_t>(1e9 / fps));
+        }), py::arg("path"), py::arg("queues"), py::arg("realtime") = true, py::arg("speed") = 1.0, py::arg("loop") = false, py::arg("workers") = 2, py::arg("prefetch") = 16, py::arg("fps") = 30.0,
+        "Replays 'path' into input queues (DataInputQueue or MockDataInputQueue). For a recording, 'queues' maps recorded stream names to input queues (other streams are skipped).\n"
+        "For a directory of images or a video (decoded by 'cv2'), 'queues' holds a single queue, which receives ImgFrame messages (BGR or grayscale) at 'fps'\n"
+        "(video frame rate if known). With 'realtime', messages are sent at their original timing scaled by 'speed', otherwise as fast as the queues accept them.\n"
+        "With 'loop', replay starts over once all messages were sent, a loop following the previous one by the average interval between messages\n"
+        "(or by 1/'fps', if the source has a single message or all its messages share a timestamp)")
+        .def("start", &Replay::start, "Starts the replay", py::call_guard<py::gil_scoped_release>())
+        .def("stop", &Replay::stop, "Stops the replay", py::call_guard<py::gil_scoped_release>())
+        .def("wait", [](Replay& r, microseconds timeout){
+            bool done = blockingCall([&](microseconds slice){
+                return r.wait(slice);
+            }, timeout);
+            r.checkError();
+            return done;
+        }, py::arg("timeout") = microseconds(-1), "Blocks until all messages were sent or timeout occurs (negative timeout meaning indefinitely). Returns false on timeout. Raises if replay failed")
+        .def("isRunning", &Replay::isRunning, "Returns true while replay is sending messages")
+        .def("getStats", &Replay::getStats, "Returns snapshot of replay counters, including achieved throughput")
+        .def("__enter__", [](py::object self){
+            self.attr("start")();
+            return self;
+        })
+        .def("__exit__", [](Replay& r, py::object, py::object, py::object){
+            py::gil_scoped_release release;
+            r.stop();
+        })
+        ;
+
+}
@@ -0,0 +1,305 @@
+#include "SharedMemoryQueueBindings.hpp"
+
+// std
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai-shared/utility/Serialization.hpp"
+
+// project
+#include "pipeline/datatype/HostMessage.hpp"
+#include "utility/AnyQueue.hpp"
+#include "utility/BlockingCall.hpp"
+#include "utility/SharedMemoryRing.hpp"
+
+// Messages which can be moved through shared memory, all of them carrying their payload as message data
+static bool isSharedMemoryDatatype(dai::DatatypeEnum datatype) {
+    switch(datatype) {
+        case dai::DatatypeEnum::Buffer:
+        case dai::DatatypeEnum::ImgFrame:
+        case dai::DatatypeEnum::EncodedFrame:
+        case dai::DatatypeEnum::NNData:
+            return true;
+        default:
+            return false;
+    }
+}
+
+// Writes metadata and data of a message into the ring. Doesn't require the GIL
+static bool pushSharedMemoryMessage(SharedMemoryRing& ring, const dai::ADatatype& msg, std::chrono::microseconds timeout) {
+    std::vector<std::uint8_t> metadata;
+    dai::DatatypeEnum datatype;
+    msg.getRaw()->serialize(metadata, datatype);
+    if(!isSharedMemoryDatatype(datatype)) throw std::invalid_argument("SharedMemoryQueue only supports Buffer, ImgFrame, EncodedFrame and NNData messages");
+    const auto data = getMessageDataSpan(msg);
+    return ring.push({static_cast<std::int32_t>(datatype), metadata.data(), metadata.size(), data.first, data.second}, timeout);
+}
+
+// Claimed slot of a ring, given back to the producer once the last view of its data is released
+struct SharedMemoryLease {
+    std::shared_ptr<SharedMemoryRing> ring;
+    std::uint32_t index;
+
+    ~SharedMemoryLease() {
+        ring->release(index);
+    }
+};
+
+template <typename Raw>
+static void deserializeSharedMemoryMetadata(Raw& raw, const SharedMemoryRing::Message& slot) {
+    if(!dai::utility::deserialize(slot.metadata, slot.metadataSize, raw)) throw std::runtime_error("Couldn't deserialize SharedMemoryQueue message metadata");
+}
+
+// Message referencing data in its slot as external data, the slot stays leased for as long as the message or any view of its data lives
+template <typename Base, typename Raw>
+static pybind11::object leasedSharedMemoryMessage(std::unique_ptr<SharedMemoryLease> lease, const SharedMemoryRing::Message& slot) {
+    auto msg = std::make_shared<HostMessage<Base, Raw>>();
+    deserializeSharedMemoryMetadata(static_cast<Raw&>(*msg->getRaw()), slot);
+    pybind11::capsule owner(lease.get(), [](void* ptr) { delete static_cast<SharedMemoryLease*>(ptr); });
+    lease.release();
+    pybind11::array data(pybind11::dtype::of<std::uint8_t>(), {static_cast<pybind11::ssize_t>(slot.dataSize)}, {}, slot.data, owner);
+    msg->setExternalData(data);
+    // Returned as the bound type, host message type itself isn't registered
+    return pybind11::cast(std::static_pointer_cast<Base>(msg));
+}
+
+// Creates message from a claimed slot. Must be called with GIL held
+static pybind11::object receiveSharedMemoryMessage(const std::shared_ptr<SharedMemoryRing>& ring, std::uint32_t index) {
+    std::unique_ptr<SharedMemoryLease> lease(new SharedMemoryLease{ring, index});
+    const auto slot = ring->message(index);
+    switch(static_cast<dai::DatatypeEnum>(slot.datatype)) {
+        case dai::DatatypeEnum::Buffer:
+            return leasedSharedMemoryMessage<dai::Buffer, dai::RawBuffer>(std::move(lease), slot);
+        case dai::DatatypeEnum::ImgFrame:
+            return leasedSharedMemoryMessage<dai::ImgFrame, dai::RawImgFrame>(std::move(lease), slot);
+        case dai::DatatypeEnum::EncodedFrame:
+            return leasedSharedMemoryMessage<dai::EncodedFrame, dai::RawEncodedFrame>(std::move(lease), slot);
+        case dai::DatatypeEnum::NNData: {
+            // Not leased: core NNData getters (getLayerFp16, ...) read tensors from the messages own data, which can't reference
+            // the slot, so message data is copied and the slot released right away. Tensor views then reference the copy
+            auto msg = std::make_shared<HostNNData>();
+            auto& raw = static_cast<dai::RawNNData&>(*msg->getRaw());
+            deserializeSharedMemoryMetadata(raw, slot);
+            raw.data.assign(slot.data, slot.data + slot.dataSize);
+            return pybind11::cast(std::static_pointer_cast<dai::NNData>(msg));
+        }
+        default:
+            throw std::runtime_error("Unsupported SharedMemoryQueue message type");
+    }
+}
+
+// Moves messages to other processes through a ring of shared memory slots.
+// Creating process is the producer - it sends messages or attaches output queues, whose messages are then copied into free slots.
+// Other processes open the queue by name (or receive it pickled) and get messages referencing their slot, without a copy.
+// A slot is only reused once its message and all views of its data are released, a full ring applies backpressure to the producer.
+// Leases aren't recovered: slots claimed by a consumer process which died stay taken until the producer closes the queue,
+// so producers which may outlive their consumers should send with a timeout or attach non-blocking
+class SharedMemoryQueue {
+   public:
+    SharedMemoryQueue(std::uint32_t slots, std::size_t slotSize, const pybind11::object& name)
+        : ring(std::make_shared<SharedMemoryRing>(slots, slotSize, name)), state(std::make_shared<State>()) {}
+
+    explicit SharedMemoryQueue(const std::string& name) : ring(std::make_shared<SharedMemoryRing>(name)), state(std::make_shared<State>()) {}
+
+    ~SharedMemoryQueue() {
+        try {
+            close();
+        } catch(pybind11::error_already_set& e) {
+            e.discard_as_unraisable("SharedMemoryQueue");
+        }
+    }
+
+    std::string getName() const {
+        return ring->getName();
+    }
+
+    bool isOwner() const {
+        return ring->isOwner();
+    }
+
+    std::uint32_t getSlots() const {
+        return ring->getSlots();
+    }
+
+    std::size_t getSlotSize() const {
+        return ring->getSlotSize();
+    }
+
+    std::uint64_t getDropped() const {
+        return state->dropped.load(std::memory_order_relaxed);
+    }
+
+    bool isClosed() const {
+        return closed || ring->isClosed();
+    }
+
+    // Producer closes the ring for all processes and removes it once every process released it, consumers only stop using it.
+    // Must be called with GIL held
+    void close() {
+        if(closed) return;
+        closed = true;
+        if(!ring->isOwner()) return;
+        // Blocked callbacks return once the ring is closed, before their queues can be detached
+        ring->close();
+        {
+            pybind11::gil_scoped_release release;
+            for(auto& attached : attachments) attached.first->removeCallback(attached.second);
+        }
+        attachments.clear();
+        ring->unlink();
+    }
+
+    // Copies messages of an output queue into the ring as they arrive, on its reading thread.
+    // Messages stay in the output queue as well. When the ring is full, a blocking attachment stalls the stream,
+    // otherwise the newest message is dropped. Unsupported and oversized messages are dropped too
+    void attach(std::shared_ptr<AnyOutputQueue> queue, bool blocking) {
+        checkProducer();
+        if(!queue) throw std::invalid_argument("SharedMemoryQueue can't attach to None");
+        auto ring = this->ring;
+        auto state = this->state;
+        const auto timeout = std::chrono::microseconds(blocking ? -1 : 0);
+        int callbackId;
+        {
+            // Reading thread holds the queue callbacks lock while a callback runs
+            pybind11::gil_scoped_release release;
+            callbackId = queue->addCallback([ring, state, timeout](std::shared_ptr<dai::ADatatype> msg) {
+                if(!msg) return;
+                try {
+                    if(!pushSharedMemoryMessage(*ring, *msg, timeout)) state->dropped.fetch_add(1, std::memory_order_relaxed);
+                } catch(const std::exception&) {
+                    state->dropped.fetch_add(1, std::memory_order_relaxed);
+                }
+            });
+        }
+        attachments.emplace_back(std::move(queue), callbackId);
+    }
+
+    // Must be called with GIL held
+    bool send(const std::shared_ptr<dai::ADatatype>& msg, std::chrono::microseconds timeout) {
+        checkProducer();
+        if(!msg) throw std::invalid_argument("SharedMemoryQueue can't send None");
+        auto ring = this->ring;
+        return blockingCall([&](std::chrono::microseconds slice) { return pushSharedMemoryMessage(*ring, *msg, slice); }, timeout);
+    }
+
+    bool has() const {
+        return !closed && ring->size() > 0;
+    }
+
+    // Must be called with GIL held
+    pybind11::object tryGet() {
+        checkConsumer();
+        const auto index = ring->tryClaim();
+        if(index < 0) return pybind11::none();
+        return receiveSharedMemoryMessage(ring, static_cast<std::uint32_t>(index));
+    }
+
+    // Must be called with GIL held
+    pybind11::object get(std::chrono::microseconds timeout) {
+        checkConsumer();
+        auto ring = this->ring;
+        std::int64_t index = -1;
+        blockingCall(
+            [&](std::chrono::microseconds slice) {
+                index = ring->claim(slice);
+                return index >= 0 || ring->isClosed();
+            },
+            timeout);
+        if(index >= 0) return receiveSharedMemoryMessage(ring, static_cast<std::uint32_t>(index));
+        if(ring->isClosed()) throw std::runtime_error("SharedMemoryQueue is closed");
+        return pybind11::none();
+    }
+
+   private:
+    // Shared with the callbacks of attached queues
+    struct State {
+        std::atomic<std::uint64_t> dropped{0};
+    };
+
+    void checkProducer() const {
+        if(isClosed()) throw std::runtime_error("SharedMemoryQueue is closed");
+        if(!ring->isOwner()) throw std::runtime_error("Only the process which created the SharedMemoryQueue can send messages");
+    }
+
+    void checkConsumer() const {
+        if(closed || (ring->isClosed() && ring->size() == 0)) throw std::runtime_error("SharedMemoryQueue is closed");
+    }
+
+    std::shared_ptr<SharedMemoryRing> ring;
+    std::shared_ptr<State> state;
+    std::vector<std::pair<std::shared_ptr<AnyOutputQueue>, int>> attachments;
+    bool closed = false;
+};
+
+void SharedMemoryQueueBindings::bind(pybind11::module& m, void* pCallstack){
+
+    using namespace dai;
+    namespace py = pybind11;
+    using namespace std::chrono;
+
+    // Type definitions
+    py::class_<SharedMemoryQueue, std::shared_ptr<SharedMemoryQueue>> sharedMemoryQueue(m, "SharedMemoryQueue",
+        "Moves Buffer, ImgFrame, EncodedFrame and NNData messages to other processes through a ring of shared memory slots.\n"
+        "Created by the producer process, which sends messages or attaches output queues. Other processes open it by name or receive it pickled\n"
+        "(eg. as multiprocessing worker argument) and get messages referencing the shared memory without a copy.\n"
+        "NNData is the exception - its data is copied out of the slot on receive (tensor views reference the copy) and the slot is released right away.\n"
+        "A slot is reused only once its message and all views of its data are released. When all slots are taken, the producer waits.\n"
+        "Slots held by a consumer process which dies aren't recovered until the queue is closed, so a producer which may outlive its consumers\n"
+        "should send with a timeout, or attach queues non-blocking");
+
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    // Call the rest of the type defines, then perform the actual bindings
+    Callstack* callstack = (Callstack*) pCallstack;
+    auto cb = callstack->top();
+    callstack->pop();
+    cb(m, pCallstack);
+    // Actual bindings
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+
+    sharedMemoryQueue
+        .def(py::init<std::uint32_t, std::size_t, py::object>(), py::arg("slots"), py::arg("slotSize"), py::arg("name") = py::none(),
+            "Creates a new queue of 'slots' slots, each holding a message of up to 'slotSize' bytes (metadata and data). Name is generated if not given")
+        .def(py::init<std::string>(), py::arg("name"), "Opens a queue created by another process")
+        .def("getName", &SharedMemoryQueue::getName, "Returns name of the shared memory segment")
+        .def("isOwner", &SharedMemoryQueue::isOwner, "Returns true if queue was created by this process, which is the only one allowed to send messages")
+        .def("getSlots", &SharedMemoryQueue::getSlots, "Returns number of slots")
+        .def("getSlotSize", &SharedMemoryQueue::getSlotSize, "Returns maximum size of a message in bytes (metadata and data)")
+        .def("getDropped", &SharedMemoryQueue::getDropped, "Returns number of messages dropped by non-blocking attached queues, or for being unsupported or oversized")
+        .def("isClosed", &SharedMemoryQueue::isClosed, "Returns true once the queue was closed, by this process or the producer")
+        .def("close", &SharedMemoryQueue::close, "Closes the queue. Closing by the producer closes it for all processes and removes the shared memory once every process released it")
+        .def("__enter__", [](py::object self){
+            return self;
+        })
+        .def("__exit__", [](SharedMemoryQueue& q, py::object, py::object, py::object){
+            q.close();
+        })
+        .def("__reduce__", [](py::object self){
+            // Unpickled queue opens the same shared memory, as consumer
+            return py::make_tuple(py::type::of(self), py::make_tuple(self.attr("getName")()));
+        })
+        .def("attach", [](SharedMemoryQueue& q, py::object queue, bool blocking){
+            q.attach(castAnyOutputQueue(queue), blocking);
+        }, py::arg("queue"), py::arg("blocking") = false,
+            "Copies messages of an output queue (DataOutputQueue or MockDataOutputQueue) into the shared memory as they arrive (messages stay in the output queue as well).\n"
+            "When all slots are taken, a blocking attachment stalls the stream, otherwise the newest message is dropped")
+        .def("send", &SharedMemoryQueue::send, py::arg("msg"), py::arg("timeout") = microseconds(-1),
+            "Copies a message into the next slot. Blocks until the slot is released or timeout occurs (negative timeout meaning indefinitely). Returns false on timeout")
+        .def("has", &SharedMemoryQueue::has, "Returns true if a message is available")
+        .def("tryGet", &SharedMemoryQueue::tryGet, "Returns a message if available, None otherwise")
+        .def("get", &SharedMemoryQueue::get, py::arg("timeout") = microseconds(-1),
+            "Block until a message is available or timeout occurs (negative timeout meaning indefinitely). None is returned on timeout")
+        ;
+
+}
@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -76,4 +77,6 @@ void bind_apriltagconfig(pybind11::module& m, void* pCallstack){
     m.attr("AprilTagConfig").attr("Family") = m.attr("RawAprilTagConfig").attr("Family");
     m.attr("AprilTagConfig").attr("QuadThresholds") = m.attr("RawAprilTagConfig").attr("QuadThresholds");
 
+    bindMessagePickle<RawAprilTagConfig>(aprilTagConfig);
+
 }
@@ -1,5 +1,7 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -50,10 +52,14 @@ void bind_apriltags(pybind11::module& m, void* pCallstack){
         .def_property("aprilTags", [](AprilTags& det) { return &det.aprilTags; }, [](AprilTags& det, std::vector<AprilTag> val) { det.aprilTags = val; })
         .def("getTimestamp", &AprilTags::Buffer::getTimestamp, DOC(dai, Buffer, getTimestamp))
         .def("getTimestampDevice", &AprilTags::Buffer::getTimestampDevice, DOC(dai, Buffer, getTimestampDevice))
+        .def("getTimestampNs", &getMessageTimestampNs, "Returns timestamp related to dai::Clock::now() in nanoseconds")
+        .def("getTimestampDeviceNs", &getMessageTimestampDeviceNs, "Returns timestamp related to when the message was created on the device, in nanoseconds")
         .def("getSequenceNum", &AprilTags::Buffer::getSequenceNum, DOC(dai, Buffer, getSequenceNum))
         .def("setTimestamp", &AprilTags::setTimestamp, DOC(dai, AprilTags, setTimestamp))
         .def("setTimestampDevice", &AprilTags::setTimestampDevice, DOC(dai, AprilTags, setTimestampDevice))
         .def("setSequenceNum", &AprilTags::setSequenceNum, DOC(dai, AprilTags, setSequenceNum))
         ;
 
+    bindMessagePickle<RawAprilTags>(aprilTags);
+
 }
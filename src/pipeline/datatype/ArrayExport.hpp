@@ -0,0 +1,150 @@
+#pragma once
+
+// std
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+// pybind
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+// Zero-copy export of message data to other array libraries (PyTorch, ONNX Runtime, Numba, ...)
+// through the DLPack protocol and numpy '__array_interface__', both built from the numpy view of the message.
+// Exported tensors keep the view, and so the message, alive
+
+// DLPack ABI (v0.8, legacy unversioned "dltensor" capsule), as defined by dlpack.h
+enum DLDeviceType : std::int32_t { kDLCPU = 1 };
+enum DLDataTypeCode : std::uint8_t { kDLInt = 0, kDLUInt = 1, kDLFloat = 2, kDLBool = 6 };
+
+struct DLDevice {
+    DLDeviceType device_type;
+    std::int32_t device_id;
+};
+
+struct DLDataType {
+    std::uint8_t code;
+    std::uint8_t bits;
+    std::uint16_t lanes;
+};
+
+struct DLTensor {
+    void* data;
+    DLDevice device;
+    std::int32_t ndim;
+    DLDataType dtype;
+    std::int64_t* shape;
+    std::int64_t* strides;
+    std::uint64_t byte_offset;
+};
+
+struct DLManagedTensor {
+    DLTensor dl_tensor;
+    void* manager_ctx;
+    void (*deleter)(DLManagedTensor* self);
+};
+
+// Owns the exported view and the shape and strides the tensor points to
+struct DLPackContext {
+    pybind11::object view;
+    std::vector<std::int64_t> shape;
+    std::vector<std::int64_t> strides;
+    DLManagedTensor tensor;
+};
+
+inline void dlpackDeleter(DLManagedTensor* self) {
+    auto* ctx = static_cast<DLPackContext*>(self->manager_ctx);
+    // Consumers may release the tensor from any thread
+    if(!Py_IsInitialized()) return;
+    pybind11::gil_scoped_acquire acquire;
+    delete ctx;
+}
+
+inline DLDataType dlpackDataType(const pybind11::dtype& dtype) {
+    DLDataType type{0, static_cast<std::uint8_t>(dtype.itemsize() * 8), 1};
+    switch(dtype.kind()) {
+        case 'i':
+            type.code = kDLInt;
+            break;
+        case 'u':
+            type.code = kDLUInt;
+            break;
+        case 'f':
+            type.code = kDLFloat;
+            break;
+        case 'b':
+            type.code = kDLBool;
+            break;
+        default:
+            throw pybind11::type_error("Data type '" + pybind11::str(dtype).cast<std::string>() + "' can't be exported to DLPack");
+    }
+    return type;
+}
+
+// Returns a "dltensor" capsule of the view
+// 'copy' follows the array API standard: True always copies, False never does, None copies only if needed
+inline pybind11::capsule arrayToDLPack(pybind11::array view, const pybind11::object& dlDevice, const pybind11::object& copy) {
+    if(!dlDevice.is_none()) {
+        auto device = dlDevice.cast<std::pair<int, int>>();
+        if(device.first != kDLCPU || device.second != 0) throw pybind11::buffer_error("Messages can only be exported to CPU device");
+    }
+    const bool readonly = !view.writeable();
+    if(!copy.is_none() && copy.cast<bool>()) {
+        view = view.attr("copy")();
+    } else if(readonly) {
+        // Legacy DLPack can't signal read-only data
+        if(!copy.is_none()) throw pybind11::buffer_error("Message data is read-only and can't be exported to DLPack without a copy");
+        view = view.attr("copy")();
+    }
+
+    auto ctx = std::unique_ptr<DLPackContext>(new DLPackContext());
+    const auto ndim = static_cast<std::size_t>(view.ndim());
+    const auto itemSize = static_cast<std::int64_t>(view.itemsize());
+    for(std::size_t i = 0; i < ndim; i++) {
+        // DLPack strides are in elements
+        if(view.strides(i) % itemSize != 0) throw pybind11::buffer_error("Array strides aren't a multiple of its item size");
+        ctx->shape.push_back(static_cast<std::int64_t>(view.shape(i)));
+        ctx->strides.push_back(static_cast<std::int64_t>(view.strides(i)) / itemSize);
+    }
+
+    auto& tensor = ctx->tensor.dl_tensor;
+    tensor.data = const_cast<void*>(view.data());
+    tensor.device = {kDLCPU, 0};
+    tensor.ndim = static_cast<std::int32_t>(ndim);
+    tensor.dtype = dlpackDataType(view.dtype());
+    tensor.shape = ctx->shape.data();
+    tensor.strides = ctx->strides.data();
+    tensor.byte_offset = 0;
+    ctx->tensor.manager_ctx = ctx.get();
+    ctx->tensor.deleter = dlpackDeleter;
+    ctx->view = std::move(view);
+
+    // Consumers rename the capsule to "used_dltensor" once they take ownership
+    PyObject* capsule = PyCapsule_New(&ctx->tensor, "dltensor", [](PyObject* self) {
+        if(!PyCapsule_IsValid(self, "dltensor")) return;
+        auto* managed = static_cast<DLManagedTensor*>(PyCapsule_GetPointer(self, "dltensor"));
+        managed->deleter(managed);
+    });
+    if(capsule == nullptr) throw pybind11::error_already_set();
+    ctx.release();
+    return pybind11::reinterpret_steal<pybind11::capsule>(capsule);
+}
+
+// Binds '__dlpack__', '__dlpack_device__' and '__array_interface__' of a message class.
+// 'getView' returns the zero-copy numpy view of a message (given as Python object), which is exported
+template <typename Class, typename GetView>
+void bindArrayExport(Class& cls, GetView getView) {
+    cls.def("__dlpack__", [getView](pybind11::object& obj, pybind11::object stream, pybind11::object maxVersion, pybind11::object dlDevice, pybind11::object copy) {
+        // Data lives on host, 'stream' and 'max_version' don't apply
+        return arrayToDLPack(getView(obj), dlDevice, copy);
+    }, pybind11::arg("stream") = pybind11::none(), pybind11::arg("max_version") = pybind11::none(), pybind11::arg("dl_device") = pybind11::none(), pybind11::arg("copy") = pybind11::none(),
+    "Exports message data as DLPack capsule (zero-copy), eg. for 'torch.from_dlpack'. Exported tensor keeps the message alive")
+        .def("__dlpack_device__", [](pybind11::object&) {
+            return std::make_pair(static_cast<int>(kDLCPU), 0);
+        }, "Returns DLPack device of message data, always CPU")
+        .def_property_readonly("__array_interface__", [getView](pybind11::object& obj) {
+            // Points into message data, consumers keep the message alive
+            return getView(obj).attr("__array_interface__");
+        }, "Numpy array interface of message data (zero-copy)");
+}
@@ -1,5 +1,9 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/HostMessage.hpp"
+#include "pipeline/datatype/ArrayExport.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -62,31 +66,58 @@ void bind_buffer(pybind11::module& m, void* pCallstack){
                 o.tsDevice.nsec = (ts - o.tsDevice.sec) * 1000000000.0;
             }
         )
+        .def_property("tsNs",
+            [](const RawBuffer& o){ return timestampToNs(o.ts); },
+            [](RawBuffer& o, std::int64_t ts){ timestampFromNs(o.ts, ts); }
+        )
+        .def_property("tsDeviceNs",
+            [](const RawBuffer& o){ return timestampToNs(o.tsDevice); },
+            [](RawBuffer& o, std::int64_t ts){ timestampFromNs(o.tsDevice, ts); }
+        )
         .def_readwrite("sequenceNum", &RawBuffer::sequenceNum)
         ;
 
     // Message
     buffer
-        .def(py::init<>(), DOC(dai, Buffer, Buffer))
+        .def(py::init([](){
+            return std::static_pointer_cast<Buffer>(std::make_shared<HostBuffer>());
+        }), DOC(dai, Buffer, Buffer))
 
         // obj is "Python" object, which we used then to bind the numpy arrays lifespan to
         .def("getData", [](py::object &obj){
             // creates numpy array (zero-copy) which holds correct information such as shape, ...
-            dai::Buffer &a = obj.cast<dai::Buffer&>();
-            return py::array_t<uint8_t>(a.getData().size(), a.getData().data(), obj);
+            MessageData data(obj);
+            return data.view(py::dtype::of<uint8_t>(), {static_cast<py::ssize_t>(data.size)});
         }, DOC(dai, Buffer, getData))
-        .def("setData", py::overload_cast<const std::vector<std::uint8_t>&>(&Buffer::setData), DOC(dai, Buffer, setData))
+        .def("setData", [](Buffer& buffer, const std::vector<std::uint8_t>& data){
+            resetMessageExternalData(buffer);
+            buffer.setData(data);
+        }, DOC(dai, Buffer, setData))
         .def("setData", [](Buffer& buffer, py::array_t<std::uint8_t, py::array::c_style | py::array::forcecast> array){
+            resetMessageExternalData(buffer);
             buffer.getData().clear();
             buffer.getData().insert(buffer.getData().begin(), array.data(), array.data() + array.nbytes());
         }, DOC(dai, Buffer, setData))
         .def("getTimestamp", &Buffer::getTimestamp, DOC(dai, Buffer, getTimestamp))
         .def("getTimestampDevice", &Buffer::getTimestampDevice, DOC(dai, Buffer, getTimestampDevice))
+        .def("getTimestampNs", &getMessageTimestampNs, "Returns timestamp related to dai::Clock::now() in nanoseconds")
+        .def("getTimestampDeviceNs", &getMessageTimestampDeviceNs, "Returns timestamp related to when the message was created on the device, in nanoseconds")
         .def("getSequenceNum", &Buffer::getSequenceNum, DOC(dai, Buffer, getSequenceNum))
         .def("setTimestamp", &Buffer::setTimestamp, DOC(dai, Buffer, setTimestamp))
         .def("setTimestampDevice", &Buffer::setTimestampDevice, DOC(dai, Buffer, setTimestampDevice))
         .def("setSequenceNum", &Buffer::setSequenceNum, DOC(dai, Buffer, setSequenceNum))
+        .def_static("getTimestampsNs", [](const std::vector<std::shared_ptr<Buffer>>& messages){
+            return getMessagesTimestampsNs(messages, false);
+        }, py::arg("messages"), "Returns timestamps (related to dai::Clock::now()) of a list of messages as int64 array of nanoseconds")
+        .def_static("getTimestampsDeviceNs", [](const std::vector<std::shared_ptr<Buffer>>& messages){
+            return getMessagesTimestampsNs(messages, true);
+        }, py::arg("messages"), "Returns device timestamps of a list of messages as int64 array of nanoseconds")
         ;
+    bindArrayExport(buffer, [](py::object& obj) -> py::array {
+        MessageData data(obj);
+        return data.view(py::dtype::of<uint8_t>(), {static_cast<py::ssize_t>(data.size)});
+    });
 
+    bindMessagePickle<RawBuffer>(buffer);
 
 }
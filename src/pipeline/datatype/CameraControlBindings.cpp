@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -261,5 +262,6 @@ std::vector<const char *> camCtrlAttr;
         m.attr("CameraControl").attr(a) = m.attr("RawCameraControl").attr(a);
     }
 
+    bindMessagePickle<RawCameraControl>(cameraControl);
 
 }
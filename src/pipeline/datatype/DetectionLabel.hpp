@@ -0,0 +1,20 @@
+#pragma once
+
+// std
+#include <cmath>
+#include <cstdint>
+#include <limits>
+#include <string>
+
+// pybind
+#include <pybind11/pybind11.h>
+
+// Label column of detections arrays (ImgDetections.toNumpy, SpatialImgDetections.toNumpy) is float,
+// only finite integral values within uint32 range map to a label
+inline std::uint32_t detectionLabelFromFloat(float label, std::size_t row) {
+    if(!std::isfinite(label) || label < 0.0f || label >= 4294967296.0f || std::trunc(label) != label) {
+        throw pybind11::value_error("Invalid label " + std::to_string(label) + " in row " + std::to_string(row) + ", expected an integer in range [0, "
+                                    + std::to_string(std::numeric_limits<std::uint32_t>::max()) + "]");
+    }
+    return static_cast<std::uint32_t>(label);
+}
@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -54,4 +55,6 @@ void bind_edgedetectorconfig(pybind11::module& m, void* pCallstack){
         .def("set",         &EdgeDetectorConfig::set, py::arg("config"), DOC(dai, EdgeDetectorConfig, set))
         ;
 
+    bindMessagePickle<RawEdgeDetectorConfig>(edgeDetectorConfig);
+
 }
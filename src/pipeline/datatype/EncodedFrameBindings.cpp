@@ -1,6 +1,8 @@
 #include "DatatypeBindings.hpp"
 #include "depthai-shared/datatype/RawEncodedFrame.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <memory>
 #include <unordered_map>
 
@@ -90,6 +92,10 @@ void bind_encodedframe(pybind11::module &m, void *pCallstack) {
            py::overload_cast<>(&EncodedFrame::Buffer::getTimestampDevice,
                                py::const_),
            DOC(dai, Buffer, getTimestampDevice))
+      .def("getTimestampNs", &getMessageTimestampNs,
+           "Returns timestamp related to dai::Clock::now() in nanoseconds")
+      .def("getTimestampDeviceNs", &getMessageTimestampDeviceNs,
+           "Returns timestamp related to when the message was created on the device, in nanoseconds")
       .def("getInstanceNum", &EncodedFrame::getInstanceNum,
            DOC(dai, EncodedFrame, getInstanceNum))
       .def("getWidth", &EncodedFrame::getWidth,
@@ -145,4 +151,7 @@ void bind_encodedframe(pybind11::module &m, void *pCallstack) {
       m.attr("RawEncodedFrame").attr("FrameType");
   m.attr("EncodedFrame").attr("Profile") =
       m.attr("RawEncodedFrame").attr("Profile");
+
+    bindMessagePickle<RawEncodedFrame>(encodedFrame);
+
 }
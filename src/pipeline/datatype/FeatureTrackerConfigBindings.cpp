@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -126,4 +127,6 @@ void bind_featuretrackerconfig(pybind11::module& m, void* pCallstack){
     m.attr("FeatureTrackerConfig").attr("MotionEstimator") = m.attr("RawFeatureTrackerConfig").attr("MotionEstimator");
     m.attr("FeatureTrackerConfig").attr("FeatureMaintainer") = m.attr("RawFeatureTrackerConfig").attr("FeatureMaintainer");
 
+    bindMessagePickle<RawFeatureTrackerConfig>(featureTrackerConfig);
+
 }
@@ -0,0 +1,206 @@
+#pragma once
+
+// std
+#include <algorithm>
+#include <cstdint>
+#include <memory>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/Buffer.hpp"
+#include "depthai/pipeline/datatype/EncodedFrame.hpp"
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
+#include "depthai/pipeline/datatype/NNData.hpp"
+
+// pybind
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+// Message data referenced from a Python buffer protocol object (shared memory slot, recording mapping, out-of-band pickle buffer)
+// instead of being copied into the message, so received messages are readable without a copy.
+// The object is exported through a memoryview, which keeps it alive and prevents it from being resized or closed
+class ExternalData {
+   public:
+    virtual ~ExternalData() {
+        if(view) {
+            pybind11::gil_scoped_acquire gil;
+            view = pybind11::object();
+        }
+    }
+
+    // Must be called with GIL held
+    void setExternalData(const pybind11::object& obj) {
+        auto memview = pybind11::reinterpret_steal<pybind11::object>(PyMemoryView_FromObject(obj.ptr()));
+        if(!memview) throw pybind11::error_already_set();
+        Py_buffer* buffer = PyMemoryView_GET_BUFFER(memview.ptr());
+        if(!PyBuffer_IsContiguous(buffer, 'C')) {
+            throw pybind11::value_error("External data must be C-contiguous");
+        }
+        externalData = static_cast<std::uint8_t*>(buffer->buf);
+        externalSize = static_cast<std::size_t>(buffer->len);
+        externalReadonly = buffer->readonly != 0;
+        view = std::move(memview);
+    }
+
+    // Must be called with GIL held
+    void resetExternalData() {
+        view = pybind11::object();
+        externalData = nullptr;
+        externalSize = 0;
+    }
+
+    bool hasExternalData() const {
+        return static_cast<bool>(view);
+    }
+
+    std::size_t getExternalSize() const {
+        return externalSize;
+    }
+
+    const std::uint8_t* getExternalData() const {
+        return externalData;
+    }
+
+   protected:
+    friend struct MessageData;
+    pybind11::object view;
+    std::uint8_t* externalData = nullptr;
+    std::size_t externalSize = 0;
+    bool externalReadonly = false;
+};
+
+// Message created on host, which can reference external data.
+// Core RawBuffer owns its data, so external data is copied into a copy of raw message if the message gets sent
+template <typename Base, typename Raw>
+class HostMessage : public Base, public ExternalData {
+    std::shared_ptr<dai::RawBuffer> serialize() const override {
+        if(!hasExternalData()) return this->raw;
+        auto serialized = std::make_shared<Raw>(static_cast<const Raw&>(*this->raw));
+        serialized->data.assign(externalData, externalData + externalSize);
+        return serialized;
+    }
+
+   public:
+    using Base::Base;
+};
+
+using HostBuffer = HostMessage<dai::Buffer, dai::RawBuffer>;
+using HostImgFrame = HostMessage<dai::ImgFrame, dai::RawImgFrame>;
+using HostEncodedFrame = HostMessage<dai::EncodedFrame, dai::RawEncodedFrame>;
+
+// Same alignment of tensors within message data as used by core NNData
+constexpr std::size_t TENSOR_DATA_ALIGNMENT = 64;
+
+// NNData created on host.
+// Core NNData stages layers separately and copies them into message data on every serialize.
+// Here tensors are written directly into message data instead, so sending doesn't copy them again
+// and they are readable (getLayer, getTensor, ...) right after being set.
+class HostNNData : public dai::NNData {
+    std::shared_ptr<dai::RawBuffer> serialize() const override {
+        return raw;
+    }
+
+   public:
+    // Reserves space for a tensor in message data, replacing existing tensor with the same name.
+    // Space is reused if existing tensor is of same size, so refilling a message doesn't allocate
+    std::uint8_t* allocateTensor(dai::TensorInfo info, std::size_t size) {
+        auto& rawNn = static_cast<dai::RawNNData&>(*raw);
+        auto tensorSize = [](const dai::TensorInfo& tensor) -> std::size_t { return tensor.dims.empty() ? 0 : tensor.dims.back() * tensor.strides.back(); };
+
+        auto it = std::find_if(rawNn.tensors.begin(), rawNn.tensors.end(), [&info](const dai::TensorInfo& tensor) { return tensor.name == info.name; });
+        if(it != rawNn.tensors.end()) {
+            if(tensorSize(*it) == size) {
+                info.offset = it->offset;
+                *it = std::move(info);
+                return rawNn.data.data() + it->offset;
+            }
+
+            // Remove existing tensor and compact the rest
+            rawNn.tensors.erase(it);
+            std::vector<std::uint8_t> data;
+            data.reserve(rawNn.data.size());
+            for(auto& tensor : rawNn.tensors) {
+                data.resize((data.size() + TENSOR_DATA_ALIGNMENT - 1) / TENSOR_DATA_ALIGNMENT * TENSOR_DATA_ALIGNMENT, 0);
+                const auto begin = rawNn.data.begin() + tensor.offset;
+                tensor.offset = static_cast<unsigned int>(data.size());
+                data.insert(data.end(), begin, begin + tensorSize(tensor));
+            }
+            rawNn.data = std::move(data);
+        }
+
+        const std::size_t offset = (rawNn.data.size() + TENSOR_DATA_ALIGNMENT - 1) / TENSOR_DATA_ALIGNMENT * TENSOR_DATA_ALIGNMENT;
+        rawNn.data.resize(offset + size, 0);
+        info.offset = static_cast<unsigned int>(offset);
+        rawNn.tensors.push_back(std::move(info));
+        return rawNn.data.data() + offset;
+    }
+};
+
+// Data of a message, either external or the messages own buffer
+struct MessageData {
+    std::uint8_t* data;
+    std::size_t size;
+    // Object to bind lifetime of views to
+    pybind11::object base;
+    bool readonly;
+
+    // obj must be a Buffer (or derived) message
+    explicit MessageData(pybind11::object& obj) : base(obj), readonly(false) {
+        auto& msg = obj.cast<dai::Buffer&>();
+        auto* external = dynamic_cast<ExternalData*>(&msg);
+        if(external != nullptr && external->hasExternalData()) {
+            data = external->externalData;
+            size = external->externalSize;
+            base = external->view;
+            readonly = external->externalReadonly;
+        } else {
+            data = msg.getData().data();
+            size = msg.getData().size();
+        }
+    }
+
+    // Creates zero-copy numpy view of the data
+    pybind11::array view(const pybind11::dtype& dtype, std::vector<pybind11::ssize_t> shape, std::vector<pybind11::ssize_t> strides = {}, std::size_t offset = 0) const {
+        pybind11::array arr(dtype, std::move(shape), std::move(strides), data + offset, base);
+        if(readonly) arr.attr("setflags")(pybind11::arg("write") = false);
+        return arr;
+    }
+};
+
+// Sets external data of a message, which must be created on host. Must be called with GIL held
+inline void setMessageExternalData(dai::Buffer& msg, const pybind11::object& obj) {
+    auto* external = dynamic_cast<ExternalData*>(&msg);
+    if(external == nullptr) {
+        throw std::runtime_error("External data is only supported on Buffer and ImgFrame messages created on host");
+    }
+    external->setExternalData(obj);
+    // Message data isn't used anymore
+    std::vector<std::uint8_t>().swap(msg.getData());
+}
+
+// Drops external data of a message (if any), before its own data is set
+inline void resetMessageExternalData(dai::Buffer& msg) {
+    if(auto* external = dynamic_cast<ExternalData*>(&msg)) {
+        external->resetExternalData();
+    }
+}
+
+// Size of message data, including external data
+inline std::size_t getMessageDataSize(const dai::ADatatype& msg) {
+    auto* external = dynamic_cast<const ExternalData*>(&msg);
+    if(external != nullptr && external->hasExternalData()) return external->getExternalSize();
+    return msg.getRaw()->data.size();
+}
+
+// Message data, including external data. Doesn't require the GIL, valid for as long as the message is
+inline std::pair<const std::uint8_t*, std::size_t> getMessageDataSpan(const dai::ADatatype& msg) {
+    auto* external = dynamic_cast<const ExternalData*>(&msg);
+    if(external != nullptr && external->hasExternalData()) return {external->getExternalData(), external->getExternalSize()};
+    const auto& data = msg.getRaw()->data;
+    return {data.data(), data.size()};
+}
+
+inline std::size_t getMessageDataSize(const dai::RawBuffer& raw) {
+    return raw.data.size();
+}
@@ -1,7 +1,14 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <limits>
 #include <unordered_map>
 #include <memory>
+#include <vector>
 
 // depthai
 #include "depthai/pipeline/datatype/IMUData.hpp"
@@ -12,6 +19,251 @@
 
 // #include "spdlog/spdlog.h"
 
+// Sensors exported by IMUData.toNumpy and stored by IMURingBuffer, named as IMUPacket fields
+constexpr std::size_t IMU_SENSOR_COUNT = 4;
+constexpr std::size_t IMU_SENSOR_ROTATION_VECTOR = 3;
+static const char* const IMU_SENSOR_NAMES[IMU_SENSOR_COUNT] = {"acceleroMeter", "gyroscope", "magneticField", "rotationVector"};
+// Values per sample: x, y, z, or i, j, k, real for rotation vector
+static const std::size_t IMU_SENSOR_VALUES[IMU_SENSOR_COUNT] = {3, 3, 3, 4};
+constexpr std::size_t IMU_MAX_SENSOR_VALUES = 4;
+
+static std::size_t getIMUSensor(const std::string& name) {
+    for(std::size_t sensor = 0; sensor < IMU_SENSOR_COUNT; sensor++) {
+        if(name == IMU_SENSOR_NAMES[sensor]) return sensor;
+    }
+    throw py::key_error("Unknown IMU sensor '" + name + "'");
+}
+
+// Returns report of a sensor in a packet and stores its values
+static const dai::IMUReport& getIMUReport(const dai::IMUPacket& packet, std::size_t sensor, float* values) {
+    switch(sensor) {
+        case 0:
+            values[0] = packet.acceleroMeter.x;
+            values[1] = packet.acceleroMeter.y;
+            values[2] = packet.acceleroMeter.z;
+            return packet.acceleroMeter;
+        case 1:
+            values[0] = packet.gyroscope.x;
+            values[1] = packet.gyroscope.y;
+            values[2] = packet.gyroscope.z;
+            return packet.gyroscope;
+        case 2:
+            values[0] = packet.magneticField.x;
+            values[1] = packet.magneticField.y;
+            values[2] = packet.magneticField.z;
+            return packet.magneticField;
+        default:
+            values[0] = packet.rotationVector.i;
+            values[1] = packet.rotationVector.j;
+            values[2] = packet.rotationVector.k;
+            values[3] = packet.rotationVector.real;
+            return packet.rotationVector;
+    }
+}
+
+static std::int64_t getIMUTimestampNs(const dai::IMUReport& report, bool device) {
+    return timestampToNs(device ? report.tsDevice : report.timestamp);
+}
+
+// Calls f(timestamp, values, jumpedBack) for each new sample of a sensor and returns timestamp of the last one.
+// Every packet contains a report of each sensor, left empty (zero timestamp) for disabled sensors and
+// repeated (same timestamp as the previous sample) for sensors running at a lower rate than others - both are skipped.
+// A sample older than the previous one ('lastTimestamp' initially) means timestamps jumped back (eg. device was reset), f is told so
+template <typename F>
+static std::int64_t forEachIMUSample(const std::vector<dai::IMUPacket>& packets, std::size_t sensor, bool device, std::int64_t lastTimestamp, F&& f) {
+    float values[IMU_MAX_SENSOR_VALUES];
+    for(const auto& packet : packets) {
+        const auto timestamp = getIMUTimestampNs(getIMUReport(packet, sensor, values), device);
+        if(timestamp == 0 || timestamp == lastTimestamp) continue;
+        f(timestamp, values, timestamp < lastTimestamp);
+        lastTimestamp = timestamp;
+    }
+    return lastTimestamp;
+}
+
+static py::dict imuDataToNumpy(const dai::IMUData& imuData, bool device) {
+    py::dict sensors;
+    for(std::size_t sensor = 0; sensor < IMU_SENSOR_COUNT; sensor++) {
+        const std::size_t width = IMU_SENSOR_VALUES[sensor];
+        py::ssize_t count = 0;
+        forEachIMUSample(imuData.packets, sensor, device, 0, [&count](std::int64_t, const float*, bool) { count++; });
+
+        py::array_t<std::int64_t> timestamps(count);
+        py::array_t<float> values({count, static_cast<py::ssize_t>(width)});
+        auto* ts = timestamps.mutable_data();
+        auto* value = values.mutable_data();
+        forEachIMUSample(imuData.packets, sensor, device, 0, [&](std::int64_t timestamp, const float* sample, bool) {
+            *ts++ = timestamp;
+            value = std::copy(sample, sample + width, value);
+        });
+        sensors[IMU_SENSOR_NAMES[sensor]] = py::make_tuple(timestamps, values);
+    }
+    return sensors;
+}
+
+// Host side buffer of last IMU samples of each sensor, stored in preallocated ring buffers,
+// which can be interpolated at arbitrary timestamps (eg. of frames)
+class IMURingBuffer {
+   public:
+    IMURingBuffer(std::size_t capacity, bool device) : device(device) {
+        if(capacity == 0) throw std::invalid_argument("IMURingBuffer requires non zero 'capacity'");
+        for(std::size_t sensor = 0; sensor < IMU_SENSOR_COUNT; sensor++) {
+            rings[sensor].width = IMU_SENSOR_VALUES[sensor];
+            rings[sensor].timestamps.resize(capacity);
+            rings[sensor].values.resize(capacity * IMU_SENSOR_VALUES[sensor]);
+        }
+    }
+
+    void add(const dai::IMUData& imuData) {
+        for(std::size_t sensor = 0; sensor < IMU_SENSOR_COUNT; sensor++) {
+            auto& ring = rings[sensor];
+            ring.lastTimestamp = forEachIMUSample(imuData.packets, sensor, device, ring.lastTimestamp, [&ring](std::int64_t timestamp, const float* values, bool jumpedBack) {
+                // Buffered samples must stay ordered by timestamp, older ones belong to a different timeline
+                if(jumpedBack) ring.clear();
+                ring.push(timestamp, values);
+            });
+        }
+    }
+
+    std::size_t getSize(const std::string& sensor) const {
+        return rings[getIMUSensor(sensor)].count;
+    }
+
+    // Samples with timestamps within [start, end], oldest first
+    py::tuple getSamples(const std::string& sensor, std::int64_t start, std::int64_t end) const {
+        const auto& ring = rings[getIMUSensor(sensor)];
+        const std::size_t first = ring.lowerBound(start);
+        const std::size_t last = std::max(ring.upperBound(end), first);
+        const auto count = static_cast<py::ssize_t>(last - first);
+
+        py::array_t<std::int64_t> timestamps(count);
+        py::array_t<float> values({count, static_cast<py::ssize_t>(ring.width)});
+        auto* ts = timestamps.mutable_data();
+        auto* value = values.mutable_data();
+        for(std::size_t i = first; i < last; i++) {
+            *ts++ = ring.timestampAt(i);
+            value = std::copy(ring.valuesAt(i), ring.valuesAt(i) + ring.width, value);
+        }
+        return py::make_tuple(timestamps, values);
+    }
+
+    // Linearly interpolates samples of a sensor at given timestamps, rotation vector using normalized linear interpolation.
+    // Rows of timestamps outside of buffered samples are NaN
+    py::array_t<float> interpolate(const std::string& sensor, py::array_t<std::int64_t, py::array::c_style | py::array::forcecast> timestamps) const {
+        const auto& ring = rings[getIMUSensor(sensor)];
+        const auto count = static_cast<std::size_t>(timestamps.size());
+        py::array_t<float> values({static_cast<py::ssize_t>(count), static_cast<py::ssize_t>(ring.width)});
+
+        const auto* ts = timestamps.data();
+        auto* value = values.mutable_data();
+        const bool rotation = &ring == &rings[IMU_SENSOR_ROTATION_VECTOR];
+        for(std::size_t i = 0; i < count; i++, value += ring.width) {
+            const std::int64_t t = ts[i];
+            if(ring.count == 0 || t < ring.timestampAt(0) || t > ring.timestampAt(ring.count - 1)) {
+                std::fill(value, value + ring.width, std::numeric_limits<float>::quiet_NaN());
+                continue;
+            }
+
+            // Samples a, b with ta <= t <= tb
+            const std::size_t b = std::min(ring.upperBound(t), ring.count - 1);
+            const std::size_t a = b == 0 ? 0 : b - 1;
+            const std::int64_t ta = ring.timestampAt(a);
+            const std::int64_t tb = ring.timestampAt(b);
+            const float alpha = tb == ta ? 1.0f : static_cast<float>(static_cast<double>(t - ta) / static_cast<double>(tb - ta));
+            const float* va = ring.valuesAt(a);
+            const float* vb = ring.valuesAt(b);
+
+            if(!rotation) {
+                for(std::size_t v = 0; v < ring.width; v++) value[v] = va[v] + (vb[v] - va[v]) * alpha;
+                continue;
+            }
+
+            // Quaternions q and -q represent same rotation, interpolate along the shorter arc
+            float dot = 0.0f;
+            for(std::size_t v = 0; v < ring.width; v++) dot += va[v] * vb[v];
+            const float sign = dot < 0.0f ? -1.0f : 1.0f;
+            float norm = 0.0f;
+            for(std::size_t v = 0; v < ring.width; v++) {
+                value[v] = va[v] + (sign * vb[v] - va[v]) * alpha;
+                norm += value[v] * value[v];
+            }
+            norm = std::sqrt(norm);
+            if(norm > 0.0f) {
+                for(std::size_t v = 0; v < ring.width; v++) value[v] /= norm;
+            }
+        }
+        return values;
+    }
+
+    void clear() {
+        for(auto& ring : rings) {
+            ring.clear();
+            ring.lastTimestamp = 0;
+        }
+    }
+
+   private:
+    struct Ring {
+        std::size_t width = 0;
+        std::vector<std::int64_t> timestamps;
+        std::vector<float> values;
+        // Index of the oldest sample
+        std::size_t head = 0;
+        std::size_t count = 0;
+        std::int64_t lastTimestamp = 0;
+
+        std::size_t index(std::size_t i) const {
+            return (head + i) % timestamps.size();
+        }
+
+        std::int64_t timestampAt(std::size_t i) const {
+            return timestamps[index(i)];
+        }
+
+        const float* valuesAt(std::size_t i) const {
+            return &values[index(i) * width];
+        }
+
+        void clear() {
+            head = 0;
+            count = 0;
+        }
+
+        void push(std::int64_t timestamp, const float* sample) {
+            const std::size_t i = index(count);
+            timestamps[i] = timestamp;
+            std::copy(sample, sample + width, &values[i * width]);
+            if(count == timestamps.size()) {
+                head = (head + 1) % timestamps.size();
+            } else {
+                count++;
+            }
+        }
+
+        // Index of the first sample not older than 't' (samples are ordered by timestamp)
+        std::size_t lowerBound(std::int64_t t) const {
+            return t == std::numeric_limits<std::int64_t>::min() ? 0 : upperBound(t - 1);
+        }
+
+        // Index of the first sample newer than 't'
+        std::size_t upperBound(std::int64_t t) const {
+            std::size_t low = 0, high = count;
+            while(low < high) {
+                const std::size_t mid = low + (high - low) / 2;
+                if(timestampAt(mid) <= t) {
+                    low = mid + 1;
+                } else {
+                    high = mid;
+                }
+            }
+            return low;
+        }
+    };
+
+    bool device;
+    Ring rings[IMU_SENSOR_COUNT];
+};
+
 void bind_imudata(pybind11::module& m, void* pCallstack){
 
     using namespace dai;
@@ -25,6 +277,7 @@ void bind_imudata(pybind11::module& m, void* pCallstack){
     py::class_<IMUPacket> imuPacket(m, "IMUPacket", DOC(dai, IMUPacket));
     py::class_<RawIMUData, RawBuffer, std::shared_ptr<RawIMUData>> rawIMUPackets(m, "RawIMUData", DOC(dai, RawIMUData));
     py::class_<IMUData, Buffer, std::shared_ptr<IMUData>> imuData(m, "IMUData", DOC(dai, IMUData));
+    py::class_<IMURingBuffer> imuRingBuffer(m, "IMURingBuffer", "Host side buffer of last IMU samples of each sensor, which can be interpolated at arbitrary timestamps");
 
     ///////////////////////////////////////////////////////////////////////
     ///////////////////////////////////////////////////////////////////////
@@ -48,6 +301,8 @@ void bind_imudata(pybind11::module& m, void* pCallstack){
         .def_readwrite("tsDevice", &IMUReport::tsDevice)
         .def("getTimestamp", &IMUReport::getTimestamp, DOC(dai, IMUReport, getTimestamp))
         .def("getTimestampDevice", &IMUReport::getTimestampDevice, DOC(dai, IMUReport, getTimestampDevice))
+        .def("getTimestampNs", [](IMUReport& report) { return getIMUTimestampNs(report, false); }, "Returns timestamp related to dai::Clock::now() in nanoseconds")
+        .def("getTimestampDeviceNs", [](IMUReport& report) { return getIMUTimestampNs(report, true); }, "Returns timestamp directly captured from device's monotonic clock, in nanoseconds")
         .def("getSequenceNum", &IMUReport::getSequenceNum, DOC(dai, IMUReport, getSequenceNum))
         ;
 
@@ -161,6 +416,27 @@ void bind_imudata(pybind11::module& m, void* pCallstack){
     imuData
         .def(py::init<>())
         .def_property("packets", [](IMUData& imuDta) { return &imuDta.packets; }, [](IMUData& imuDta, std::vector<IMUPacket> val) { imuDta.packets = val; }, DOC(dai, IMUData, packets))
+        .def("toNumpy", &imuDataToNumpy, py::arg("device") = true,
+             "Returns samples of all packets as dict of sensor name (acceleroMeter, gyroscope, magneticField, rotationVector) to tuple of\n"
+             "(N,) int64 timestamps in nanoseconds and (N, 3) float32 values x, y, z, or (N, 4) i, j, k, real for rotation vector.\n"
+             "Timestamps are device timestamps, or host synced ones if 'device' is false. Disabled sensors and repeated reports are omitted")
+        ;
+
+    imuRingBuffer
+        .def(py::init<std::size_t, bool>(), py::arg("capacity"), py::arg("device") = true,
+             "Creates buffer keeping last 'capacity' samples of each sensor, timestamped with device timestamps, or host synced ones if 'device' is false")
+        .def("add", &IMURingBuffer::add, py::arg("imuData"), "Appends samples of all packets. Disabled sensors and repeated reports are skipped.\n"
+             "If timestamps of a sensor jump back (eg. device was reset), its previously buffered samples are dropped")
+        .def("getSize", &IMURingBuffer::getSize, py::arg("sensor"), "Returns number of buffered samples of a sensor")
+        .def("getSamples", &IMURingBuffer::getSamples, py::arg("sensor"), py::arg("start") = std::numeric_limits<std::int64_t>::min(), py::arg("end") = std::numeric_limits<std::int64_t>::max(),
+             "Returns buffered samples of a sensor with timestamps (ns) within [start, end], oldest first, as tuple of timestamps and values arrays (same as IMUData.toNumpy)")
+        .def("interpolate", &IMURingBuffer::interpolate, py::arg("sensor"), py::arg("timestamps"),
+             "Interpolates samples of a sensor at given timestamps (ns), returning (N, 3) or (N, 4) float32 array.\n"
+             "Vectors are interpolated linearly, rotation vector using normalized linear interpolation of the quaternions.\n"
+             "Rows of timestamps outside of buffered samples are NaN")
+        .def("clear", &IMURingBuffer::clear, "Removes all samples")
         ;
 
+    bindMessagePickle<RawIMUData>(imuData);
+
 }
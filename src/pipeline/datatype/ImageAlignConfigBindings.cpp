@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -46,4 +47,6 @@ void bind_imagealignconfig(pybind11::module& m, void* pCallstack){
         .def("set",         &ImageAlignConfig::set, py::arg("config"), DOC(dai, ImageAlignConfig, set))
         ;
 
+    bindMessagePickle<RawImageAlignConfig>(imageAlignConfig);
+
 }
@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -140,5 +141,6 @@ void bind_imagemanipconfig(pybind11::module& m, void* pCallstack){
         .def("getInterpolation", &ImageManipConfig::getInterpolation, DOC(dai, ImageManipConfig, getInterpolation))
         ;
 
+    bindMessagePickle<RawImageManipConfig>(imageManipConfig);
 
 }
@@ -1,5 +1,9 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
+#include "pipeline/datatype/DetectionLabel.hpp"
+#include <algorithm>
 #include <unordered_map>
 #include <memory>
 
@@ -12,6 +16,81 @@
 
 // #include "spdlog/spdlog.h"
 
+// Row of ImgDetections.toNumpy(structured=True)
+struct ImgDetectionRecord {
+    std::uint32_t label;
+    float confidence;
+    float xmin;
+    float ymin;
+    float xmax;
+    float ymax;
+};
+
+// Columns of ImgDetections.toNumpy(): label, confidence, xmin, ymin, xmax, ymax
+constexpr py::ssize_t IMG_DETECTION_COLUMNS = 6;
+
+static py::array imgDetectionsToNumpy(const std::vector<dai::ImgDetection>& detections, bool structured) {
+    const auto count = static_cast<py::ssize_t>(detections.size());
+    if(structured) {
+        py::array_t<ImgDetectionRecord> array(count);
+        auto* records = array.mutable_data();
+        for(const auto& det : detections) {
+            *records++ = {det.label, det.confidence, det.xmin, det.ymin, det.xmax, det.ymax};
+        }
+        return array;
+    }
+
+    py::array_t<float> array({count, IMG_DETECTION_COLUMNS});
+    auto* row = array.mutable_data();
+    for(const auto& det : detections) {
+        row[0] = static_cast<float>(det.label);
+        row[1] = det.confidence;
+        row[2] = det.xmin;
+        row[3] = det.ymin;
+        row[4] = det.xmax;
+        row[5] = det.ymax;
+        row += IMG_DETECTION_COLUMNS;
+    }
+    return array;
+}
+
+static std::vector<dai::ImgDetection> imgDetectionsFromNumpy(const py::array& array) {
+    std::vector<dai::ImgDetection> detections;
+    if(array.dtype().equal(py::dtype::of<ImgDetectionRecord>())) {
+        py::array_t<ImgDetectionRecord, py::array::c_style | py::array::forcecast> records(array);
+        detections.resize(records.size());
+        const auto* record = records.data();
+        for(auto& det : detections) {
+            det.label = record->label;
+            det.confidence = record->confidence;
+            det.xmin = record->xmin;
+            det.ymin = record->ymin;
+            det.xmax = record->xmax;
+            det.ymax = record->ymax;
+            record++;
+        }
+        return detections;
+    }
+
+    py::array_t<float, py::array::c_style | py::array::forcecast> rows(array);
+    if(rows.ndim() != 2 || rows.shape(1) != IMG_DETECTION_COLUMNS) {
+        throw py::value_error("Expected array of shape (N, " + std::to_string(IMG_DETECTION_COLUMNS) + ") or structured array as returned by toNumpy(structured=True)");
+    }
+    detections.resize(rows.shape(0));
+    const auto* row = rows.data();
+    for(std::size_t i = 0; i < detections.size(); i++) {
+        auto& det = detections[i];
+        det.label = detectionLabelFromFloat(row[0], i);
+        det.confidence = row[1];
+        det.xmin = row[2];
+        det.ymin = row[3];
+        det.xmax = row[4];
+        det.ymax = row[5];
+        row += IMG_DETECTION_COLUMNS;
+    }
+    return detections;
+}
+
 void bind_imgdetections(pybind11::module& m, void* pCallstack){
 
     using namespace dai;
@@ -33,6 +112,8 @@ void bind_imgdetections(pybind11::module& m, void* pCallstack){
     ///////////////////////////////////////////////////////////////////////
     ///////////////////////////////////////////////////////////////////////
 
+    PYBIND11_NUMPY_DTYPE(ImgDetectionRecord, label, confidence, xmin, ymin, xmax, ymax);
+
     // Metadata / raw
     imgDetection
         .def(py::init<>())
@@ -74,13 +155,26 @@ void bind_imgdetections(pybind11::module& m, void* pCallstack){
     imgDetections
         .def(py::init<>(), DOC(dai, ImgDetections, ImgDetections))
         .def_property("detections", [](ImgDetections& det) { return &det.detections; }, [](ImgDetections& det, std::vector<ImgDetection> val) { det.detections = val; }, DOC(dai, ImgDetections, detections))
+        .def("toNumpy", [](ImgDetections& det, bool structured) {
+            return imgDetectionsToNumpy(det.detections, structured);
+        }, py::arg("structured") = false,
+        "Returns detections as (N, 6) float32 array with columns label, confidence, xmin, ymin, xmax, ymax.\n"
+        "If 'structured' is set, returns structured array with fields of same names instead (label being uint32)")
+        .def_static("fromNumpy", [](py::array array) {
+            auto det = std::make_shared<ImgDetections>();
+            det->detections = imgDetectionsFromNumpy(array);
+            return det;
+        }, py::arg("array"), "Creates ImgDetections from an array in the format returned by toNumpy. Labels must be integers within uint32 range")
         .def("getTimestamp", &ImgDetections::Buffer::getTimestamp, DOC(dai, Buffer, getTimestamp))
         .def("getTimestampDevice", &ImgDetections::Buffer::getTimestampDevice, DOC(dai, Buffer, getTimestampDevice))
+        .def("getTimestampNs", &getMessageTimestampNs, "Returns timestamp related to dai::Clock::now() in nanoseconds")
+        .def("getTimestampDeviceNs", &getMessageTimestampDeviceNs, "Returns timestamp related to when the message was created on the device, in nanoseconds")
         .def("getSequenceNum", &ImgDetections::Buffer::getSequenceNum, DOC(dai, Buffer, getSequenceNum))
         .def("setTimestamp", &ImgDetections::setTimestamp, DOC(dai, ImgDetections, setTimestamp))
         .def("setTimestampDevice", &ImgDetections::setTimestampDevice, DOC(dai, ImgDetections, setTimestampDevice))
         .def("setSequenceNum", &ImgDetections::setSequenceNum, DOC(dai, ImgDetections, setSequenceNum))
         ;
 
+    bindMessagePickle<RawImgDetections>(imgDetections);
 
 }
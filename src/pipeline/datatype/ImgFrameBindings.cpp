@@ -1,5 +1,11 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/HostMessage.hpp"
+#include "pipeline/datatype/ArrayExport.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
+#include <algorithm>
+#include <cstring>
 #include <unordered_map>
 #include <memory>
 
@@ -10,6 +16,140 @@
 #include <pybind11/chrono.h>
 #include <pybind11/numpy.h>
 
+// Stride and plane offsets (in bytes) of a frame
+struct FrameLayout {
+    std::size_t stride;
+    std::size_t chromaStride;
+    std::size_t p1Offset;
+    std::size_t p2Offset;
+    std::size_t p3Offset;
+};
+
+// Number of samples stored per pixel in the first plane ('typeToBpp' gives bytes per sample only)
+static std::size_t getInterleavedChannels(dai::RawImgFrame::Type type) {
+    using Type = dai::RawImgFrame::Type;
+    switch(type) {
+        case Type::RGB888i:
+        case Type::BGR888i:
+        case Type::YUV444i:
+        case Type::RGB161616:
+        case Type::RGBF16F16F16i:
+        case Type::BGRF16F16F16i:
+            return 3;
+        case Type::RGBA8888:
+            return 4;
+        case Type::YUV422i:
+            return 2;
+        default:
+            return 1;
+    }
+}
+
+// Frames created on host might not have stride or plane offsets set, assume tightly packed in that case.
+// 'ImgFrame::setWidth' sets stride to width * bytes per sample, which is too short for interleaved types, so
+// the stride is never less than a tightly packed row
+static FrameLayout getFrameLayout(const dai::RawImgFrame::Specs& fb) {
+    using Type = dai::RawImgFrame::Type;
+
+    const std::size_t packedStride = fb.width * dai::RawImgFrame::typeToBpp(fb.type) * getInterleavedChannels(fb.type);
+    const std::size_t chromaHeight = (fb.height + 1) / 2;
+
+    FrameLayout layout;
+    layout.stride = std::max<std::size_t>(fb.stride, packedStride);
+    layout.chromaStride = layout.stride;
+    std::size_t chromaRows = fb.height;
+    switch(fb.type) {
+        case Type::YUV420p:
+            layout.chromaStride = layout.stride / 2;
+            chromaRows = chromaHeight;
+            break;
+        case Type::YUV422p:
+            layout.chromaStride = layout.stride / 2;
+            break;
+        default:
+            break;
+    }
+
+    const bool offsetsSet = fb.p2Offset > 0;
+    layout.p1Offset = fb.p1Offset;
+    layout.p2Offset = offsetsSet ? fb.p2Offset : layout.p1Offset + layout.stride * fb.height;
+    layout.p3Offset = offsetsSet && fb.p3Offset > 0 ? fb.p3Offset : layout.p2Offset + layout.chromaStride * chromaRows;
+    return layout;
+}
+
+// Imports 'numpy' module once, subsequent calls return the cached handle
+static py::module_& getNumpyModule(const char* functionName) {
+    PYBIND11_CONSTINIT static py::gil_safe_call_once_and_store<py::module_> storage;
+    try {
+        return storage.call_once_and_store_result([]() { return py::module_::import("numpy"); }).get_stored();
+    } catch (const py::error_already_set& err){
+        throw std::runtime_error(std::string("Function '") + functionName + "' requires 'numpy' module");
+    }
+}
+
+// ITU-R BT.601 YUV to BGR conversion, fixed point coefficients match the ones used by OpenCV 'cvtColor'
+constexpr int YUV_SHIFT = 20;
+constexpr int YUV_CY = 1220542;
+constexpr int YUV_CUB = 2116026;
+constexpr int YUV_CUG = -409993;
+constexpr int YUV_CVG = -852492;
+constexpr int YUV_CVR = 1673527;
+
+static inline std::uint8_t saturateU8(int value) {
+    return static_cast<std::uint8_t>(value < 0 ? 0 : (value > 255 ? 255 : value));
+}
+
+// Converts 4:2:0 subsampled frame to BGR888i. 'uvStep' is distance between neighbouring chroma samples (2 for NV12/NV21, 1 for YUV420p)
+static void convertYuv420ToBgr(const std::uint8_t* yPlane, std::size_t yStride, const std::uint8_t* uPlane, const std::uint8_t* vPlane, std::size_t uvStride, std::size_t uvStep,
+                               std::size_t width, std::size_t height, std::uint8_t* dst, std::size_t dstStride) {
+    constexpr int half = 1 << (YUV_SHIFT - 1);
+    for(std::size_t row = 0; row < height; row++) {
+        const std::uint8_t* y = yPlane + row * yStride;
+        const std::uint8_t* u = uPlane + (row / 2) * uvStride;
+        const std::uint8_t* v = vPlane + (row / 2) * uvStride;
+        std::uint8_t* d = dst + row * dstStride;
+        for(std::size_t col = 0; col < width; col++) {
+            const int uu = static_cast<int>(u[(col / 2) * uvStep]) - 128;
+            const int vv = static_cast<int>(v[(col / 2) * uvStep]) - 128;
+            const int yy = std::max(0, static_cast<int>(y[col]) - 16) * YUV_CY;
+            d[3 * col + 0] = saturateU8((yy + half + YUV_CUB * uu) >> YUV_SHIFT);
+            d[3 * col + 1] = saturateU8((yy + half + YUV_CVG * vv + YUV_CUG * uu) >> YUV_SHIFT);
+            d[3 * col + 2] = saturateU8((yy + half + YUV_CVR * vv) >> YUV_SHIFT);
+        }
+    }
+}
+
+static void convertPlanarToBgr(const std::uint8_t* bPlane, const std::uint8_t* gPlane, const std::uint8_t* rPlane, std::size_t stride,
+                               std::size_t width, std::size_t height, std::uint8_t* dst, std::size_t dstStride) {
+    for(std::size_t row = 0; row < height; row++) {
+        const std::uint8_t* b = bPlane + row * stride;
+        const std::uint8_t* g = gPlane + row * stride;
+        const std::uint8_t* r = rPlane + row * stride;
+        std::uint8_t* d = dst + row * dstStride;
+        for(std::size_t col = 0; col < width; col++) {
+            d[3 * col + 0] = b[col];
+            d[3 * col + 1] = g[col];
+            d[3 * col + 2] = r[col];
+        }
+    }
+}
+
+static void convertInterleavedToBgr(const std::uint8_t* src, std::size_t stride, bool swapRB, std::size_t width, std::size_t height, std::uint8_t* dst, std::size_t dstStride) {
+    for(std::size_t row = 0; row < height; row++) {
+        const std::uint8_t* s = src + row * stride;
+        std::uint8_t* d = dst + row * dstStride;
+        if(!swapRB) {
+            std::memcpy(d, s, width * 3);
+            continue;
+        }
+        for(std::size_t col = 0; col < width; col++) {
+            d[3 * col + 0] = s[3 * col + 2];
+            d[3 * col + 1] = s[3 * col + 1];
+            d[3 * col + 2] = s[3 * col + 0];
+        }
+    }
+}
+
 void bind_imgframe(pybind11::module& m, void* pCallstack){
 
     using namespace dai;
@@ -115,12 +255,22 @@ void bind_imgframe(pybind11::module& m, void* pCallstack){
 
     // Message
         imgFrame
-        .def(py::init<>())
+        .def(py::init([](){
+            return std::static_pointer_cast<ImgFrame>(std::make_shared<HostImgFrame>());
+        }))
         // getters
         .def("getTimestamp", py::overload_cast<>(&ImgFrame::Buffer::getTimestamp, py::const_), DOC(dai, Buffer, getTimestamp))
         .def("getTimestampDevice", py::overload_cast<>(&ImgFrame::Buffer::getTimestampDevice, py::const_), DOC(dai, Buffer, getTimestampDevice))
+        .def("getTimestampNs", &getMessageTimestampNs, "Returns timestamp related to dai::Clock::now() in nanoseconds")
+        .def("getTimestampDeviceNs", &getMessageTimestampDeviceNs, "Returns timestamp related to when the message was created on the device, in nanoseconds")
         .def("getTimestamp", py::overload_cast<CameraExposureOffset>(&ImgFrame::getTimestamp, py::const_), py::arg("offset"), DOC(dai, ImgFrame, getTimestamp))
         .def("getTimestampDevice", py::overload_cast<CameraExposureOffset>(&ImgFrame::getTimestampDevice, py::const_), py::arg("offset"), DOC(dai, ImgFrame, getTimestampDevice))
+        .def("getTimestampNs", [](ImgFrame& frame, CameraExposureOffset offset) {
+            return timePointToNs(frame.getTimestamp(offset));
+        }, py::arg("offset"), "Retrieves image timestamp (at the specified offset of exposure) related to dai::Clock::now(), in nanoseconds")
+        .def("getTimestampDeviceNs", [](ImgFrame& frame, CameraExposureOffset offset) {
+            return timePointToNs(frame.getTimestampDevice(offset));
+        }, py::arg("offset"), "Retrieves image timestamp (at the specified offset of exposure) directly captured from device's monotonic clock, in nanoseconds")
         .def("getSequenceNum", &ImgFrame::Buffer::getSequenceNum, DOC(dai, Buffer, getSequenceNum))
         .def("getInstanceNum", &ImgFrame::getInstanceNum, DOC(dai, ImgFrame, getInstanceNum))
         .def("getCategory", &ImgFrame::getCategory, DOC(dai, ImgFrame, getCategory))
@@ -135,36 +285,25 @@ void bind_imgframe(pybind11::module& m, void* pCallstack){
 
         // OpenCV Support section
         .def("setFrame", [](dai::ImgFrame& frm, py::array arr){
-             // Try importing 'numpy' module
-            py::module numpy;
-            try {
-                numpy = py::module::import("numpy");
-            } catch (const py::error_already_set& err){
-                throw std::runtime_error("Function 'setFrame' requires 'numpy' module");
-            }
-
-            py::array contiguous = numpy.attr("ascontiguousarray")(arr);
+            py::array contiguous = getNumpyModule("setFrame").attr("ascontiguousarray")(arr);
+            resetMessageExternalData(frm);
             frm.getData().resize(contiguous.nbytes());
             memcpy(frm.getData().data(), contiguous.data(), contiguous.nbytes());
 
         }, py::arg("array"), "Copies array bytes to ImgFrame buffer")
         .def("getFrame", [](py::object &obj, bool copy){
 
-            // Try importing 'numpy' module
-            py::module numpy;
-            try {
-                numpy = py::module::import("numpy");
-            } catch (const py::error_already_set& err){
-                throw std::runtime_error("Function 'getFrame' requires 'numpy' module");
-            }
+            // Check for 'numpy' module
+            getNumpyModule("getFrame");
 
             // obj is "Python" object, which we used then to bind the numpy view lifespan to
             // creates numpy array (zero-copy) which holds correct information such as shape, ...
             auto& img = obj.cast<dai::ImgFrame&>();
+            MessageData data(obj);
 
             // shape
             bool valid = img.getWidth() > 0 && img.getHeight() > 0;
-            std::vector<std::size_t> shape = {img.getData().size()};
+            std::vector<std::size_t> shape = {data.size};
             py::dtype dtype = py::dtype::of<uint8_t>();
 
             switch(img.getType()){
@@ -224,13 +363,13 @@ void bind_imgframe(pybind11::module& m, void* pCallstack){
 
                 case ImgFrame::Type::BITSTREAM :
                 default:
-                    shape = {img.getData().size()};
+                    shape = {data.size};
                     dtype = py::dtype::of<uint8_t>();
                     break;
             }
 
             // Check if enough data
-            long actualSize = img.getData().size();
+            long actualSize = data.size;
             long requiredSize = dtype.itemsize();
             for(const auto& dim : shape) requiredSize *= dim;
             if(actualSize < requiredSize){
@@ -246,81 +385,243 @@ void bind_imgframe(pybind11::module& m, void* pCallstack){
 
             if(copy){
                 py::array a(dtype, shape);
-                std::memcpy(a.mutable_data(), img.getData().data(), std::min( (long) (img.getData().size()), (long) (a.nbytes())));
+                std::memcpy(a.mutable_data(), data.data, std::min( (long) (data.size), (long) (a.nbytes())));
                 return a;
             } else {
-                return py::array(dtype, shape, img.getData().data(), obj);
+                return data.view(dtype, std::vector<py::ssize_t>(shape.begin(), shape.end()));
             }
 
         }, py::arg("copy") = false, "Returns numpy array with shape as specified by width, height and type")
+        .def("getPlanes", [](py::object &obj){
+
+            // obj is "Python" object, which we used then to bind the numpy views lifespan to
+            auto& img = obj.cast<dai::ImgFrame&>();
+            const auto& fb = std::static_pointer_cast<RawImgFrame>(img.getRaw())->fb;
+            MessageData data(obj);
 
-        .def("getCvFrame", [](py::object &obj){
-            using namespace pybind11::literals;
-
-            // Try importing 'cv2' module
-            py::module cv2;
-            py::module numpy;
-            try {
-                cv2 = py::module::import("cv2");
-                numpy = py::module::import("numpy");
-            } catch (const py::error_already_set& err){
-                throw std::runtime_error("Function 'getCvFrame' requires 'cv2' module (opencv-python package)");
+            if(img.getWidth() <= 0 || img.getHeight() <= 0){
+                throw std::runtime_error("ImgFrame size invalid (width: " + std::to_string(img.getWidth()) + ", height: " + std::to_string(img.getHeight()) + ")");
             }
 
-            // ImgFrame
-            auto& img = obj.cast<dai::ImgFrame&>();
+            const auto layout = getFrameLayout(fb);
+            const std::size_t p1 = layout.p1Offset, p2 = layout.p2Offset, p3 = layout.p3Offset;
+
+            py::list planes;
+            auto addPlane = [&](py::dtype dtype, std::size_t offset, std::vector<py::ssize_t> shape, std::vector<py::ssize_t> strides){
+                // Check that last element of the plane lies within the buffer
+                std::size_t end = offset + dtype.itemsize();
+                for(std::size_t i = 0; i < shape.size(); i++) end += (shape[i] - 1) * strides[i];
+                if(end > data.size){
+                    throw std::runtime_error("ImgFrame doesn't have enough data to encode plane " + std::to_string(planes.size()) + ", required " + std::to_string(end)
+                        + ", actual " + std::to_string(data.size) + ". Maybe metadataOnly transfer was made?");
+                }
+                planes.append(data.view(dtype, std::move(shape), std::move(strides), offset));
+            };
+            const py::ssize_t w = fb.width, h = fb.height, ch = (fb.height + 1) / 2, cw = (fb.width + 1) / 2;
+            const py::ssize_t st = layout.stride, cst = layout.chromaStride;
+            const auto u8 = py::dtype::of<uint8_t>();
 
-            // Get numpy frame (python object) by calling getFrame
-            auto frame = obj.attr("getFrame")();
+            switch(img.getType()){
 
-            // Convert numpy array to bgr frame using cv2 module
-            switch(img.getType()) {
+                case ImgFrame::Type::NV12:
+                case ImgFrame::Type::NV21:
+                    // Y and interleaved UV (VU for NV21), chroma rows share luma stride
+                    addPlane(u8, p1, {h, w}, {st, 1});
+                    addPlane(u8, p2, {ch, cw, 2}, {cst, 2, 1});
+                break;
 
-                case ImgFrame::Type::BGR888p:
-                    return numpy.attr("ascontiguousarray")(frame.attr("transpose")(1, 2, 0));
-                    break;
+                case ImgFrame::Type::YUV420p:
+                    // Y, U and V, chroma planes have half the luma stride
+                    addPlane(u8, p1, {h, w}, {st, 1});
+                    addPlane(u8, p2, {ch, cw}, {cst, 1});
+                    addPlane(u8, p3, {ch, cw}, {cst, 1});
+                break;
 
-                case ImgFrame::Type::BGR888i:
-                    return frame.attr("copy")();
-                    break;
+                case ImgFrame::Type::YUV422p:
+                    addPlane(u8, p1, {h, w}, {st, 1});
+                    addPlane(u8, p2, {h, cw}, {cst, 1});
+                    addPlane(u8, p3, {h, cw}, {cst, 1});
+                break;
 
+                case ImgFrame::Type::YUV444p:
                 case ImgFrame::Type::RGB888p:
-                    // Transpose to RGB888i then convert to BGR
-                    return cv2.attr("cvtColor")(frame.attr("transpose")(1, 2, 0), cv2.attr("COLOR_RGB2BGR"));
-                    break;
+                case ImgFrame::Type::BGR888p:
+                    addPlane(u8, p1, {h, w}, {st, 1});
+                    addPlane(u8, p2, {h, w}, {st, 1});
+                    addPlane(u8, p3, {h, w}, {st, 1});
+                break;
+
+                case ImgFrame::Type::RGBF16F16F16p:
+                case ImgFrame::Type::BGRF16F16F16p:
+                    addPlane(py::dtype("half"), p1, {h, w}, {st, 2});
+                    addPlane(py::dtype("half"), p2, {h, w}, {st, 2});
+                    addPlane(py::dtype("half"), p3, {h, w}, {st, 2});
+                break;
 
                 case ImgFrame::Type::RGB888i:
-                    return cv2.attr("cvtColor")(frame, cv2.attr("COLOR_RGB2BGR"));
-                    break;
+                case ImgFrame::Type::BGR888i:
+                case ImgFrame::Type::YUV444i:
+                    addPlane(u8, p1, {h, w, 3}, {st, 3, 1});
+                break;
 
-                case ImgFrame::Type::YUV420p:
-                    return cv2.attr("cvtColor")(frame, cv2.attr("COLOR_YUV2BGR_IYUV"));
-                    break;
+                case ImgFrame::Type::RGBF16F16F16i:
+                case ImgFrame::Type::BGRF16F16F16i:
+                    addPlane(py::dtype("half"), p1, {h, w, 3}, {st, 6, 2});
+                break;
 
-                case ImgFrame::Type::NV12:
-                    return cv2.attr("cvtColor")(frame, cv2.attr("COLOR_YUV2BGR_NV12"));
-                    break;
+                case ImgFrame::Type::YUV400p:
+                case ImgFrame::Type::RAW8:
+                case ImgFrame::Type::GRAY8:
+                    addPlane(u8, p1, {h, w}, {st, 1});
+                break;
 
-                case ImgFrame::Type::NV21:
-                    return cv2.attr("cvtColor")(frame, cv2.attr("COLOR_YUV2BGR_NV21"));
-                    break;
+                case ImgFrame::Type::GRAYF16:
+                    addPlane(py::dtype("half"), p1, {h, w}, {st, 2});
+                break;
 
-                case ImgFrame::Type::RAW8:
                 case ImgFrame::Type::RAW16:
                 case ImgFrame::Type::RAW14:
                 case ImgFrame::Type::RAW12:
                 case ImgFrame::Type::RAW10:
-                case ImgFrame::Type::GRAY8:
-                case ImgFrame::Type::GRAYF16:
+                    addPlane(py::dtype::of<uint16_t>(), p1, {h, w}, {st, 2});
+                break;
+
+                default:
+                    throw std::runtime_error("Function 'getPlanes' doesn't support ImgFrame type " + std::to_string(static_cast<int>(img.getType())));
+            }
+
+            return py::tuple(planes);
+
+        }, "Returns tuple of zero-copy numpy views, one per image plane (eg. Y and UV for NV12, Y, U and V for YUV420p), with strides and offsets as specified by frame Specs")
+
+        .def("getCvFrame", [](py::object &obj, py::object out){
+
+            // ImgFrame
+            auto& img = obj.cast<dai::ImgFrame&>();
+            const auto type = img.getType();
+
+            // Types which are converted natively to BGR888i
+            bool convert = false;
+            switch(type) {
+                case ImgFrame::Type::NV12:
+                case ImgFrame::Type::NV21:
+                case ImgFrame::Type::YUV420p:
+                case ImgFrame::Type::RGB888p:
+                case ImgFrame::Type::BGR888p:
+                case ImgFrame::Type::RGB888i:
+                case ImgFrame::Type::BGR888i:
+                    convert = true;
+                    break;
                 default:
-                    return frame.attr("copy")();
                     break;
             }
 
-            // Default case
-            return frame.attr("copy")();
+            // Rest (grayscale, RAW, ...) is returned as copy of numpy frame (python object) by calling getFrame
+            if(!convert) {
+                auto frame = obj.attr("getFrame")();
+                if(out.is_none()) return frame.attr("copy")();
+                getNumpyModule("getCvFrame").attr("copyto")(out, frame);
+                return out;
+            }
 
-        }, "Returns BGR or grayscale frame compatible with use in other opencv functions")
+            if(img.getWidth() <= 0 || img.getHeight() <= 0){
+                throw std::runtime_error("ImgFrame size invalid (width: " + std::to_string(img.getWidth()) + ", height: " + std::to_string(img.getHeight()) + ")");
+            }
+            const std::size_t width = img.getWidth();
+            const std::size_t height = img.getHeight();
+            const std::size_t chromaHeight = (height + 1) / 2;
+            const std::size_t chromaWidth = (width + 1) / 2;
+            const auto layout = getFrameLayout(std::static_pointer_cast<RawImgFrame>(img.getRaw())->fb);
+
+            // Check if enough data
+            std::size_t requiredSize = 0;
+            auto requirePlane = [&](std::size_t offset, std::size_t rows, std::size_t rowStride, std::size_t rowBytes){
+                requiredSize = std::max(requiredSize, offset + rowStride * (rows - 1) + rowBytes);
+            };
+            switch(type) {
+                case ImgFrame::Type::NV12:
+                case ImgFrame::Type::NV21:
+                    requirePlane(layout.p1Offset, height, layout.stride, width);
+                    requirePlane(layout.p2Offset, chromaHeight, layout.chromaStride, chromaWidth * 2);
+                    break;
+                case ImgFrame::Type::YUV420p:
+                    requirePlane(layout.p1Offset, height, layout.stride, width);
+                    requirePlane(layout.p2Offset, chromaHeight, layout.chromaStride, chromaWidth);
+                    requirePlane(layout.p3Offset, chromaHeight, layout.chromaStride, chromaWidth);
+                    break;
+                case ImgFrame::Type::RGB888p:
+                case ImgFrame::Type::BGR888p:
+                    requirePlane(layout.p1Offset, height, layout.stride, width);
+                    requirePlane(layout.p2Offset, height, layout.stride, width);
+                    requirePlane(layout.p3Offset, height, layout.stride, width);
+                    break;
+                default:
+                    requirePlane(layout.p1Offset, height, layout.stride, width * 3);
+                    break;
+            }
+            const MessageData data(obj);
+            if(data.size < requiredSize){
+                throw std::runtime_error("ImgFrame doesn't have enough data to encode specified frame, required " + std::to_string(requiredSize)
+                        + ", actual " + std::to_string(data.size) + ". Maybe metadataOnly transfer was made?");
+            }
+
+            // Output BGR888i frame, either newly allocated or provided by caller
+            py::array_t<std::uint8_t> bgr;
+            if(out.is_none()) {
+                bgr = py::array_t<std::uint8_t>({static_cast<py::ssize_t>(height), static_cast<py::ssize_t>(width), static_cast<py::ssize_t>(3)});
+            } else {
+                if(!py::isinstance<py::array_t<std::uint8_t>>(out)) {
+                    throw py::type_error("Output array 'out' must be a numpy array of dtype uint8");
+                }
+                bgr = out.cast<py::array_t<std::uint8_t>>();
+                if(bgr.ndim() != 3 || bgr.shape(0) != static_cast<py::ssize_t>(height) || bgr.shape(1) != static_cast<py::ssize_t>(width) || bgr.shape(2) != 3) {
+                    throw py::value_error("Output array 'out' must be of shape (" + std::to_string(height) + ", " + std::to_string(width) + ", 3)");
+                }
+                if(bgr.strides(2) != 1 || bgr.strides(1) != 3) {
+                    throw py::value_error("Output array 'out' must have contiguous rows");
+                }
+                if(!bgr.writeable()) {
+                    throw py::value_error("Output array 'out' must be writeable");
+                }
+            }
+            std::uint8_t* dst = bgr.mutable_data();
+            const std::size_t dstStride = bgr.strides(0);
+            const std::uint8_t* src = data.data;
+
+            {
+                // Conversion doesn't touch any python objects
+                py::gil_scoped_release release;
+
+                switch(type) {
+                    case ImgFrame::Type::NV12:
+                        convertYuv420ToBgr(src + layout.p1Offset, layout.stride, src + layout.p2Offset, src + layout.p2Offset + 1, layout.chromaStride, 2, width, height, dst, dstStride);
+                        break;
+                    case ImgFrame::Type::NV21:
+                        convertYuv420ToBgr(src + layout.p1Offset, layout.stride, src + layout.p2Offset + 1, src + layout.p2Offset, layout.chromaStride, 2, width, height, dst, dstStride);
+                        break;
+                    case ImgFrame::Type::YUV420p:
+                        convertYuv420ToBgr(src + layout.p1Offset, layout.stride, src + layout.p2Offset, src + layout.p3Offset, layout.chromaStride, 1, width, height, dst, dstStride);
+                        break;
+                    case ImgFrame::Type::RGB888p:
+                        convertPlanarToBgr(src + layout.p3Offset, src + layout.p2Offset, src + layout.p1Offset, layout.stride, width, height, dst, dstStride);
+                        break;
+                    case ImgFrame::Type::BGR888p:
+                        convertPlanarToBgr(src + layout.p1Offset, src + layout.p2Offset, src + layout.p3Offset, layout.stride, width, height, dst, dstStride);
+                        break;
+                    case ImgFrame::Type::RGB888i:
+                        convertInterleavedToBgr(src + layout.p1Offset, layout.stride, true, width, height, dst, dstStride);
+                        break;
+                    case ImgFrame::Type::BGR888i:
+                    default:
+                        convertInterleavedToBgr(src + layout.p1Offset, layout.stride, false, width, height, dst, dstStride);
+                        break;
+                }
+            }
+
+            return py::object(bgr);
+
+        }, py::arg("out") = py::none(), "Returns BGR or grayscale frame compatible with use in other opencv functions. NV12, NV21, YUV420p and RGB/BGR frames are converted natively, without requiring 'cv2' module. "
+           "Optionally converts into provided 'out' array (BGR: uint8 of shape (height, width, 3), otherwise matching 'getFrame'), to avoid allocating a new frame on each call")
 
         // setters
         .def("setTimestamp", &ImgFrame::setTimestamp, py::arg("timestamp"), DOC(dai, ImgFrame, setTimestamp))
@@ -334,8 +635,14 @@ void bind_imgframe(pybind11::module& m, void* pCallstack){
         .def("setSize", static_cast<ImgFrame&(ImgFrame::*)(std::tuple<unsigned int, unsigned int>)>(&ImgFrame::setSize), py::arg("sizer"), DOC(dai, ImgFrame, setSize, 2))
         .def("setType", &ImgFrame::setType, py::arg("type"), DOC(dai, ImgFrame, setType))
         ;
+    // Shape and dtype as given by 'getFrame'
+    bindArrayExport(imgFrame, [](py::object& obj) -> py::array {
+        return obj.attr("getFrame")(false);
+    });
     // add aliases dai.ImgFrame.Type and dai.ImgFrame.Specs
     m.attr("ImgFrame").attr("Type") = m.attr("RawImgFrame").attr("Type");
     m.attr("ImgFrame").attr("Specs") = m.attr("RawImgFrame").attr("Specs");
 
+    bindMessagePickle<RawImgFrame>(imgFrame);
+
 }
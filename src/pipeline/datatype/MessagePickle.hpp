@@ -0,0 +1,97 @@
+#pragma once
+
+// std
+#include <cstdint>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/Buffer.hpp"
+#include "depthai/pipeline/datatype/MessageGroup.hpp"
+#include "depthai-shared/utility/Serialization.hpp"
+
+// pybind
+#include <pybind11/pybind11.h>
+
+// project
+#include "pipeline/datatype/HostMessage.hpp"
+
+// Pickle support of messages, built on the same metadata serialization as used for sending messages over XLink.
+// Pickled state is (datatype, metadata, data). With protocol 5, data is passed as a PickleBuffer, which can be
+// transferred out-of-band without copying. Unpickled Buffer and ImgFrame messages reference the received data
+// as external data, other messages copy it
+
+// Returns '(datatype, metadata)' of a message
+inline pybind11::tuple getMessageMetadataState(const dai::Buffer& msg) {
+    std::vector<std::uint8_t> metadata;
+    dai::DatatypeEnum datatype;
+    msg.getRaw()->serialize(metadata, datatype);
+    return pybind11::make_tuple(static_cast<int>(datatype), pybind11::bytes(reinterpret_cast<const char*>(metadata.data()), metadata.size()));
+}
+
+// Deserializes metadata into raw message of given type
+template <typename Raw>
+void setMessageMetadataState(Raw& raw, const pybind11::tuple& state) {
+    if(state.size() < 2 || state[0].cast<int>() != static_cast<int>(raw.getType())) {
+        throw pybind11::value_error("Pickled state doesn't match message type");
+    }
+    const auto metadata = state[1].cast<std::string>();
+    if(!dai::utility::deserialize(reinterpret_cast<const std::uint8_t*>(metadata.data()), metadata.size(), raw)) {
+        throw pybind11::value_error("Couldn't deserialize pickled message metadata");
+    }
+}
+
+// Binds '__reduce_ex__' and '__setstate__' of a message class with given raw type
+template <typename Raw, typename Class>
+void bindMessagePickle(Class& cls) {
+    cls.def("__reduce_ex__", [](pybind11::object& obj, int protocol) {
+        auto state = getMessageMetadataState(obj.cast<dai::Buffer&>());
+        MessageData data(obj);
+        pybind11::object payload;
+        if(protocol >= 5) {
+            payload = pybind11::module::import("pickle").attr("PickleBuffer")(data.view(pybind11::dtype::of<std::uint8_t>(), {static_cast<pybind11::ssize_t>(data.size)}));
+        } else {
+            payload = pybind11::bytes(reinterpret_cast<const char*>(data.data), data.size);
+        }
+        return pybind11::make_tuple(pybind11::type::of(obj), pybind11::tuple(), pybind11::make_tuple(state[0], state[1], payload));
+    }, pybind11::arg("protocol"), "Pickles the message. With protocol 5, message data can be transferred out-of-band")
+        .def("__setstate__", [](dai::Buffer& msg, pybind11::tuple state) {
+            setMessageMetadataState(static_cast<Raw&>(*msg.getRaw()), state);
+            if(state.size() != 3) throw pybind11::value_error("Pickled state doesn't match message type");
+            pybind11::object payload = state[2];
+            if(dynamic_cast<ExternalData*>(&msg) != nullptr) {
+                // Messages created on host reference the data instead
+                setMessageExternalData(msg, payload);
+                return;
+            }
+            pybind11::buffer_info info = pybind11::reinterpret_borrow<pybind11::buffer>(payload).request();
+            const auto* begin = static_cast<const std::uint8_t*>(info.ptr);
+            msg.getData().assign(begin, begin + info.size * info.itemsize);
+        }, pybind11::arg("state"));
+}
+
+// MessageGroup holds other messages, which are pickled alongside its metadata (each with their own data)
+template <typename Class>
+void bindMessageGroupPickle(Class& cls) {
+    cls.def("__reduce_ex__", [](pybind11::object& obj, int) {
+        auto& group = obj.cast<dai::MessageGroup&>();
+        auto state = getMessageMetadataState(group);
+        pybind11::list messages;
+        for(const auto& name : group.getMessageNames()) messages.append(pybind11::make_tuple(name, group[name]));
+        return pybind11::make_tuple(pybind11::type::of(obj), pybind11::tuple(), pybind11::make_tuple(state[0], state[1], messages));
+    }, pybind11::arg("protocol"), "Pickles the message group, together with its messages")
+        .def("__setstate__", [](dai::MessageGroup& group, pybind11::tuple state) {
+            // Only timestamps and sequence number are taken from the metadata, messages are added separately
+            dai::RawMessageGroup raw;
+            setMessageMetadataState(raw, state);
+            if(state.size() != 3) throw pybind11::value_error("Pickled state doesn't match message type");
+            auto& groupRaw = static_cast<dai::RawMessageGroup&>(*group.getRaw());
+            groupRaw.ts = raw.ts;
+            groupRaw.tsDevice = raw.tsDevice;
+            groupRaw.sequenceNum = raw.sequenceNum;
+            for(const auto& item : state[2].cast<pybind11::list>()) {
+                auto pair = item.cast<pybind11::tuple>();
+                group.add(pair[0].cast<std::string>(), pair[1].cast<std::shared_ptr<dai::ADatatype>>());
+            }
+        }, pybind11::arg("state"));
+}
@@ -0,0 +1,230 @@
+#include "DatatypeBindings.hpp"
+#include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/HostMessage.hpp"
+#include <atomic>
+#include <chrono>
+#include <functional>
+#include <memory>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/Buffer.hpp"
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
+#include "depthai/pipeline/datatype/NNData.hpp"
+
+// Pool of preallocated host messages.
+// A message is handed out again once neither Python nor a DataInputQueue references it anymore
+// (the queue holds the raw message until it was written to the device).
+// Not thread safe by itself, all methods are called with the GIL held
+template <typename Message>
+class MessagePool {
+   public:
+    MessagePool(std::function<std::shared_ptr<Message>()> create, std::function<void(Message&)> recycle, std::size_t capacity)
+        : create(std::move(create)), recycle(std::move(recycle)) {
+        messages.reserve(capacity);
+        for(std::size_t i = 0; i < capacity; i++) {
+            messages.push_back(this->create());
+        }
+    }
+
+    // Returns a free message from the pool, or a newly allocated one (not retained by the pool) if none is free
+    std::shared_ptr<Message> acquire() {
+        for(std::size_t i = 0; i < messages.size(); i++) {
+            auto& msg = messages[(next + i) % messages.size()];
+            if(isFree(msg)) {
+                next = (next + i + 1) % messages.size();
+                // Synchronize with the writing thread releasing the raw message
+                std::atomic_thread_fence(std::memory_order_acquire);
+                recycle(*msg);
+                hits++;
+                return msg;
+            }
+        }
+        misses++;
+        return create();
+    }
+
+    std::size_t getAvailable() const {
+        std::size_t available = 0;
+        for(const auto& msg : messages) {
+            if(isFree(msg)) available++;
+        }
+        return available;
+    }
+
+    std::size_t getCapacity() const {
+        return messages.size();
+    }
+
+    std::uint64_t getHits() const {
+        return hits;
+    }
+
+    std::uint64_t getMisses() const {
+        return misses;
+    }
+
+    void resetStats() {
+        hits = 0;
+        misses = 0;
+    }
+
+   private:
+    static bool isFree(const std::shared_ptr<Message>& msg) {
+        // Pool holds the only reference to the message, and the message (plus the temporary) to its raw message
+        return msg.use_count() == 1 && msg->getRaw().use_count() == 2;
+    }
+
+    std::function<std::shared_ptr<Message>()> create;
+    std::function<void(Message&)> recycle;
+    std::vector<std::shared_ptr<Message>> messages;
+    std::size_t next = 0;
+    std::uint64_t hits = 0;
+    std::uint64_t misses = 0;
+};
+
+// Size of a tightly packed frame
+static std::size_t getFrameSize(dai::RawImgFrame::Type type, std::size_t width, std::size_t height) {
+    using Type = dai::RawImgFrame::Type;
+    const std::size_t pixels = width * height;
+    switch(type) {
+        case Type::YUV420p:
+        case Type::NV12:
+        case Type::NV21:
+            return pixels * 3 / 2;
+        case Type::YUV422p:
+        case Type::YUV422i:
+            return pixels * 2;
+        case Type::YUV444p:
+        case Type::YUV444i:
+        case Type::RGB888p:
+        case Type::BGR888p:
+        case Type::RGB888i:
+        case Type::BGR888i:
+            return pixels * 3;
+        case Type::RGBA8888:
+            return pixels * 4;
+        case Type::RGB161616:
+        case Type::RGBF16F16F16p:
+        case Type::BGRF16F16F16p:
+        case Type::RGBF16F16F16i:
+        case Type::BGRF16F16F16i:
+            return pixels * 3 * 2;
+        default:
+            return pixels * dai::RawImgFrame::typeToBpp(type);
+    }
+}
+
+// Drops external data and restores preallocated size of a recycled message
+static void recycleMessageData(dai::Buffer& msg, std::size_t size) {
+    resetMessageExternalData(msg);
+    if(msg.getData().size() != size) msg.getData().resize(size);
+}
+
+// Resets metadata (timestamps, sequence number, frame specs, ...) of a recycled message to that of a newly created one,
+// keeping its data allocation
+template <typename Raw>
+static Raw& resetMessageMetadata(dai::Buffer& msg) {
+    auto& raw = static_cast<Raw&>(*msg.getRaw());
+    std::vector<std::uint8_t> data;
+    data.swap(raw.data);
+    raw = Raw();
+    raw.data.swap(data);
+    return raw;
+}
+
+template <typename Message>
+static void bindMessagePool(py::class_<MessagePool<Message>>& pool) {
+    pool
+        .def("acquire", &MessagePool<Message>::acquire,
+             "Returns a free message from the pool. If all are still in use, a new message is allocated (counted as a miss), which isn't retained by the pool")
+        .def("getAvailable", &MessagePool<Message>::getAvailable, "Returns number of messages currently free")
+        .def("getCapacity", &MessagePool<Message>::getCapacity, "Returns number of messages in the pool")
+        .def("getHits", &MessagePool<Message>::getHits, "Returns number of acquires served from the pool")
+        .def("getMisses", &MessagePool<Message>::getMisses, "Returns number of acquires which required allocating a new message")
+        .def("resetStats", &MessagePool<Message>::resetStats, "Resets hit and miss counters")
+        ;
+}
+
+void bind_messagepool(pybind11::module& m, void* pCallstack){
+
+    using namespace dai;
+
+    py::class_<MessagePool<Buffer>> bufferPool(m, "BufferPool", "Pool of preallocated Buffer messages, recycled once no longer referenced by Python or a DataInputQueue");
+    py::class_<MessagePool<ImgFrame>> imgFramePool(m, "ImgFramePool", "Pool of preallocated ImgFrame messages, recycled once no longer referenced by Python or a DataInputQueue");
+    py::class_<MessagePool<NNData>> nnDataPool(m, "NNDataPool", "Pool of NNData messages, recycled once no longer referenced by Python or a DataInputQueue");
+
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    // Call the rest of the type defines, then perform the actual bindings
+    Callstack* callstack = (Callstack*) pCallstack;
+    auto cb = callstack->top();
+    callstack->pop();
+    cb(m, pCallstack);
+    // Actual bindings
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////
+
+    bufferPool
+        .def(py::init([](std::size_t size, std::size_t capacity){
+            return std::make_unique<MessagePool<Buffer>>(
+                [size](){
+                    auto buffer = std::make_shared<HostBuffer>();
+                    buffer->getData().resize(size);
+                    return std::static_pointer_cast<Buffer>(buffer);
+                },
+                [size](Buffer& buffer){
+                    resetMessageMetadata<RawBuffer>(buffer);
+                    recycleMessageData(buffer, size);
+                },
+                capacity);
+        }), py::arg("size"), py::arg("capacity"), "Creates pool of 'capacity' Buffer messages with 'size' bytes of data each")
+        ;
+    bindMessagePool(bufferPool);
+
+    imgFramePool
+        .def(py::init([](unsigned int width, unsigned int height, ImgFrame::Type type, std::size_t capacity){
+            const std::size_t size = getFrameSize(type, width, height);
+            return std::make_unique<MessagePool<ImgFrame>>(
+                [width, height, type, size](){
+                    // Type first, so stride accounts for bytes per pixel
+                    auto frame = std::make_shared<HostImgFrame>();
+                    frame->setType(type);
+                    frame->setWidth(width);
+                    frame->setHeight(height);
+                    frame->getData().resize(size);
+                    return std::static_pointer_cast<ImgFrame>(frame);
+                },
+                [width, height, type, size](ImgFrame& frame){
+                    resetMessageMetadata<RawImgFrame>(frame);
+                    recycleMessageData(frame, size);
+                    // same as a newly created frame
+                    frame.setType(type);
+                    frame.setWidth(width);
+                    frame.setHeight(height);
+                    frame.setTimestamp(std::chrono::steady_clock::now());
+                },
+                capacity);
+        }), py::arg("width"), py::arg("height"), py::arg("type"), py::arg("capacity"),
+        "Creates pool of 'capacity' ImgFrame messages of given size and type, with data preallocated for a tightly packed frame")
+        ;
+    bindMessagePool(imgFramePool);
+
+    nnDataPool
+        .def(py::init([](std::size_t capacity){
+            return std::make_unique<MessagePool<NNData>>(
+                [](){ return std::static_pointer_cast<NNData>(std::make_shared<HostNNData>()); },
+                [](NNData& nnData){
+                    // Tensors are kept, the rest of the metadata is reset
+                    auto tensors = std::move(static_cast<RawNNData&>(*nnData.getRaw()).tensors);
+                    resetMessageMetadata<RawNNData>(nnData).tensors = std::move(tensors);
+                },
+                capacity);
+        }), py::arg("capacity"),
+        "Creates pool of 'capacity' NNData messages. Tensors are kept between uses, so setting a tensor of the same size again doesn't allocate")
+        ;
+    bindMessagePool(nnDataPool);
+
+}
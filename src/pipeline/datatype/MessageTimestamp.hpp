@@ -0,0 +1,54 @@
+#pragma once
+
+// std
+#include <chrono>
+#include <cstdint>
+#include <memory>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/Buffer.hpp"
+#include "depthai-shared/common/Timestamp.hpp"
+
+// pybind
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+// Integer nanosecond timestamps, exact and without constructing a timedelta per call
+
+inline std::int64_t timestampToNs(const dai::Timestamp& ts) {
+    return ts.sec * 1000000000LL + ts.nsec;
+}
+
+inline void timestampFromNs(dai::Timestamp& ts, std::int64_t ns) {
+    // Floor division, so nsec stays within [0, 1e9) for negative values as well
+    ts.sec = ns / 1000000000LL;
+    ts.nsec = ns % 1000000000LL;
+    if(ts.nsec < 0) {
+        ts.sec -= 1;
+        ts.nsec += 1000000000LL;
+    }
+}
+
+inline std::int64_t timePointToNs(std::chrono::time_point<std::chrono::steady_clock, std::chrono::steady_clock::duration> tp) {
+    return std::chrono::duration_cast<std::chrono::nanoseconds>(tp.time_since_epoch()).count();
+}
+
+inline std::int64_t getMessageTimestampNs(const dai::Buffer& msg) {
+    return timePointToNs(msg.getTimestamp());
+}
+
+inline std::int64_t getMessageTimestampDeviceNs(const dai::Buffer& msg) {
+    return timePointToNs(msg.getTimestampDevice());
+}
+
+// Timestamps of a list of messages as int64 array
+inline pybind11::array_t<std::int64_t> getMessagesTimestampsNs(const std::vector<std::shared_ptr<dai::Buffer>>& msgs, bool device) {
+    pybind11::array_t<std::int64_t> timestamps(static_cast<pybind11::ssize_t>(msgs.size()));
+    auto* ts = timestamps.mutable_data();
+    for(const auto& msg : msgs) {
+        if(!msg) throw pybind11::value_error("Messages must not be None");
+        *ts++ = device ? getMessageTimestampDeviceNs(*msg) : getMessageTimestampNs(*msg);
+    }
+    return timestamps;
+}
@@ -1,5 +1,11 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/HostMessage.hpp"
+#include "pipeline/datatype/ArrayExport.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
+#include <algorithm>
+#include <cstring>
 #include <unordered_map>
 #include <memory>
 
@@ -12,6 +18,252 @@
 
 // #include "spdlog/spdlog.h"
 
+// numpy dtype and element size of a tensor data type
+static py::dtype getTensorDtype(dai::TensorInfo::DataType type) {
+    switch(type) {
+        case dai::TensorInfo::DataType::FP16:
+            return py::dtype("float16");
+        case dai::TensorInfo::DataType::U8F:
+            return py::dtype::of<std::uint8_t>();
+        case dai::TensorInfo::DataType::INT:
+            return py::dtype::of<std::int32_t>();
+        case dai::TensorInfo::DataType::FP32:
+            return py::dtype::of<float>();
+        case dai::TensorInfo::DataType::I8:
+            return py::dtype::of<std::int8_t>();
+    }
+    throw std::invalid_argument("Unsupported tensor data type");
+}
+
+static inline float fp32FromBits(std::uint32_t bits) {
+    float value;
+    std::memcpy(&value, &bits, sizeof(value));
+    return value;
+}
+
+static inline std::uint32_t fp32ToBits(float value) {
+    std::uint32_t bits;
+    std::memcpy(&bits, &value, sizeof(bits));
+    return bits;
+}
+
+// IEEE half <-> single precision conversions (same algorithms as the FP16 library used by core).
+// Selection is done with masks instead of branches, so the conversion loops get auto vectorized
+static inline float fp16ToFp32(std::uint16_t h) {
+    const std::uint32_t w = static_cast<std::uint32_t>(h) << 16;
+    const std::uint32_t sign = w & 0x80000000u;
+    const std::uint32_t twoW = w + w;
+
+    // 2^-112 - rescales exponent bias from 15 to 127
+    const float normalized = fp32FromBits((twoW >> 4) + (0xE0u << 23)) * 1.92592994438723585e-34f;
+    const float denormalized = fp32FromBits((twoW >> 17) | (126u << 23)) - 0.5f;
+    const std::uint32_t denormalMask = 0u - static_cast<std::uint32_t>(twoW < (1u << 27));
+    return fp32FromBits(sign | (fp32ToBits(denormalized) & denormalMask) | (fp32ToBits(normalized) & ~denormalMask));
+}
+
+static inline std::uint16_t fp32ToFp16(float f) {
+    const std::uint32_t w = fp32ToBits(f);
+    const std::uint32_t shl1W = w + w;
+    const std::uint32_t sign = w & 0x80000000u;
+    const std::uint32_t bias = std::max(shl1W & 0xFF000000u, 0x71000000u);
+
+    // scale by 2^112 and 2^-110 - overflows to infinity and rounds the mantissa
+    float base = (fp32FromBits(w & 0x7FFFFFFFu) * 5.1922968585348276e+33f) * 7.7037197775489434e-34f;
+    base = fp32FromBits((bias >> 1) + 0x07800000u) + base;
+    const std::uint32_t bits = fp32ToBits(base);
+    const std::uint32_t nonsign = ((bits >> 13) & 0x00007C00u) + (bits & 0x00000FFFu);
+    const std::uint32_t nanMask = 0u - static_cast<std::uint32_t>(shl1W > 0xFF000000u);
+    return static_cast<std::uint16_t>((sign >> 16) | (0x7E00u & nanMask) | (nonsign & ~nanMask));
+}
+
+static void convertFp16ToFp32(const std::uint16_t* src, float* dst, std::size_t count) {
+    for(std::size_t i = 0; i < count; i++) {
+        dst[i] = fp16ToFp32(src[i]);
+    }
+}
+
+template <typename T>
+static void convertToFp16(const T* src, std::uint16_t* dst, std::size_t count) {
+    for(std::size_t i = 0; i < count; i++) {
+        dst[i] = fp32ToFp16(static_cast<float>(src[i]));
+    }
+}
+
+static std::size_t getTensorItemSize(dai::TensorInfo::DataType type) {
+    switch(type) {
+        case dai::TensorInfo::DataType::FP16:
+            return sizeof(std::uint16_t);
+        case dai::TensorInfo::DataType::U8F:
+            return sizeof(std::uint8_t);
+        case dai::TensorInfo::DataType::INT:
+            return sizeof(std::int32_t);
+        case dai::TensorInfo::DataType::FP32:
+            return sizeof(float);
+        case dai::TensorInfo::DataType::I8:
+            return sizeof(std::int8_t);
+    }
+    throw std::invalid_argument("Unsupported tensor data type");
+}
+
+// Default storage order of a tensor given its number of dimensions
+static dai::TensorInfo::StorageOrder getDefaultStorageOrder(std::size_t numDimensions) {
+    switch(numDimensions) {
+        case 1:
+            return dai::TensorInfo::StorageOrder::C;
+        case 2:
+            return dai::TensorInfo::StorageOrder::NC;
+        case 3:
+            return dai::TensorInfo::StorageOrder::CHW;
+        default:
+            return dai::TensorInfo::StorageOrder::NCHW;
+    }
+}
+
+// Tensor data type matching a numpy dtype
+static dai::TensorInfo::DataType getTensorDataType(const py::dtype& dtype) {
+    if(dtype.equal(py::dtype("float16"))) return dai::TensorInfo::DataType::FP16;
+    if(dtype.equal(py::dtype::of<float>())) return dai::TensorInfo::DataType::FP32;
+    if(dtype.equal(py::dtype::of<std::uint8_t>())) return dai::TensorInfo::DataType::U8F;
+    if(dtype.equal(py::dtype::of<std::int8_t>())) return dai::TensorInfo::DataType::I8;
+    if(dtype.equal(py::dtype::of<std::int32_t>())) return dai::TensorInfo::DataType::INT;
+    throw py::type_error("Array dtype '" + py::str(dtype).cast<std::string>() + "' has no matching tensor data type, specify 'dtype' explicitly");
+}
+
+// Copies array into a tensor of the same element type, casting first if needed
+template <typename T>
+static void setTensorData(HostNNData& nnData, const dai::TensorInfo& info, const py::array& array) {
+    py::array_t<T, py::array::c_style | py::array::forcecast> src(array);
+    std::uint8_t* dst = nnData.allocateTensor(info, src.size() * sizeof(T));
+    py::gil_scoped_release release;
+    std::memcpy(dst, src.data(), src.size() * sizeof(T));
+}
+
+// Converts array into a FP16 tensor in a single pass
+template <typename T>
+static void setFp16TensorData(HostNNData& nnData, const dai::TensorInfo& info, const py::array& array) {
+    py::array_t<T, py::array::c_style | py::array::forcecast> src(array);
+    auto* dst = reinterpret_cast<std::uint16_t*>(nnData.allocateTensor(info, src.size() * sizeof(std::uint16_t)));
+    py::gil_scoped_release release;
+    convertToFp16(src.data(), dst, static_cast<std::size_t>(src.size()));
+}
+
+static void setTensor(HostNNData& nnData, const std::string& name, const py::array& array, dai::TensorInfo::DataType dataType, dai::TensorInfo::StorageOrder order) {
+    using DataType = dai::TensorInfo::DataType;
+
+    dai::TensorInfo info;
+    info.name = name;
+    info.dataType = dataType;
+    info.order = order;
+    // Dims and strides are listed innermost first, as on device (eg. W, H, C for a CHW tensor),
+    // so core getters size the tensor as dims[last] * strides[last]
+    info.dims.assign(array.shape(), array.shape() + array.ndim());
+    if(info.dims.empty()) info.dims.push_back(1);
+    std::reverse(info.dims.begin(), info.dims.end());
+    info.numDimensions = static_cast<unsigned int>(info.dims.size());
+
+    // Tensor is stored C contiguous
+    info.strides.resize(info.dims.size());
+    unsigned int stride = static_cast<unsigned int>(getTensorItemSize(dataType));
+    for(std::size_t i = 0; i < info.dims.size(); i++) {
+        info.strides[i] = stride;
+        stride *= info.dims[i];
+    }
+
+    switch(dataType) {
+        case DataType::FP16:
+            if(array.dtype().equal(py::dtype("float16"))) {
+                setTensorData<std::uint16_t>(nnData, info, array.attr("view")(py::dtype::of<std::uint16_t>()));
+            } else if(array.dtype().equal(py::dtype::of<double>())) {
+                setFp16TensorData<double>(nnData, info, array);
+            } else {
+                setFp16TensorData<float>(nnData, info, array);
+            }
+            break;
+        case DataType::U8F:
+            setTensorData<std::uint8_t>(nnData, info, array);
+            break;
+        case DataType::INT:
+            setTensorData<std::int32_t>(nnData, info, array);
+            break;
+        case DataType::FP32:
+            setTensorData<float>(nnData, info, array);
+            break;
+        case DataType::I8:
+            setTensorData<std::int8_t>(nnData, info, array);
+            break;
+    }
+}
+
+// NNData created on host, or nullptr if received from device
+static HostNNData* getHostNNData(dai::NNData& nnData) {
+    return dynamic_cast<HostNNData*>(&nnData);
+}
+
+// Zero-copy view of a tensor in the messages data, with shape and strides given by TensorInfo
+static py::array getTensorView(py::object& obj, const dai::TensorInfo& tensor) {
+    auto& nnData = obj.cast<dai::NNData&>();
+    auto& data = nnData.getRaw()->data;
+
+    const py::dtype dtype = getTensorDtype(tensor.dataType);
+    const std::size_t itemSize = static_cast<std::size_t>(dtype.itemsize());
+
+    // TensorInfo lists dims innermost first, numpy outermost first
+    std::vector<py::ssize_t> shape(tensor.dims.rbegin(), tensor.dims.rend());
+    if(shape.empty()) {
+        shape.push_back(static_cast<py::ssize_t>((data.size() - std::min<std::size_t>(tensor.offset, data.size())) / itemSize));
+    }
+
+    // Strides are in bytes, fall back to C contiguous if not specified (eg. when parsed from blob)
+    std::vector<py::ssize_t> strides(shape.size());
+    if(tensor.strides.size() == shape.size()) {
+        std::copy(tensor.strides.rbegin(), tensor.strides.rend(), strides.begin());
+    } else {
+        py::ssize_t stride = static_cast<py::ssize_t>(itemSize);
+        for(std::size_t i = shape.size(); i-- > 0;) {
+            strides[i] = stride;
+            stride *= shape[i];
+        }
+    }
+
+    // Check that the view stays within the message data
+    std::size_t end = tensor.offset + itemSize;
+    bool empty = false;
+    for(std::size_t i = 0; i < shape.size(); i++) {
+        if(shape[i] == 0) empty = true;
+        else end += static_cast<std::size_t>(shape[i] - 1) * static_cast<std::size_t>(strides[i]);
+    }
+    if(!empty && end > data.size()) {
+        throw std::runtime_error("Tensor '" + tensor.name + "' exceeds message data size (" + std::to_string(end) + " > " + std::to_string(data.size()) + ")");
+    }
+
+    return py::array(dtype, shape, strides, data.data() + (empty ? 0 : tensor.offset), obj);
+}
+
+// Returns view of a tensor, or a converted copy if a different dtype is requested.
+// FP16 -> FP32 conversion is done natively, without holding the GIL
+static py::array getTensorArray(py::object& obj, const dai::TensorInfo& tensor, const py::object& dtype) {
+    py::array view = getTensorView(obj, tensor);
+    if(dtype.is_none()) return view;
+
+    const py::dtype target = py::dtype::from_args(dtype);
+    if(target.equal(view.dtype())) return view;
+
+    if(tensor.dataType == dai::TensorInfo::DataType::FP16 && target.equal(py::dtype::of<float>())) {
+        py::array_t<std::uint16_t, py::array::c_style | py::array::forcecast> src(view.attr("view")(py::dtype::of<std::uint16_t>()));
+        py::array_t<float> dst(std::vector<py::ssize_t>(view.shape(), view.shape() + view.ndim()));
+        const std::uint16_t* srcData = src.data();
+        float* dstData = dst.mutable_data();
+        const std::size_t count = static_cast<std::size_t>(src.size());
+        {
+            py::gil_scoped_release release;
+            convertFp16ToFp32(srcData, dstData, count);
+        }
+        return dst;
+    }
+
+    return view.attr("astype")(target);
+}
+
 void bind_nndata(pybind11::module& m, void* pCallstack){
 
     using namespace dai;
@@ -105,15 +357,53 @@ void bind_nndata(pybind11::module& m, void* pCallstack){
     // Message
 
     nnData
-        .def(py::init<>(), DOC(dai, NNData, NNData))
+        .def(py::init([](){
+            return std::static_pointer_cast<NNData>(std::make_shared<HostNNData>());
+        }), DOC(dai, NNData, NNData))
         // setters
-        .def("setLayer", [](NNData& obj, const std::string& name, py::array_t<std::uint8_t, py::array::c_style | py::array::forcecast> data){
+        .def("setLayer", [](NNData& obj, const std::string& name, py::array_t<std::uint8_t, py::array::c_style | py::array::forcecast> data) -> NNData& {
+            if(auto* host = getHostNNData(obj)) {
+                setTensor(*host, name, data.attr("ravel")(), TensorInfo::DataType::U8F, TensorInfo::StorageOrder::C);
+                return obj;
+            }
             std::vector<std::uint8_t> vec(data.data(), data.data() + data.size());
-            obj.setLayer(name, std::move(vec));
+            return obj.setLayer(name, std::move(vec));
         }, py::arg("name"), py::arg("data"), DOC(dai, NNData, setLayer))
-        .def("setLayer", static_cast<NNData&(NNData::*)(const std::string&, const std::vector<int>&)>(&NNData::setLayer), py::arg("name"), py::arg("data"), DOC(dai, NNData, setLayer, 2))
-        .def("setLayer", static_cast<NNData&(NNData::*)(const std::string&, std::vector<float>)>(&NNData::setLayer), py::arg("name"), py::arg("data"), DOC(dai, NNData, setLayer, 3))
-        .def("setLayer", static_cast<NNData&(NNData::*)(const std::string&, std::vector<double>)>(&NNData::setLayer), py::arg("name"), py::arg("data"), DOC(dai, NNData, setLayer, 4))
+        .def("setLayer", [](NNData& obj, const std::string& name, const std::vector<int>& data) -> NNData& {
+            if(auto* host = getHostNNData(obj)) {
+                setTensor(*host, name, py::array_t<int>(data.size(), data.data()), TensorInfo::DataType::U8F, TensorInfo::StorageOrder::C);
+                return obj;
+            }
+            return obj.setLayer(name, data);
+        }, py::arg("name"), py::arg("data"), DOC(dai, NNData, setLayer, 2))
+        .def("setLayer", [](NNData& obj, const std::string& name, std::vector<float> data) -> NNData& {
+            if(auto* host = getHostNNData(obj)) {
+                setTensor(*host, name, py::array_t<float>(data.size(), data.data()), TensorInfo::DataType::FP16, TensorInfo::StorageOrder::C);
+                return obj;
+            }
+            return obj.setLayer(name, std::move(data));
+        }, py::arg("name"), py::arg("data"), DOC(dai, NNData, setLayer, 3))
+        .def("setLayer", [](NNData& obj, const std::string& name, std::vector<double> data) -> NNData& {
+            if(auto* host = getHostNNData(obj)) {
+                setTensor(*host, name, py::array_t<double>(data.size(), data.data()), TensorInfo::DataType::FP16, TensorInfo::StorageOrder::C);
+                return obj;
+            }
+            return obj.setLayer(name, std::move(data));
+        }, py::arg("name"), py::arg("data"), DOC(dai, NNData, setLayer, 4))
+        .def("setTensor", [](NNData& obj, const std::string& name, py::array array, py::object dtype, py::object order) -> NNData& {
+            auto* host = getHostNNData(obj);
+            if(host == nullptr) {
+                throw std::runtime_error("setTensor is only supported on NNData messages created on host");
+            }
+            const auto dataType = dtype.is_none() ? getTensorDataType(array.dtype()) : dtype.cast<TensorInfo::DataType>();
+            const auto storageOrder = order.is_none() ? getDefaultStorageOrder(array.ndim()) : order.cast<TensorInfo::StorageOrder>();
+            setTensor(*host, name, array, dataType, storageOrder);
+            return obj;
+        }, py::arg("name"), py::arg("array"), py::arg("dtype") = py::none(), py::arg("order") = py::none(),
+        "Sets tensor from a numpy array, filling its TensorInfo (dims, strides, order) from the array. Dims and strides are stored innermost first, as on device.\n"
+        "Data is written directly into message data, converting to 'dtype' (TensorInfo.DataType) in a single pass if it differs from arrays dtype.\n"
+        "By default data type is deduced from arrays dtype and order from its number of dimensions.\n"
+        "Only supported on messages created on host")
         .def("getLayer", &NNData::getLayer, py::arg("name"), py::arg("tensor"), DOC(dai, NNData, getLayer))
         .def("hasLayer", &NNData::hasLayer, py::arg("name"), DOC(dai, NNData, hasLayer))
         .def("getAllLayerNames", &NNData::getAllLayerNames, DOC(dai, NNData, getAllLayerNames))
@@ -125,13 +415,44 @@ void bind_nndata(pybind11::module& m, void* pCallstack){
         .def("getFirstLayerUInt8", &NNData::getFirstLayerUInt8, DOC(dai, NNData, getFirstLayerUInt8))
         .def("getFirstLayerFp16", &NNData::getFirstLayerFp16, DOC(dai, NNData, getFirstLayerFp16))
         .def("getFirstLayerInt32", &NNData::getFirstLayerInt32, DOC(dai, NNData, getFirstLayerInt32))
+        .def("getTensor", [](py::object& obj, const std::string& name, py::object dtype) -> py::array {
+            auto& nnData = obj.cast<NNData&>();
+            TensorInfo tensor;
+            if(!nnData.getLayer(name, tensor)) {
+                throw py::key_error("Tensor '" + name + "' does not exist");
+            }
+            return getTensorArray(obj, tensor, dtype);
+        }, py::arg("name"), py::arg("dtype") = py::none(),
+        "Returns tensor as numpy array, with shape and strides given by its TensorInfo.\n"
+        "Returned array is a zero-copy view into message data, unless 'dtype' differs from tensors data type,\n"
+        "in which case a converted copy is returned (eg. numpy.float32 for FP16 tensors)")
+        .def("getAllTensors", [](py::object& obj, py::object dtype) {
+            auto& nnData = obj.cast<NNData&>();
+            auto raw = std::static_pointer_cast<RawNNData>(nnData.getRaw());
+            py::dict tensors;
+            for(const auto& tensor : raw->tensors) {
+                tensors[py::str(tensor.name)] = getTensorArray(obj, tensor, dtype);
+            }
+            return tensors;
+        }, py::arg("dtype") = py::none(), "Returns all tensors as a dictionary of name to numpy array. See getTensor")
         .def("getTimestamp", &NNData::Buffer::getTimestamp, DOC(dai, Buffer, getTimestamp))
         .def("getTimestampDevice", &NNData::Buffer::getTimestampDevice, DOC(dai, Buffer, getTimestampDevice))
+        .def("getTimestampNs", &getMessageTimestampNs, "Returns timestamp related to dai::Clock::now() in nanoseconds")
+        .def("getTimestampDeviceNs", &getMessageTimestampDeviceNs, "Returns timestamp related to when the message was created on the device, in nanoseconds")
         .def("getSequenceNum", &NNData::Buffer::getSequenceNum, DOC(dai, Buffer, getSequenceNum))
         .def("setTimestamp", &NNData::setTimestamp, DOC(dai, NNData, setTimestamp))
         .def("setTimestampDevice", &NNData::setTimestampDevice, DOC(dai, NNData, setTimestampDevice))
         .def("setSequenceNum", &NNData::setSequenceNum, DOC(dai, NNData, setSequenceNum))
         ;
+    // Exported as a single tensor, messages with multiple tensors export them via 'getTensor'
+    bindArrayExport(nnData, [](py::object& obj) -> py::array {
+        auto raw = std::static_pointer_cast<RawNNData>(obj.cast<NNData&>().getRaw());
+        if(raw->tensors.size() != 1) {
+            throw py::buffer_error("NNData with " + std::to_string(raw->tensors.size()) + " tensors can't be exported as a single array, export 'getTensor(name)' instead");
+        }
+        return getTensorView(obj, raw->tensors[0]);
+    });
 
+    bindMessagePickle<RawNNData>(nnData);
 
 }
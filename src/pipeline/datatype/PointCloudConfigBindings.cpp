@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -60,4 +61,6 @@ void bind_pointcloudconfig(pybind11::module& m, void* pCallstack){
 
     // add aliases
 
+    bindMessagePickle<RawPointCloudConfig>(config);
+
 }
@@ -1,10 +1,16 @@
 #include "DatatypeBindings.hpp"
 #include "depthai-shared/datatype/RawPointCloudData.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/ArrayExport.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
+#include <cmath>
+#include <cstring>
 #include <unordered_map>
 #include <memory>
 
 // depthai
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
 #include "depthai/pipeline/datatype/PointCloudData.hpp"
 
 //pybind
@@ -13,6 +19,12 @@
 
 // #include "spdlog/spdlog.h"
 
+// Points without depth are either zero or non finite
+static inline bool isValidPoint(const dai::Point3f& point) {
+    if(!std::isfinite(point.x) || !std::isfinite(point.y) || !std::isfinite(point.z)) return false;
+    return point.x != 0.0f || point.y != 0.0f || point.z != 0.0f;
+}
+
 void bind_pointclouddata(pybind11::module& m, void* pCallstack){
 
     using namespace dai;
@@ -52,20 +64,96 @@ void bind_pointclouddata(pybind11::module& m, void* pCallstack){
     pointCloudData
         .def(py::init<>())
         .def_property("points", [](PointCloudData& data) { return &data.getPoints(); }, [](PointCloudData& data, std::vector<Point3f> points) {data.getPoints() = points;})
-        .def("getPoints", [](py::object &obj){
+        .def("getPoints", [](py::object &obj, bool copy){
             // creates numpy array (zero-copy) which holds correct information such as shape, ...
             dai::PointCloudData& data = obj.cast<dai::PointCloudData&>();
-            Point3f* points = (Point3f*)data.getData().data();
-            unsigned long size = data.getData().size() / sizeof(Point3f);
-            py::array_t<float> arr({size, 3UL});
-            auto ra = arr.mutable_unchecked();
-            for (int i = 0; i < size; i++) {
-                ra(i, 0) = points[i].x;
-                ra(i, 1) = points[i].y;
-                ra(i, 2) = points[i].z;
+            py::ssize_t size = data.getData().size() / sizeof(Point3f);
+            std::vector<py::ssize_t> shape = {size, 3};
+            std::vector<py::ssize_t> strides = {sizeof(Point3f), sizeof(float)};
+            if(copy){
+                py::array_t<float> arr(shape);
+                std::memcpy(arr.mutable_data(), data.getData().data(), size * sizeof(Point3f));
+                return arr;
+            }
+            return py::array_t<float>(shape, strides, reinterpret_cast<float*>(data.getData().data()), obj);
+        }, py::arg("copy") = false, "Returns numpy array of shape (N, 3) of points. Unless copy is requested, array is a view into the message data, valid for as long as the message is")
+        .def("getPointsOrganized", [](py::object &obj, bool copy){
+            dai::PointCloudData& data = obj.cast<dai::PointCloudData&>();
+            const std::size_t size = data.getData().size() / sizeof(Point3f);
+            if(data.isSparse() || static_cast<std::size_t>(data.getWidth()) * data.getHeight() != size){
+                throw std::runtime_error("PointCloudData isn't organized (sparse: " + std::to_string(data.isSparse()) + ", width: " + std::to_string(data.getWidth())
+                        + ", height: " + std::to_string(data.getHeight()) + ", points: " + std::to_string(size) + ")");
             }
+            return obj.attr("getPoints")(copy).attr("reshape")(data.getHeight(), data.getWidth(), 3);
+        }, py::arg("copy") = false, "Returns numpy array of shape (height, width, 3) of points, matching pixels of the source depth frame. Requires point cloud which isn't sparse")
+        .def("getValidPoints", [](PointCloudData& data){
+            const auto* points = reinterpret_cast<const Point3f*>(data.getData().data());
+            const std::size_t size = data.getData().size() / sizeof(Point3f);
+
+            py::array_t<float> arr(std::vector<py::ssize_t>{static_cast<py::ssize_t>(size), 3});
+            float* out = arr.mutable_data();
+            std::size_t count = 0;
+            {
+                py::gil_scoped_release release;
+                for(std::size_t i = 0; i < size; i++) {
+                    if(!isValidPoint(points[i])) continue;
+                    out[3 * count + 0] = points[i].x;
+                    out[3 * count + 1] = points[i].y;
+                    out[3 * count + 2] = points[i].z;
+                    count++;
+                }
+            }
+            arr.resize({static_cast<py::ssize_t>(count), static_cast<py::ssize_t>(3)});
             return arr;
-        })
+        }, "Returns numpy array of shape (N, 3) of points, without invalid (zero or non finite) ones")
+        .def("getPointsRGB", [](PointCloudData& data, py::object frame, bool filterInvalid){
+            const auto* points = reinterpret_cast<const Point3f*>(data.getData().data());
+            const std::size_t size = data.getData().size() / sizeof(Point3f);
+            if(data.isSparse() || static_cast<std::size_t>(data.getWidth()) * data.getHeight() != size){
+                throw std::runtime_error("Colored points require PointCloudData which isn't sparse");
+            }
+            auto& img = frame.cast<ImgFrame&>();
+            if(img.getWidth() != data.getWidth() || img.getHeight() != data.getHeight()){
+                throw std::runtime_error("ImgFrame size (" + std::to_string(img.getWidth()) + "x" + std::to_string(img.getHeight()) + ") doesn't match PointCloudData size ("
+                        + std::to_string(data.getWidth()) + "x" + std::to_string(data.getHeight()) + "). Align depth to the color camera");
+            }
+
+            // BGR (or grayscale) frame, with native conversion from other types
+            py::array_t<std::uint8_t, py::array::c_style | py::array::forcecast> bgr = frame.attr("getCvFrame")();
+            const std::size_t channels = bgr.ndim() == 3 ? bgr.shape(2) : 1;
+            if(static_cast<std::size_t>(bgr.size()) != size * channels || (channels != 1 && channels != 3)){
+                throw std::runtime_error("ImgFrame type " + std::to_string(static_cast<int>(img.getType())) + " isn't supported for coloring points");
+            }
+            const std::uint8_t* pixels = bgr.data();
+
+            py::array_t<float> outPoints(std::vector<py::ssize_t>{static_cast<py::ssize_t>(size), 3});
+            py::array_t<std::uint8_t> outColors(std::vector<py::ssize_t>{static_cast<py::ssize_t>(size), 3});
+            float* p = outPoints.mutable_data();
+            std::uint8_t* c = outColors.mutable_data();
+            std::size_t count = 0;
+            {
+                py::gil_scoped_release release;
+                for(std::size_t i = 0; i < size; i++) {
+                    if(filterInvalid && !isValidPoint(points[i])) continue;
+                    p[3 * count + 0] = points[i].x;
+                    p[3 * count + 1] = points[i].y;
+                    p[3 * count + 2] = points[i].z;
+                    if(channels == 3) {
+                        // BGR -> RGB
+                        c[3 * count + 0] = pixels[3 * i + 2];
+                        c[3 * count + 1] = pixels[3 * i + 1];
+                        c[3 * count + 2] = pixels[3 * i + 0];
+                    } else {
+                        c[3 * count + 0] = c[3 * count + 1] = c[3 * count + 2] = pixels[i];
+                    }
+                    count++;
+                }
+            }
+            outPoints.resize({static_cast<py::ssize_t>(count), static_cast<py::ssize_t>(3)});
+            outColors.resize({static_cast<py::ssize_t>(count), static_cast<py::ssize_t>(3)});
+            return py::make_tuple(outPoints, outColors);
+        }, py::arg("frame"), py::arg("filterInvalid") = true, "Returns tuple of points (N, 3) float32 and their RGB colors (N, 3) uint8, taken from aligned ImgFrame of same size. "
+           "If filterInvalid is set, invalid (zero or non finite) points are left out")
         .def("getWidth", &PointCloudData::getWidth, DOC(dai, PointCloudData, getWidth))
         .def("getHeight", &PointCloudData::getHeight, DOC(dai, PointCloudData, getHeight))
         .def("isSparse", &PointCloudData::isSparse, DOC(dai, PointCloudData, isSparse))
@@ -78,6 +166,8 @@ void bind_pointclouddata(pybind11::module& m, void* pCallstack){
         .def("getInstanceNum", &PointCloudData::getInstanceNum, DOC(dai, PointCloudData, getInstanceNum))
         .def("getTimestamp", &PointCloudData::Buffer::getTimestamp, DOC(dai, Buffer, getTimestamp))
         .def("getTimestampDevice", &PointCloudData::Buffer::getTimestampDevice, DOC(dai, Buffer, getTimestampDevice))
+        .def("getTimestampNs", &getMessageTimestampNs, "Returns timestamp related to dai::Clock::now() in nanoseconds")
+        .def("getTimestampDeviceNs", &getMessageTimestampDeviceNs, "Returns timestamp related to when the message was created on the device, in nanoseconds")
         .def("getSequenceNum", &PointCloudData::Buffer::getSequenceNum, DOC(dai, Buffer, getSequenceNum))
         .def("setWidth", &PointCloudData::setWidth, DOC(dai, PointCloudData, setWidth))
         .def("setHeight", &PointCloudData::setHeight, DOC(dai, PointCloudData, setHeight))
@@ -94,5 +184,11 @@ void bind_pointclouddata(pybind11::module& m, void* pCallstack){
         .def("setTimestampDevice", &PointCloudData::setTimestampDevice, DOC(dai, PointCloudData, setTimestampDevice))
         .def("setSequenceNum", &PointCloudData::setSequenceNum, DOC(dai, PointCloudData, setSequenceNum))
         ;
+    // Points of shape (N, 3), as given by 'getPoints'
+    bindArrayExport(pointCloudData, [](py::object& obj) -> py::array {
+        return obj.attr("getPoints")(false);
+    });
+
+    bindMessagePickle<RawPointCloudData>(pointCloudData);
 
 }
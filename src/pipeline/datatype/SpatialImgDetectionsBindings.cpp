@@ -1,5 +1,9 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
+#include "pipeline/datatype/DetectionLabel.hpp"
+#include <algorithm>
 #include <unordered_map>
 #include <memory>
 
@@ -12,6 +16,90 @@
 
 // #include "spdlog/spdlog.h"
 
+// Row of SpatialImgDetections.toNumpy(structured=True)
+struct SpatialImgDetectionRecord {
+    std::uint32_t label;
+    float confidence;
+    float xmin;
+    float ymin;
+    float xmax;
+    float ymax;
+    float x;
+    float y;
+    float z;
+};
+
+// Columns of SpatialImgDetections.toNumpy(): label, confidence, xmin, ymin, xmax, ymax, x, y, z
+constexpr py::ssize_t SPATIAL_IMG_DETECTION_COLUMNS = 9;
+
+static py::array spatialImgDetectionsToNumpy(const std::vector<dai::SpatialImgDetection>& detections, bool structured) {
+    const auto count = static_cast<py::ssize_t>(detections.size());
+    if(structured) {
+        py::array_t<SpatialImgDetectionRecord> array(count);
+        auto* records = array.mutable_data();
+        for(const auto& det : detections) {
+            const auto& xyz = det.spatialCoordinates;
+            *records++ = {det.label, det.confidence, det.xmin, det.ymin, det.xmax, det.ymax, xyz.x, xyz.y, xyz.z};
+        }
+        return array;
+    }
+
+    py::array_t<float> array({count, SPATIAL_IMG_DETECTION_COLUMNS});
+    auto* row = array.mutable_data();
+    for(const auto& det : detections) {
+        row[0] = static_cast<float>(det.label);
+        row[1] = det.confidence;
+        row[2] = det.xmin;
+        row[3] = det.ymin;
+        row[4] = det.xmax;
+        row[5] = det.ymax;
+        row[6] = det.spatialCoordinates.x;
+        row[7] = det.spatialCoordinates.y;
+        row[8] = det.spatialCoordinates.z;
+        row += SPATIAL_IMG_DETECTION_COLUMNS;
+    }
+    return array;
+}
+
+static std::vector<dai::SpatialImgDetection> spatialImgDetectionsFromNumpy(const py::array& array) {
+    std::vector<dai::SpatialImgDetection> detections;
+    if(array.dtype().equal(py::dtype::of<SpatialImgDetectionRecord>())) {
+        py::array_t<SpatialImgDetectionRecord, py::array::c_style | py::array::forcecast> records(array);
+        detections.resize(records.size());
+        const auto* record = records.data();
+        for(auto& det : detections) {
+            det.label = record->label;
+            det.confidence = record->confidence;
+            det.xmin = record->xmin;
+            det.ymin = record->ymin;
+            det.xmax = record->xmax;
+            det.ymax = record->ymax;
+            det.spatialCoordinates = {record->x, record->y, record->z};
+            record++;
+        }
+        return detections;
+    }
+
+    py::array_t<float, py::array::c_style | py::array::forcecast> rows(array);
+    if(rows.ndim() != 2 || rows.shape(1) != SPATIAL_IMG_DETECTION_COLUMNS) {
+        throw py::value_error("Expected array of shape (N, " + std::to_string(SPATIAL_IMG_DETECTION_COLUMNS) + ") or structured array as returned by toNumpy(structured=True)");
+    }
+    detections.resize(rows.shape(0));
+    const auto* row = rows.data();
+    for(std::size_t i = 0; i < detections.size(); i++) {
+        auto& det = detections[i];
+        det.label = detectionLabelFromFloat(row[0], i);
+        det.confidence = row[1];
+        det.xmin = row[2];
+        det.ymin = row[3];
+        det.xmax = row[4];
+        det.ymax = row[5];
+        det.spatialCoordinates = {row[6], row[7], row[8]};
+        row += SPATIAL_IMG_DETECTION_COLUMNS;
+    }
+    return detections;
+}
+
 void bind_spatialimgdetections(pybind11::module& m, void* pCallstack){
 
     using namespace dai;
@@ -33,6 +121,8 @@ void bind_spatialimgdetections(pybind11::module& m, void* pCallstack){
     ///////////////////////////////////////////////////////////////////////
     ///////////////////////////////////////////////////////////////////////
 
+    PYBIND11_NUMPY_DTYPE(SpatialImgDetectionRecord, label, confidence, xmin, ymin, xmax, ymax, x, y, z);
+
     // Metadata / raw
     spatialImgDetection
         .def(py::init<>())
@@ -70,14 +160,26 @@ void bind_spatialimgdetections(pybind11::module& m, void* pCallstack){
     spatialImgDetections
         .def(py::init<>())
         .def_property("detections", [](SpatialImgDetections& det) { return &det.detections; }, [](SpatialImgDetections& det, std::vector<SpatialImgDetection> val) { det.detections = val; })
+        .def("toNumpy", [](SpatialImgDetections& det, bool structured) {
+            return spatialImgDetectionsToNumpy(det.detections, structured);
+        }, py::arg("structured") = false,
+        "Returns detections as (N, 9) float32 array with columns label, confidence, xmin, ymin, xmax, ymax, x, y, z (spatial coordinates).\n"
+        "If 'structured' is set, returns structured array with fields of same names instead (label being uint32)")
+        .def_static("fromNumpy", [](py::array array) {
+            auto det = std::make_shared<SpatialImgDetections>();
+            det->detections = spatialImgDetectionsFromNumpy(array);
+            return det;
+        }, py::arg("array"), "Creates SpatialImgDetections from an array in the format returned by toNumpy. Labels must be integers within uint32 range")
         .def("getTimestamp", &SpatialImgDetections::Buffer::getTimestamp, DOC(dai, Buffer, getTimestamp))
         .def("getTimestampDevice", &SpatialImgDetections::Buffer::getTimestampDevice, DOC(dai, Buffer, getTimestampDevice))
+        .def("getTimestampNs", &getMessageTimestampNs, "Returns timestamp related to dai::Clock::now() in nanoseconds")
+        .def("getTimestampDeviceNs", &getMessageTimestampDeviceNs, "Returns timestamp related to when the message was created on the device, in nanoseconds")
         .def("getSequenceNum", &SpatialImgDetections::Buffer::getSequenceNum, DOC(dai, Buffer, getSequenceNum))
         .def("setTimestamp", &SpatialImgDetections::setTimestamp, DOC(dai, SpatialImgDetections, setTimestamp))
         .def("setTimestampDevice", &SpatialImgDetections::setTimestampDevice, DOC(dai, SpatialImgDetections, setTimestampDevice))
         .def("setSequenceNum", &SpatialImgDetections::setSequenceNum, DOC(dai, SpatialImgDetections, setSequenceNum))
         ;
 
-
+    bindMessagePickle<RawSpatialImgDetections>(spatialImgDetections);
 
 }
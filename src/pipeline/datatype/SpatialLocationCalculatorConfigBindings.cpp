@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -68,4 +69,6 @@ void bind_spatiallocationcalculatorconfig(pybind11::module& m, void* pCallstack)
         .def("get",         &SpatialLocationCalculatorConfig::get, DOC(dai, SpatialLocationCalculatorConfig, get))
         ;
 
+    bindMessagePickle<RawSpatialLocationCalculatorConfig>(spatialLocationCalculatorConfig);
+
 }
@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -264,5 +265,6 @@ void bind_stereodepthconfig(pybind11::module& m, void* pCallstack){
     m.attr("StereoDepthConfig").attr("CostMatching") = costMatching;
     m.attr("StereoDepthConfig").attr("CostAggregation") = costAggregation;
 
+    bindMessagePickle<RawStereoDepthConfig>(stereoDepthConfig);
 
 }
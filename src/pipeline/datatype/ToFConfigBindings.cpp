@@ -1,5 +1,6 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
 #include <unordered_map>
 #include <memory>
 
@@ -61,4 +62,6 @@ void bind_tofconfig(pybind11::module& m, void* pCallstack){
 
     // add aliases
 
+    bindMessagePickle<RawToFConfig>(toFConfig);
+
 }
@@ -1,7 +1,14 @@
 #include "DatatypeBindings.hpp"
 #include "pipeline/CommonBindings.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+#include "pipeline/datatype/MessagePickle.hpp"
+#include <algorithm>
+#include <chrono>
+#include <cstring>
+#include <limits>
 #include <unordered_map>
 #include <memory>
+#include <vector>
 
 // depthai
 #include "depthai/pipeline/datatype/Tracklets.hpp"
@@ -12,6 +19,262 @@
 
 // #include "spdlog/spdlog.h"
 
+// Row of Tracklets.toNumpy(structured=True)
+struct TrackletRecord {
+    std::int32_t id;
+    std::int32_t label;
+    std::int32_t age;
+    std::int32_t status;
+    float x;
+    float y;
+    float width;
+    float height;
+    float spatialX;
+    float spatialY;
+    float spatialZ;
+};
+
+// Columns of Tracklets.toNumpy(): id, label, age, status, x, y, width, height, spatialX, spatialY, spatialZ
+constexpr py::ssize_t TRACKLET_COLUMNS = 11;
+
+static py::array trackletsToNumpy(const std::vector<dai::Tracklet>& tracklets, bool structured) {
+    const auto count = static_cast<py::ssize_t>(tracklets.size());
+    if(structured) {
+        py::array_t<TrackletRecord> array(count);
+        auto* records = array.mutable_data();
+        for(const auto& t : tracklets) {
+            *records++ = {t.id, t.label, t.age, static_cast<std::int32_t>(t.status), t.roi.x, t.roi.y, t.roi.width, t.roi.height,
+                          t.spatialCoordinates.x, t.spatialCoordinates.y, t.spatialCoordinates.z};
+        }
+        return array;
+    }
+
+    py::array_t<float> array({count, TRACKLET_COLUMNS});
+    auto* row = array.mutable_data();
+    for(const auto& t : tracklets) {
+        row[0] = static_cast<float>(t.id);
+        row[1] = static_cast<float>(t.label);
+        row[2] = static_cast<float>(t.age);
+        row[3] = static_cast<float>(t.status);
+        row[4] = t.roi.x;
+        row[5] = t.roi.y;
+        row[6] = t.roi.width;
+        row[7] = t.roi.height;
+        row[8] = t.spatialCoordinates.x;
+        row[9] = t.spatialCoordinates.y;
+        row[10] = t.spatialCoordinates.z;
+        row += TRACKLET_COLUMNS;
+    }
+    return array;
+}
+
+// Host side history of tracklets, kept per track id in preallocated ring buffers.
+// Appending is O(1) per tracklet, including evicting the least recently updated track (slots are kept in an intrusive LRU list).
+// Queries copy out contiguous (oldest to newest) arrays
+class TrackletHistory {
+   public:
+    // Values stored per entry: roi x, y, width, height and spatial x, y, z
+    static constexpr std::size_t NUM_VALUES = 7;
+
+    TrackletHistory(std::size_t maxTracks, std::size_t length)
+        : maxTracks(maxTracks),
+          length(length),
+          values(maxTracks * length * NUM_VALUES),
+          sequenceNums(maxTracks * length),
+          timestamps(maxTracks * length),
+          slots(maxTracks) {
+        if(maxTracks == 0 || length == 0) {
+            throw std::invalid_argument("TrackletHistory requires non zero 'maxTracks' and 'length'");
+        }
+        freeSlots.reserve(maxTracks);
+        for(std::size_t i = maxTracks; i-- > 0;) freeSlots.push_back(i);
+    }
+
+    // Appends all tracklets of a message to their tracks. Tracks of REMOVED tracklets are dropped
+    void add(const dai::Tracklets& msg) {
+        const auto sequenceNum = msg.getSequenceNum();
+        const auto timestamp = std::chrono::duration_cast<std::chrono::nanoseconds>(msg.getTimestamp().time_since_epoch()).count();
+
+        for(const auto& t : msg.tracklets) {
+            if(t.status == dai::Tracklet::TrackingStatus::REMOVED) {
+                auto it = slotIds.find(t.id);
+                if(it != slotIds.end()) {
+                    unlink(it->second);
+                    freeSlots.push_back(it->second);
+                    slotIds.erase(it);
+                }
+                continue;
+            }
+
+            const std::size_t slotIndex = getSlot(t.id);
+            auto& slot = slots[slotIndex];
+            const std::size_t index = slot.index * length + slot.head;
+            float* value = &values[index * NUM_VALUES];
+            value[0] = t.roi.x;
+            value[1] = t.roi.y;
+            value[2] = t.roi.width;
+            value[3] = t.roi.height;
+            value[4] = t.spatialCoordinates.x;
+            value[5] = t.spatialCoordinates.y;
+            value[6] = t.spatialCoordinates.z;
+            sequenceNums[index] = sequenceNum;
+            timestamps[index] = timestamp;
+
+            slot.head = (slot.head + 1) % length;
+            slot.count = std::min(slot.count + 1, length);
+            unlink(slotIndex);
+            linkNewest(slotIndex);
+        }
+    }
+
+    bool hasTrack(std::int32_t id) const {
+        return slotIds.count(id) > 0;
+    }
+
+    std::vector<std::int32_t> getTrackIds() const {
+        std::vector<std::int32_t> ids;
+        ids.reserve(slotIds.size());
+        for(const auto& kv : slotIds) ids.push_back(kv.first);
+        std::sort(ids.begin(), ids.end());
+        return ids;
+    }
+
+    std::size_t getNumTracks() const {
+        return slotIds.size();
+    }
+
+    std::size_t getLength(std::int32_t id) const {
+        return findSlot(id).count;
+    }
+
+    // Copies last 'last' entries of a track (all if 0), oldest first, 'width' elements per entry
+    template <typename T>
+    py::array_t<T> copyOut(const std::vector<T>& storage, std::size_t width, std::int32_t id, std::size_t last) const {
+        const auto& slot = findSlot(id);
+        const std::size_t count = last == 0 ? slot.count : std::min(last, slot.count);
+
+        std::vector<py::ssize_t> shape{static_cast<py::ssize_t>(count)};
+        if(width > 1) shape.push_back(static_cast<py::ssize_t>(width));
+        py::array_t<T> array(shape);
+
+        // Entries [begin, begin + count) modulo length
+        const std::size_t begin = (slot.head + length - count) % length;
+        const std::size_t first = std::min(count, length - begin);
+        const T* base = &storage[slot.index * length * width];
+        T* dst = array.mutable_data();
+        std::memcpy(dst, base + begin * width, first * width * sizeof(T));
+        std::memcpy(dst + first * width, base, (count - first) * width * sizeof(T));
+        return array;
+    }
+
+    py::array_t<float> getHistory(std::int32_t id, std::size_t last) const {
+        return copyOut(values, NUM_VALUES, id, last);
+    }
+
+    py::array_t<std::int64_t> getSequenceNums(std::int32_t id, std::size_t last) const {
+        return copyOut(sequenceNums, 1, id, last);
+    }
+
+    py::array_t<std::int64_t> getTimestamps(std::int32_t id, std::size_t last) const {
+        return copyOut(timestamps, 1, id, last);
+    }
+
+    // Centers of track roi
+    py::array_t<float> getPositions(std::int32_t id, std::size_t last) const {
+        const auto history = getHistory(id, last);
+        py::array_t<float> positions({history.shape(0), static_cast<py::ssize_t>(2)});
+        const float* src = history.data();
+        float* dst = positions.mutable_data();
+        for(py::ssize_t i = 0; i < history.shape(0); i++) {
+            dst[0] = src[0] + src[2] / 2.0f;
+            dst[1] = src[1] + src[3] / 2.0f;
+            src += NUM_VALUES;
+            dst += 2;
+        }
+        return positions;
+    }
+
+    void clear() {
+        slotIds.clear();
+        lruOldest = NO_SLOT;
+        lruNewest = NO_SLOT;
+        freeSlots.clear();
+        for(std::size_t i = maxTracks; i-- > 0;) freeSlots.push_back(i);
+    }
+
+   private:
+    static constexpr std::size_t NO_SLOT = std::numeric_limits<std::size_t>::max();
+
+    struct Slot {
+        std::int32_t id = 0;
+        std::size_t index = 0;
+        std::size_t head = 0;
+        std::size_t count = 0;
+        // Neighbours in the LRU list, from least to most recently updated
+        std::size_t older = NO_SLOT;
+        std::size_t newer = NO_SLOT;
+    };
+
+    const Slot& findSlot(std::int32_t id) const {
+        auto it = slotIds.find(id);
+        if(it == slotIds.end()) throw py::key_error("Track " + std::to_string(id) + " not in history");
+        return slots[it->second];
+    }
+
+    // Returns slot of a track, assigning a new one if needed (evicting the least recently updated track if all are used)
+    std::size_t getSlot(std::int32_t id) {
+        auto it = slotIds.find(id);
+        if(it != slotIds.end()) return it->second;
+
+        if(freeSlots.empty()) {
+            const std::size_t oldest = lruOldest;
+            unlink(oldest);
+            slotIds.erase(slots[oldest].id);
+            freeSlots.push_back(oldest);
+        }
+        const std::size_t index = freeSlots.back();
+        freeSlots.pop_back();
+        slots[index] = Slot();
+        slots[index].id = id;
+        slots[index].index = index;
+        linkNewest(index);
+        slotIds[id] = index;
+        return index;
+    }
+
+    // Removes a slot from the LRU list
+    void unlink(std::size_t index) {
+        auto& slot = slots[index];
+        if(slot.older != NO_SLOT) slots[slot.older].newer = slot.newer;
+        else if(lruOldest == index) lruOldest = slot.newer;
+        if(slot.newer != NO_SLOT) slots[slot.newer].older = slot.older;
+        else if(lruNewest == index) lruNewest = slot.older;
+        slot.older = NO_SLOT;
+        slot.newer = NO_SLOT;
+    }
+
+    // Appends a slot to the LRU list as the most recently updated one
+    void linkNewest(std::size_t index) {
+        auto& slot = slots[index];
+        slot.older = lruNewest;
+        slot.newer = NO_SLOT;
+        if(lruNewest != NO_SLOT) slots[lruNewest].newer = index;
+        lruNewest = index;
+        if(lruOldest == NO_SLOT) lruOldest = index;
+    }
+
+    std::size_t maxTracks;
+    std::size_t length;
+    std::vector<float> values;
+    std::vector<std::int64_t> sequenceNums;
+    std::vector<std::int64_t> timestamps;
+    std::vector<Slot> slots;
+    std::vector<std::size_t> freeSlots;
+    std::unordered_map<std::int32_t, std::size_t> slotIds;
+    std::size_t lruOldest = NO_SLOT;
+    std::size_t lruNewest = NO_SLOT;
+};
+
 void bind_tracklets(pybind11::module& m, void* pCallstack){
 
     using namespace dai;
@@ -20,6 +283,7 @@ void bind_tracklets(pybind11::module& m, void* pCallstack){
     py::class_<Tracklet> tracklet(m, "Tracklet", DOC(dai, Tracklet));
     py::enum_<Tracklet::TrackingStatus> trackletTrackingStatus(tracklet, "TrackingStatus", DOC(dai, Tracklet, TrackingStatus));
     py::class_<Tracklets, Buffer, std::shared_ptr<Tracklets>> tracklets(m, "Tracklets", DOC(dai, Tracklets));
+    py::class_<TrackletHistory> trackletHistory(m, "TrackletHistory", "Host side history of tracklets per track id, stored in preallocated ring buffers");
 
     ///////////////////////////////////////////////////////////////////////
     ///////////////////////////////////////////////////////////////////////
@@ -34,6 +298,8 @@ void bind_tracklets(pybind11::module& m, void* pCallstack){
     ///////////////////////////////////////////////////////////////////////
     ///////////////////////////////////////////////////////////////////////
 
+    PYBIND11_NUMPY_DTYPE(TrackletRecord, id, label, age, status, x, y, width, height, spatialX, spatialY, spatialZ);
+
     // Metadata / raw
     tracklet
         .def(py::init<>())
@@ -62,12 +328,38 @@ void bind_tracklets(pybind11::module& m, void* pCallstack){
     tracklets
         .def(py::init<>())
         .def_property("tracklets", [](Tracklets& track) { return &track.tracklets; }, [](Tracklets& track, std::vector<Tracklet> val) { track.tracklets = val; }, DOC(dai, Tracklets, tracklets))
+        .def("toNumpy", [](Tracklets& track, bool structured) {
+            return trackletsToNumpy(track.tracklets, structured);
+        }, py::arg("structured") = false,
+        "Returns tracklets as (N, 11) float32 array with columns id, label, age, status, x, y, width, height (roi), spatialX, spatialY, spatialZ.\n"
+        "If 'structured' is set, returns structured array with fields of same names instead (id, label, age and status being int32)")
         .def("getTimestamp", &Tracklets::Buffer::getTimestamp, DOC(dai, Buffer, getTimestamp))
         .def("getTimestampDevice", &Tracklets::Buffer::getTimestampDevice, DOC(dai, Buffer, getTimestampDevice))
+        .def("getTimestampNs", &getMessageTimestampNs, "Returns timestamp related to dai::Clock::now() in nanoseconds")
+        .def("getTimestampDeviceNs", &getMessageTimestampDeviceNs, "Returns timestamp related to when the message was created on the device, in nanoseconds")
         .def("getSequenceNum", &Tracklets::Buffer::getSequenceNum, DOC(dai, Buffer, getSequenceNum))
         .def("setTimestamp", &Tracklets::setTimestamp, DOC(dai, Tracklets, setTimestamp))
         .def("setTimestampDevice", &Tracklets::setTimestampDevice, DOC(dai, Tracklets, setTimestampDevice))
         .def("setSequenceNum", &Tracklets::setSequenceNum, DOC(dai, Tracklets, setSequenceNum))
         ;
 
+    trackletHistory
+        .def(py::init<std::size_t, std::size_t>(), py::arg("maxTracks"), py::arg("length"),
+             "Creates history for up to 'maxTracks' tracks, keeping last 'length' entries of each. When full, least recently updated track is evicted")
+        .def("add", &TrackletHistory::add, py::arg("tracklets"), "Appends tracklets to their tracks. Tracks of REMOVED tracklets are dropped")
+        .def("hasTrack", &TrackletHistory::hasTrack, py::arg("id"))
+        .def("getTrackIds", &TrackletHistory::getTrackIds, "Returns sorted ids of tracks in history")
+        .def("getLength", &TrackletHistory::getLength, py::arg("id"), "Returns number of entries stored for a track")
+        .def("getHistory", &TrackletHistory::getHistory, py::arg("id"), py::arg("last") = 0,
+             "Returns last entries of a track (all if 'last' is 0), oldest first, as (N, 7) float32 array with columns x, y, width, height (roi), spatialX, spatialY, spatialZ")
+        .def("getPositions", &TrackletHistory::getPositions, py::arg("id"), py::arg("last") = 0, "Returns roi centers of last entries of a track as (N, 2) float32 array, oldest first")
+        .def("getSequenceNums", &TrackletHistory::getSequenceNums, py::arg("id"), py::arg("last") = 0, "Returns sequence numbers of the messages of last entries of a track")
+        .def("getTimestamps", &TrackletHistory::getTimestamps, py::arg("id"), py::arg("last") = 0, "Returns host timestamps (ns) of the messages of last entries of a track")
+        .def("clear", &TrackletHistory::clear, "Removes all tracks")
+        .def("__len__", &TrackletHistory::getNumTracks)
+        .def("__contains__", &TrackletHistory::hasTrack)
+        ;
+
+    bindMessagePickle<RawTracklets>(tracklets);
+
 }
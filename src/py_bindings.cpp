@@ -25,6 +25,11 @@
 #include "DeviceBootloaderBindings.hpp"
 #include "DatatypeBindings.hpp"
 #include "DataQueueBindings.hpp"
+#include "HostSyncBindings.hpp"
+#include "SharedMemoryQueueBindings.hpp"
+#include "RecordingBindings.hpp"
+#include "ReplayBindings.hpp"
+#include "MockDeviceBindings.hpp"
 #include "openvino/OpenVINOBindings.hpp"
 #include "log/LogBindings.hpp"
 #include "VersionBindings.hpp"
@@ -46,6 +51,11 @@ PYBIND11_MODULE(depthai, m)
     callstack.push_front(&LogBindings::bind);
     callstack.push_front(&VersionBindings::bind);
     callstack.push_front(&DataQueueBindings::bind);
+    callstack.push_front(&HostSyncBindings::bind);
+    callstack.push_front(&SharedMemoryQueueBindings::bind);
+    callstack.push_front(&RecordingBindings::bind);
+    callstack.push_front(&ReplayBindings::bind);
+    callstack.push_front(&MockDeviceBindings::bind);
     callstack.push_front(&OpenVINOBindings::bind);
     NodeBindings::addToCallstack(callstack);
     callstack.push_front(&AssetManagerBindings::bind);
@@ -0,0 +1,118 @@
+#pragma once
+
+// std
+#include <chrono>
+#include <functional>
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+
+// pybind
+#include <pybind11/pybind11.h>
+
+// project
+#include "utility/MockQueue.hpp"
+#include "utility/QueueStats.hpp"
+
+// Output queue of any bound queue type - DataOutputQueue or MockDataOutputQueue - for host side consumers
+// which are given queues from Python (Recorder, SharedMemoryQueue, HostSync). Keeps the queue alive
+class AnyOutputQueue {
+   public:
+    virtual ~AnyOutputQueue() = default;
+    virtual std::string getName() const = 0;
+    virtual bool isClosed() const = 0;
+    virtual std::vector<std::shared_ptr<dai::ADatatype>> tryGetAll() = 0;
+    virtual int addCallback(std::function<void(std::shared_ptr<dai::ADatatype>)> callback) = 0;
+    virtual int addCallback(std::function<void()> callback) = 0;
+    virtual bool removeCallback(int callbackId) = 0;
+    // Counters of the queue, attached if it wasn't accessed from the bindings yet
+    virtual std::shared_ptr<QueueCounters> getCounters() const = 0;
+};
+
+template <typename Queue>
+class AnyOutputQueueOf : public AnyOutputQueue {
+   public:
+    explicit AnyOutputQueueOf(std::shared_ptr<Queue> queue) : queue(std::move(queue)) {}
+
+    std::string getName() const override {
+        return queue->getName();
+    }
+    bool isClosed() const override {
+        return queue->isClosed();
+    }
+    std::vector<std::shared_ptr<dai::ADatatype>> tryGetAll() override {
+        return queue->tryGetAll();
+    }
+    int addCallback(std::function<void(std::shared_ptr<dai::ADatatype>)> callback) override {
+        return queue->addCallback(std::move(callback));
+    }
+    int addCallback(std::function<void()> callback) override {
+        return queue->addCallback(std::move(callback));
+    }
+    bool removeCallback(int callbackId) override {
+        return queue->removeCallback(callbackId);
+    }
+    std::shared_ptr<QueueCounters> getCounters() const override {
+        return QueueCountersRegistry::get(queue);
+    }
+
+   private:
+    std::shared_ptr<Queue> queue;
+};
+
+// Input queue of any bound queue type - DataInputQueue or MockDataInputQueue - for host side producers (Replay). Keeps the queue alive
+class AnyInputQueue {
+   public:
+    virtual ~AnyInputQueue() = default;
+    virtual std::string getName() const = 0;
+    // Waits at most 'timeout' for space in a blocking queue. Returns false on timeout
+    virtual bool send(const std::shared_ptr<dai::ADatatype>& msg, std::chrono::milliseconds timeout) = 0;
+    virtual std::shared_ptr<QueueCounters> getCounters() const = 0;
+};
+
+template <typename Queue>
+class AnyInputQueueOf : public AnyInputQueue {
+   public:
+    explicit AnyInputQueueOf(std::shared_ptr<Queue> queue) : queue(std::move(queue)) {}
+
+    std::string getName() const override {
+        return queue->getName();
+    }
+    bool send(const std::shared_ptr<dai::ADatatype>& msg, std::chrono::milliseconds timeout) override {
+        return queue->send(msg, timeout);
+    }
+    std::shared_ptr<QueueCounters> getCounters() const override {
+        return QueueCountersRegistry::get(queue);
+    }
+
+   private:
+    std::shared_ptr<Queue> queue;
+};
+
+// Output queue of a Python object, nullptr if None. Must be called with GIL held
+inline std::shared_ptr<AnyOutputQueue> castAnyOutputQueue(pybind11::handle queue) {
+    if(queue.is_none()) return nullptr;
+    if(pybind11::isinstance<dai::DataOutputQueue>(queue)) {
+        return std::make_shared<AnyOutputQueueOf<dai::DataOutputQueue>>(queue.cast<std::shared_ptr<dai::DataOutputQueue>>());
+    }
+    if(pybind11::isinstance<MockOutputQueue>(queue)) {
+        return std::make_shared<AnyOutputQueueOf<MockOutputQueue>>(queue.cast<std::shared_ptr<MockOutputQueue>>());
+    }
+    throw pybind11::type_error("Expected DataOutputQueue or MockDataOutputQueue, got " + pybind11::str(pybind11::type::of(queue).attr("__name__")).cast<std::string>());
+}
+
+// Input queue of a Python object, nullptr if None. Must be called with GIL held
+inline std::shared_ptr<AnyInputQueue> castAnyInputQueue(pybind11::handle queue) {
+    if(queue.is_none()) return nullptr;
+    if(pybind11::isinstance<dai::DataInputQueue>(queue)) {
+        return std::make_shared<AnyInputQueueOf<dai::DataInputQueue>>(queue.cast<std::shared_ptr<dai::DataInputQueue>>());
+    }
+    if(pybind11::isinstance<MockInputQueue>(queue)) {
+        return std::make_shared<AnyInputQueueOf<MockInputQueue>>(queue.cast<std::shared_ptr<MockInputQueue>>());
+    }
+    throw pybind11::type_error("Expected DataInputQueue or MockDataInputQueue, got " + pybind11::str(pybind11::type::of(queue).attr("__name__")).cast<std::string>());
+}
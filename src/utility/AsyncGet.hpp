@@ -0,0 +1,169 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <memory>
+#include <stdexcept>
+
+// pybind
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+// project
+#include "utility/QueueStats.hpp"
+
+// Interval in which a pending future checks whether its queue was closed.
+// Core queues don't call callbacks when closed (eg. on device close or disconnect), so closure isn't notified
+constexpr std::chrono::milliseconds ASYNC_GET_CLOSED_CHECK_INTERVAL{100};
+
+// State of a pending 'getAsync', 'getAllAsync' or '__anext__' call.
+// Instead of parking a thread per awaitable, a one-shot callback is registered on the queue,
+// which schedules resolving of the future on the event loop once a message arrives.
+// Queue is a DataOutputQueue or any queue providing the same 'tryGet', 'tryGetAll', 'has', 'isClosed',
+// 'addCallback(std::function<void()>)' and 'removeCallback' interface
+template <typename Queue>
+struct AsyncGetState {
+    std::weak_ptr<Queue> queue;
+    // Counters messages taken are recorded on, if the queue is instrumented
+    std::shared_ptr<QueueCounters> counters;
+    bool all = false;
+    bool iteration = false;
+    pybind11::object loop;
+    pybind11::object future;
+    std::atomic<bool> scheduled{false};
+    std::atomic<int> callbackId{-1};
+
+    ~AsyncGetState() {
+        // May be destroyed from XLink reading thread, Python objects require GIL to be released
+        pybind11::gil_scoped_acquire acquire;
+        loop = pybind11::object();
+        future = pybind11::object();
+    }
+};
+
+template <typename Queue>
+void asyncGetArm(const std::shared_ptr<AsyncGetState<Queue>>& state);
+
+// Tries to complete the future with messages already in queue
+// Returns true if future was completed
+template <typename Queue>
+bool asyncGetTryResolve(AsyncGetState<Queue>& state) {
+    auto queue = state.queue.lock();
+    try {
+        if(!queue) throw std::runtime_error("Queue was destroyed");
+        if(state.all) {
+            auto messages = queue->tryGetAll();
+            if(messages.empty()) return false;
+            if(state.counters) state.counters->onOut(messages);
+            state.future.attr("set_result")(messages);
+        } else {
+            auto message = queue->tryGet();
+            if(message == nullptr) return false;
+            if(state.counters) state.counters->onOut(message);
+            state.future.attr("set_result")(message);
+        }
+    } catch(const std::runtime_error& ex) {
+        // Queue closed
+        if(state.iteration) {
+            state.future.attr("set_exception")(pybind11::reinterpret_borrow<pybind11::object>(PyExc_StopAsyncIteration)());
+        } else {
+            state.future.attr("set_exception")(pybind11::reinterpret_borrow<pybind11::object>(PyExc_RuntimeError)(ex.what()));
+        }
+    }
+    return true;
+}
+
+// Runs on the event loop thread
+template <typename Queue>
+void asyncGetResolve(const std::shared_ptr<AsyncGetState<Queue>>& state) {
+    // Remove the one-shot callback. Release GIL as XLink reading thread
+    // might hold the callbacks lock while waiting for GIL
+    if(auto queue = state->queue.lock()) {
+        pybind11::gil_scoped_release release;
+        queue->removeCallback(state->callbackId);
+    }
+
+    // Cancelled in the meantime
+    if(state->future.attr("done")().template cast<bool>()) return;
+
+    // Message might have already been taken by another consumer - wait for the next one
+    if(!asyncGetTryResolve(*state)) asyncGetArm(state);
+}
+
+// Can be called from any thread
+template <typename Queue>
+void asyncGetSchedule(const std::shared_ptr<AsyncGetState<Queue>>& state) {
+    if(state->scheduled.exchange(true)) return;
+
+    pybind11::gil_scoped_acquire acquire;
+    try {
+        state->loop.attr("call_soon_threadsafe")(pybind11::cpp_function([state]() { asyncGetResolve(state); }));
+    } catch(pybind11::error_already_set&) {
+        // Event loop already closed, nothing left to resolve
+    }
+}
+
+template <typename Queue>
+void asyncGetArm(const std::shared_ptr<AsyncGetState<Queue>>& state) {
+    auto queue = state->queue.lock();
+    if(!queue) {
+        asyncGetTryResolve(*state);
+        return;
+    }
+
+    state->scheduled = false;
+    {
+        pybind11::gil_scoped_release release;
+        state->callbackId = queue->addCallback([state]() { asyncGetSchedule(state); });
+    }
+    // A message might have arrived before the callback was registered
+    if(queue->isClosed() || queue->has()) asyncGetSchedule(state);
+}
+
+// Runs on the event loop thread until the future is done, resolving it once the queue is closed or destroyed.
+// Holds the state, so the future is resolved even if the queue and its callbacks are destroyed
+template <typename Queue>
+void asyncGetWatchClosed(const std::shared_ptr<AsyncGetState<Queue>>& state) {
+    try {
+        state->loop.attr("call_later")(std::chrono::duration<double>(ASYNC_GET_CLOSED_CHECK_INTERVAL).count(), pybind11::cpp_function([state]() {
+            if(state->future.attr("done")().template cast<bool>()) return;
+            auto queue = state->queue.lock();
+            if(!queue || queue->isClosed()) asyncGetSchedule(state);
+            asyncGetWatchClosed(state);
+        }));
+    } catch(pybind11::error_already_set&) {
+        // Event loop already closed, nothing left to resolve
+    }
+}
+
+template <typename Queue>
+pybind11::object asyncGet(const std::shared_ptr<Queue>& queue, bool all, bool iteration, std::shared_ptr<QueueCounters> counters = nullptr) {
+    auto loop = pybind11::module::import("asyncio").attr("get_running_loop")();
+    auto state = std::make_shared<AsyncGetState<Queue>>();
+    state->queue = queue;
+    state->counters = std::move(counters);
+    state->all = all;
+    state->iteration = iteration;
+    state->loop = loop;
+    state->future = loop.attr("create_future")();
+
+    // Fast path, messages already available
+    if(asyncGetTryResolve(*state)) return state->future;
+    asyncGetArm(state);
+    asyncGetWatchClosed(state);
+
+    // Cancelled (eg. by 'asyncio.wait_for' timing out) - don't leave the one-shot callback registered until the next message.
+    // Holds the state weakly, as the state holds the future
+    std::weak_ptr<AsyncGetState<Queue>> weakState = state;
+    state->future.attr("add_done_callback")(pybind11::cpp_function([weakState](pybind11::object future) {
+        if(!future.attr("cancelled")().template cast<bool>()) return;
+        auto state = weakState.lock();
+        if(!state) return;
+        if(auto queue = state->queue.lock()) {
+            pybind11::gil_scoped_release release;
+            queue->removeCallback(state->callbackId);
+        }
+    }));
+    return state->future;
+}
@@ -0,0 +1,70 @@
+#pragma once
+
+// std
+#include <algorithm>
+#include <chrono>
+
+// pybind
+#include <pybind11/pybind11.h>
+
+// Interval at which a call blocked on the main thread wakes up to process Python signals (eg. KeyboardInterrupt)
+constexpr std::chrono::milliseconds SIGNAL_CHECK_INTERVAL{100};
+
+// Converts a slice to the millisecond timeouts of core queues, rounding up, so a sub-millisecond remainder
+// waits for a whole millisecond instead of truncating to a zero timeout and spinning until the deadline
+inline std::chrono::milliseconds ceilMilliseconds(std::chrono::microseconds slice) {
+    if(slice <= std::chrono::microseconds(0)) return std::chrono::milliseconds(0);
+    return std::chrono::duration_cast<std::chrono::milliseconds>(slice + std::chrono::microseconds(999));
+}
+
+// Identifier of the Python main thread - the only thread on which Python runs signal handlers
+// Must be called with GIL held
+inline unsigned long getMainThreadId() {
+    static const unsigned long mainThreadId = pybind11::module::import("threading").attr("main_thread")().attr("ident").cast<unsigned long>();
+    return mainThreadId;
+}
+
+inline bool isMainThread() {
+    return PyThread_get_thread_ident() == getMainThreadId();
+}
+
+// Performs a blocking operation with the GIL released.
+// 'op' is invoked with the maximum duration it may block for (negative meaning indefinitely)
+// and returns true once it completed.
+// Threads other than the main one never have to handle signals, so they block in a single call until
+// the operation completes, times out or throws (eg. queue closed) - without ever reacquiring the GIL in between.
+// The main thread blocks in slices of SIGNAL_CHECK_INTERVAL to stay responsive to interrupts.
+//
+// @param timeout Maximum time to block for. If negative then wait is indefinite
+// @returns True if operation completed, false if timeout occurred
+template <typename Op>
+bool blockingCall(Op&& op, std::chrono::microseconds timeout = std::chrono::microseconds(-1)) {
+    using namespace std::chrono;
+
+    const bool unlimitedTimeout = timeout < microseconds(0);
+    const bool checkSignals = isMainThread();
+    const auto deadline = steady_clock::now() + (unlimitedTimeout ? microseconds(0) : timeout);
+
+    while(true) {
+        microseconds slice(-1);
+        if(!unlimitedTimeout) {
+            slice = std::max(duration_cast<microseconds>(deadline - steady_clock::now()), microseconds(0));
+        }
+        if(checkSignals && (slice < microseconds(0) || slice > SIGNAL_CHECK_INTERVAL)) {
+            slice = SIGNAL_CHECK_INTERVAL;
+        }
+
+        bool done = false;
+        {
+            // releases python GIL
+            pybind11::gil_scoped_release release;
+            done = op(slice);
+        }
+        if(done) return true;
+
+        // reacquired python GIL - check if interrupt triggered in between
+        if(checkSignals && PyErr_CheckSignals() != 0) throw pybind11::error_already_set();
+
+        if(!unlimitedTimeout && steady_clock::now() >= deadline) return false;
+    }
+}
@@ -0,0 +1,487 @@
+#pragma once
+
+// std
+#include <algorithm>
+#include <array>
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <type_traits>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/ADatatype.hpp"
+#include "depthai/pipeline/datatype/MessageGroup.hpp"
+#include "depthai/pipeline/datatype/StreamMessageParser.hpp"
+#include "depthai/utility/LockingQueue.hpp"
+#include "depthai-shared/datatype/RawMessageGroup.hpp"
+
+// pybind
+#include <pybind11/pybind11.h>
+
+// project
+#include "utility/QueueStats.hpp"
+
+// Default size of mock queues, same as of device queues
+constexpr unsigned int MOCK_QUEUE_DEFAULT_MAX_SIZE = 16;
+// Interval in which waiting link threads check whether they were stopped
+constexpr std::chrono::milliseconds MOCK_STOP_CHECK_INTERVAL{100};
+
+// Snapshot of mock link counters
+struct MockLinkStats {
+    std::uint64_t messagesSent = 0;
+    std::uint64_t bytesSent = 0;
+    std::uint64_t messagesReceived = 0;
+    std::uint64_t bytesReceived = 0;
+    std::uint64_t messagesConsumed = 0;
+    std::chrono::nanoseconds elapsed{0};
+    double messagesPerSecond = 0.0;
+    double bytesPerSecond = 0.0;
+    std::chrono::microseconds meanLatency{0};
+    std::chrono::microseconds maxLatency{0};
+    std::array<std::uint64_t, QUEUE_WAIT_HISTOGRAM_BUCKETS> latencyHistogram{};
+};
+
+// Counters of all queues of a mock device, updated lock-free from link threads and Python threads (relaxed, as they are only statistics).
+// Latency is measured from a message being added to an input queue until it is taken from an output queue
+class MockLinkCounters {
+   public:
+    MockLinkCounters() {
+        reset();
+    }
+
+    void onSend(std::size_t bytes) {
+        messagesSent.fetch_add(1, std::memory_order_relaxed);
+        bytesSent.fetch_add(bytes, std::memory_order_relaxed);
+    }
+
+    void onReceive(std::size_t bytes) {
+        messagesReceived.fetch_add(1, std::memory_order_relaxed);
+        bytesReceived.fetch_add(bytes, std::memory_order_relaxed);
+    }
+
+    void onConsume(std::chrono::steady_clock::time_point sent) {
+        const auto us = std::chrono::duration_cast<std::chrono::microseconds>(std::chrono::steady_clock::now() - sent).count();
+        const auto bucket = std::upper_bound(QUEUE_WAIT_HISTOGRAM_BOUNDS_US.begin(), QUEUE_WAIT_HISTOGRAM_BOUNDS_US.end(), us) - QUEUE_WAIT_HISTOGRAM_BOUNDS_US.begin();
+        latencyHistogram[bucket].fetch_add(1, std::memory_order_relaxed);
+        messagesConsumed.fetch_add(1, std::memory_order_relaxed);
+        totalLatencyUs.fetch_add(us, std::memory_order_relaxed);
+        auto peak = maxLatencyUs.load(std::memory_order_relaxed);
+        while(us > peak && !maxLatencyUs.compare_exchange_weak(peak, us, std::memory_order_relaxed)) {
+        }
+    }
+
+    MockLinkStats snapshot() const {
+        using namespace std::chrono;
+        MockLinkStats stats;
+        stats.messagesSent = messagesSent.load(std::memory_order_relaxed);
+        stats.bytesSent = bytesSent.load(std::memory_order_relaxed);
+        stats.messagesReceived = messagesReceived.load(std::memory_order_relaxed);
+        stats.bytesReceived = bytesReceived.load(std::memory_order_relaxed);
+        stats.messagesConsumed = messagesConsumed.load(std::memory_order_relaxed);
+        stats.elapsed = steady_clock::now() - steady_clock::time_point(steady_clock::duration(startTime.load(std::memory_order_relaxed)));
+        const double seconds = duration<double>(stats.elapsed).count();
+        if(seconds > 0.0) {
+            stats.messagesPerSecond = stats.messagesReceived / seconds;
+            stats.bytesPerSecond = stats.bytesReceived / seconds;
+        }
+        if(stats.messagesConsumed > 0) stats.meanLatency = microseconds(totalLatencyUs.load(std::memory_order_relaxed) / static_cast<std::int64_t>(stats.messagesConsumed));
+        stats.maxLatency = microseconds(maxLatencyUs.load(std::memory_order_relaxed));
+        for(std::size_t i = 0; i < QUEUE_WAIT_HISTOGRAM_BUCKETS; i++) stats.latencyHistogram[i] = latencyHistogram[i].load(std::memory_order_relaxed);
+        return stats;
+    }
+
+    // Resets all counters and restarts the elapsed time
+    void reset() {
+        messagesSent = 0;
+        bytesSent = 0;
+        messagesReceived = 0;
+        bytesReceived = 0;
+        messagesConsumed = 0;
+        totalLatencyUs = 0;
+        maxLatencyUs = 0;
+        for(auto& bucket : latencyHistogram) bucket = 0;
+        startTime = std::chrono::steady_clock::now().time_since_epoch().count();
+    }
+
+   private:
+    std::atomic<std::uint64_t> messagesSent{0};
+    std::atomic<std::uint64_t> bytesSent{0};
+    std::atomic<std::uint64_t> messagesReceived{0};
+    std::atomic<std::uint64_t> bytesReceived{0};
+    std::atomic<std::uint64_t> messagesConsumed{0};
+    std::atomic<std::int64_t> totalLatencyUs{0};
+    std::atomic<std::int64_t> maxLatencyUs{0};
+    std::array<std::atomic<std::uint64_t>, QUEUE_WAIT_HISTOGRAM_BUCKETS> latencyHistogram{};
+    std::atomic<std::chrono::steady_clock::rep> startTime{0};
+};
+
+// Host side of an XLinkOut stream of a mock device, with the interface of DataOutputQueue, so the same bindings apply to both.
+// Not a DataOutputQueue, which can only be created over an XLinkConnection to a booted device, but built on the same LockingQueue.
+// Messages are pushed, and callbacks called, by writing threads of connected input queues
+class MockOutputQueue {
+   public:
+    using Callback = std::function<void(std::string, std::shared_ptr<dai::ADatatype>)>;
+
+    // Message in the queue, with the time it was sent at
+    struct Entry {
+        std::shared_ptr<dai::ADatatype> msg;
+        std::chrono::steady_clock::time_point sent;
+    };
+
+    MockOutputQueue(std::string name, std::shared_ptr<MockLinkCounters> counters)
+        : queue(MOCK_QUEUE_DEFAULT_MAX_SIZE, true), name(std::move(name)), counters(std::move(counters)) {}
+
+    // Waits at most 'timeout' for space in a blocking queue. Returns false on timeout or once closed
+    bool push(const Entry& entry, std::size_t bytes, std::chrono::microseconds timeout) {
+        if(!running || !queue.tryWaitAndPush(entry, timeout)) return false;
+        counters->onReceive(bytes);
+
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        for(const auto& kv : callbacks) {
+            try {
+                kv.second(name, entry.msg);
+            } catch(pybind11::error_already_set& ex) {
+                pybind11::gil_scoped_acquire acquire;
+                ex.discard_as_unraisable("MockDataOutputQueue callback");
+            } catch(const std::exception&) {
+                // Callbacks mustn't break the link
+            }
+        }
+        return true;
+    }
+
+    std::string getName() const {
+        return name;
+    }
+
+    bool isClosed() const {
+        return !running;
+    }
+
+    void close() {
+        running = false;
+        queue.destruct();
+    }
+
+    void setBlocking(bool blocking) {
+        checkRunning();
+        queue.setBlocking(blocking);
+    }
+
+    bool getBlocking() const {
+        checkRunning();
+        return queue.getBlocking();
+    }
+
+    void setMaxSize(unsigned int maxSize) {
+        checkRunning();
+        queue.setMaxSize(maxSize);
+    }
+
+    unsigned int getMaxSize() const {
+        checkRunning();
+        return queue.getMaxSize();
+    }
+
+    int addCallback(Callback callback) {
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        callbacks[nextCallbackId] = std::move(callback);
+        return nextCallbackId++;
+    }
+
+    int addCallback(std::function<void(std::shared_ptr<dai::ADatatype>)> callback) {
+        return addCallback([callback](std::string, std::shared_ptr<dai::ADatatype> msg) { callback(std::move(msg)); });
+    }
+
+    int addCallback(std::function<void()> callback) {
+        return addCallback([callback](std::string, std::shared_ptr<dai::ADatatype>) { callback(); });
+    }
+
+    bool removeCallback(int callbackId) {
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        return callbacks.erase(callbackId) > 0;
+    }
+
+    bool has() const {
+        checkRunning();
+        return !queue.empty();
+    }
+
+    std::shared_ptr<dai::ADatatype> tryGet() {
+        checkRunning();
+        Entry entry;
+        if(!queue.tryPop(entry)) return nullptr;
+        return take(entry);
+    }
+
+    std::shared_ptr<dai::ADatatype> get() {
+        checkRunning();
+        Entry entry;
+        if(!queue.waitAndPop(entry)) throw std::runtime_error(closedMessage());
+        return take(entry);
+    }
+
+    template <typename Rep, typename Period>
+    std::shared_ptr<dai::ADatatype> get(std::chrono::duration<Rep, Period> timeout, bool& timedout) {
+        checkRunning();
+        Entry entry;
+        timedout = !queue.tryWaitAndPop(entry, timeout);
+        if(timedout) {
+            checkRunning();
+            return nullptr;
+        }
+        return take(entry);
+    }
+
+    std::vector<std::shared_ptr<dai::ADatatype>> tryGetAll() {
+        checkRunning();
+        std::vector<std::shared_ptr<dai::ADatatype>> messages;
+        queue.consumeAll([this, &messages](Entry& entry) { messages.push_back(take(entry)); });
+        return messages;
+    }
+
+    std::vector<std::shared_ptr<dai::ADatatype>> getAll() {
+        checkRunning();
+        std::vector<std::shared_ptr<dai::ADatatype>> messages;
+        if(!queue.waitAndConsumeAll([this, &messages](Entry& entry) { messages.push_back(take(entry)); })) throw std::runtime_error(closedMessage());
+        return messages;
+    }
+
+    template <typename Rep, typename Period>
+    std::vector<std::shared_ptr<dai::ADatatype>> getAll(std::chrono::duration<Rep, Period> timeout, bool& timedout) {
+        checkRunning();
+        std::vector<std::shared_ptr<dai::ADatatype>> messages;
+        timedout = !queue.waitAndConsumeAll([this, &messages](Entry& entry) { messages.push_back(take(entry)); }, timeout);
+        if(timedout) checkRunning();
+        return messages;
+    }
+
+   private:
+    std::shared_ptr<dai::ADatatype> take(Entry& entry) {
+        counters->onConsume(entry.sent);
+        return std::move(entry.msg);
+    }
+
+    std::string closedMessage() const {
+        return "MockDataOutputQueue (" + name + ") closed";
+    }
+
+    void checkRunning() const {
+        if(!running) throw std::runtime_error(closedMessage());
+    }
+
+    dai::LockingQueue<Entry> queue;
+    const std::string name;
+    std::shared_ptr<MockLinkCounters> counters;
+    std::atomic<bool> running{true};
+    std::mutex callbacksMtx;
+    std::unordered_map<int, Callback> callbacks;
+    int nextCallbackId = 0;
+};
+
+// Host side of an XLinkIn stream of a mock device, with the interface of DataInputQueue.
+// Its writing thread serializes messages exactly as they are written to XLink and delivers them to the output queues
+// of XLinkOut nodes linked to the XLinkIn node, parsed as DataOutputQueue parses them
+class MockInputQueue {
+   public:
+    MockInputQueue(std::string name, std::size_t maxDataSize, std::vector<std::shared_ptr<MockOutputQueue>> outputs, std::shared_ptr<MockLinkCounters> counters)
+        : queue(MOCK_QUEUE_DEFAULT_MAX_SIZE, true), name(std::move(name)), maxDataSize(maxDataSize), outputs(std::move(outputs)), counters(std::move(counters)) {
+        writingThread = std::thread([this]() { write(); });
+    }
+
+    ~MockInputQueue() {
+        // Callbacks on the writing thread may be waiting for the GIL
+        if(PyGILState_Check()) {
+            pybind11::gil_scoped_release release;
+            close();
+        } else {
+            close();
+        }
+    }
+
+    std::string getName() const {
+        return name;
+    }
+
+    bool isClosed() const {
+        return !running;
+    }
+
+    // Stops the writing thread, dropping messages which weren't delivered yet
+    void close() {
+        std::unique_lock<std::mutex> lock(closeMtx);
+        running = false;
+        queue.destruct();
+        if(writingThread.joinable() && writingThread.get_id() != std::this_thread::get_id()) writingThread.join();
+    }
+
+    void setBlocking(bool blocking) {
+        checkRunning();
+        queue.setBlocking(blocking);
+    }
+
+    bool getBlocking() const {
+        checkRunning();
+        return queue.getBlocking();
+    }
+
+    void setMaxSize(unsigned int maxSize) {
+        checkRunning();
+        queue.setMaxSize(maxSize);
+    }
+
+    unsigned int getMaxSize() const {
+        checkRunning();
+        return queue.getMaxSize();
+    }
+
+    std::size_t getMaxDataSize() const {
+        return maxDataSize;
+    }
+
+    // Serializes a message as DataInputQueue::send does
+    std::shared_ptr<dai::RawBuffer> serialize(const dai::ADatatype& msg) const {
+        auto raw = msg.serialize();
+        checkDataSize(*raw);
+        return raw;
+    }
+
+    // Same as DataInputQueue::send, serializing the message on the calling thread
+    void send(const std::shared_ptr<dai::ADatatype>& msg) {
+        if(!msg) throw std::invalid_argument("Message passed is not valid (nullptr)");
+        push(serialize(*msg), std::chrono::steady_clock::now(), std::chrono::microseconds(-1));
+    }
+
+    bool send(const std::shared_ptr<dai::ADatatype>& msg, std::chrono::milliseconds timeout) {
+        if(!msg) throw std::invalid_argument("Message passed is not valid (nullptr)");
+        return push(serialize(*msg), std::chrono::steady_clock::now(), timeout);
+    }
+
+    void send(const std::shared_ptr<dai::RawBuffer>& raw) {
+        if(!raw) throw std::invalid_argument("Message passed is not valid (nullptr)");
+        checkDataSize(*raw);
+        push(raw, std::chrono::steady_clock::now(), std::chrono::microseconds(-1));
+    }
+
+    bool send(const std::shared_ptr<dai::RawBuffer>& raw, std::chrono::milliseconds timeout) {
+        if(!raw) throw std::invalid_argument("Message passed is not valid (nullptr)");
+        checkDataSize(*raw);
+        return push(raw, std::chrono::steady_clock::now(), timeout);
+    }
+
+    // Adds a serialized message sent at 'sent', waiting at most 'timeout' (negative meaning indefinitely) for space in a blocking queue.
+    // Returns false on timeout
+    bool push(const std::shared_ptr<dai::RawBuffer>& raw, std::chrono::steady_clock::time_point sent, std::chrono::microseconds timeout) {
+        checkRunning();
+        const Packet packet{raw, sent};
+        if(timeout < std::chrono::microseconds(0)) {
+            if(!queue.push(packet)) throw std::runtime_error("Underlying queue destructed");
+            return true;
+        }
+        return queue.tryWaitAndPush(packet, timeout);
+    }
+
+   private:
+    struct Packet {
+        std::shared_ptr<dai::RawBuffer> raw;
+        std::chrono::steady_clock::time_point sent;
+    };
+
+    void write() {
+        try {
+            while(running) {
+                Packet packet;
+                if(!queue.waitAndPop(packet)) continue;
+
+                // A MessageGroup is written followed by its messages, which the group references by index
+                std::vector<std::vector<std::uint8_t>> serialized;
+                if(packet.raw->getType() == dai::DatatypeEnum::MessageGroup) {
+                    auto rawMsgGrp = std::static_pointer_cast<dai::RawMessageGroup>(packet.raw);
+                    serialized.reserve(rawMsgGrp->group.size() + 1);
+                    serialized.emplace_back();
+                    std::uint32_t index = 0;
+                    for(auto& msg : rawMsgGrp->group) {
+                        msg.second.index = index++;
+                        serialized.push_back(dai::StreamMessageParser::serializeMessage(msg.second.buffer));
+                    }
+                    serialized.front() = dai::StreamMessageParser::serializeMessage(packet.raw);
+                } else {
+                    serialized.push_back(dai::StreamMessageParser::serializeMessage(packet.raw));
+                }
+                std::size_t bytes = 0;
+                for(const auto& data : serialized) bytes += data.size();
+                counters->onSend(bytes);
+
+                // Each linked stream parses its own copy
+                for(const auto& output : outputs) {
+                    const MockOutputQueue::Entry entry{parse(serialized), packet.sent};
+                    while(!output->push(entry, bytes, MOCK_STOP_CHECK_INTERVAL)) {
+                        if(!running || output->isClosed()) break;
+                    }
+                }
+            }
+        } catch(const std::exception& ex) {
+            exceptionMessage = std::string("Mock link exception. Original message '") + ex.what() + "'";
+        }
+
+        running = false;
+        queue.destruct();
+    }
+
+    // Parses packets the same as DataOutputQueue reads them from XLink
+    static std::shared_ptr<dai::ADatatype> parse(std::vector<std::vector<std::uint8_t>>& packets) {
+        auto parsePacket = [](std::vector<std::uint8_t>& data, dai::DatatypeEnum& type) {
+            streamPacketDesc_t packet{};
+            packet.data = data.data();
+            packet.length = static_cast<std::uint32_t>(data.size());
+            return dai::StreamMessageParser::parseMessageToADatatype(&packet, type);
+        };
+
+        dai::DatatypeEnum type;
+        auto data = parsePacket(packets.front(), type);
+        if(type == dai::DatatypeEnum::MessageGroup) {
+            auto msgGrp = std::static_pointer_cast<dai::MessageGroup>(data);
+            std::vector<std::shared_ptr<dai::ADatatype>> messages;
+            messages.reserve(packets.size() - 1);
+            for(std::size_t i = 1; i < packets.size(); i++) {
+                dai::DatatypeEnum messageType;
+                messages.push_back(parsePacket(packets[i], messageType));
+            }
+            auto rawMsgGrp = std::static_pointer_cast<dai::RawMessageGroup>(data->getRaw());
+            for(auto& msg : rawMsgGrp->group) msgGrp->add(msg.first, messages.at(msg.second.index));
+        }
+        return data;
+    }
+
+    void checkDataSize(const dai::RawBuffer& raw) const {
+        if(raw.data.size() > maxDataSize) {
+            throw std::runtime_error("Trying to send larger (" + std::to_string(raw.data.size()) + "B) message than XLinkIn maxDataSize (" + std::to_string(maxDataSize) + "B)");
+        }
+    }
+
+    void checkRunning() const {
+        if(!running) throw std::runtime_error(exceptionMessage.empty() ? "MockDataInputQueue (" + name + ") closed" : exceptionMessage);
+    }
+
+    dai::LockingQueue<Packet> queue;
+    const std::string name;
+    const std::size_t maxDataSize;
+    const std::vector<std::shared_ptr<MockOutputQueue>> outputs;
+    std::shared_ptr<MockLinkCounters> counters;
+    std::atomic<bool> running{true};
+    std::string exceptionMessage;
+    std::mutex closeMtx;
+    std::thread writingThread;
+};
+
+template <>
+struct IsInputQueue<MockInputQueue> : std::true_type {};
@@ -0,0 +1,730 @@
+#pragma once
+
+// std
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <deque>
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/ADatatype.hpp"
+#include "depthai/utility/LockingQueue.hpp"
+
+// pybind
+#include "pybind11_common.hpp"
+
+// project
+#include "pipeline/datatype/HostMessage.hpp"
+#include "utility/AsyncGet.hpp"
+#include "utility/BlockingCall.hpp"
+#include "utility/QueueLimiter.hpp"
+#include "utility/QueueStats.hpp"
+
+// Bindings side features of queues, shared by DataOutputQueue / DataInputQueue and queues of the same interface (MockDevice queues).
+// Queue types only need to provide the methods of the core queues these use
+
+// Interval in which 'sendAsync' retries to add a message to a full blocking queue.
+// Doubles with each failed attempt, so many pending sends on an idle loop don't spin it
+constexpr std::chrono::milliseconds ASYNC_SEND_RETRY_INTERVAL_MIN{1};
+constexpr std::chrono::milliseconds ASYNC_SEND_RETRY_INTERVAL_MAX{32};
+
+// Input queues have no notification when space frees up, so a full blocking queue
+// is retried from the event loop itself, without parking a thread
+template <typename Queue, typename MSG>
+void asyncSendTry(std::shared_ptr<Queue> queue, std::shared_ptr<QueueCounters> counters, std::shared_ptr<MSG> msg, py::object loop, py::object future, std::chrono::milliseconds retryInterval) {
+    if(future.attr("done")().cast<bool>()) return;
+    try {
+        const auto bytes = getMessageDataSize(*msg);
+        if(queue->send(msg, std::chrono::milliseconds(0))) {
+            counters->onSend(bytes);
+            future.attr("set_result")(py::none());
+            return;
+        }
+    } catch(const std::exception& ex) {
+        future.attr("set_exception")(py::reinterpret_borrow<py::object>(PyExc_RuntimeError)(ex.what()));
+        return;
+    }
+    const auto nextInterval = std::min(retryInterval * 2, ASYNC_SEND_RETRY_INTERVAL_MAX);
+    loop.attr("call_later")(std::chrono::duration<double>(retryInterval).count(), py::cpp_function([queue, counters, msg, loop, future, nextInterval]() {
+        asyncSendTry(queue, counters, msg, loop, future, nextInterval);
+    }));
+}
+
+template <typename Queue, typename MSG>
+py::object asyncSend(py::object self, std::shared_ptr<MSG> msg) {
+    auto loop = py::module::import("asyncio").attr("get_running_loop")();
+    auto future = loop.attr("create_future")();
+    asyncSendTry(self.cast<std::shared_ptr<Queue>>(), getQueueCounters<Queue>(self), std::move(msg), loop, future, ASYNC_SEND_RETRY_INTERVAL_MIN);
+    return future;
+}
+
+// Blocking 'get' of an output queue or its limiter
+template <typename Queue>
+bool blockingGet(Queue& queue, std::chrono::microseconds timeout, std::shared_ptr<dai::ADatatype>& msg) {
+    return blockingCall([&](std::chrono::microseconds slice){
+        if(slice < std::chrono::microseconds(0)) {
+            msg = queue.get();
+            return true;
+        }
+        bool timedout = true;
+        msg = queue.get(slice, timedout);
+        return !timedout;
+    }, timeout);
+}
+
+// Blocking 'getAll' of an output queue or its limiter
+template <typename Queue>
+bool blockingGetAll(Queue& queue, std::chrono::microseconds timeout, std::vector<std::shared_ptr<dai::ADatatype>>& messages) {
+    return blockingCall([&](std::chrono::microseconds slice){
+        if(slice < std::chrono::microseconds(0)) {
+            messages = queue.getAll();
+            return true;
+        }
+        bool timedout = true;
+        messages = queue.getAll(slice, timedout);
+        return !timedout;
+    }, timeout);
+}
+
+// Batches kept pending for a dispatched callback before the oldest messages are dropped
+constexpr std::size_t CALLBACK_MAX_PENDING_BATCHES = 16;
+// Interval in which an idle dispatcher checks whether its queue was closed (closing doesn't call the queue callbacks)
+constexpr std::chrono::milliseconds CALLBACK_CLOSED_CHECK_INTERVAL{100};
+
+// Delivers messages of an output queue to a Python callback from a worker thread, in batches.
+// The queue reading thread only appends messages to the pending batch, so it never waits for the GIL,
+// and each batch is delivered with a single GIL acquisition.
+// At most CALLBACK_MAX_PENDING_BATCHES batches are kept pending, older messages are dropped and counted on the queue counters.
+// The worker exits by itself once the queue is closed and pending messages are delivered. It is stopped and joined by 'stop',
+// called from 'removeCallback', when the dispatcher is destroyed and at interpreter exit (see CallbackDispatcherRegistry)
+class CallbackDispatcher {
+   public:
+    CallbackDispatcher(py::function callback,
+                       py::object executor,
+                       std::size_t batch,
+                       std::chrono::microseconds maxLatency,
+                       std::shared_ptr<QueueCounters> counters,
+                       std::function<bool()> queueClosed)
+        : state(std::make_shared<State>()) {
+        state->callback = std::move(callback);
+        state->counters = std::move(counters);
+        state->executor = std::move(executor);
+        state->batch = std::max<std::size_t>(batch, 1);
+        state->maxLatency = maxLatency;
+        state->queueClosed = std::move(queueClosed);
+        auto s = state;
+        worker = std::thread([s]() { run(*s); });
+    }
+
+    ~CallbackDispatcher() {
+        stop();
+        releasePython();
+    }
+
+    // Called from the queue reading thread
+    void push(std::shared_ptr<dai::ADatatype> msg) {
+        std::shared_ptr<dai::ADatatype> dropped;
+        {
+            std::unique_lock<std::mutex> lock(state->mtx);
+            state->pending.emplace_back(std::chrono::steady_clock::now(), std::move(msg));
+            // Python can't keep up, drop the oldest messages
+            if(state->pending.size() > state->batch * CALLBACK_MAX_PENDING_BATCHES) {
+                dropped = std::move(state->pending.front().second);
+                state->pending.pop_front();
+            }
+        }
+        if(dropped && state->counters) state->counters->onCallbackDrop();
+        state->cv.notify_one();
+    }
+
+    // Stops the worker and waits for it, a batch being delivered is completed. Can be called with or without the GIL, repeatedly
+    void stop() {
+        {
+            std::unique_lock<std::mutex> lock(state->mtx);
+            state->running = false;
+        }
+        state->cv.notify_all();
+        // The worker might be waiting for the GIL to deliver a batch
+        if(PyGILState_Check()) {
+            py::gil_scoped_release release;
+            join();
+        } else {
+            join();
+        }
+    }
+
+    // Drops the references to the callback and executor, acquiring the GIL. Done once the worker is stopped,
+    // at the latest at interpreter exit, so dispatchers destroyed during finalization don't touch Python
+    void releasePython() {
+        if(state->released.exchange(true)) return;
+        py::gil_scoped_acquire acquire;
+        state->callback = py::function();
+        state->executor = py::object();
+    }
+
+   private:
+    struct State {
+        std::mutex mtx;
+        std::condition_variable cv;
+        std::deque<std::pair<std::chrono::steady_clock::time_point, std::shared_ptr<dai::ADatatype>>> pending;
+        bool running = true;
+        std::atomic<bool> released{false};
+        py::function callback;
+        py::object executor;
+        std::size_t batch = 1;
+        std::chrono::microseconds maxLatency{0};
+        std::shared_ptr<QueueCounters> counters;
+        std::function<bool()> queueClosed;
+    };
+
+    void join() {
+        std::unique_lock<std::mutex> lock(workerMtx);
+        if(!worker.joinable()) return;
+        if(worker.get_id() == std::this_thread::get_id()) {
+            // Destroyed on its own worker, which released the last reference to the queue, and exits right after
+            worker.detach();
+        } else {
+            worker.join();
+        }
+    }
+
+    static void run(State& state) {
+        std::unique_lock<std::mutex> lock(state.mtx);
+        while(state.running) {
+            if(state.pending.empty()) {
+                if(!state.cv.wait_for(lock, CALLBACK_CLOSED_CHECK_INTERVAL, [&state]() { return !state.running || !state.pending.empty(); })) {
+                    lock.unlock();
+                    const bool closed = state.queueClosed();
+                    lock.lock();
+                    if(closed && state.pending.empty()) return;
+                }
+                continue;
+            }
+
+            // Wait for the batch to fill up, at most 'maxLatency' since the oldest message arrived
+            const auto deadline = state.pending.front().first + state.maxLatency;
+            state.cv.wait_until(lock, deadline, [&state]() { return !state.running || state.pending.size() >= state.batch; });
+            if(!state.running) return;
+
+            std::vector<std::shared_ptr<dai::ADatatype>> messages;
+            const std::size_t count = std::min(state.batch, state.pending.size());
+            messages.reserve(count);
+            for(std::size_t i = 0; i < count; i++) {
+                messages.push_back(std::move(state.pending.front().second));
+                state.pending.pop_front();
+            }
+
+            lock.unlock();
+            {
+                py::gil_scoped_acquire acquire;
+                try {
+                    if(state.executor.is_none()) {
+                        state.callback(messages);
+                    } else {
+                        state.executor.attr("submit")(state.callback, messages);
+                    }
+                } catch(py::error_already_set& ex) {
+                    ex.discard_as_unraisable("DataOutputQueue callback");
+                }
+            }
+            lock.lock();
+        }
+    }
+
+    std::shared_ptr<State> state;
+    std::mutex workerMtx;
+    std::thread worker;
+};
+
+// Dispatchers by queue and callback id, so 'removeCallback' stops the worker of the removed callback
+// and all workers are stopped at interpreter exit, while their callbacks can still be released
+class CallbackDispatcherRegistry {
+   public:
+    // Must be called with GIL held
+    static void add(const void* queue, int callbackId, const std::shared_ptr<CallbackDispatcher>& dispatcher) {
+        auto& registry = instance();
+        if(!registry.atexitRegistered) {
+            registry.atexitRegistered = true;
+            py::module::import("atexit").attr("register")(py::cpp_function([]() { stopAll(); }));
+        }
+        std::unique_lock<std::mutex> lock(registry.mtx);
+        // Drop entries of removed callbacks and destroyed queues
+        for(auto it = registry.entries.begin(); it != registry.entries.end();) {
+            it = it->second.expired() ? registry.entries.erase(it) : std::next(it);
+        }
+        registry.entries[{queue, callbackId}] = dispatcher;
+    }
+
+    // Removes a dispatcher from the registry, returning it if still alive
+    static std::shared_ptr<CallbackDispatcher> take(const void* queue, int callbackId) {
+        auto& registry = instance();
+        std::unique_lock<std::mutex> lock(registry.mtx);
+        auto it = registry.entries.find({queue, callbackId});
+        if(it == registry.entries.end()) return nullptr;
+        auto dispatcher = it->second.lock();
+        registry.entries.erase(it);
+        return dispatcher;
+    }
+
+   private:
+    // Called at interpreter exit, with GIL held
+    static void stopAll() {
+        std::vector<std::shared_ptr<CallbackDispatcher>> dispatchers;
+        {
+            auto& registry = instance();
+            std::unique_lock<std::mutex> lock(registry.mtx);
+            for(auto& kv : registry.entries) {
+                if(auto dispatcher = kv.second.lock()) dispatchers.push_back(std::move(dispatcher));
+            }
+            registry.entries.clear();
+        }
+        for(auto& dispatcher : dispatchers) {
+            dispatcher->stop();
+            dispatcher->releasePython();
+        }
+    }
+
+    static CallbackDispatcherRegistry& instance() {
+        static CallbackDispatcherRegistry registry;
+        return registry;
+    }
+
+    std::mutex mtx;
+    std::map<std::pair<const void*, int>, std::weak_ptr<CallbackDispatcher>> entries;
+    // Only accessed with GIL held
+    bool atexitRegistered = false;
+};
+
+// Independent consumer of an output queue, fed by a callback on its reading thread.
+// Holds the same messages (shared, not copied) in its own queue, with its own size and blocking behavior.
+// A blocking subscription applies backpressure - the reading thread waits until it has space, stalling the stream for all consumers.
+// Provides the 'tryGet', 'tryGetAll', 'has', 'isClosed', 'addCallback' and 'removeCallback' interface of DataOutputQueue
+class QueueSubscription {
+   public:
+    // Queue is a DataOutputQueue or a queue of the same interface
+    template <typename Queue>
+    QueueSubscription(const std::shared_ptr<Queue>& queue, unsigned int maxSize, bool blocking)
+        : name(queue->getName()), feed(std::make_shared<Feed>(maxSize, blocking)) {
+        if(maxSize == 0) throw std::invalid_argument("Subscription maximum size must be at least 1");
+        std::weak_ptr<Queue> weakQueue = queue;
+        queueClosed = [weakQueue]() {
+            auto q = weakQueue.lock();
+            return !q || q->isClosed();
+        };
+        // The callback only holds the feed, so the subscription is never destroyed on the reading thread
+        auto f = feed;
+        py::gil_scoped_release release;
+        const int callbackId = queue->addCallback([f](std::shared_ptr<dai::ADatatype> msg) {
+            if(f->out.push(msg)) f->notify();
+        });
+        detach = [weakQueue, callbackId]() {
+            if(auto q = weakQueue.lock()) q->removeCallback(callbackId);
+        };
+    }
+
+    ~QueueSubscription() {
+        // Reading thread might hold the queue callbacks lock while waiting for the GIL
+        if(PyGILState_Check()) {
+            py::gil_scoped_release release;
+            close();
+        } else {
+            close();
+        }
+    }
+
+    void close() {
+        if(closed.exchange(true)) return;
+        // Unblock the reading thread first, it might be waiting for space while holding the callbacks lock
+        feed->out.destruct();
+        detach();
+        feed->notify();
+    }
+
+    bool isClosed() const {
+        return closed || queueClosed();
+    }
+
+    std::string getName() const {
+        return name;
+    }
+
+    unsigned int getMaxSize() const {
+        return feed->out.getMaxSize();
+    }
+
+    bool getBlocking() const {
+        return feed->out.getBlocking();
+    }
+
+    bool has() {
+        return !feed->out.empty();
+    }
+
+    std::shared_ptr<dai::ADatatype> tryGet() {
+        std::shared_ptr<dai::ADatatype> msg;
+        if(feed->out.tryPop(msg)) return msg;
+        if(isClosed()) throw std::runtime_error("Subscription is closed");
+        return nullptr;
+    }
+
+    std::vector<std::shared_ptr<dai::ADatatype>> tryGetAll() {
+        std::vector<std::shared_ptr<dai::ADatatype>> messages;
+        feed->out.consumeAll([&messages](std::shared_ptr<dai::ADatatype>& msg) { messages.push_back(std::move(msg)); });
+        if(messages.empty() && isClosed()) throw std::runtime_error("Subscription is closed");
+        return messages;
+    }
+
+    std::shared_ptr<dai::ADatatype> get() {
+        bool timedout = true;
+        std::shared_ptr<dai::ADatatype> msg;
+        while(timedout) msg = get(QUEUE_LIMITER_CLOSED_CHECK_INTERVAL, timedout);
+        return msg;
+    }
+
+    template <typename Rep, typename Period>
+    std::shared_ptr<dai::ADatatype> get(std::chrono::duration<Rep, Period> timeout, bool& timedout) {
+        std::shared_ptr<dai::ADatatype> msg;
+        // Closing the underlying queue doesn't notify, wake up periodically to check
+        const auto deadline = std::chrono::steady_clock::now() + timeout;
+        while(true) {
+            const auto remaining = std::max<std::chrono::steady_clock::duration>(deadline - std::chrono::steady_clock::now(), std::chrono::steady_clock::duration(0));
+            if(feed->out.tryWaitAndPop(msg, std::min<std::chrono::steady_clock::duration>(remaining, QUEUE_LIMITER_CLOSED_CHECK_INTERVAL))) {
+                timedout = false;
+                return msg;
+            }
+            if(isClosed()) throw std::runtime_error("Subscription is closed");
+            if(std::chrono::steady_clock::now() >= deadline) {
+                timedout = true;
+                return nullptr;
+            }
+        }
+    }
+
+    std::vector<std::shared_ptr<dai::ADatatype>> getAll() {
+        bool timedout = true;
+        std::vector<std::shared_ptr<dai::ADatatype>> messages;
+        while(timedout) messages = getAll(QUEUE_LIMITER_CLOSED_CHECK_INTERVAL, timedout);
+        return messages;
+    }
+
+    template <typename Rep, typename Period>
+    std::vector<std::shared_ptr<dai::ADatatype>> getAll(std::chrono::duration<Rep, Period> timeout, bool& timedout) {
+        std::vector<std::shared_ptr<dai::ADatatype>> messages;
+        auto first = get(timeout, timedout);
+        if(timedout) return messages;
+        messages.push_back(std::move(first));
+        feed->out.consumeAll([&messages](std::shared_ptr<dai::ADatatype>& msg) { messages.push_back(std::move(msg)); });
+        return messages;
+    }
+
+    int addCallback(std::function<void()> callback) {
+        std::unique_lock<std::mutex> lock(feed->callbacksMtx);
+        feed->callbacks[feed->nextCallbackId] = std::move(callback);
+        return feed->nextCallbackId++;
+    }
+
+    bool removeCallback(int callbackId) {
+        std::unique_lock<std::mutex> lock(feed->callbacksMtx);
+        return feed->callbacks.erase(callbackId) > 0;
+    }
+
+   private:
+    struct Feed {
+        Feed(unsigned int maxSize, bool blocking) : out(maxSize, blocking) {}
+
+        void notify() {
+            std::unique_lock<std::mutex> lock(callbacksMtx);
+            for(auto& kv : callbacks) kv.second();
+        }
+
+        dai::LockingQueue<std::shared_ptr<dai::ADatatype>> out;
+        std::mutex callbacksMtx;
+        std::unordered_map<int, std::function<void()>> callbacks;
+        int nextCallbackId = 0;
+    };
+
+    // Subscribed queue, held weakly and type erased
+    std::function<bool()> queueClosed;
+    std::function<void()> detach;
+    std::string name;
+    std::shared_ptr<Feed> feed;
+    std::atomic<bool> closed{false};
+};
+
+// Output queue getters, taking messages from the host side limiter if the queue is limited and counting them.
+// Queue is a DataOutputQueue or a queue of the same interface, 'self' its Python object. Must be called with GIL held
+template <typename Queue>
+bool outputQueueHas(py::object self) {
+    if(auto limiter = findQueueLimiter(*getQueueCounters<Queue>(self))) return limiter->has();
+    return self.cast<Queue&>().has();
+}
+
+template <typename Queue>
+std::shared_ptr<dai::ADatatype> outputQueueTryGet(py::object self) {
+    auto counters = getQueueCounters<Queue>(self);
+    auto limiter = findQueueLimiter(*counters);
+    auto d = limiter ? limiter->tryGet() : self.cast<Queue&>().tryGet();
+    counters->onOut(d);
+    return d;
+}
+
+template <typename Queue>
+std::vector<std::shared_ptr<dai::ADatatype>> outputQueueTryGetAll(py::object self) {
+    auto counters = getQueueCounters<Queue>(self);
+    auto limiter = findQueueLimiter(*counters);
+    auto messages = limiter ? limiter->tryGetAll() : self.cast<Queue&>().tryGetAll();
+    counters->onOut(messages);
+    return messages;
+}
+
+// Binds the features the bindings add to output queues - counted blocking and awaitable getters, batched callbacks,
+// host side limits, subscriptions and statistics - onto DataOutputQueue or a queue class of the same interface.
+// Basic methods of the queue ('getName', 'has', 'tryGet', unbatched 'addCallback', ...) are bound by the caller, before these.
+// 'removeCallback' is bound here, as it also stops the worker of a batched callback
+template <typename Queue>
+void bindOutputQueue(py::class_<Queue, std::shared_ptr<Queue>>& queueClass) {
+    using namespace std::chrono;
+
+    queueClass
+        .def("addCallback", [](py::object self, py::function cb, py::object executor, std::size_t batch, double maxLatencyMs) -> int {
+            auto queue = self.cast<std::shared_ptr<Queue>>();
+            auto numParams = py::len(py::module::import("inspect").attr("signature")(cb).attr("parameters"));
+            if(numParams != 1) throw py::value_error("Batched callback must take one argument - list of messages");
+            std::weak_ptr<Queue> weakQueue = queue;
+            auto queueClosed = [weakQueue]() {
+                auto q = weakQueue.lock();
+                return !q || q->isClosed();
+            };
+            auto dispatcher = std::make_shared<CallbackDispatcher>(
+                std::move(cb), std::move(executor), batch, duration_cast<microseconds>(duration<double, std::milli>(maxLatencyMs)), getQueueCounters<Queue>(self), std::move(queueClosed));
+            int callbackId;
+            {
+                py::gil_scoped_release release;
+                callbackId = queue->addCallback([dispatcher](std::shared_ptr<dai::ADatatype> msg) { dispatcher->push(std::move(msg)); });
+            }
+            CallbackDispatcherRegistry::add(queue.get(), callbackId, dispatcher);
+            return callbackId;
+        }, py::arg("callback"), py::arg("executor") = py::none(), py::arg("batch") = 1, py::arg("maxLatencyMs") = 0.0,
+        "Adds a callback called with lists of messages from a worker thread, so the queue reading thread never waits for Python.\n"
+        "Up to 'batch' messages are delivered at once, waiting at most 'maxLatencyMs' for a batch to fill up.\n"
+        "If 'executor' (eg. concurrent.futures.ThreadPoolExecutor) is given, batches are submitted to it instead (not preserving order).\n"
+        "At most 16 batches ('batch' * 16 messages) are kept pending - if Python falls behind further, oldest messages are dropped\n"
+        "and counted in 'getStats().callbackDropped'. The worker is stopped by 'removeCallback' (after which the callback isn't called anymore),\n"
+        "once the queue is closed and at interpreter exit. Returns callback id")
+        .def("removeCallback", [](py::object self, int callbackId){
+            auto& queue = self.cast<Queue&>();
+            // Held until its worker is stopped, so the dispatcher isn't destroyed under the queue callbacks lock
+            auto dispatcher = CallbackDispatcherRegistry::take(&queue, callbackId);
+            bool removed;
+            {
+                py::gil_scoped_release release;
+                removed = queue.removeCallback(callbackId);
+            }
+            if(dispatcher) dispatcher->stop();
+            return removed;
+        }, py::arg("callbackId"), DOC(dai, DataOutputQueue, removeCallback))
+        .def("getAll", [](py::object self, microseconds timeout){
+            auto& obj = self.cast<Queue&>();
+            auto counters = getQueueCounters<Queue>(self);
+            std::vector<std::shared_ptr<dai::ADatatype>> messages;
+            const auto start = steady_clock::now();
+            auto limiter = findQueueLimiter(*counters);
+            bool done = limiter ? blockingGetAll(*limiter, timeout, messages) : blockingGetAll(obj, timeout, messages);
+            counters->onWait(steady_clock::now() - start, !done);
+            counters->onOut(messages);
+            return messages;
+        }, py::arg("timeout") = microseconds(-1), DOC(dai, DataOutputQueue, getAll, 2))
+        .def("get", [](py::object self, microseconds timeout){
+            auto& obj = self.cast<Queue&>();
+            auto counters = getQueueCounters<Queue>(self);
+            std::shared_ptr<dai::ADatatype> d = nullptr;
+            const auto start = steady_clock::now();
+            auto limiter = findQueueLimiter(*counters);
+            bool done = limiter ? blockingGet(*limiter, timeout, d) : blockingGet(obj, timeout, d);
+            counters->onWait(steady_clock::now() - start, !done);
+            counters->onOut(d);
+            return d;
+        }, py::arg("timeout") = microseconds(-1), DOC(dai, DataOutputQueue, get, 2))
+        .def("getAsync", [](py::object self){
+            auto counters = getQueueCounters<Queue>(self);
+            if(auto limiter = findQueueLimiter(*counters)) return asyncGet(limiter, false, false, counters);
+            return asyncGet(self.cast<std::shared_ptr<Queue>>(), false, false, counters);
+        }, "Awaitable variant of 'get'. Must be called from a running asyncio event loop. Returns a future which completes once a message is available")
+        .def("getAllAsync", [](py::object self){
+            auto counters = getQueueCounters<Queue>(self);
+            if(auto limiter = findQueueLimiter(*counters)) return asyncGet(limiter, true, false, counters);
+            return asyncGet(self.cast<std::shared_ptr<Queue>>(), true, false, counters);
+        }, "Awaitable variant of 'getAll'. Must be called from a running asyncio event loop. Returns a future which completes with all messages in the queue, once at least one is available")
+        .def("__aiter__", [](py::object self){
+            return self;
+        })
+        .def("__anext__", [](py::object self){
+            auto obj = self.cast<std::shared_ptr<Queue>>();
+            auto counters = getQueueCounters<Queue>(self);
+            auto limiter = findQueueLimiter(*counters);
+            if(limiter ? limiter->isClosed() : obj->isClosed()) {
+                PyErr_SetNone(PyExc_StopAsyncIteration);
+                throw py::error_already_set();
+            }
+            if(limiter) return asyncGet(limiter, false, true, counters);
+            return asyncGet(obj, false, true, counters);
+        })
+        .def("setMaxBytes", [](std::shared_ptr<Queue> obj, std::size_t maxBytes){
+            QueueLimiterRegistry::get(obj)->setMaxBytes(maxBytes);
+        }, py::arg("maxBytes"), "Sets maximum total size of message data kept in the queue on host, 0 meaning unlimited.\n"
+        "Once set, messages are held on host side and the queue drops messages by its drop policy instead of blocking,\n"
+        "until the limits are removed by 'removeLimits'. At least one message is always kept, regardless of the drop policy")
+        .def("getMaxBytes", [](std::shared_ptr<Queue> obj){
+            auto limiter = QueueLimiterRegistry::find(obj);
+            return limiter ? limiter->getMaxBytes() : 0;
+        }, "Returns maximum total size of message data kept in the queue, 0 meaning unlimited")
+        .def("setDropPolicy", [](std::shared_ptr<Queue> obj, QueueDropPolicy policy, unsigned int keepEveryN){
+            QueueLimiterRegistry::get(obj)->setDropPolicy(policy, keepEveryN);
+        }, py::arg("policy"), py::arg("keepEveryN") = 1, "Sets which messages are dropped once the queue exceeds its maximum size, maximum bytes or the device host memory budget.\n"
+        "'keepEveryN' is the decimation used by KEEP_EVERY_NTH policy.\n"
+        "Once set, messages are held on host side and the queue drops messages instead of blocking, until the limits are removed by 'removeLimits'")
+        .def("removeLimits", [](std::shared_ptr<Queue> obj){
+            QueueLimiterRegistry::detach(obj);
+        }, "Removes maximum bytes and drop policy of the queue, and excludes it from the device host memory budget,\n"
+        "so the queue behaves as set by 'setMaxSize' and 'setBlocking' again. Messages already held on host side are returned first")
+        .def("getDropPolicy", [](std::shared_ptr<Queue> obj){
+            auto limiter = QueueLimiterRegistry::find(obj);
+            return limiter ? limiter->getDropPolicy() : QueueDropPolicy::DROP_OLDEST;
+        }, "Returns drop policy of the queue")
+        .def("getKeepEveryN", [](std::shared_ptr<Queue> obj){
+            auto limiter = QueueLimiterRegistry::find(obj);
+            return limiter ? limiter->getKeepEveryN() : 1u;
+        }, "Returns decimation used by KEEP_EVERY_NTH drop policy")
+        .def("subscribe", [](std::shared_ptr<Queue> obj, unsigned int maxSize, bool blocking){
+            return std::make_shared<QueueSubscription>(obj, maxSize, blocking);
+        }, py::arg("maxSize") = 4, py::arg("blocking") = false,
+        "Creates an independent consumer of this queue's messages, with its own maximum size and blocking behavior.\n"
+        "A blocking subscription stalls the stream (for all consumers) while full. The queue itself keeps receiving messages too,\n"
+        "so if only subscriptions are consumed, the queue should be non-blocking")
+        .def("getStats", [](py::object self){
+            return getQueueCounters<Queue>(self)->snapshot(self.cast<Queue&>().getName());
+        }, "Returns snapshot of queue counters. Counting starts when the queue is first returned by 'getOutputQueue' (or since 'resetStats'),\n"
+        "messages the queue received before that aren't counted. Messages dropped are the ones overwritten by a non-blocking queue")
+        .def("resetStats", [](py::object self){
+            getQueueCounters<Queue>(self)->reset();
+        }, "Resets queue counters (except current depth)")
+        ;
+}
+
+// Counted blocking 'send' of an input queue, MSG being a message or a raw message
+template <typename Queue, typename MSG>
+bool inputQueueSend(py::object self, const std::shared_ptr<MSG>& d, std::chrono::microseconds timeout) {
+    using namespace std::chrono;
+    auto& obj = self.cast<Queue&>();
+    auto counters = getQueueCounters<Queue>(self);
+    const auto bytes = d ? getMessageDataSize(*d) : 0;
+    const auto start = steady_clock::now();
+    bool sent = blockingCall([&](microseconds slice){
+        if(slice < microseconds(0)) {
+            obj.send(d);
+            return true;
+        }
+        return obj.send(d, ceilMilliseconds(slice));
+    }, timeout);
+    counters->onWait(steady_clock::now() - start, !sent);
+    if(sent) counters->onSend(bytes);
+    return sent;
+}
+
+// Binds the features the bindings add to input queues - counted blocking and awaitable sends and statistics -
+// onto DataInputQueue or a queue class of the same interface
+template <typename Queue>
+void bindInputQueue(py::class_<Queue, std::shared_ptr<Queue>>& queueClass) {
+    using namespace std::chrono;
+
+    queueClass
+        .def("send", [](py::object self, std::shared_ptr<dai::ADatatype> d, microseconds timeout){
+            return inputQueueSend<Queue>(self, d, timeout);
+        }, py::arg("msg"), py::arg("timeout") = microseconds(-1), DOC(dai, DataInputQueue, send, 2))
+        .def("send", [](py::object self, std::shared_ptr<dai::RawBuffer> d, microseconds timeout){
+            return inputQueueSend<Queue>(self, d, timeout);
+        }, py::arg("rawMsg"), py::arg("timeout") = microseconds(-1), DOC(dai, DataInputQueue, send))
+        .def("sendAsync", [](py::object self, std::shared_ptr<dai::ADatatype> d){
+            return asyncSend<Queue>(self, d);
+        }, py::arg("msg"), "Awaitable variant of 'send'. Must be called from a running asyncio event loop. Returns a future which completes once the message is added to the queue.\n"
+        "A full blocking queue is retried from the event loop, backing off from 1 ms up to 32 ms between attempts")
+        .def("sendAsync", [](py::object self, std::shared_ptr<dai::RawBuffer> d){
+            return asyncSend<Queue>(self, d);
+        }, py::arg("rawMsg"), "Awaitable variant of 'send'. Must be called from a running asyncio event loop. Returns a future which completes once the raw message is added to the queue")
+        .def("getStats", [](py::object self){
+            return getQueueCounters<Queue>(self)->snapshot(self.cast<Queue&>().getName());
+        }, "Returns snapshot of queue counters. Every send made through the bindings is counted (since 'resetStats', if called).\n"
+        "Messages in are the ones sent, depth and drops aren't tracked for input queues")
+        .def("resetStats", [](py::object self){
+            getQueueCounters<Queue>(self)->reset();
+        }, "Resets queue counters")
+        ;
+}
+
+// Messages taken from output queues, in order of given queue names
+using QueueMessages = std::vector<std::pair<std::string, std::vector<std::shared_ptr<dai::ADatatype>>>>;
+
+// Output queue with its counters, resolved once per call instead of on every drain
+template <typename Queue>
+struct ResolvedQueue {
+    std::string name;
+    std::shared_ptr<Queue> queue;
+    std::shared_ptr<QueueCounters> counters;
+};
+
+// Takes all messages currently available in given output queues, skipping empty ones
+template <typename Queue>
+QueueMessages tryGetAllMessages(const std::vector<ResolvedQueue<Queue>>& queues) {
+    QueueMessages messages;
+    for(const auto& q : queues) {
+        auto limiter = findQueueLimiter(*q.counters);
+        auto msgs = limiter ? limiter->tryGetAll() : q.queue->tryGetAll();
+        q.counters->onOut(msgs);
+        if(!msgs.empty()) messages.emplace_back(q.name, std::move(msgs));
+    }
+    return messages;
+}
+
+inline py::dict queueMessagesToDict(QueueMessages& messages) {
+    py::dict dict;
+    for(auto& kv : messages) {
+        dict[py::str(kv.first)] = py::cast(kv.second);
+    }
+    return dict;
+}
+
+// Blocks until any of given output queues has messages (or timeout elapses), then takes all available messages from all of them at once.
+// 'wait' blocks at most given duration (negative meaning indefinitely) for new messages, returning false on timeout. Must be called with GIL held
+template <typename Queue, typename Wait>
+py::dict waitAnyMessages(const std::vector<ResolvedQueue<Queue>>& queues, std::chrono::microseconds timeout, Wait&& wait) {
+    using namespace std::chrono;
+
+    // if timeout < 0, unlimited timeout
+    QueueMessages messages;
+    blockingCall([&](microseconds slice){
+        const auto deadline = steady_clock::now() + slice;
+        while(true) {
+            // Drain first - events might be stale if messages were already taken by a previous call
+            messages = tryGetAllMessages(queues);
+            if(!messages.empty()) return true;
+
+            auto remaining = slice;
+            if(slice >= microseconds(0)) {
+                remaining = std::max(duration_cast<microseconds>(deadline - steady_clock::now()), microseconds(0));
+            }
+            if(!wait(remaining)) return false;
+        }
+    }, timeout);
+    return queueMessagesToDict(messages);
+}
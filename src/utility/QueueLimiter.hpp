@@ -0,0 +1,592 @@
+#pragma once
+
+// std
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <deque>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/pipeline/datatype/EncodedFrame.hpp"
+
+// pybind
+#include <pybind11/pybind11.h>
+
+// project
+#include "utility/QueueStats.hpp"
+
+// Interval in which a waiting 'get' checks whether the underlying queue was closed, as closing doesn't notify callbacks
+constexpr std::chrono::milliseconds QUEUE_LIMITER_CLOSED_CHECK_INTERVAL{100};
+
+// Which messages are dropped once a queue exceeds its limits
+enum class QueueDropPolicy {
+    // Drops oldest messages in the queue
+    DROP_OLDEST,
+    // Drops the incoming message
+    DROP_NEWEST,
+    // While the queue is over its limits, only keeps every Nth incoming message, then drops oldest messages
+    KEEP_EVERY_NTH,
+    // Drops whole groups of pictures of an EncodedFrame stream, so the queue always starts with a keyframe
+    KEEP_KEYFRAMES,
+};
+
+// Host memory budget shared by all output queues of a device. Limit of 0 means unlimited.
+// Keeps track of the limiters sharing it, so the one holding the most bytes can be evicted from
+class HostMemoryBudget {
+   public:
+    void setLimit(std::size_t bytes) {
+        limit = bytes;
+    }
+    std::size_t getLimit() const {
+        return limit;
+    }
+    std::size_t getUsage() const {
+        return static_cast<std::size_t>(std::max<std::int64_t>(used.load(), 0));
+    }
+    void acquire(std::size_t bytes) {
+        used.fetch_add(static_cast<std::int64_t>(bytes));
+    }
+    void release(std::size_t bytes) {
+        used.fetch_sub(static_cast<std::int64_t>(bytes));
+    }
+    bool exceeded() const {
+        const auto l = limit.load();
+        return l != 0 && used.load() > static_cast<std::int64_t>(l);
+    }
+
+    void addMember(const std::shared_ptr<QueueLimiter>& limiter) {
+        std::unique_lock<std::mutex> lock(membersMtx);
+        members.erase(std::remove_if(members.begin(), members.end(), [](const std::weak_ptr<QueueLimiter>& m) { return m.expired(); }), members.end());
+        members.push_back(limiter);
+    }
+    void removeMember(const QueueLimiter* limiter) {
+        std::unique_lock<std::mutex> lock(membersMtx);
+        members.erase(std::remove_if(members.begin(), members.end(), [limiter](const std::weak_ptr<QueueLimiter>& m) {
+                          auto l = m.lock();
+                          return !l || l.get() == limiter;
+                      }),
+                      members.end());
+    }
+    std::vector<std::shared_ptr<QueueLimiter>> getMembers() {
+        std::unique_lock<std::mutex> lock(membersMtx);
+        std::vector<std::shared_ptr<QueueLimiter>> alive;
+        alive.reserve(members.size());
+        for(const auto& m : members) {
+            if(auto l = m.lock()) alive.push_back(std::move(l));
+        }
+        return alive;
+    }
+
+   private:
+    std::atomic<std::size_t> limit{0};
+    std::atomic<std::int64_t> used{0};
+    std::mutex membersMtx;
+    std::vector<std::weak_ptr<QueueLimiter>> members;
+};
+
+// Host side limits of an output queue, by bytes and by a shared device budget, with a selectable drop policy.
+// Core queue only limits number of messages and may only drop its oldest, so once limits are set, messages are moved
+// out of the queue as they arrive (from a callback on the reading thread, or by any consumer beforehand)
+// and the bindings take them from the limiter instead. Queue maximum size still applies, as a non-blocking limit.
+// Once the device budget is exceeded, messages are evicted from the queue holding the most bytes, so a queue nobody reads
+// can't starve the others. Being limited, the queue never blocks the reading thread - it drops messages instead.
+// Limits can be removed again by 'detach', after which the queue behaves as the underlying one.
+// Provides the 'tryGet', 'tryGetAll', 'has', 'isClosed', 'addCallback' and 'removeCallback' interface of DataOutputQueue
+class QueueLimiter : public std::enable_shared_from_this<QueueLimiter> {
+   public:
+    // Queue is a DataOutputQueue or a queue of the same interface
+    template <typename Queue>
+    QueueLimiter(std::weak_ptr<Queue> queue, std::shared_ptr<QueueCounters> counters) : counters(std::move(counters)) {
+        this->counters->setExternalDrops(true);
+        queueClosed = [queue]() {
+            auto q = queue.lock();
+            return !q || q->isClosed();
+        };
+        queueTake = [queue](std::vector<std::shared_ptr<dai::ADatatype>>& arrived, unsigned int& maxSize, bool all) {
+            auto q = queue.lock();
+            if(!q) return false;
+            try {
+                if(all) {
+                    arrived = q->tryGetAll();
+                } else if(auto msg = q->tryGet()) {
+                    arrived.push_back(std::move(msg));
+                }
+                maxSize = q->getMaxSize();
+            } catch(const std::runtime_error&) {
+                // Queue closed
+                return false;
+            }
+            return true;
+        };
+    }
+
+    ~QueueLimiter() {
+        if(budget) {
+            budget->release(bytes);
+            budget->removeMember(this);
+        }
+    }
+
+    void setMaxBytes(std::size_t maxBytes) {
+        std::unique_lock<std::mutex> lock(mtx);
+        this->maxBytes = maxBytes;
+        enforce(lock);
+    }
+    std::size_t getMaxBytes() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return maxBytes;
+    }
+
+    void setDropPolicy(QueueDropPolicy policy, unsigned int keepEveryN) {
+        if(keepEveryN == 0) throw std::invalid_argument("'keepEveryN' must be at least 1");
+        std::unique_lock<std::mutex> lock(mtx);
+        this->policy = policy;
+        this->keepEveryN = keepEveryN;
+        congestedArrivals = 0;
+        waitKeyframe = false;
+    }
+    QueueDropPolicy getDropPolicy() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return policy;
+    }
+    unsigned int getKeepEveryN() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return keepEveryN;
+    }
+
+    // Limits the queue again after 'detach', with default limits
+    void attach() {
+        std::unique_lock<std::mutex> lock(mtx);
+        if(!detached) return;
+        detached = false;
+        counters->setExternalDrops(true);
+        counters->setLimiter(this);
+        pullLocked(lock);
+    }
+
+    // Removes all limits (and the device budget), so the queue behaves as the underlying one again, blocking included.
+    // Messages already moved out are returned first, only then are the bindings taking messages from the underlying queue again
+    void detach() {
+        std::unique_lock<std::mutex> lock(mtx);
+        if(detached) return;
+        detached = true;
+        maxBytes = 0;
+        policy = QueueDropPolicy::DROP_OLDEST;
+        keepEveryN = 1;
+        congestedArrivals = 0;
+        waitKeyframe = false;
+        if(budget) {
+            budget->release(bytes);
+            budget->removeMember(this);
+            budget.reset();
+        }
+        releaseIfDrained();
+        cv.notify_all();
+    }
+
+    bool isDetached() const {
+        return detached;
+    }
+
+    void setBudget(std::shared_ptr<HostMemoryBudget> budget) {
+        std::unique_lock<std::mutex> lock(mtx);
+        if(this->budget == budget) return;
+        if(this->budget) {
+            this->budget->release(bytes);
+            this->budget->removeMember(this);
+        }
+        this->budget = std::move(budget);
+        if(this->budget) {
+            this->budget->acquire(bytes);
+            this->budget->addMember(shared_from_this());
+        }
+        enforce(lock);
+    }
+
+    // Moves messages from the underlying queue, applying the limits. Once detached, messages are left in the underlying queue
+    void pull() {
+        std::unique_lock<std::mutex> lock(mtx);
+        if(!detached) pullLocked(lock);
+    }
+
+    bool isClosed() {
+        return queueClosed();
+    }
+
+    // As with the underlying queue, throws once the queue is closed (and all messages moved out were taken)
+    bool has() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return available(lock);
+    }
+
+    std::shared_ptr<dai::ADatatype> tryGet() {
+        std::unique_lock<std::mutex> lock(mtx);
+        if(!available(lock)) return nullptr;
+        return popFront();
+    }
+
+    std::vector<std::shared_ptr<dai::ADatatype>> tryGetAll() {
+        std::unique_lock<std::mutex> lock(mtx);
+        available(lock);
+        std::vector<std::shared_ptr<dai::ADatatype>> all;
+        all.reserve(messages.size());
+        while(!messages.empty()) all.push_back(popFront());
+        return all;
+    }
+
+    std::shared_ptr<dai::ADatatype> get() {
+        bool timedout = true;
+        std::shared_ptr<dai::ADatatype> msg;
+        while(timedout) msg = get(QUEUE_LIMITER_CLOSED_CHECK_INTERVAL, timedout);
+        return msg;
+    }
+
+    template <typename Rep, typename Period>
+    std::shared_ptr<dai::ADatatype> get(std::chrono::duration<Rep, Period> timeout, bool& timedout) {
+        std::unique_lock<std::mutex> lock(mtx);
+        timedout = !waitAvailable(lock, timeout);
+        if(timedout) return nullptr;
+        return popFront();
+    }
+
+    std::vector<std::shared_ptr<dai::ADatatype>> getAll() {
+        bool timedout = true;
+        std::vector<std::shared_ptr<dai::ADatatype>> all;
+        while(timedout) all = getAll(QUEUE_LIMITER_CLOSED_CHECK_INTERVAL, timedout);
+        return all;
+    }
+
+    template <typename Rep, typename Period>
+    std::vector<std::shared_ptr<dai::ADatatype>> getAll(std::chrono::duration<Rep, Period> timeout, bool& timedout) {
+        std::unique_lock<std::mutex> lock(mtx);
+        std::vector<std::shared_ptr<dai::ADatatype>> all;
+        timedout = !waitAvailable(lock, timeout);
+        if(timedout) return all;
+        all.reserve(messages.size());
+        while(!messages.empty()) all.push_back(popFront());
+        return all;
+    }
+
+    int addCallback(std::function<void()> callback) {
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        const int id = nextCallbackId++;
+        callbacks[id] = std::move(callback);
+        return id;
+    }
+
+    bool removeCallback(int callbackId) {
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        return callbacks.erase(callbackId) > 0;
+    }
+
+    // Called by the underlying queue on each message arrival, from its reading thread
+    void onArrival() {
+        pull();
+        std::unique_lock<std::mutex> lock(callbacksMtx);
+        for(auto& kv : callbacks) kv.second();
+    }
+
+    const std::shared_ptr<QueueCounters>& getCounters() const {
+        return counters;
+    }
+
+   private:
+    struct Entry {
+        std::shared_ptr<dai::ADatatype> msg;
+        std::size_t bytes;
+    };
+
+    static std::size_t messageBytes(const std::shared_ptr<dai::ADatatype>& msg) {
+        return msg->getRaw()->data.size();
+    }
+
+    static bool isKeyframe(const std::shared_ptr<dai::ADatatype>& msg) {
+        auto frame = std::dynamic_pointer_cast<dai::EncodedFrame>(msg);
+        // Other messages are all treated as keyframes
+        return !frame || frame->getFrameType() == dai::EncodedFrame::FrameType::I;
+    }
+
+    bool available(std::unique_lock<std::mutex>& lock) {
+        if(!detached) {
+            pullLocked(lock);
+        } else if(messages.empty()) {
+            // Consumer which started waiting before detaching, takes messages one by one so none are left behind
+            pullLocked(lock, false);
+        }
+        if(!messages.empty()) return true;
+        if(isClosed()) throw std::runtime_error("Queue is closed");
+        return false;
+    }
+
+    template <typename Rep, typename Period>
+    bool waitAvailable(std::unique_lock<std::mutex>& lock, std::chrono::duration<Rep, Period> timeout) {
+        const auto deadline = std::chrono::steady_clock::now() + timeout;
+        while(true) {
+            if(available(lock)) return true;
+            const auto now = std::chrono::steady_clock::now();
+            if(now >= deadline) return false;
+            // Woken up by arrivals, periodically checking for closure
+            cv.wait_until(lock, std::min<std::chrono::steady_clock::time_point>(deadline, now + QUEUE_LIMITER_CLOSED_CHECK_INTERVAL));
+        }
+    }
+
+    std::shared_ptr<dai::ADatatype> popFront() {
+        auto entry = std::move(messages.front());
+        messages.pop_front();
+        bytes -= entry.bytes;
+        if(budget) budget->release(entry.bytes);
+        releaseIfDrained();
+        return std::move(entry.msg);
+    }
+
+    // Once detached and all messages moved out were taken, the bindings use the underlying queue again
+    void releaseIfDrained() {
+        if(!detached || !messages.empty()) return;
+        counters->setLimiter(nullptr);
+        counters->setExternalDrops(false);
+    }
+
+    void drop(std::size_t index) {
+        const auto size = messages[index].bytes;
+        messages.erase(messages.begin() + index);
+        bytes -= size;
+        if(budget) budget->release(size);
+        counters->onDrop(1);
+    }
+
+    void pullLocked(std::unique_lock<std::mutex>& lock, bool all = true) {
+        std::vector<std::shared_ptr<dai::ADatatype>> arrived;
+        unsigned int maxSize = 0;
+        // Queue destroyed or closed, keep what was already moved out
+        if(!queueTake(arrived, maxSize, all) || arrived.empty()) return;
+        this->maxSize = maxSize;
+        for(auto& msg : arrived) {
+            if(msg) push(std::move(msg));
+        }
+        enforce(lock);
+        cv.notify_all();
+    }
+
+    void push(std::shared_ptr<dai::ADatatype> msg) {
+        const auto size = messageBytes(msg);
+        if(policy == QueueDropPolicy::KEEP_EVERY_NTH) {
+            // Decimates only while congested, starting with a kept message
+            if(!congested(size)) {
+                congestedArrivals = 0;
+            } else if(congestedArrivals++ % keepEveryN != 0) {
+                counters->onDrop(1);
+                return;
+            }
+        }
+        if(policy == QueueDropPolicy::KEEP_KEYFRAMES) {
+            // Frames following a dropped one can't be decoded until the next keyframe
+            if(isKeyframe(msg)) {
+                waitKeyframe = false;
+            } else if(waitKeyframe) {
+                counters->onDrop(1);
+                return;
+            }
+        }
+        messages.push_back({std::move(msg), size});
+        bytes += size;
+        if(budget) budget->acquire(size);
+    }
+
+    // Whether an incoming message of given size would put the queue over its limits or the device budget
+    bool congested(std::size_t size) const {
+        return (maxSize != 0 && messages.size() >= maxSize) || (maxBytes != 0 && bytes + size > maxBytes) || (budget && budget->exceeded());
+    }
+
+    bool overLimits() const {
+        // At least one message is kept regardless of the queue own limits, only the device budget is strict
+        return messages.size() > 1 && ((maxSize != 0 && messages.size() > maxSize) || (maxBytes != 0 && bytes > maxBytes));
+    }
+
+    void enforce(std::unique_lock<std::mutex>&) {
+        while(overLimits()) dropByPolicy();
+        if(!budget) return;
+
+        while(budget->exceeded()) {
+            // Evict from the queue holding the most bytes, which may be this one
+            auto members = budget->getMembers();
+            QueueLimiter* victim = this;
+            for(const auto& member : members) {
+                if(member->bytes > victim->bytes) victim = member.get();
+            }
+            if(victim != this) {
+                // Never wait for another queue - it may be evicting from this one. Can't take its lock without waiting,
+                // so only drop own messages above an equal share of the budget
+                std::unique_lock<std::mutex> victimLock(victim->mtx, std::try_to_lock);
+                if(victimLock.owns_lock() && !victim->messages.empty()) {
+                    victim->dropByPolicy();
+                    continue;
+                }
+                if(bytes <= budget->getLimit() / std::max<std::size_t>(members.size(), 1)) break;
+            }
+            if(messages.empty()) break;
+            dropByPolicy();
+        }
+    }
+
+    // Drops messages by the drop policy, at least one. Must be called with the lock held and messages not empty
+    void dropByPolicy() {
+        switch(policy) {
+            case QueueDropPolicy::DROP_NEWEST:
+                drop(messages.size() - 1);
+                break;
+            case QueueDropPolicy::KEEP_KEYFRAMES: {
+                // Drop the oldest group of pictures, up to the next keyframe
+                std::size_t next = 1;
+                while(next < messages.size() && !isKeyframe(messages[next].msg)) next++;
+                if(next == messages.size()) {
+                    // No keyframe to continue from, drop the newest and wait for one
+                    drop(messages.size() - 1);
+                    waitKeyframe = true;
+                } else {
+                    for(std::size_t i = 0; i < next; i++) drop(0);
+                }
+                break;
+            }
+            case QueueDropPolicy::DROP_OLDEST:
+            case QueueDropPolicy::KEEP_EVERY_NTH:
+            default:
+                drop(0);
+                break;
+        }
+    }
+
+    // Underlying queue, held weakly and type erased, so limiters of any queue type share a budget
+    std::function<bool()> queueClosed;
+    // Takes all messages of the underlying queue, or at most one
+    std::function<bool(std::vector<std::shared_ptr<dai::ADatatype>>&, unsigned int&, bool)> queueTake;
+    std::shared_ptr<QueueCounters> counters;
+
+    std::mutex mtx;
+    std::condition_variable cv;
+    std::deque<Entry> messages;
+    // Read without the lock by other queues sharing the budget
+    std::atomic<std::size_t> bytes{0};
+    std::size_t maxBytes = 0;
+    unsigned int maxSize = 0;
+    QueueDropPolicy policy = QueueDropPolicy::DROP_OLDEST;
+    unsigned int keepEveryN = 1;
+    // Arrivals since the queue became congested, for KEEP_EVERY_NTH
+    std::uint64_t congestedArrivals = 0;
+    bool waitKeyframe = false;
+    std::atomic<bool> detached{false};
+    std::shared_ptr<HostMemoryBudget> budget;
+
+    std::mutex callbacksMtx;
+    std::unordered_map<int, std::function<void()>> callbacks;
+    int nextCallbackId = 0;
+};
+
+// Limiters of output queues (DataOutputQueue or a queue of the same interface), attached the first time limits are set
+class QueueLimiterRegistry {
+   public:
+    // Returns the limiter of given queue, or nullptr if the queue isn't limited
+    template <typename Queue>
+    static std::shared_ptr<QueueLimiter> find(const std::shared_ptr<Queue>& queue) {
+        auto limiter = findAny(queue);
+        if(limiter && limiter->isDetached()) return nullptr;
+        return limiter;
+    }
+
+    // Whether limits of given queue were removed by 'detach'
+    template <typename Queue>
+    static bool isDetached(const std::shared_ptr<Queue>& queue) {
+        auto limiter = findAny(queue);
+        return limiter && limiter->isDetached();
+    }
+
+    // Removes limits of given queue, if any
+    template <typename Queue>
+    static void detach(const std::shared_ptr<Queue>& queue) {
+        if(auto limiter = findAny(queue)) limiter->detach();
+    }
+
+    // Returns the limiter of given queue, attaching one if needed (or again, if detached)
+    template <typename Queue>
+    static std::shared_ptr<QueueLimiter> get(const std::shared_ptr<Queue>& queue) {
+        auto counters = QueueCountersRegistry::get(queue);
+        auto& registry = instance();
+        std::shared_ptr<QueueLimiter> limiter;
+        {
+            std::unique_lock<std::mutex> lock(registry.mtx);
+            auto it = registry.entries.find(queue.get());
+            if(it != registry.entries.end() && !it->second.queue.expired()) limiter = it->second.limiter;
+        }
+        if(limiter) {
+            // Its callback stays registered on the queue, as the limiter is kept
+            limiter->attach();
+            return limiter;
+        }
+        {
+            std::unique_lock<std::mutex> lock(registry.mtx);
+            auto it = registry.entries.find(queue.get());
+            if(it != registry.entries.end() && !it->second.queue.expired()) return it->second.limiter;
+
+            // Drop entries of destroyed queues, as their addresses may be reused
+            for(auto e = registry.entries.begin(); e != registry.entries.end();) {
+                e = e->second.queue.expired() ? registry.entries.erase(e) : std::next(e);
+            }
+            limiter = std::make_shared<QueueLimiter>(std::weak_ptr<Queue>(queue), counters);
+            registry.entries[queue.get()] = {queue, limiter};
+        }
+        counters->setLimiter(limiter.get());
+
+        // Outside of the lock and GIL - reading thread might hold the queue callbacks lock while waiting for either
+        auto attach = [&]() {
+            queue->addCallback([limiter]() { limiter->onArrival(); });
+            // Messages which arrived in the meantime
+            limiter->pull();
+        };
+        if(PyGILState_Check()) {
+            pybind11::gil_scoped_release release;
+            attach();
+        } else {
+            attach();
+        }
+        return limiter;
+    }
+
+   private:
+    struct Entry {
+        std::weak_ptr<void> queue;
+        std::shared_ptr<QueueLimiter> limiter;
+    };
+
+    template <typename Queue>
+    static std::shared_ptr<QueueLimiter> findAny(const std::shared_ptr<Queue>& queue) {
+        auto& registry = instance();
+        std::unique_lock<std::mutex> lock(registry.mtx);
+        auto it = registry.entries.find(queue.get());
+        if(it == registry.entries.end() || it->second.queue.expired()) return nullptr;
+        return it->second.limiter;
+    }
+
+    static QueueLimiterRegistry& instance() {
+        static QueueLimiterRegistry registry;
+        return registry;
+    }
+
+    std::mutex mtx;
+    std::unordered_map<const void*, Entry> entries;
+};
+
+// Limiter of a queue given its counters, or nullptr if the queue isn't limited.
+// Lock-free, the queue must be kept alive by the caller
+inline std::shared_ptr<QueueLimiter> findQueueLimiter(const QueueCounters& counters) {
+    auto* limiter = counters.getLimiter();
+    return limiter ? limiter->shared_from_this() : nullptr;
+}
@@ -0,0 +1,261 @@
+#pragma once
+
+// std
+#include <algorithm>
+#include <array>
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <type_traits>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+
+// pybind
+#include <pybind11/pybind11.h>
+
+class QueueLimiter;
+
+// Whether a queue type is an input queue (sent to by host) rather than an output queue (read by host).
+// Specialized by other queue types of the DataInputQueue interface
+template <typename Queue>
+struct IsInputQueue : std::false_type {};
+template <>
+struct IsInputQueue<dai::DataInputQueue> : std::true_type {};
+
+// Upper bounds of wait time histogram buckets, last bucket holding all longer waits
+constexpr std::array<std::chrono::microseconds::rep, 6> QUEUE_WAIT_HISTOGRAM_BOUNDS_US{10, 100, 1000, 10000, 100000, 1000000};
+constexpr std::size_t QUEUE_WAIT_HISTOGRAM_BUCKETS = QUEUE_WAIT_HISTOGRAM_BOUNDS_US.size() + 1;
+
+// Snapshot of queue counters
+struct QueueStats {
+    std::string name;
+    std::uint64_t messagesIn = 0;
+    std::uint64_t messagesOut = 0;
+    std::uint64_t messagesDropped = 0;
+    std::uint64_t bytesIn = 0;
+    std::uint64_t bytesOut = 0;
+    std::uint64_t depth = 0;
+    std::uint64_t peakDepth = 0;
+    std::uint64_t timeouts = 0;
+    std::uint64_t callbackDropped = 0;
+    std::array<std::uint64_t, QUEUE_WAIT_HISTOGRAM_BUCKETS> waitHistogram{};
+    std::chrono::microseconds totalWaitTime{0};
+};
+
+// Counters of a queue, updated lock-free from the XLink thread and Python threads (relaxed, as they are only statistics).
+// Output queues count messages in from a callback on the reading thread and messages out from the bindings getters,
+// messages dropped by a non-blocking queue are the ones which would exceed its maximum size.
+// Input queues count messages sent, as the writing thread isn't observable
+class QueueCounters {
+   public:
+    void onIn(std::size_t bytes, unsigned int maxSize, bool blocking) {
+        messagesIn.fetch_add(1, std::memory_order_relaxed);
+        bytesIn.fetch_add(bytes, std::memory_order_relaxed);
+        const auto current = depth.fetch_add(1, std::memory_order_relaxed) + 1;
+        if(!blocking && !externalDrops.load(std::memory_order_relaxed) && current > static_cast<std::int64_t>(maxSize)) {
+            // Queue overwrote its oldest message
+            depth.fetch_sub(1, std::memory_order_relaxed);
+            messagesDropped.fetch_add(1, std::memory_order_relaxed);
+            return;
+        }
+        auto peak = peakDepth.load(std::memory_order_relaxed);
+        while(current > peak && !peakDepth.compare_exchange_weak(peak, current, std::memory_order_relaxed)) {
+        }
+    }
+
+    void onOut(std::size_t count, std::size_t bytes) {
+        if(count == 0) return;
+        messagesOut.fetch_add(count, std::memory_order_relaxed);
+        bytesOut.fetch_add(bytes, std::memory_order_relaxed);
+        depth.fetch_sub(static_cast<std::int64_t>(count), std::memory_order_relaxed);
+    }
+
+    void onOut(const std::shared_ptr<dai::ADatatype>& msg) {
+        if(msg) onOut(1, msg->getRaw()->data.size());
+    }
+
+    void onOut(const std::vector<std::shared_ptr<dai::ADatatype>>& messages) {
+        std::size_t count = 0, bytes = 0;
+        for(const auto& msg : messages) {
+            if(!msg) continue;
+            count++;
+            bytes += msg->getRaw()->data.size();
+        }
+        onOut(count, bytes);
+    }
+
+    // Messages dropped by a host side limit (see QueueLimiter), which then replaces the inferred drops
+    void onDrop(std::size_t count) {
+        if(count == 0) return;
+        messagesDropped.fetch_add(count, std::memory_order_relaxed);
+        depth.fetch_sub(static_cast<std::int64_t>(count), std::memory_order_relaxed);
+    }
+
+    void setExternalDrops(bool external) {
+        externalDrops = external;
+    }
+
+    // Messages a batched callback dispatcher dropped, as Python couldn't keep up. Not in the queue, so depth is unaffected
+    void onCallbackDrop() {
+        callbackDropped.fetch_add(1, std::memory_order_relaxed);
+    }
+
+    // Input queues count messages when added to the queue
+    void onSend(std::size_t bytes) {
+        messagesIn.fetch_add(1, std::memory_order_relaxed);
+        bytesIn.fetch_add(bytes, std::memory_order_relaxed);
+    }
+
+    void onWait(std::chrono::steady_clock::duration waited, bool timedout) {
+        const auto us = std::chrono::duration_cast<std::chrono::microseconds>(waited);
+        const auto bucket = std::upper_bound(QUEUE_WAIT_HISTOGRAM_BOUNDS_US.begin(), QUEUE_WAIT_HISTOGRAM_BOUNDS_US.end(), us.count()) - QUEUE_WAIT_HISTOGRAM_BOUNDS_US.begin();
+        waitHistogram[bucket].fetch_add(1, std::memory_order_relaxed);
+        totalWaitUs.fetch_add(us.count(), std::memory_order_relaxed);
+        if(timedout) timeouts.fetch_add(1, std::memory_order_relaxed);
+    }
+
+    QueueStats snapshot(std::string name) const {
+        QueueStats stats;
+        stats.name = std::move(name);
+        stats.messagesIn = messagesIn.load(std::memory_order_relaxed);
+        stats.messagesOut = messagesOut.load(std::memory_order_relaxed);
+        stats.messagesDropped = messagesDropped.load(std::memory_order_relaxed);
+        stats.bytesIn = bytesIn.load(std::memory_order_relaxed);
+        stats.bytesOut = bytesOut.load(std::memory_order_relaxed);
+        // Consumer might take a message before the reading thread counted it in
+        stats.depth = static_cast<std::uint64_t>(std::max<std::int64_t>(depth.load(std::memory_order_relaxed), 0));
+        stats.peakDepth = static_cast<std::uint64_t>(peakDepth.load(std::memory_order_relaxed));
+        stats.timeouts = timeouts.load(std::memory_order_relaxed);
+        stats.callbackDropped = callbackDropped.load(std::memory_order_relaxed);
+        for(std::size_t i = 0; i < QUEUE_WAIT_HISTOGRAM_BUCKETS; i++) stats.waitHistogram[i] = waitHistogram[i].load(std::memory_order_relaxed);
+        stats.totalWaitTime = std::chrono::microseconds(totalWaitUs.load(std::memory_order_relaxed));
+        return stats;
+    }
+
+    // Host side limiter of the queue, once attached by QueueLimiterRegistry. The limiter is kept alive by the queue,
+    // so the pointer may only be used while holding the queue
+    QueueLimiter* getLimiter() const {
+        return limiter.load(std::memory_order_acquire);
+    }
+
+    void setLimiter(QueueLimiter* limiter) {
+        this->limiter.store(limiter, std::memory_order_release);
+    }
+
+    // Resets all counters except current depth
+    void reset() {
+        messagesIn = 0;
+        messagesOut = 0;
+        messagesDropped = 0;
+        bytesIn = 0;
+        bytesOut = 0;
+        peakDepth = std::max<std::int64_t>(depth.load(), 0);
+        timeouts = 0;
+        callbackDropped = 0;
+        for(auto& bucket : waitHistogram) bucket = 0;
+        totalWaitUs = 0;
+    }
+
+   private:
+    std::atomic<std::uint64_t> messagesIn{0};
+    std::atomic<std::uint64_t> messagesOut{0};
+    std::atomic<std::uint64_t> messagesDropped{0};
+    std::atomic<std::uint64_t> bytesIn{0};
+    std::atomic<std::uint64_t> bytesOut{0};
+    std::atomic<std::int64_t> depth{0};
+    std::atomic<std::int64_t> peakDepth{0};
+    std::atomic<std::uint64_t> timeouts{0};
+    std::atomic<std::uint64_t> callbackDropped{0};
+    std::array<std::atomic<std::uint64_t>, QUEUE_WAIT_HISTOGRAM_BUCKETS> waitHistogram{};
+    std::atomic<std::int64_t> totalWaitUs{0};
+    std::atomic<bool> externalDrops{false};
+    std::atomic<QueueLimiter*> limiter{nullptr};
+};
+
+// Counters of queues, attached the first time a queue is accessed from the bindings (Device.getOutputQueue/getInputQueue).
+// Keyed by queue, entries of destroyed queues are dropped. Lookups take a process wide lock, so consumers handling
+// every message (Recorder, HostSync, ...) resolve the counters once per queue instead of on every message
+class QueueCountersRegistry {
+   public:
+    // Queue is a DataOutputQueue, DataInputQueue or a queue of the same interface (see IsInputQueue)
+    template <typename Queue>
+    static std::shared_ptr<QueueCounters> get(const std::shared_ptr<Queue>& queue) {
+        return get(queue, IsInputQueue<Queue>{});
+    }
+
+   private:
+    struct Entry {
+        std::weak_ptr<void> queue;
+        std::shared_ptr<QueueCounters> counters;
+    };
+
+    // Output queues count messages in from a callback on their reading thread
+    template <typename Queue>
+    static std::shared_ptr<QueueCounters> get(const std::shared_ptr<Queue>& queue, std::false_type) {
+        return instance().find(queue, [](const std::shared_ptr<Queue>& q, const std::shared_ptr<QueueCounters>& counters) {
+            std::weak_ptr<Queue> weakQueue = q;
+            q->addCallback([counters, weakQueue](std::shared_ptr<dai::ADatatype> msg) {
+                auto queue = weakQueue.lock();
+                if(!queue || !msg) return;
+                try {
+                    counters->onIn(msg->getRaw()->data.size(), queue->getMaxSize(), queue->getBlocking());
+                } catch(const std::runtime_error&) {
+                    // Queue closed
+                }
+            });
+        });
+    }
+
+    template <typename Queue>
+    static std::shared_ptr<QueueCounters> get(const std::shared_ptr<Queue>& queue, std::true_type) {
+        return instance().find(queue, [](const std::shared_ptr<Queue>&, const std::shared_ptr<QueueCounters>&) {});
+    }
+
+    static QueueCountersRegistry& instance() {
+        static QueueCountersRegistry registry;
+        return registry;
+    }
+
+    template <typename Queue, typename Attach>
+    std::shared_ptr<QueueCounters> find(const std::shared_ptr<Queue>& queue, Attach&& attach) {
+        std::shared_ptr<QueueCounters> counters;
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            auto it = entries.find(queue.get());
+            if(it != entries.end() && !it->second.queue.expired()) return it->second.counters;
+
+            // Drop entries of destroyed queues, as their addresses may be reused
+            for(auto e = entries.begin(); e != entries.end();) {
+                e = e->second.queue.expired() ? entries.erase(e) : std::next(e);
+            }
+            counters = std::make_shared<QueueCounters>();
+            entries[queue.get()] = {queue, counters};
+        }
+
+        // Outside of the lock and GIL - reading thread might hold the queue callbacks lock while waiting for either
+        if(PyGILState_Check()) {
+            pybind11::gil_scoped_release release;
+            attach(queue, counters);
+        } else {
+            attach(queue, counters);
+        }
+        return counters;
+    }
+
+    std::mutex mtx;
+    std::unordered_map<const void*, Entry> entries;
+};
+
+// Counters of a queue, given its Python object (DataOutputQueue, DataInputQueue or a queue of the same interface).
+// Must be called with GIL held
+template <typename Queue>
+std::shared_ptr<QueueCounters> getQueueCounters(pybind11::handle self) {
+    return QueueCountersRegistry::get(self.cast<std::shared_ptr<Queue>>());
+}
@@ -0,0 +1,611 @@
+#pragma once
+
+// std
+#include <algorithm>
+#include <array>
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <cstring>
+#include <deque>
+#include <fstream>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/ADatatype.hpp"
+#include "depthai/pipeline/datatype/StreamMessageParser.hpp"
+#include "depthai-shared/utility/Serialization.hpp"
+
+// pybind
+#include <pybind11/pybind11.h>
+
+// project
+#include "pipeline/datatype/HostMessage.hpp"
+#include "pipeline/datatype/MessageTimestamp.hpp"
+
+// Recording container: append-only file of chunks, each holding a batch of records, followed by an index once closed.
+//
+//   file header | chunk header, records... | chunk header, records... | ... | index | trailer
+//
+// A record is a record header followed by a packet. Message packets are laid out the same as XLink packets
+// (data, metadata, datatype, metadata size, marker), so any message type is parsed by the core parser.
+// Records and message data are aligned, so data can be referenced directly from a memory mapped file.
+// The index lists streams and per message its stream, sequence number, timestamps and offset.
+// If the recording wasn't closed (no index), it's rebuilt by scanning the complete chunks
+
+constexpr std::array<char, 8> RECORDING_MAGIC{{'D', 'A', 'I', 'R', 'E', 'C', '\0', '\0'}};
+constexpr std::uint32_t RECORDING_VERSION = 1;
+constexpr std::uint32_t RECORDING_CHUNK_MAGIC = 0x4b4e4843;  // "CHNK"
+constexpr std::uint32_t RECORDING_INDEX_MAGIC = 0x58444e49;  // "INDX"
+// Alignment of records and message data within the file
+constexpr std::size_t RECORDING_ALIGNMENT = 64;
+// Same end of packet marker as XLink packets
+constexpr std::array<std::uint8_t, 16> RECORDING_PACKET_MARKER{{0xAB, 0xCD, 0xEF, 0x01, 0x23, 0x45, 0x67, 0x89, 0x12, 0x34, 0x56, 0x78, 0x9A, 0xBC, 0xDE, 0xF0}};
+// Datatype and metadata size (4B LE each) and the marker, following packet metadata
+constexpr std::size_t RECORDING_PACKET_TAIL_SIZE = 8 + RECORDING_PACKET_MARKER.size();
+// Pending records are written as a chunk once they reach this size, or once the oldest waited for the flush interval
+constexpr std::size_t RECORDING_CHUNK_SIZE = 4 * 1024 * 1024;
+constexpr std::chrono::milliseconds RECORDING_FLUSH_INTERVAL{100};
+// Buffer of the file stream, small writes (headers, metadata) are coalesced into it
+constexpr std::size_t RECORDING_WRITE_BUFFER_SIZE = 1024 * 1024;
+
+enum class RecordKind : std::uint32_t { STREAM = 1, MESSAGE = 2 };
+
+struct RecordingFileHeader {
+    std::array<char, 8> magic;
+    std::uint32_t version;
+    std::uint8_t reserved[52];
+};
+
+struct RecordingChunkHeader {
+    std::uint32_t magic;
+    std::uint32_t records;
+    // Size of the records following
+    std::uint64_t size;
+    std::uint8_t reserved[48];
+};
+
+struct RecordingRecordHeader {
+    RecordKind kind;
+    std::uint32_t stream;
+    // Size of the packet following, without padding
+    std::uint64_t size;
+    std::int64_t sequenceNum;
+    std::int64_t timestampNs;
+    std::int64_t timestampDeviceNs;
+    std::uint8_t reserved[24];
+};
+
+struct RecordingIndexHeader {
+    std::uint32_t magic;
+    std::uint32_t streams;
+    std::uint64_t entries;
+};
+
+struct RecordingIndexEntry {
+    std::uint32_t stream;
+    std::uint32_t reserved;
+    std::int64_t sequenceNum;
+    std::int64_t timestampNs;
+    std::int64_t timestampDeviceNs;
+    // Offset of the record header
+    std::uint64_t offset;
+};
+
+struct RecordingTrailer {
+    std::uint64_t indexOffset;
+    std::uint32_t magic;
+    std::uint32_t version;
+};
+
+static_assert(sizeof(RecordingFileHeader) == RECORDING_ALIGNMENT && sizeof(RecordingChunkHeader) == RECORDING_ALIGNMENT
+                  && sizeof(RecordingRecordHeader) == RECORDING_ALIGNMENT,
+              "Recording headers must keep records aligned");
+
+constexpr std::uint64_t recordingAlign(std::uint64_t size) {
+    return (size + RECORDING_ALIGNMENT - 1) / RECORDING_ALIGNMENT * RECORDING_ALIGNMENT;
+}
+
+// Appends records to a recording from a dedicated I/O thread.
+// Messages are only queued by 'write' (on queue reading threads), serialized and written in large chunks by the I/O thread.
+// Once more than 'maxPendingBytes' of message data waits to be written, further messages are dropped instead of stalling the writers
+class RecordingWriter {
+   public:
+    RecordingWriter(const std::string& path, std::size_t maxPendingBytes) : path(path), maxPendingBytes(maxPendingBytes) {
+        file.rdbuf()->pubsetbuf(writeBuffer.data(), writeBuffer.size());
+        file.open(path, std::ios::binary | std::ios::out | std::ios::trunc);
+        if(!file) throw std::runtime_error("Couldn't open recording '" + path + "' for writing");
+        RecordingFileHeader header{};
+        header.magic = RECORDING_MAGIC;
+        header.version = RECORDING_VERSION;
+        file.write(reinterpret_cast<const char*>(&header), sizeof(header));
+        offset = sizeof(header);
+        thread = std::thread([this]() { run(); });
+    }
+
+    ~RecordingWriter() {
+        try {
+            close();
+        } catch(const std::exception&) {
+            // Write errors are reported by an explicit close
+        }
+    }
+
+    // Declares a stream, returns its id
+    std::uint32_t addStream(const std::string& name) {
+        std::unique_lock<std::mutex> lock(mtx);
+        const auto stream = static_cast<std::uint32_t>(streams.size());
+        streams.push_back(name);
+        pending.push_back({RecordKind::STREAM, stream, nullptr});
+        return stream;
+    }
+
+    // Queues a message of a stream, returns false if it was dropped. Doesn't require the GIL
+    bool write(std::uint32_t stream, std::shared_ptr<dai::ADatatype> msg) {
+        const auto bytes = getMessageDataSpan(*msg).second;
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            if(closing || !error.empty() || pendingBytes + bytes > maxPendingBytes) {
+                dropped++;
+                return false;
+            }
+            pendingBytes += bytes;
+            pending.push_back({RecordKind::MESSAGE, stream, std::move(msg)});
+        }
+        cv.notify_one();
+        return true;
+    }
+
+    // Writes pending records and the index. Must be called without the GIL, as releasing messages may require it
+    void close() {
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            if(closing) return;
+            closing = true;
+        }
+        cv.notify_one();
+        if(thread.joinable()) thread.join();
+        if(error.empty()) writeIndex();
+        file.close();
+        if(!error.empty()) throw std::runtime_error("Couldn't write recording '" + path + "': " + error);
+    }
+
+    std::string getPath() const {
+        return path;
+    }
+
+    std::vector<std::string> getStreams() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return streams;
+    }
+
+    std::uint64_t getMessagesWritten() const {
+        return messagesWritten.load(std::memory_order_relaxed);
+    }
+
+    std::uint64_t getBytesWritten() const {
+        return bytesWritten.load(std::memory_order_relaxed);
+    }
+
+    std::uint64_t getMessagesDropped() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return dropped;
+    }
+
+    std::size_t getPendingBytes() {
+        std::unique_lock<std::mutex> lock(mtx);
+        return pendingBytes;
+    }
+
+   private:
+    struct Pending {
+        RecordKind kind;
+        std::uint32_t stream;
+        std::shared_ptr<dai::ADatatype> msg;
+    };
+
+    // Record of a pending entry, serialized on the I/O thread
+    struct Record {
+        RecordingRecordHeader header;
+        std::vector<std::uint8_t> metadata;
+        const std::uint8_t* data;
+        std::size_t dataSize;
+        std::array<std::uint8_t, RECORDING_PACKET_TAIL_SIZE> tail;
+    };
+
+    void run() {
+        std::unique_lock<std::mutex> lock(mtx);
+        while(true) {
+            // Batch until a chunk worth of data is pending, or the oldest pending record waited long enough
+            cv.wait(lock, [this]() { return closing || !pending.empty(); });
+            if(!closing) {
+                const auto deadline = std::chrono::steady_clock::now() + RECORDING_FLUSH_INTERVAL;
+                cv.wait_until(lock, deadline, [this]() { return closing || pendingBytes >= RECORDING_CHUNK_SIZE; });
+            }
+            if(pending.empty() && closing) return;
+
+            std::deque<Pending> batch;
+            batch.swap(pending);
+            pendingBytes = 0;
+            std::vector<std::string> names = streams;
+            lock.unlock();
+
+            std::string failure;
+            try {
+                writeChunk(batch, names);
+            } catch(const std::exception& e) {
+                failure = e.what();
+            }
+            // Messages are released outside of the lock, as it may require the GIL
+            batch.clear();
+
+            lock.lock();
+            if(!failure.empty()) {
+                error = failure;
+                dropped += pending.size();
+                batch.swap(pending);
+                pendingBytes = 0;
+                lock.unlock();
+                return;
+            }
+        }
+    }
+
+    void writeChunk(const std::deque<Pending>& batch, const std::vector<std::string>& names) {
+        std::vector<Record> records;
+        records.reserve(batch.size());
+        std::uint64_t size = 0;
+        for(const auto& entry : batch) {
+            Record record{};
+            record.header.kind = entry.kind;
+            record.header.stream = entry.stream;
+            if(entry.kind == RecordKind::STREAM) {
+                const auto& name = names.at(entry.stream);
+                record.metadata.assign(name.begin(), name.end());
+                record.data = nullptr;
+                record.dataSize = 0;
+                record.header.size = record.metadata.size();
+            } else {
+                const auto& raw = *entry.msg->getRaw();
+                dai::DatatypeEnum datatype;
+                raw.serialize(record.metadata, datatype);
+                const auto data = getMessageDataSpan(*entry.msg);
+                record.data = data.first;
+                record.dataSize = data.second;
+                record.header.sequenceNum = raw.sequenceNum;
+                record.header.timestampNs = timestampToNs(raw.ts);
+                record.header.timestampDeviceNs = timestampToNs(raw.tsDevice);
+                for(int i = 0; i < 4; i++) record.tail[i] = (static_cast<std::uint32_t>(datatype) >> (i * 8)) & 0xFF;
+                for(int i = 0; i < 4; i++) record.tail[4 + i] = (static_cast<std::uint32_t>(record.metadata.size()) >> (i * 8)) & 0xFF;
+                std::copy(RECORDING_PACKET_MARKER.begin(), RECORDING_PACKET_MARKER.end(), record.tail.begin() + 8);
+                record.header.size = record.dataSize + record.metadata.size() + record.tail.size();
+            }
+            size += sizeof(RecordingRecordHeader) + recordingAlign(record.header.size);
+            records.push_back(std::move(record));
+        }
+
+        RecordingChunkHeader chunk{};
+        chunk.magic = RECORDING_CHUNK_MAGIC;
+        chunk.records = static_cast<std::uint32_t>(records.size());
+        chunk.size = size;
+        file.write(reinterpret_cast<const char*>(&chunk), sizeof(chunk));
+        auto position = offset + sizeof(chunk);
+
+        static const std::array<char, RECORDING_ALIGNMENT> padding{};
+        std::vector<RecordingIndexEntry> entries;
+        std::uint64_t messageBytes = 0;
+        for(const auto& record : records) {
+            file.write(reinterpret_cast<const char*>(&record.header), sizeof(record.header));
+            if(record.header.kind == RecordKind::MESSAGE) {
+                file.write(reinterpret_cast<const char*>(record.data), static_cast<std::streamsize>(record.dataSize));
+                file.write(reinterpret_cast<const char*>(record.metadata.data()), static_cast<std::streamsize>(record.metadata.size()));
+                file.write(reinterpret_cast<const char*>(record.tail.data()), static_cast<std::streamsize>(record.tail.size()));
+                entries.push_back({record.header.stream, 0, record.header.sequenceNum, record.header.timestampNs, record.header.timestampDeviceNs, position});
+                messageBytes += record.header.size;
+            } else {
+                file.write(reinterpret_cast<const char*>(record.metadata.data()), static_cast<std::streamsize>(record.metadata.size()));
+            }
+            file.write(padding.data(), static_cast<std::streamsize>(recordingAlign(record.header.size) - record.header.size));
+            position += sizeof(record.header) + recordingAlign(record.header.size);
+        }
+        file.flush();
+        if(!file) throw std::runtime_error("write failed");
+
+        offset = position;
+        index.insert(index.end(), entries.begin(), entries.end());
+        messagesWritten.fetch_add(entries.size(), std::memory_order_relaxed);
+        bytesWritten.fetch_add(messageBytes, std::memory_order_relaxed);
+    }
+
+    void writeIndex() {
+        RecordingIndexHeader header{RECORDING_INDEX_MAGIC, static_cast<std::uint32_t>(streams.size()), index.size()};
+        file.write(reinterpret_cast<const char*>(&header), sizeof(header));
+        std::uint64_t size = sizeof(header);
+        for(const auto& name : streams) {
+            const auto length = static_cast<std::uint32_t>(name.size());
+            file.write(reinterpret_cast<const char*>(&length), sizeof(length));
+            file.write(name.data(), length);
+            size += sizeof(length) + length;
+        }
+        // Entries are 8 byte aligned
+        static const std::array<char, 8> padding{};
+        file.write(padding.data(), static_cast<std::streamsize>((8 - size % 8) % 8));
+        file.write(reinterpret_cast<const char*>(index.data()), static_cast<std::streamsize>(index.size() * sizeof(RecordingIndexEntry)));
+        RecordingTrailer trailer{offset, RECORDING_INDEX_MAGIC, RECORDING_VERSION};
+        file.write(reinterpret_cast<const char*>(&trailer), sizeof(trailer));
+        file.flush();
+        if(!file) error = "write failed";
+    }
+
+    std::string path;
+    std::size_t maxPendingBytes;
+    std::array<char, RECORDING_WRITE_BUFFER_SIZE> writeBuffer{};
+    std::ofstream file;
+    // Owned by the I/O thread until it exits
+    std::uint64_t offset = 0;
+    std::vector<RecordingIndexEntry> index;
+
+    std::mutex mtx;
+    std::condition_variable cv;
+    std::deque<Pending> pending;
+    std::size_t pendingBytes = 0;
+    std::vector<std::string> streams;
+    std::uint64_t dropped = 0;
+    bool closing = false;
+    std::string error;
+    std::thread thread;
+
+    std::atomic<std::uint64_t> messagesWritten{0};
+    std::atomic<std::uint64_t> bytesWritten{0};
+};
+
+// Memory mapped recording, messages are created on demand from their records.
+// Buffer, ImgFrame and EncodedFrame messages reference their data in the mapped file (read-only), other messages copy it
+class RecordingReader {
+   public:
+    // Must be called with GIL held
+    explicit RecordingReader(const std::string& path) : path(path) {
+        auto mmapModule = pybind11::module::import("mmap");
+        pybind11::object file = pybind11::module::import("builtins").attr("open")(path, "rb");
+        try {
+            mapping = mmapModule.attr("mmap")(file.attr("fileno")(), 0, pybind11::arg("access") = mmapModule.attr("ACCESS_READ"));
+        } catch(pybind11::error_already_set& e) {
+            file.attr("close")();
+            if(!e.matches(PyExc_ValueError)) throw;
+            throw std::runtime_error("'" + path + "' isn't a recording");
+        }
+        file.attr("close")();
+        if(PyObject_GetBuffer(mapping.ptr(), &buffer, PyBUF_SIMPLE) != 0) throw pybind11::error_already_set();
+        mapped = true;
+        base = static_cast<const std::uint8_t*>(buffer.buf);
+        size = static_cast<std::uint64_t>(buffer.len);
+
+        try {
+            load();
+        } catch(...) {
+            unmap();
+            throw;
+        }
+    }
+
+    RecordingReader(const RecordingReader&) = delete;
+    RecordingReader& operator=(const RecordingReader&) = delete;
+
+    ~RecordingReader() {
+        if(!PyGILState_Check() && !Py_IsInitialized()) return;
+        pybind11::gil_scoped_acquire gil;
+        try {
+            unmap();
+        } catch(pybind11::error_already_set& e) {
+            e.discard_as_unraisable("RecordingReader");
+        }
+        mapping = pybind11::object();
+    }
+
+    std::string getPath() const {
+        return path;
+    }
+
+    bool isComplete() const {
+        return complete;
+    }
+
+    const std::vector<std::string>& getStreams() const {
+        return streams;
+    }
+
+    std::uint32_t getStreamId(const std::string& name) const {
+        auto it = std::find(streams.begin(), streams.end(), name);
+        if(it == streams.end()) throw pybind11::key_error("Recording has no stream '" + name + "'");
+        return static_cast<std::uint32_t>(it - streams.begin());
+    }
+
+    // Index entries of a stream, in recorded order
+    const std::vector<RecordingIndexEntry>& getEntries(std::uint32_t stream) const {
+        return entries.at(stream);
+    }
+
+    // Entries of all streams in recorded order
+    const std::vector<RecordingIndexEntry>& getAllEntries() const {
+        return all;
+    }
+
+    // Index of first message of a stream with sequence number at least 'sequenceNum'
+    std::size_t findSequenceNum(std::uint32_t stream, std::int64_t sequenceNum) const {
+        const auto& e = entries.at(stream);
+        return std::lower_bound(e.begin(), e.end(), sequenceNum, [](const RecordingIndexEntry& entry, std::int64_t value) { return entry.sequenceNum < value; })
+               - e.begin();
+    }
+
+    // Index of first message of a stream with (host) timestamp at least 'timestampNs'
+    std::size_t findTimestamp(std::uint32_t stream, std::int64_t timestampNs) const {
+        const auto& e = entries.at(stream);
+        return std::lower_bound(e.begin(), e.end(), timestampNs, [](const RecordingIndexEntry& entry, std::int64_t value) { return entry.timestampNs < value; })
+               - e.begin();
+    }
+
+    // Packet of a message record, as laid out in XLink packets
+    std::pair<const std::uint8_t*, std::size_t> getPacket(const RecordingIndexEntry& entry) const {
+        if(!mapped) throw std::runtime_error("Recording is closed");
+        const auto* header = reinterpret_cast<const RecordingRecordHeader*>(base + entry.offset);
+        return {base + entry.offset + sizeof(RecordingRecordHeader), static_cast<std::size_t>(header->size)};
+    }
+
+    // Creates message of an index entry. Must be called with GIL held
+    pybind11::object getMessage(const RecordingIndexEntry& entry) const {
+        if(!mapped) throw std::runtime_error("Recording is closed");
+        const auto packet = getPacket(entry);
+        if(packet.second < RECORDING_PACKET_TAIL_SIZE) throw std::runtime_error("Corrupted recording record");
+        const auto* tail = packet.first + packet.second - RECORDING_PACKET_TAIL_SIZE;
+        const auto datatype = static_cast<dai::DatatypeEnum>(readUInt32(tail));
+        const std::size_t metadataSize = readUInt32(tail + 4);
+        if(metadataSize > packet.second - RECORDING_PACKET_TAIL_SIZE) throw std::runtime_error("Corrupted recording record");
+        const std::size_t dataSize = packet.second - RECORDING_PACKET_TAIL_SIZE - metadataSize;
+
+        switch(datatype) {
+            case dai::DatatypeEnum::Buffer:
+                return mappedMessage<dai::Buffer, dai::RawBuffer>(packet.first, dataSize, metadataSize);
+            case dai::DatatypeEnum::ImgFrame:
+                return mappedMessage<dai::ImgFrame, dai::RawImgFrame>(packet.first, dataSize, metadataSize);
+            case dai::DatatypeEnum::EncodedFrame:
+                return mappedMessage<dai::EncodedFrame, dai::RawEncodedFrame>(packet.first, dataSize, metadataSize);
+            default: {
+                // Parsed the same as received messages, which copies the data
+                streamPacketDesc_t desc{};
+                desc.data = const_cast<std::uint8_t*>(packet.first);
+                desc.length = static_cast<std::uint32_t>(packet.second);
+                return pybind11::cast(dai::StreamMessageParser::parseMessageToADatatype(&desc));
+            }
+        }
+    }
+
+    // Must be called with GIL held. Messages still referencing the file keep it mapped, further reads throw
+    void close() {
+        unmap();
+    }
+
+   private:
+    static std::uint32_t readUInt32(const std::uint8_t* data) {
+        return data[0] | (data[1] << 8) | (data[2] << 16) | (static_cast<std::uint32_t>(data[3]) << 24);
+    }
+
+    template <typename Base, typename Raw>
+    pybind11::object mappedMessage(const std::uint8_t* packet, std::size_t dataSize, std::size_t metadataSize) const {
+        auto msg = std::make_shared<HostMessage<Base, Raw>>();
+        if(!dai::utility::deserialize(packet + dataSize, metadataSize, static_cast<Raw&>(*msg->getRaw()))) {
+            throw std::runtime_error("Couldn't deserialize recorded message metadata");
+        }
+        const auto start = static_cast<pybind11::ssize_t>(packet - base);
+        msg->setExternalData(pybind11::memoryview(mapping)[pybind11::slice(start, start + static_cast<pybind11::ssize_t>(dataSize), 1)]);
+        // Returned as the bound type, host message type itself isn't registered
+        return pybind11::cast(std::static_pointer_cast<Base>(msg));
+    }
+
+    void load() {
+        if(size < sizeof(RecordingFileHeader) || std::memcmp(base, RECORDING_MAGIC.data(), RECORDING_MAGIC.size()) != 0) {
+            throw std::runtime_error("'" + path + "' isn't a recording");
+        }
+        if(reinterpret_cast<const RecordingFileHeader*>(base)->version != RECORDING_VERSION) {
+            throw std::runtime_error("Recording '" + path + "' is of an incompatible version");
+        }
+        complete = loadIndex();
+        if(!complete) scan();
+
+        entries.assign(streams.size(), {});
+        for(const auto& entry : all) {
+            if(entry.stream >= streams.size()) throw std::runtime_error("Corrupted recording index");
+            entries[entry.stream].push_back(entry);
+        }
+    }
+
+    // Reads the index written on close, returns false if there is none
+    bool loadIndex() {
+        if(size < sizeof(RecordingFileHeader) + sizeof(RecordingTrailer)) return false;
+        RecordingTrailer trailer;
+        std::memcpy(&trailer, base + size - sizeof(trailer), sizeof(trailer));
+        if(trailer.magic != RECORDING_INDEX_MAGIC || trailer.version != RECORDING_VERSION) return false;
+        if(trailer.indexOffset < sizeof(RecordingFileHeader) || trailer.indexOffset + sizeof(RecordingIndexHeader) > size - sizeof(trailer)) return false;
+
+        RecordingIndexHeader header;
+        std::memcpy(&header, base + trailer.indexOffset, sizeof(header));
+        if(header.magic != RECORDING_INDEX_MAGIC) return false;
+        std::uint64_t position = trailer.indexOffset + sizeof(header);
+        const auto end = size - sizeof(trailer);
+        std::vector<std::string> names;
+        for(std::uint32_t i = 0; i < header.streams; i++) {
+            if(position + sizeof(std::uint32_t) > end) return false;
+            const auto length = readUInt32(base + position);
+            position += sizeof(std::uint32_t);
+            if(position + length > end) return false;
+            names.emplace_back(reinterpret_cast<const char*>(base + position), length);
+            position += length;
+        }
+        position = (position + 7) / 8 * 8;
+        if(header.entries > (end - std::min(position, end)) / sizeof(RecordingIndexEntry)) return false;
+
+        std::vector<RecordingIndexEntry> index(header.entries);
+        std::memcpy(index.data(), base + position, index.size() * sizeof(RecordingIndexEntry));
+        for(const auto& entry : index) {
+            if(entry.offset + sizeof(RecordingRecordHeader) > trailer.indexOffset) return false;
+            const auto* record = reinterpret_cast<const RecordingRecordHeader*>(base + entry.offset);
+            if(entry.offset + sizeof(RecordingRecordHeader) + record->size > trailer.indexOffset) return false;
+        }
+        streams = std::move(names);
+        all = std::move(index);
+        return true;
+    }
+
+    // Rebuilds the index from complete chunks, eg. of a recording which was interrupted
+    void scan() {
+        std::uint64_t position = sizeof(RecordingFileHeader);
+        while(position + sizeof(RecordingChunkHeader) <= size) {
+            const auto* chunk = reinterpret_cast<const RecordingChunkHeader*>(base + position);
+            if(chunk->magic != RECORDING_CHUNK_MAGIC || chunk->size > size - position - sizeof(RecordingChunkHeader)) break;
+            auto record = position + sizeof(RecordingChunkHeader);
+            const auto end = record + chunk->size;
+            for(std::uint32_t i = 0; i < chunk->records && record + sizeof(RecordingRecordHeader) <= end; i++) {
+                const auto* header = reinterpret_cast<const RecordingRecordHeader*>(base + record);
+                if(header->size > end - record - sizeof(RecordingRecordHeader)) throw std::runtime_error("Corrupted recording chunk");
+                if(header->kind == RecordKind::STREAM) {
+                    if(header->stream != streams.size()) throw std::runtime_error("Corrupted recording stream declaration");
+                    streams.emplace_back(reinterpret_cast<const char*>(base + record + sizeof(RecordingRecordHeader)), static_cast<std::size_t>(header->size));
+                } else if(header->kind == RecordKind::MESSAGE) {
+                    all.push_back({header->stream, 0, header->sequenceNum, header->timestampNs, header->timestampDeviceNs, record});
+                }
+                record += sizeof(RecordingRecordHeader) + recordingAlign(header->size);
+            }
+            position = end;
+        }
+    }
+
+    // Must be called with GIL held
+    void unmap() {
+        if(!mapped) return;
+        PyBuffer_Release(&buffer);
+        mapped = false;
+        try {
+            mapping.attr("close")();
+        } catch(pybind11::error_already_set& e) {
+            // Messages still reference the mapping, it's closed once they are released
+            if(!e.matches(PyExc_BufferError)) throw;
+        }
+    }
+
+    std::string path;
+    pybind11::object mapping;
+    Py_buffer buffer{};
+    bool mapped = false;
+    const std::uint8_t* base = nullptr;
+    std::uint64_t size = 0;
+    bool complete = false;
+    std::vector<std::string> streams;
+    std::vector<RecordingIndexEntry> all;
+    std::vector<std::vector<RecordingIndexEntry>> entries;
+};
@@ -0,0 +1,300 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <climits>
+#include <cstdint>
+#include <cstring>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+
+// pybind
+#include <pybind11/pybind11.h>
+
+// Identifies a shared memory segment created by SharedMemoryRing, and its layout version
+constexpr std::uint32_t SHARED_MEMORY_RING_MAGIC = 0x44414951;  // "DAIQ"
+constexpr std::uint32_t SHARED_MEMORY_RING_VERSION = 1;
+// Alignment of slots and of message data within a slot
+constexpr std::size_t SHARED_MEMORY_RING_ALIGNMENT = 64;
+// Interval in which a full (producer) or empty (consumer) ring is polled, as there is no cross-process notification
+constexpr std::chrono::microseconds SHARED_MEMORY_RING_POLL_INTERVAL{200};
+
+// Atomics are shared between processes, which is only well defined if they are lock-free
+static_assert(ATOMIC_INT_LOCK_FREE == 2 && ATOMIC_LLONG_LOCK_FREE == 2, "SharedMemoryRing requires lock-free atomics");
+
+// Ring of fixed size slots in a 'multiprocessing.shared_memory.SharedMemory' segment.
+// A single producer (the process which created the segment) writes messages into free slots in order,
+// any number of consumers (in any process) claim them in the same order by advancing the shared read index.
+// Claimed slots stay leased until the consumer releases them, only then the producer may reuse them.
+// Segment layout: header, followed by 'slots' slots, each a slot header followed by metadata and (aligned) data
+class SharedMemoryRing {
+   public:
+    enum SlotState : std::uint32_t { FREE = 0, READY = 1, READING = 2 };
+
+    struct Header {
+        std::uint32_t magic;
+        std::uint32_t version;
+        std::uint32_t slots;
+        std::uint32_t reserved;
+        std::uint64_t slotSize;
+        std::atomic<std::uint64_t> writeIndex;
+        std::atomic<std::uint64_t> readIndex;
+        std::atomic<std::uint32_t> closed;
+    };
+
+    struct SlotHeader {
+        std::atomic<std::uint32_t> state;
+        std::int32_t datatype;
+        std::uint64_t metadataSize;
+        std::uint64_t dataSize;
+    };
+
+    // Message as written into or read from a slot
+    struct Message {
+        std::int32_t datatype;
+        const std::uint8_t* metadata;
+        std::size_t metadataSize;
+        const std::uint8_t* data;
+        std::size_t dataSize;
+    };
+
+    static constexpr std::size_t align(std::size_t size) {
+        return (size + SHARED_MEMORY_RING_ALIGNMENT - 1) / SHARED_MEMORY_RING_ALIGNMENT * SHARED_MEMORY_RING_ALIGNMENT;
+    }
+
+    static std::size_t segmentSize(std::uint32_t slots, std::size_t slotSize) {
+        return align(sizeof(Header)) + static_cast<std::size_t>(slots) * (align(sizeof(SlotHeader)) + align(slotSize));
+    }
+
+    // Creates a new segment. Must be called with GIL held
+    SharedMemoryRing(std::uint32_t slots, std::size_t slotSize, const pybind11::object& name) : owner(true) {
+        if(slots == 0) throw std::invalid_argument("SharedMemoryQueue requires at least one slot");
+        if(slotSize == 0) throw std::invalid_argument("SharedMemoryQueue slot size must be positive");
+        auto sharedMemory = pybind11::module::import("multiprocessing.shared_memory").attr("SharedMemory");
+        shm = sharedMemory(pybind11::arg("name") = name, pybind11::arg("create") = true, pybind11::arg("size") = segmentSize(slots, slotSize));
+        try {
+            map();
+        } catch(...) {
+            unmap();
+            shm.attr("unlink")();
+            throw;
+        }
+
+        // Fresh segment is zero filled, atomics are constructed in place
+        header = new(base) Header();
+        header->magic = SHARED_MEMORY_RING_MAGIC;
+        header->version = SHARED_MEMORY_RING_VERSION;
+        header->slots = slots;
+        header->slotSize = slotSize;
+        for(std::uint32_t i = 0; i < slots; i++) new(slotAt(i)) SlotHeader();
+        std::atomic_thread_fence(std::memory_order_release);
+    }
+
+    // Opens an existing segment. Must be called with GIL held
+    explicit SharedMemoryRing(const std::string& name) : owner(false) {
+        auto sharedMemory = pybind11::module::import("multiprocessing.shared_memory").attr("SharedMemory");
+        try {
+            // Python 3.13+, segment is cleaned up by its creator only
+            shm = sharedMemory(name, pybind11::arg("track") = false);
+        } catch(pybind11::error_already_set& e) {
+            if(!e.matches(PyExc_TypeError)) throw;
+            // Worker processes share the resource tracker of their parent, which already tracks the segment.
+            // Otherwise a new resource tracker would unlink the segment once this process exits
+            bool inherited = true;
+            try {
+                auto tracker = pybind11::module::import("multiprocessing.resource_tracker").attr("_resource_tracker");
+                inherited = !pybind11::getattr(tracker, "_fd", pybind11::none()).is_none();
+            } catch(pybind11::error_already_set&) {
+                // No resource tracker on this platform
+            }
+            shm = sharedMemory(name);
+            if(!inherited) pybind11::module::import("multiprocessing.resource_tracker").attr("unregister")(shm.attr("_name"), "shared_memory");
+        }
+        try {
+            map();
+            if(buffer.len < static_cast<Py_ssize_t>(sizeof(Header))) throw std::runtime_error("Shared memory segment '" + name + "' isn't a SharedMemoryQueue");
+            header = static_cast<Header*>(base);
+            std::atomic_thread_fence(std::memory_order_acquire);
+            if(header->magic != SHARED_MEMORY_RING_MAGIC) throw std::runtime_error("Shared memory segment '" + name + "' isn't a SharedMemoryQueue");
+            if(header->version != SHARED_MEMORY_RING_VERSION) {
+                throw std::runtime_error("Shared memory segment '" + name + "' is of an incompatible SharedMemoryQueue version");
+            }
+            if(static_cast<std::size_t>(buffer.len) < segmentSize(header->slots, header->slotSize)) {
+                throw std::runtime_error("Shared memory segment '" + name + "' is smaller than its SharedMemoryQueue layout");
+            }
+        } catch(...) {
+            unmap();
+            throw;
+        }
+    }
+
+    SharedMemoryRing(const SharedMemoryRing&) = delete;
+    SharedMemoryRing& operator=(const SharedMemoryRing&) = delete;
+
+    // Last reference may be dropped by a queue callback (without the GIL)
+    ~SharedMemoryRing() {
+        // Interpreter is already marked uninitialized while objects are destroyed at exit, but GIL is held then
+        if(!PyGILState_Check() && !Py_IsInitialized()) return;
+        pybind11::gil_scoped_acquire gil;
+        try {
+            unmap();
+        } catch(pybind11::error_already_set& e) {
+            e.discard_as_unraisable("SharedMemoryQueue");
+        }
+        shm = pybind11::object();
+    }
+
+    std::string getName() const {
+        return name;
+    }
+
+    bool isOwner() const {
+        return owner;
+    }
+
+    std::uint32_t getSlots() const {
+        return header->slots;
+    }
+
+    std::size_t getSlotSize() const {
+        return static_cast<std::size_t>(header->slotSize);
+    }
+
+    bool isClosed() const {
+        return header->closed.load(std::memory_order_acquire) != 0;
+    }
+
+    void close() {
+        header->closed.store(1, std::memory_order_release);
+    }
+
+    // Removes the segment name, mapping stays valid until the last ring referencing it is destroyed. Must be called with GIL held
+    void unlink() {
+        if(unlinked) return;
+        unlinked = true;
+        shm.attr("unlink")();
+    }
+
+    // Messages written but not yet claimed
+    std::size_t size() const {
+        const auto read = header->readIndex.load(std::memory_order_acquire);
+        const auto write = header->writeIndex.load(std::memory_order_acquire);
+        return write > read ? static_cast<std::size_t>(write - read) : 0;
+    }
+
+    // Whether a message of given sizes fits into a slot
+    bool fits(std::size_t metadataSize, std::size_t dataSize) const {
+        return align(metadataSize) + dataSize <= header->slotSize;
+    }
+
+    // Writes a message into next slot, waiting up to 'timeout' for it to be released (negative waits indefinitely).
+    // Returns false on timeout, throws if ring is closed or message doesn't fit into a slot. Doesn't require the GIL
+    bool push(const Message& msg, std::chrono::microseconds timeout) {
+        if(!owner) throw std::runtime_error("Only the process which created the SharedMemoryQueue can send messages");
+        if(!fits(msg.metadataSize, msg.dataSize)) {
+            throw std::length_error("Message of " + std::to_string(align(msg.metadataSize) + msg.dataSize) + " bytes doesn't fit into SharedMemoryQueue slot of "
+                                    + std::to_string(header->slotSize) + " bytes");
+        }
+
+        std::unique_lock<std::mutex> lock(producerMtx);
+        const auto index = header->writeIndex.load(std::memory_order_relaxed);
+        auto* slot = slotAt(static_cast<std::uint32_t>(index % header->slots));
+        const auto deadline = std::chrono::steady_clock::now() + timeout;
+        while(slot->state.load(std::memory_order_acquire) != FREE) {
+            if(isClosed()) throw std::runtime_error("SharedMemoryQueue is closed");
+            if(timeout >= std::chrono::microseconds(0) && std::chrono::steady_clock::now() >= deadline) return false;
+            std::this_thread::sleep_for(SHARED_MEMORY_RING_POLL_INTERVAL);
+        }
+        if(isClosed()) throw std::runtime_error("SharedMemoryQueue is closed");
+
+        auto* metadata = slotData(slot);
+        if(msg.metadataSize > 0) std::memcpy(metadata, msg.metadata, msg.metadataSize);
+        if(msg.dataSize > 0) std::memcpy(metadata + align(msg.metadataSize), msg.data, msg.dataSize);
+        slot->datatype = msg.datatype;
+        slot->metadataSize = msg.metadataSize;
+        slot->dataSize = msg.dataSize;
+        slot->state.store(READY, std::memory_order_release);
+        header->writeIndex.store(index + 1, std::memory_order_release);
+        return true;
+    }
+
+    // Claims the oldest unclaimed message, leaving its slot leased until 'release' is called.
+    // Returns the slot index or -1 if ring is empty. Doesn't require the GIL
+    std::int64_t tryClaim() {
+        auto read = header->readIndex.load(std::memory_order_acquire);
+        while(read < header->writeIndex.load(std::memory_order_acquire)) {
+            // Other consumers compete for the same message, the one advancing read index owns it
+            if(header->readIndex.compare_exchange_weak(read, read + 1, std::memory_order_acq_rel, std::memory_order_acquire)) {
+                const auto index = static_cast<std::uint32_t>(read % header->slots);
+                slotAt(index)->state.store(READING, std::memory_order_relaxed);
+                return index;
+            }
+        }
+        return -1;
+    }
+
+    // Waits up to 'timeout' for a message to claim (negative waits indefinitely), returns -1 on timeout or if ring is closed and empty
+    std::int64_t claim(std::chrono::microseconds timeout) {
+        const auto deadline = std::chrono::steady_clock::now() + timeout;
+        while(true) {
+            const auto index = tryClaim();
+            if(index >= 0 || isClosed()) return index;
+            if(timeout >= std::chrono::microseconds(0) && std::chrono::steady_clock::now() >= deadline) return -1;
+            std::this_thread::sleep_for(SHARED_MEMORY_RING_POLL_INTERVAL);
+        }
+    }
+
+    // Message in a claimed slot, valid until the slot is released
+    Message message(std::uint32_t index) const {
+        const auto* slot = slotAt(index);
+        const auto* metadata = slotData(slot);
+        return {slot->datatype, metadata, static_cast<std::size_t>(slot->metadataSize), metadata + align(slot->metadataSize), static_cast<std::size_t>(slot->dataSize)};
+    }
+
+    // Returns a claimed slot to the producer
+    void release(std::uint32_t index) {
+        slotAt(index)->state.store(FREE, std::memory_order_release);
+    }
+
+   private:
+    // Must be called with GIL held
+    void map() {
+        name = shm.attr("name").cast<std::string>();
+        pybind11::object buf = shm.attr("buf");
+        if(PyObject_GetBuffer(buf.ptr(), &buffer, PyBUF_WRITABLE) != 0) throw pybind11::error_already_set();
+        mapped = true;
+        base = buffer.buf;
+        if(reinterpret_cast<std::uintptr_t>(base) % SHARED_MEMORY_RING_ALIGNMENT != 0) throw std::runtime_error("Shared memory segment isn't aligned");
+    }
+
+    // Must be called with GIL held
+    void unmap() {
+        if(mapped) PyBuffer_Release(&buffer);
+        mapped = false;
+        shm.attr("close")();
+    }
+
+    SlotHeader* slotAt(std::uint32_t index) const {
+        auto* slots = static_cast<std::uint8_t*>(base) + align(sizeof(Header));
+        return reinterpret_cast<SlotHeader*>(slots + static_cast<std::size_t>(index) * (align(sizeof(SlotHeader)) + align(header->slotSize)));
+    }
+
+    static std::uint8_t* slotData(const SlotHeader* slot) {
+        return const_cast<std::uint8_t*>(reinterpret_cast<const std::uint8_t*>(slot)) + align(sizeof(SlotHeader));
+    }
+
+    // Exported buffer of the segment keeps it mapped, even if the SharedMemory object is closed elsewhere
+    pybind11::object shm;
+    Py_buffer buffer{};
+    bool mapped = false;
+    void* base = nullptr;
+    Header* header = nullptr;
+    std::string name;
+    bool owner;
+    bool unlinked = false;
+    std::mutex producerMtx;
+};
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import depthai as dai
+
+def make_img_detections(count):
+    message = dai.ImgDetections()
+    detections = []
+    for i in range(count):
+        det = dai.ImgDetection()
+        det.label = i
+        det.confidence = 0.5
+        det.xmin, det.ymin, det.xmax, det.ymax = 0.1 * i, 0.2, 0.3 + 0.1 * i, 0.4
+        detections.append(det)
+    message.detections = detections
+    return message
+
+def make_spatial_img_detections(count):
+    message = dai.SpatialImgDetections()
+    detections = []
+    for i in range(count):
+        det = dai.SpatialImgDetection()
+        det.label = i
+        det.confidence = 0.75
+        det.xmin, det.ymin, det.xmax, det.ymax = 0.1, 0.2, 0.3, 0.4
+        det.spatialCoordinates = dai.Point3f(10.0 * i, 20.0, 30.0)
+        detections.append(det)
+    message.detections = detections
+    return message
+
+def test_img_detections_to_numpy():
+    array = make_img_detections(3).toNumpy()
+    assert array.shape == (3, 6)
+    assert array.dtype == np.float32
+    assert np.array_equal(array[:, 0], [0, 1, 2])
+    assert np.allclose(array[2], [2, 0.5, 0.2, 0.2, 0.5, 0.4])
+    assert make_img_detections(0).toNumpy().shape == (0, 6)
+
+@pytest.mark.parametrize("structured", [False, True])
+def test_img_detections_roundtrip(structured):
+    message = make_img_detections(4)
+    array = message.toNumpy(structured=structured)
+    if structured:
+        assert array.dtype.names == ("label", "confidence", "xmin", "ymin", "xmax", "ymax")
+        assert array["label"].dtype == np.uint32
+    restored = dai.ImgDetections.fromNumpy(array)
+    assert len(restored.detections) == 4
+    for original, det in zip(message.detections, restored.detections):
+        assert det.label == original.label
+        assert (det.confidence, det.xmin, det.ymin, det.xmax, det.ymax) == pytest.approx(
+            (original.confidence, original.xmin, original.ymin, original.xmax, original.ymax))
+
+@pytest.mark.parametrize("structured", [False, True])
+def test_spatial_img_detections_roundtrip(structured):
+    message = make_spatial_img_detections(3)
+    array = message.toNumpy(structured=structured)
+    if structured:
+        assert array.dtype.names[-3:] == ("x", "y", "z")
+    else:
+        assert array.shape == (3, 9)
+    restored = dai.SpatialImgDetections.fromNumpy(array)
+    assert [det.label for det in restored.detections] == [0, 1, 2]
+    assert [det.spatialCoordinates.x for det in restored.detections] == pytest.approx([0, 10, 20])
+
+@pytest.mark.parametrize("label", [1.5, -1, np.nan, np.inf, 2.0 ** 33])
+def test_detections_from_numpy_rejects_bad_labels(label):
+    array = make_img_detections(2).toNumpy()
+    array[1, 0] = label
+    with pytest.raises(ValueError):
+        dai.ImgDetections.fromNumpy(array)
+
+    spatial = make_spatial_img_detections(2).toNumpy()
+    spatial[1, 0] = label
+    with pytest.raises(ValueError):
+        dai.SpatialImgDetections.fromNumpy(spatial)
+
+def test_detections_from_numpy_rejects_bad_shape():
+    with pytest.raises(ValueError):
+        dai.ImgDetections.fromNumpy(np.zeros((2, 5), dtype=np.float32))
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import depthai as dai
+
+WIDTH = 8
+HEIGHT = 6
+
+def make_frame(type, data):
+    # Host built frame, stride as set by 'setWidth'
+    frame = dai.ImgFrame()
+    frame.setType(type)
+    frame.setWidth(WIDTH)
+    frame.setHeight(HEIGHT)
+    frame.setData(data.reshape(-1))
+    return frame
+
+def interleaved(seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+@pytest.mark.parametrize("type", [dai.ImgFrame.Type.RGB888i, dai.ImgFrame.Type.BGR888i])
+def test_interleaved_get_planes(type):
+    pixels = interleaved()
+    frame = make_frame(type, pixels)
+    planes = frame.getPlanes()
+    assert len(planes) == 1
+    assert planes[0].shape == (HEIGHT, WIDTH, 3)
+    assert planes[0].strides == (WIDTH * 3, 3, 1)
+    assert np.array_equal(planes[0], pixels)
+    assert np.array_equal(planes[0], frame.getFrame())
+
+def test_interleaved_get_cv_frame():
+    pixels = interleaved()
+    # Old path: 'getFrame' view, channels swapped for RGB
+    rgb = make_frame(dai.ImgFrame.Type.RGB888i, pixels)
+    assert np.array_equal(rgb.getCvFrame(), rgb.getFrame()[:, :, ::-1])
+    bgr = make_frame(dai.ImgFrame.Type.BGR888i, pixels)
+    assert np.array_equal(bgr.getCvFrame(), bgr.getFrame())
+
+    out = np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    assert rgb.getCvFrame(out) is out
+    assert np.array_equal(out, pixels[:, :, ::-1])
+
+@pytest.mark.parametrize("type", [dai.ImgFrame.Type.RGB888p, dai.ImgFrame.Type.BGR888p])
+def test_planar_get_cv_frame(type):
+    pixels = interleaved(1).transpose(2, 0, 1).copy()
+    frame = make_frame(type, pixels)
+    planes = frame.getPlanes()
+    assert len(planes) == 3
+    assert all(np.array_equal(plane, pixels[i]) for i, plane in enumerate(planes))
+
+    expected = frame.getFrame().transpose(1, 2, 0)
+    if type == dai.ImgFrame.Type.RGB888p:
+        expected = expected[:, :, ::-1]
+    assert np.array_equal(frame.getCvFrame(), expected)
+
+def test_interleaved_missing_data_raises():
+    frame = make_frame(dai.ImgFrame.Type.RGB888i, interleaved()[:HEIGHT // 2])
+    with pytest.raises(RuntimeError):
+        frame.getPlanes()
+    with pytest.raises(RuntimeError):
+        frame.getCvFrame()
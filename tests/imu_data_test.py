@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import depthai as dai
+
+MS = 1000000
+
+def make_timestamp(ns):
+    ts = dai.Timestamp()
+    ts.sec = ns // 1000000000
+    ts.nsec = ns % 1000000000
+    return ts
+
+def make_packet(timestampMs, accelero=None, rotation=None):
+    # Sensors left out keep a zero timestamp, as if disabled
+    packet = dai.IMUPacket()
+    if accelero is not None:
+        report = dai.IMUReportAccelerometer()
+        report.x, report.y, report.z = accelero
+        report.tsDevice = make_timestamp(timestampMs * MS)
+        packet.acceleroMeter = report
+    if rotation is not None:
+        report = dai.IMUReportRotationVectorWAcc()
+        report.i, report.j, report.k, report.real = rotation
+        report.tsDevice = make_timestamp(timestampMs * MS)
+        packet.rotationVector = report
+    return packet
+
+def make_imu_data(packets):
+    imuData = dai.IMUData()
+    imuData.packets = packets
+    return imuData
+
+def test_imu_data_to_numpy():
+    packets = [make_packet(10, accelero=(1, 2, 3), rotation=(0, 0, 0, 1)), make_packet(20, accelero=(4, 5, 6))]
+    # Lower rate sensor repeats its last report
+    packets[1].rotationVector = packets[0].rotationVector
+    sensors = make_imu_data(packets).toNumpy()
+    assert set(sensors) == {"acceleroMeter", "gyroscope", "magneticField", "rotationVector"}
+    timestamps, values = sensors["acceleroMeter"]
+    assert list(timestamps) == [10 * MS, 20 * MS]
+    assert values.dtype == np.float32
+    assert np.array_equal(values, [[1, 2, 3], [4, 5, 6]])
+    # Disabled sensors are empty
+    timestamps, values = sensors["gyroscope"]
+    assert len(timestamps) == 0 and values.shape == (0, 3)
+    timestamps, values = sensors["rotationVector"]
+    assert list(timestamps) == [10 * MS]
+    assert np.array_equal(values, [[0, 0, 0, 1]])
+
+def test_imu_ring_buffer_interpolate():
+    ring = dai.IMURingBuffer(capacity=4)
+    ring.add(make_imu_data([make_packet(10, accelero=(0, 0, 0)), make_packet(20, accelero=(10, 20, 30))]))
+    ring.add(make_imu_data([make_packet(20, accelero=(10, 20, 30)), make_packet(30, accelero=(20, 20, 20))]))
+    assert ring.getSize("acceleroMeter") == 3
+
+    values = ring.interpolate("acceleroMeter", np.array([10, 15, 25, 30], dtype=np.int64) * MS)
+    assert np.allclose(values, [[0, 0, 0], [5, 10, 15], [15, 20, 25], [20, 20, 20]])
+    # Outside of buffered samples
+    assert np.all(np.isnan(ring.interpolate("acceleroMeter", [5 * MS, 35 * MS])))
+    assert np.all(np.isnan(ring.interpolate("gyroscope", [15 * MS])))
+
+    timestamps, values = ring.getSamples("acceleroMeter", start=15 * MS)
+    assert list(timestamps) == [20 * MS, 30 * MS]
+    with pytest.raises(KeyError):
+        ring.getSize("unknown")
+
+def test_imu_ring_buffer_capacity():
+    ring = dai.IMURingBuffer(capacity=3)
+    ring.add(make_imu_data([make_packet(10 * (i + 1), accelero=(i, i, i)) for i in range(5)]))
+    timestamps, values = ring.getSamples("acceleroMeter")
+    assert list(timestamps) == [30 * MS, 40 * MS, 50 * MS]
+    assert np.array_equal(values[:, 0], [2, 3, 4])
+
+def test_imu_ring_buffer_quaternion_nlerp():
+    ring = dai.IMURingBuffer(capacity=4)
+    s = np.sqrt(0.5)
+    # Identity and 90 degrees around z, second given as the negated (equivalent) quaternion
+    ring.add(make_imu_data([make_packet(10, rotation=(0, 0, 0, 1)), make_packet(20, rotation=(0, 0, -s, -s))]))
+    value = ring.interpolate("rotationVector", [15 * MS])[0]
+    # Halfway along the shorter arc, 45 degrees around z
+    expected = [0, 0, np.sin(np.pi / 8), np.cos(np.pi / 8)]
+    assert np.isclose(np.linalg.norm(value), 1.0)
+    assert np.allclose(value, expected, atol=1e-5)
+
+def test_imu_ring_buffer_timestamps_jump_back():
+    ring = dai.IMURingBuffer(capacity=8)
+    ring.add(make_imu_data([make_packet(100, accelero=(1, 1, 1)), make_packet(110, accelero=(2, 2, 2))]))
+    # Device reset, timestamps start over
+    ring.add(make_imu_data([make_packet(5, accelero=(3, 3, 3)), make_packet(15, accelero=(4, 4, 4))]))
+    timestamps, values = ring.getSamples("acceleroMeter")
+    assert list(timestamps) == [5 * MS, 15 * MS]
+    assert np.array_equal(values[:, 0], [3, 4])
+    assert np.allclose(ring.interpolate("acceleroMeter", [10 * MS]), [[3.5, 3.5, 3.5]])
+
+    ring.clear()
+    assert ring.getSize("acceleroMeter") == 0
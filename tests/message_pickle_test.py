@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import pickle
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+import depthai as dai
+
+def roundtrip(msg, protocol):
+    if protocol >= 5:
+        buffers = []
+        data = pickle.dumps(msg, protocol=protocol, buffer_callback=buffers.append)
+        return pickle.loads(data, buffers=buffers)
+    return pickle.loads(pickle.dumps(msg, protocol=protocol))
+
+def make_frame():
+    frame = dai.ImgFrame()
+    frame.setType(dai.ImgFrame.Type.GRAY8)
+    frame.setWidth(32)
+    frame.setHeight(24)
+    frame.setSequenceNum(42)
+    frame.setTimestamp(timedelta(seconds=1, microseconds=250))
+    frame.setData(np.arange(32 * 24, dtype=np.uint8))
+    return frame
+
+def make_nndata():
+    nnData = dai.NNData()
+    nnData.setSequenceNum(7)
+    nnData.setTensor("scores", np.linspace(0, 1, 10, dtype=np.float32))
+    nnData.setTensor("boxes", np.arange(24, dtype=np.int32).reshape(6, 4))
+    return nnData
+
+@pytest.mark.parametrize("protocol", [4, 5])
+def test_pickle_imgframe(protocol):
+    frame = make_frame()
+    restored = roundtrip(frame, protocol)
+    assert isinstance(restored, dai.ImgFrame)
+    assert restored.getWidth() == 32
+    assert restored.getHeight() == 24
+    assert restored.getType() == dai.ImgFrame.Type.GRAY8
+    assert restored.getSequenceNum() == 42
+    assert restored.getTimestamp() == frame.getTimestamp()
+    assert np.array_equal(restored.getData(), frame.getData())
+    assert np.array_equal(restored.getFrame(), frame.getFrame())
+
+@pytest.mark.parametrize("protocol", [4, 5])
+def test_pickle_nndata(protocol):
+    nnData = make_nndata()
+    restored = roundtrip(nnData, protocol)
+    assert isinstance(restored, dai.NNData)
+    assert restored.getSequenceNum() == 7
+    assert sorted(restored.getAllLayerNames()) == ["boxes", "scores"]
+    assert np.array_equal(restored.getTensor("scores"), nnData.getTensor("scores"))
+    assert np.array_equal(restored.getTensor("boxes"), nnData.getTensor("boxes"))
+
+@pytest.mark.parametrize("protocol", [4, 5])
+def test_pickle_message_group(protocol):
+    group = dai.MessageGroup()
+    group.setSequenceNum(3)
+    group["frame"] = make_frame()
+    group["nn"] = make_nndata()
+    restored = roundtrip(group, protocol)
+    assert isinstance(restored, dai.MessageGroup)
+    assert restored.getSequenceNum() == 3
+    assert sorted(restored.getMessageNames()) == ["frame", "nn"]
+    assert np.array_equal(restored["frame"].getData(), group["frame"].getData())
+    assert np.array_equal(restored["nn"].getTensor("boxes"), group["nn"].getTensor("boxes"))
+
+def test_pickle_protocol5_out_of_band():
+    frame = make_frame()
+    buffers = []
+    data = pickle.dumps(frame, protocol=5, buffer_callback=buffers.append)
+    # Message data isn't part of the pickle stream
+    assert len(buffers) == 1
+    assert len(data) < frame.getData().nbytes
+    restored = pickle.loads(data, buffers=buffers)
+    assert np.array_equal(restored.getData(), frame.getData())
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+import numpy as np
+
+import depthai as dai
+
+def test_img_frame_pool_recycle_resets_metadata():
+    pool = dai.ImgFramePool(8, 6, dai.ImgFrame.Type.BGR888i, 1)
+    frame = pool.acquire()
+    frame.setSequenceNum(42)
+    frame.setInstanceNum(2)
+    frame.setCategory(3)
+    frame.setTimestampDevice(timedelta(seconds=5))
+    frame.setWidth(4)
+    frame.getData()[:] = 7
+    del frame
+
+    frame = pool.acquire()
+    assert pool.getHits() == 2 and pool.getMisses() == 0
+    assert frame.getSequenceNum() == 0
+    assert frame.getInstanceNum() == dai.ImgFrame().getInstanceNum()
+    assert frame.getCategory() == 0
+    assert frame.getTimestampDevice() == timedelta(0)
+    assert (frame.getWidth(), frame.getHeight(), frame.getType()) == (8, 6, dai.ImgFrame.Type.BGR888i)
+    assert len(frame.getData()) == 8 * 6 * 3
+    assert np.all(frame.getCvFrame() == 7)
+
+def test_buffer_pool_recycle_resets_metadata():
+    pool = dai.BufferPool(16, 1)
+    buffer = pool.acquire()
+    buffer.setSequenceNum(9)
+    buffer.setData(np.zeros(4, dtype=np.uint8))
+    del buffer
+
+    buffer = pool.acquire()
+    assert buffer.getSequenceNum() == 0
+    assert len(buffer.getData()) == 16
+
+def test_nndata_pool_recycle_keeps_tensors():
+    pool = dai.NNDataPool(1)
+    nnData = pool.acquire()
+    nnData.setTensor("out", np.ones(4, dtype=np.float32))
+    nnData.setSequenceNum(3)
+    del nnData
+
+    nnData = pool.acquire()
+    assert nnData.getSequenceNum() == 0
+    assert nnData.hasLayer("out")
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+import depthai as dai
+
+TIMEOUT = timedelta(seconds=10)
+
+def make_frame(sequenceNum, width=64, height=48):
+    frame = dai.ImgFrame()
+    frame.setType(dai.ImgFrame.Type.GRAY8)
+    frame.setWidth(width)
+    frame.setHeight(height)
+    frame.setSequenceNum(sequenceNum)
+    frame.setData(np.full(width * height, sequenceNum % 256, dtype=np.uint8))
+    return frame
+
+def make_pipeline(outputs=("out",)):
+    # XLinkIn "in" looped back to every XLinkOut
+    pipeline = dai.Pipeline()
+    xin = pipeline.create(dai.node.XLinkIn)
+    xin.setStreamName("in")
+    for name in outputs:
+        xout = pipeline.create(dai.node.XLinkOut)
+        xout.setStreamName(name)
+        xin.out.link(xout.input)
+    return pipeline
+
+def send_frames(device, count, start=0):
+    queue = device.getInputQueue("in")
+    for i in range(start, start + count):
+        assert queue.send(make_frame(i), timeout=TIMEOUT)
+
+def wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "Timed out waiting"
+        time.sleep(0.01)
+
+def test_mock_device_load():
+    count = 2000
+    with dai.MockDevice(make_pipeline()) as device:
+        # Counting starts once the queue is handed out
+        out = device.getOutputQueue("out")
+        device.addGenerator("in", make_frame(7), count=count)
+        for _ in range(count):
+            frame = out.get(timeout=TIMEOUT)
+            assert frame is not None
+            assert frame.getSequenceNum() == 7
+            assert frame.getWidth() == 64
+
+        link = device.getLinkStats()
+        assert link.messagesSent == count
+        assert link.messagesReceived == count
+        assert link.messagesConsumed == count
+        assert link.messagesPerSecond > 0
+        assert sum(link.latencyHistogram) == count
+
+        stats = out.getStats()
+        assert stats.name == "out"
+        assert stats.messagesIn == count
+        assert stats.messagesOut == count
+        assert stats.depth == 0
+        assert device.getInputQueue("in").getStats().messagesIn == count
+
+def test_mock_queue_stats_kept_with_queue():
+    with dai.MockDevice(make_pipeline()) as device:
+        device.getOutputQueue("out")
+        send_frames(device, 3)
+        # Counters belong to the queue, not to its Python object
+        wait_until(lambda: device.getOutputQueue("out").getStats().messagesIn == 3)
+        out = device.getOutputQueue("out")
+        assert not hasattr(out, "__dict__")
+        assert len(out.getAll(timeout=TIMEOUT)) == 3
+        assert out.getStats().messagesOut == 3
+        out.resetStats()
+        assert device.getOutputQueue("out").getStats().messagesIn == 0
+
+def test_mock_device_message_integrity():
+    with dai.MockDevice(make_pipeline(("a", "b"))) as device:
+        send_frames(device, 10)
+        for name in ("a", "b"):
+            frames = [device.getOutputQueue(name).get(timeout=TIMEOUT) for _ in range(10)]
+            assert [frame.getSequenceNum() for frame in frames] == list(range(10))
+            assert all(int(frame.getData()[0]) == i for i, frame in enumerate(frames))
+
+def test_mock_device_closed_queue_raises():
+    device = dai.MockDevice(make_pipeline())
+    out = device.getOutputQueue("out")
+    device.close()
+    assert device.isClosed()
+    assert out.isClosed()
+    with pytest.raises(RuntimeError):
+        out.get(timeout=TIMEOUT)
+    with pytest.raises(RuntimeError):
+        device.getInputQueue("in").send(make_frame(0))
+
+def test_mock_queue_drop_policy():
+    count = 20
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out", maxSize=4, blocking=True)
+        out.setDropPolicy(dai.DataOutputQueue.DropPolicy.DROP_OLDEST)
+        out.setMaxBytes(1 << 20)
+        assert out.getDropPolicy() == dai.DataOutputQueue.DropPolicy.DROP_OLDEST
+        assert out.getMaxBytes() == 1 << 20
+
+        # Limited queue drops instead of blocking the link
+        send_frames(device, count)
+        wait_until(lambda: out.getStats().messagesIn == count)
+        frames = out.tryGetAll()
+        assert 0 < len(frames) <= 4
+        assert frames[-1].getSequenceNum() == count - 1
+
+        stats = out.getStats()
+        assert len(frames) + stats.messagesDropped == count
+        assert stats.depth == 0
+
+def test_mock_queue_keep_every_nth_only_when_over_limit():
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out", maxSize=4, blocking=False)
+        out.setDropPolicy(dai.DataOutputQueue.DropPolicy.KEEP_EVERY_NTH, keepEveryN=2)
+        assert out.getKeepEveryN() == 2
+
+        # Under the limit, nothing is decimated
+        send_frames(device, 3)
+        wait_until(lambda: out.getStats().messagesIn == 3)
+        assert [frame.getSequenceNum() for frame in out.tryGetAll()] == [0, 1, 2]
+        assert out.getStats().messagesDropped == 0
+
+        # Once full, only every 2nd incoming message is kept
+        send_frames(device, 8, start=3)
+        wait_until(lambda: out.getStats().messagesIn == 11)
+        assert [frame.getSequenceNum() for frame in out.tryGetAll()] == [5, 6, 7, 9]
+
+def test_mock_queue_remove_limits():
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out", maxSize=8, blocking=False)
+        out.setMaxBytes(1)
+        send_frames(device, 3)
+        wait_until(lambda: out.getStats().messagesIn == 3)
+
+        out.removeLimits()
+        assert out.getMaxBytes() == 0
+        assert out.getDropPolicy() == dai.DataOutputQueue.DropPolicy.DROP_OLDEST
+        # Held message comes first, then the queue keeps messages as set by its maximum size again
+        send_frames(device, 3, start=3)
+        wait_until(lambda: out.getStats().messagesIn == 6)
+        assert [frame.getSequenceNum() for frame in out.getAll(timeout=TIMEOUT)] == [2]
+        assert [frame.getSequenceNum() for frame in out.tryGetAll()] == [3, 4, 5]
+
+        # Limits can be set again
+        out.setMaxBytes(1)
+        assert out.getMaxBytes() == 1
+        send_frames(device, 2, start=6)
+        wait_until(lambda: out.getStats().messagesIn == 8)
+        assert [frame.getSequenceNum() for frame in out.tryGetAll()] == [7]
+
+def test_mock_queue_subscribe():
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out", maxSize=16, blocking=False)
+        with out.subscribe(maxSize=16) as subscription:
+            send_frames(device, 3)
+            messages = [subscription.get(timeout=TIMEOUT) for _ in range(3)]
+            assert [msg.getSequenceNum() for msg in messages] == [0, 1, 2]
+            # The queue keeps its own messages
+            assert [msg.getSequenceNum() for msg in out.getAll(timeout=TIMEOUT)] == [0, 1, 2]
+        assert subscription.isClosed()
+
+def test_mock_queue_async():
+    count = 50
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out")
+        inp = device.getInputQueue("in")
+
+        async def run():
+            async def produce():
+                for i in range(count):
+                    await inp.sendAsync(make_frame(i))
+
+            async def consume():
+                first = await out.getAsync()
+                received = [first.getSequenceNum()]
+                async for msg in out:
+                    received.append(msg.getSequenceNum())
+                    if len(received) == count:
+                        break
+                return received
+
+            received, _ = await asyncio.wait_for(asyncio.gather(consume(), produce()), timeout=10)
+            return received
+
+        assert asyncio.run(run()) == list(range(count))
+        assert inp.getStats().messagesIn == count
+
+def test_mock_queue_async_close():
+    device = dai.MockDevice(make_pipeline())
+    out = device.getOutputQueue("out")
+
+    async def run():
+        async def iterate():
+            return [msg async for msg in out]
+
+        pending = asyncio.ensure_future(out.getAsync())
+        iteration = asyncio.ensure_future(iterate())
+        await asyncio.sleep(0.05)
+        # Closing doesn't call queue callbacks, pending futures are resolved regardless
+        device.close()
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pending, timeout=5)
+        assert await asyncio.wait_for(iteration, timeout=5) == []
+
+    asyncio.run(run())
+
+def test_mock_queue_batched_callback():
+    count = 100
+    received = []
+    done = threading.Event()
+
+    def callback(messages):
+        received.extend(msg.getSequenceNum() for msg in messages)
+        if len(received) >= count:
+            done.set()
+
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out", maxSize=1, blocking=False)
+        callbackId = out.addCallback(callback, batch=10, maxLatencyMs=20.0)
+        send_frames(device, count)
+        assert done.wait(10)
+        assert out.removeCallback(callbackId)
+        assert not out.removeCallback(callbackId)
+        # Worker is stopped, callback isn't called anymore
+        send_frames(device, 10, start=count)
+        wait_until(lambda: out.getStats().messagesIn == count + 10)
+        time.sleep(0.1)
+    assert received == list(range(count))
+
+def test_mock_queue_batched_callback_queue_closed():
+    received = []
+    device = dai.MockDevice(make_pipeline())
+    out = device.getOutputQueue("out", maxSize=1, blocking=False)
+    callbackId = out.addCallback(lambda messages: received.extend(messages), batch=4, maxLatencyMs=100.0)
+    send_frames(device, 2)
+    wait_until(lambda: out.getStats().messagesIn == 2)
+    device.close()
+    # Messages pending when the queue is closed are still delivered
+    wait_until(lambda: len(received) == 2)
+    assert out.removeCallback(callbackId)
+
+def test_mock_device_wait_any():
+    with dai.MockDevice(make_pipeline(("a", "b"))) as device:
+        assert device.waitAny(timeout=timedelta(milliseconds=10)) == {}
+
+        thread = threading.Thread(target=send_frames, args=(device, 1))
+        thread.start()
+        received = {}
+        while set(received) != {"a", "b"}:
+            messages = device.waitAny(["a", "b"], timeout=TIMEOUT)
+            assert messages
+            for name, msgs in messages.items():
+                received.setdefault(name, []).extend(msg.getSequenceNum() for msg in msgs)
+        thread.join()
+        assert received == {"a": [0], "b": [0]}
+        assert device.getAllMessages() == {}
+
+def test_mock_queue_shared_memory_attach():
+    with dai.MockDevice(make_pipeline()) as device, dai.SharedMemoryQueue(4, 1 << 16) as shared:
+        out = device.getOutputQueue("out", maxSize=1, blocking=False)
+        shared.attach(out, blocking=True)
+        consumer = dai.SharedMemoryQueue(shared.getName())
+        send_frames(device, 3)
+        frames = [consumer.get(timeout=TIMEOUT) for _ in range(3)]
+        assert [frame.getSequenceNum() for frame in frames] == [0, 1, 2]
+
+def test_mock_queue_host_sync():
+    with dai.MockDevice(make_pipeline(("a", "b"))) as device:
+        sync = dai.HostSync({"a": device.getOutputQueue("a"), "b": device.getOutputQueue("b")})
+        send_frames(device, 1)
+        group = sync.get(timeout=TIMEOUT)
+        assert group is not None
+        assert group["a"].getSequenceNum() == group["b"].getSequenceNum() == 0
+
+def test_mock_queue_record_replay(tmp_path):
+    count = 10
+    path = str(tmp_path / "mock.rec")
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out", maxSize=count, blocking=False)
+        with dai.Recorder(path, [out]) as recorder:
+            send_frames(device, count)
+            # Recorder callback may run after the queue counters one, wait for the recorder itself
+            wait_until(lambda: recorder.getMessagesWritten() == count)
+    assert os.path.getsize(path) > 0
+
+    with dai.MockDevice(make_pipeline()) as device:
+        with dai.Replay(path, {"out": device.getInputQueue("in")}, realtime=False) as replay:
+            assert replay.wait(TIMEOUT)
+        out = device.getOutputQueue("out")
+        frames = [out.get(timeout=TIMEOUT) for _ in range(count)]
+        assert [frame.getSequenceNum() for frame in frames] == list(range(count))
+
+def record_frames(path, count, intervalMs):
+    # Frames with timestamps 'intervalMs' apart, recorded through the loopback
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out", maxSize=count, blocking=False)
+        with dai.Recorder(path, [out]) as recorder:
+            queue = device.getInputQueue("in")
+            for i in range(count):
+                frame = make_frame(i)
+                frame.setTimestamp(timedelta(milliseconds=i * intervalMs))
+                assert queue.send(frame, timeout=TIMEOUT)
+            wait_until(lambda: recorder.getMessagesWritten() == count)
+
+def replay_frames(path, count, **kwargs):
+    # Replays a recording through the loopback, returning replay stats
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out", maxSize=count, blocking=False)
+        with dai.Replay(path, {"out": device.getInputQueue("in")}, **kwargs) as replay:
+            assert replay.wait(TIMEOUT)
+            stats = replay.getStats()
+        frames = [out.get(timeout=TIMEOUT) for _ in range(count)]
+        assert [frame.getSequenceNum() for frame in frames] == list(range(count))
+    assert stats.messagesSent == count
+    return stats
+
+def test_mock_replay_timing(tmp_path):
+    count = 10
+    path = str(tmp_path / "timing.rec")
+    record_frames(path, count, intervalMs=20)
+    span = timedelta(milliseconds=(count - 1) * 20)
+
+    # Realtime replay keeps the recorded timing (scaled by speed)
+    stats = replay_frames(path, count, realtime=True)
+    assert stats.elapsed >= span * 0.9
+    assert replay_frames(path, count, realtime=True, speed=2.0).elapsed >= span / 2 * 0.9
+
+    # Otherwise messages are sent as fast as the queues accept them
+    fast = replay_frames(path, count, realtime=False)
+    assert fast.elapsed < span
+    assert fast.messagesPerSecond > stats.messagesPerSecond
+
+def test_mock_replay_loop_single_message(tmp_path):
+    path = str(tmp_path / "single.rec")
+    record_frames(path, 1, intervalMs=0)
+
+    with dai.MockDevice(make_pipeline()) as device:
+        out = device.getOutputQueue("out", maxSize=1, blocking=False)
+        # Single message loops at 'fps' instead of as fast as possible
+        with dai.Replay(path, {"out": device.getInputQueue("in")}, loop=True, fps=50.0) as replay:
+            time.sleep(0.3)
+            sent = replay.getStats().messagesSent
+        assert 5 <= sent <= 30
+        assert out.get(timeout=TIMEOUT).getSequenceNum() == 0
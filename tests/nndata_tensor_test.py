@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import depthai as dai
+
+def test_nndata_set_get_tensor_roundtrip():
+    nnData = dai.NNData()
+    for dtype in [np.float32, np.float16, np.uint8, np.int8, np.int32]:
+        array = (np.arange(24) % 100).reshape(2, 3, 4).astype(dtype)
+        nnData.setTensor(f"tensor_{np.dtype(dtype).name}", array)
+        tensor = nnData.getTensor(f"tensor_{np.dtype(dtype).name}")
+        assert tensor.dtype == array.dtype
+        assert tensor.shape == array.shape
+        assert np.array_equal(tensor, array)
+
+def test_nndata_get_tensor_is_view():
+    nnData = dai.NNData()
+    nnData.setTensor("out", np.arange(16, dtype=np.float32).reshape(4, 4))
+    tensor = nnData.getTensor("out")
+    assert not tensor.flags.owndata
+    # View keeps the message alive
+    del nnData
+    assert tensor[3, 3] == 15
+
+def test_nndata_set_tensor_converts_dtype():
+    nnData = dai.NNData()
+    array = np.linspace(-2, 2, 12, dtype=np.float32).reshape(3, 4)
+    nnData.setTensor("fp16", array, dai.TensorInfo.DataType.FP16)
+    assert nnData.getTensor("fp16").dtype == np.float16
+    converted = nnData.getTensor("fp16", np.float32)
+    assert converted.dtype == np.float32
+    assert np.allclose(converted, array, atol=1e-3)
+
+def test_nndata_tensor_info():
+    nnData = dai.NNData()
+    nnData.setTensor("chw", np.zeros((3, 8, 5), dtype=np.uint8))
+    info = dai.TensorInfo()
+    assert nnData.getLayer("chw", info)
+    # Innermost dimension first, as on device
+    assert info.dims == [5, 8, 3]
+    assert info.strides == [1, 5, 40]
+    assert info.order == dai.TensorInfo.StorageOrder.CHW
+    assert nnData.getTensor("chw").shape == (3, 8, 5)
+
+def test_nndata_set_tensor_get_layer():
+    nnData = dai.NNData()
+    array = np.linspace(-1, 1, 12, dtype=np.float32).reshape(3, 4)
+    nnData.setTensor("fp16", array, dai.TensorInfo.DataType.FP16)
+    nnData.setTensor("u8", np.arange(12, dtype=np.uint8).reshape(4, 3))
+    # Core getters size the layer from its TensorInfo, whole tensor is returned in C order
+    assert np.allclose(nnData.getLayerFp16("fp16"), array.ravel(), atol=1e-3)
+    assert nnData.getLayerUInt8("u8") == list(range(12))
+
+def test_nndata_get_all_tensors():
+    nnData = dai.NNData()
+    nnData.setTensor("a", np.ones(4, dtype=np.float32))
+    nnData.setTensor("b", np.full((2, 2), 7, dtype=np.int32))
+    tensors = nnData.getAllTensors()
+    assert set(tensors.keys()) == {"a", "b"}
+    assert np.array_equal(tensors["b"], np.full((2, 2), 7, dtype=np.int32))
+
+def test_nndata_get_missing_tensor():
+    with pytest.raises(KeyError):
+        dai.NNData().getTensor("missing")
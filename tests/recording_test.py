@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import os
+import struct
+import time
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+import depthai as dai
+
+TIMEOUT = timedelta(seconds=10)
+# indexOffset (uint64), magic (uint32), version (uint32)
+TRAILER = struct.Struct("<QII")
+# magic (uint32), records (uint32), size (uint64), padded to 64 bytes
+CHUNK_HEADER = struct.Struct("<IIQ48x")
+CHUNK_MAGIC = 0x4b4e4843
+
+def make_frame(sequenceNum, width=64, height=48):
+    frame = dai.ImgFrame()
+    frame.setType(dai.ImgFrame.Type.GRAY8)
+    frame.setWidth(width)
+    frame.setHeight(height)
+    frame.setSequenceNum(sequenceNum)
+    frame.setData(np.full(width * height, sequenceNum % 256, dtype=np.uint8))
+    return frame
+
+def make_pipeline():
+    # XLinkIn "in" looped back to XLinkOuts "a" and "b"
+    pipeline = dai.Pipeline()
+    xin = pipeline.create(dai.node.XLinkIn)
+    xin.setStreamName("in")
+    for name in ("a", "b"):
+        xout = pipeline.create(dai.node.XLinkOut)
+        xout.setStreamName(name)
+        xin.out.link(xout.input)
+    return pipeline
+
+def wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "Timed out waiting"
+        time.sleep(0.01)
+
+def record(path, count):
+    with dai.MockDevice(make_pipeline()) as device:
+        # Streams nobody else reads are made non-blocking, so the link never stalls
+        with dai.Recorder(device, [], path, blocking=False) as recorder:
+            assert sorted(recorder.getStreams()) == ["a", "b"]
+            queue = device.getInputQueue("in")
+            for i in range(count):
+                assert queue.send(make_frame(i), timeout=TIMEOUT)
+            wait_until(lambda: recorder.getMessagesWritten() == 2 * count)
+        assert recorder.isClosed()
+        assert recorder.getMessagesDropped() == 0
+
+def check_recording(recording, count):
+    assert sorted(recording.getStreams()) == ["a", "b"]
+    assert len(recording) == 2 * count
+    for stream in ("a", "b"):
+        assert recording.getCount(stream) == count
+        for i in range(count):
+            frame = recording.get(stream, i)
+            assert isinstance(frame, dai.ImgFrame)
+            assert frame.getSequenceNum() == i
+            assert frame.getWidth() == 64 and frame.getHeight() == 48
+            assert np.all(frame.getData() == i % 256)
+        assert recording.findSequenceNum(stream, count // 2) == count // 2
+        assert len(recording.getTimestampsNs(stream)) == count
+    with pytest.raises(IndexError):
+        recording.get("a", count)
+    with pytest.raises(KeyError):
+        recording.getCount("missing")
+
+def test_recording_roundtrip(tmp_path):
+    count = 20
+    path = str(tmp_path / "roundtrip.rec")
+    record(path, count)
+
+    with dai.Recording(path) as recording:
+        assert recording.isComplete()
+        check_recording(recording, count)
+        messages = recording.getAll()
+        assert len(messages) == 2 * count
+        assert sorted(stream for stream, _ in messages) == ["a"] * count + ["b"] * count
+
+def test_recorder_keeps_queue_configuration(tmp_path):
+    path = str(tmp_path / "configured.rec")
+    with dai.MockDevice(make_pipeline()) as device:
+        device.getOutputQueue("a", maxSize=8, blocking=True)
+        with dai.Recorder(device, ["a"], path):
+            queue = device.getOutputQueue("a")
+            assert queue.getMaxSize() == 8
+            assert queue.getBlocking()
+        with dai.Recorder(device, ["a"], path, blocking=False):
+            assert device.getOutputQueue("a").getMaxSize() == 8
+            assert not device.getOutputQueue("a").getBlocking()
+
+def test_recording_rebuilds_index_of_unclosed_file(tmp_path):
+    count = 20
+    path = str(tmp_path / "unclosed.rec")
+    record(path, count)
+
+    # Cut off the index and trailer, and leave a partially written chunk instead, as if recording was interrupted
+    with open(path, "r+b") as f:
+        f.seek(-TRAILER.size, os.SEEK_END)
+        indexOffset, _, _ = TRAILER.unpack(f.read(TRAILER.size))
+        f.truncate(indexOffset)
+        f.seek(0, os.SEEK_END)
+        f.write(CHUNK_HEADER.pack(CHUNK_MAGIC, 1, 4096) + b"\0" * 64)
+
+    with dai.Recording(path) as recording:
+        assert not recording.isComplete()
+        check_recording(recording, count)
+
+def test_closed_recording_raises(tmp_path):
+    path = str(tmp_path / "closed.rec")
+    record(path, 1)
+
+    recording = dai.Recording(path)
+    frame = recording.get("a", 0)
+    recording.close()
+    with pytest.raises(RuntimeError):
+        recording.get("a", 0)
+    with pytest.raises(RuntimeError):
+        recording.getAll()
+    # Messages read before closing keep their data
+    assert np.all(frame.getData() == 0)
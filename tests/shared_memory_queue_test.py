@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import multiprocessing
+import time
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+import depthai as dai
+
+def make_frame(sequenceNum, width=64, height=48):
+    frame = dai.ImgFrame()
+    frame.setType(dai.ImgFrame.Type.GRAY8)
+    frame.setWidth(width)
+    frame.setHeight(height)
+    frame.setSequenceNum(sequenceNum)
+    frame.setData(np.full(width * height, sequenceNum % 256, dtype=np.uint8))
+    return frame
+
+def make_buffer(size=16):
+    buffer = dai.Buffer()
+    buffer.setData(np.arange(size, dtype=np.uint8))
+    return buffer
+
+def worker(queue, results, count):
+    # Queue is unpickled in the worker, opening the same shared memory
+    for _ in range(count):
+        frame = queue.get(timeout=timedelta(seconds=10))
+        if frame is None:
+            results.put(None)
+            return
+        data = frame.getData()
+        results.put((frame.getSequenceNum(), frame.getWidth(), frame.getHeight(), int(data.sum()), data.size))
+
+def test_shared_memory_queue_multiprocessing_roundtrip():
+    count = 5
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    with dai.SharedMemoryQueue(2, 1 << 16) as queue:
+        process = ctx.Process(target=worker, args=(queue, results, count))
+        process.start()
+        try:
+            for i in range(count):
+                assert queue.send(make_frame(i), timeout=timedelta(seconds=10))
+            for i in range(count):
+                assert results.get(timeout=10) == (i, 64, 48, (i % 256) * 64 * 48, 64 * 48)
+        finally:
+            process.join(timeout=10)
+    assert process.exitcode == 0
+
+def test_shared_memory_queue_slot_recycling():
+    with dai.SharedMemoryQueue(2, 4096) as queue:
+        consumer = dai.SharedMemoryQueue(queue.getName())
+        assert not consumer.isOwner()
+
+        assert queue.send(make_buffer(), timeout=timedelta(0))
+        assert queue.send(make_buffer(), timeout=timedelta(0))
+        assert not queue.send(make_buffer(), timeout=timedelta(0))
+
+        # Claimed slots stay leased while their messages live
+        first = consumer.tryGet()
+        second = consumer.tryGet()
+        assert first is not None and second is not None
+        assert consumer.tryGet() is None
+        assert not queue.send(make_buffer(), timeout=timedelta(0))
+
+        # Views of the data keep the slot leased as well
+        data = first.getData()
+        del first
+        assert not queue.send(make_buffer(), timeout=timedelta(0))
+        assert np.array_equal(data, np.arange(16, dtype=np.uint8))
+        del data
+        assert queue.send(make_buffer(), timeout=timedelta(0))
+
+        del second
+        assert queue.send(make_buffer(), timeout=timedelta(0))
+        consumer.close()
+
+def test_shared_memory_queue_nndata_is_copied():
+    with dai.SharedMemoryQueue(1, 4096) as queue:
+        consumer = dai.SharedMemoryQueue(queue.getName())
+        nnData = dai.NNData()
+        nnData.setTensor("out", np.arange(12, dtype=np.float16).reshape(3, 4))
+        assert queue.send(nnData, timeout=timedelta(0))
+
+        received = consumer.tryGet()
+        tensor = received.getTensor("out")
+        # Slot is released on receive, while the tensor stays valid
+        assert queue.send(make_buffer(), timeout=timedelta(0))
+        assert np.array_equal(tensor, np.arange(12, dtype=np.float16).reshape(3, 4))
+        assert received.getLayerFp16("out") == list(range(12))
+        consumer.close()
+
+def test_shared_memory_queue_send_timeout_when_full():
+    with dai.SharedMemoryQueue(1, 4096) as queue:
+        assert queue.send(make_buffer(), timeout=timedelta(0))
+        start = time.monotonic()
+        assert not queue.send(make_buffer(), timeout=timedelta(milliseconds=100))
+        assert time.monotonic() - start >= 0.09
+
+def test_shared_memory_queue_get_timeout_when_empty():
+    with dai.SharedMemoryQueue(1, 4096) as queue:
+        consumer = dai.SharedMemoryQueue(queue.getName())
+        assert consumer.get(timeout=timedelta(milliseconds=50)) is None
+        consumer.close()
+
+def test_shared_memory_queue_rejects_oversized_and_consumer_send():
+    with dai.SharedMemoryQueue(1, 4096) as queue:
+        with pytest.raises(ValueError):
+            queue.send(make_buffer(1 << 16))
+        consumer = dai.SharedMemoryQueue(queue.getName())
+        with pytest.raises(RuntimeError):
+            consumer.send(make_buffer())
+        consumer.close()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import depthai as dai
+
+Status = dai.Tracklet.TrackingStatus
+
+def make_tracklet(id, x, status=Status.TRACKED):
+    tracklet = dai.Tracklet()
+    tracklet.id = id
+    tracklet.label = 2
+    tracklet.age = 5
+    tracklet.status = status
+    tracklet.roi = dai.Rect(x, 0.2, 0.1, 0.2)
+    tracklet.spatialCoordinates = dai.Point3f(1.0, 2.0, 3.0 + id)
+    return tracklet
+
+def make_tracklets(sequenceNum, tracklets):
+    message = dai.Tracklets()
+    message.tracklets = tracklets
+    message.setSequenceNum(sequenceNum)
+    return message
+
+def test_tracklets_to_numpy():
+    message = make_tracklets(0, [make_tracklet(1, 0.1), make_tracklet(4, 0.5, Status.LOST)])
+    array = message.toNumpy()
+    assert array.shape == (2, 11)
+    assert array.dtype == np.float32
+    assert np.allclose(array[1], [4, 2, 5, int(Status.LOST), 0.5, 0.2, 0.1, 0.2, 1.0, 2.0, 7.0])
+
+    records = message.toNumpy(structured=True)
+    assert records.dtype.names == ("id", "label", "age", "status", "x", "y", "width", "height", "spatialX", "spatialY", "spatialZ")
+    assert records["id"].dtype == np.int32
+    assert list(records["id"]) == [1, 4]
+    assert list(records["status"]) == [int(Status.TRACKED), int(Status.LOST)]
+    assert dai.Tracklets().toNumpy().shape == (0, 11)
+
+def test_tracklet_history_ring_wraparound():
+    history = dai.TrackletHistory(maxTracks=2, length=3)
+    for i in range(5):
+        history.add(make_tracklets(i, [make_tracklet(1, 0.1 * i)]))
+    assert history.getLength(1) == 3
+    # Oldest first, only the last 'length' entries are kept
+    assert list(history.getSequenceNums(1)) == [2, 3, 4]
+    assert np.allclose(history.getHistory(1)[:, 0], [0.2, 0.3, 0.4])
+    assert list(history.getSequenceNums(1, last=2)) == [3, 4]
+    assert np.allclose(history.getPositions(1, last=1), [[0.45, 0.3]])
+    assert history.getHistory(1).shape == (3, 7)
+
+def test_tracklet_history_lru_eviction():
+    history = dai.TrackletHistory(maxTracks=2, length=4)
+    history.add(make_tracklets(0, [make_tracklet(1, 0.1), make_tracklet(2, 0.2)]))
+    # Track 1 becomes the most recently updated one
+    history.add(make_tracklets(1, [make_tracklet(1, 0.1)]))
+    history.add(make_tracklets(2, [make_tracklet(3, 0.3)]))
+    assert history.getTrackIds() == [1, 3]
+    assert 2 not in history
+    assert list(history.getSequenceNums(1)) == [0, 1]
+    assert list(history.getSequenceNums(3)) == [2]
+    with pytest.raises(KeyError):
+        history.getHistory(2)
+
+def test_tracklet_history_removed():
+    history = dai.TrackletHistory(maxTracks=2, length=4)
+    history.add(make_tracklets(0, [make_tracklet(1, 0.1), make_tracklet(2, 0.2)]))
+    history.add(make_tracklets(1, [make_tracklet(1, 0.1, Status.REMOVED), make_tracklet(2, 0.2)]))
+    assert history.getTrackIds() == [2]
+    assert len(history) == 1
+    # Slot of the removed track is reused without evicting track 2
+    history.add(make_tracklets(2, [make_tracklet(5, 0.5)]))
+    assert history.getTrackIds() == [2, 5]
+    # Reappearing id starts a new track, evicting the least recently updated one
+    history.add(make_tracklets(3, [make_tracklet(1, 0.1)]))
+    assert list(history.getSequenceNums(1)) == [3]
+    assert history.getTrackIds() == [1, 5]
+    # REMOVED of an unknown track is ignored
+    history.add(make_tracklets(4, [make_tracklet(9, 0.9, Status.REMOVED)]))
+    history.clear()
+    assert len(history) == 0
+
+def test_tracklet_history_invalid_size():
+    with pytest.raises(ValueError):
+        dai.TrackletHistory(0, 4)
@@ -3,6 +3,7 @@ from typing import Any, List, Optional, Tuple, Dict
 import cv2
 import numpy as np
 import signal
+from datetime import timedelta
 
 def on_exit(sig, frame):
     cv2.destroyAllWindows()
@@ -168,24 +169,27 @@ def stress_test(mxid: str = ""):
         pipeline, outputs, pipeline_context = build_pipeline(device, args)
         device.startPipeline(pipeline)
         start_time = time.time()
-        queues = [device.getOutputQueue(name, size, False)
-                  for name, size in outputs if name != "sys_log"]
+        queue_names = [name for name, size in outputs if name != "sys_log"]
+        for name, size in outputs:
+            if name != "sys_log":
+                device.getOutputQueue(name, size, False)
         camera_control_q = device.getInputQueue("cam_control")
         sys_info_q = device.getOutputQueue("sys_log", 1, False)
         usb_speed = device.getUsbSpeed()
         while True:
-            for queue in queues:
-                packet = queue.tryGet()
-                # print("QUEUE", queue.getName(), "PACKET", packet)
-                if packet is not None:
-                    if queue.getName() == "tof":
+            # Blocks until any queue has messages, then takes them from all queues at once.
+            # Timeout keeps the GUI responsive
+            for name, packets in device.waitAny(queue_names, timedelta(milliseconds=30)).items():
+                for packet in packets:
+                    # print("QUEUE", name, "PACKET", packet)
+                    if name == "tof":
                         frame = packet.getCvFrame()
                         frame = (frame.view(np.int16).astype(float))
                         frame = cv2.normalize(
                             frame, frame, alpha=255, beta=0, norm_type=cv2.NORM_MINMAX, dtype=cv2.CV_8U)
                         frame = cv2.applyColorMap(frame, jet_custom)
-                        last_frame[queue.getName()] = frame
-                    elif queue.getName() == "stereo depth":
+                        last_frame[name] = frame
+                    elif name == "stereo depth":
                         frame = packet.getFrame()
                         depth_downscaled = frame[::4]
                         try:
@@ -199,13 +203,13 @@ def stress_test(mxid: str = ""):
                         frame = cv2.applyColorMap(
                         frame, jet_custom)
                         frame = cv2.applyColorMap(frame, jet_custom)
-                        last_frame[queue.getName()] = frame
+                        last_frame[name] = frame
                     elif isinstance(packet, dai.ImgFrame):
                         # Skip encoded frames as decoding is heavy on the host machine
                         if packet.getType() == dai.ImgFrame.Type.BITSTREAM:
                             continue
                         else:
-                            last_frame[queue.getName()] = packet.getCvFrame()
+                            last_frame[name] = packet.getCvFrame()
                     elif isinstance(packet, dai.ImgDetections):
                         frame = last_frame.get(pipeline_context.q_name_yolo_passthrough, None)
                         if frame is None:
@@ -221,6 +225,9 @@ def stress_test(mxid: str = ""):
                 print(f"[{int(time.time() - start_time)}s] Usb speed {usb_speed}")
                 print("----------------------------------------")
                 print_system_information(sys_info)
+                for name, stats in device.getQueueStats().items():
+                    if stats.messagesDropped:
+                        print(f"Queue {name}: dropped {stats.messagesDropped} of {stats.messagesIn} messages, peak depth {stats.peakDepth}")
             for name, frame in last_frame.items():
                 cv2.imshow(name, frame)
 